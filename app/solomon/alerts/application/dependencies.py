@@ -0,0 +1,14 @@
+from fastapi import Depends
+
+from app.solomon.alerts.application.services import AlertService
+from app.solomon.alerts.infrastructure.repositories import AlertRepository
+from app.solomon.infrastructure.database import get_repository
+
+get_alert_repository = get_repository(AlertRepository)
+
+
+def get_alert_service(
+    alert_repository: AlertRepository = Depends(get_alert_repository),
+) -> AlertService:
+    """Factory for AlertService"""
+    return AlertService(alert_repository)
@@ -0,0 +1,47 @@
+"""Alerts Jobs Module"""
+
+import asyncio
+import logging
+from typing import Callable
+
+from app.solomon.alerts.domain.models import Alert
+from app.solomon.alerts.infrastructure.repositories import AlertRepository
+from app.solomon.infrastructure.config import ALERTS_BATCH_SIZE
+from app.solomon.infrastructure.database import create_session
+
+logger = logging.getLogger(__name__)
+
+
+def log_alert(alert: Alert) -> None:
+    """Deliver an alert to the application log."""
+    logger.info("Alert %s for user %s: %s", alert.type, alert.user_id, alert.payload)
+
+
+def dispatch_alert_batch(deliver: Callable[[Alert], None] = log_alert) -> int:
+    """
+    Deliver a batch of pending alerts and mark them as dispatched, in a single
+    database transaction. If a delivery fails, the whole batch stays pending and
+    is retried by the next run.
+    """
+    with create_session() as session:
+        repository = AlertRepository(session)
+        alerts = repository.get_pending(ALERTS_BATCH_SIZE)
+        for alert in alerts:
+            deliver(alert)
+        if alerts:
+            repository.mark_dispatched([alert.id for alert in alerts])
+        repository.commit()
+    return len(alerts)
+
+
+async def dispatch_alerts() -> int:
+    """
+    Drain the alerts outbox in batches of ``ALERTS_BATCH_SIZE`` alerts. Returns
+    the number of alerts dispatched.
+    """
+    dispatched = 0
+    while True:
+        count = await asyncio.to_thread(dispatch_alert_batch)
+        dispatched += count
+        if count < ALERTS_BATCH_SIZE:
+            return dispatched
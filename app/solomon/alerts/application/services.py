@@ -0,0 +1,15 @@
+from app.solomon.alerts.infrastructure.repositories import AlertRepository
+from app.solomon.alerts.presentation.models import AlertsResponseMapper
+
+
+class AlertService:
+    """Service for the alerts fired by the write path"""
+
+    def __init__(self, alert_repository: AlertRepository):
+        self.alert_repository = alert_repository
+
+    def get_alerts(self, user_id: str, limit: int) -> AlertsResponseMapper:
+        """Get the most recent alerts of a user."""
+        return AlertsResponseMapper.create(
+            self.alert_repository.get_all(user_id, limit)
+        )
@@ -0,0 +1,33 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, String, text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+from app.solomon.infrastructure.database import BaseModel
+
+
+class Alert(BaseModel):
+    """
+    Alert model
+
+    Transactional outbox of the alerts fired by the write path. Alerts are inserted
+    in the same database transaction as the write that fired them, and delivered
+    later by the dispatcher job, which sets ``dispatched_at``.
+
+    Alerts that must fire only once, such as a budget exceeded in a month, have a
+    ``dedupe_key``, so firing them again is a no-op.
+    """
+
+    __tablename__ = "alerts"
+    __table_args__ = (
+        Index("ix_alerts_user_id_created_at", "user_id", "created_at"),
+        Index(
+            "ix_alerts_pending",
+            "created_at",
+            postgresql_where=text("dispatched_at IS NULL"),
+        ),
+    )
+
+    user_id = Column(UUID(as_uuid=False), ForeignKey("users.id"), nullable=False)
+    type = Column(String(30), nullable=False)
+    payload = Column(JSONB, nullable=False)
+    dedupe_key = Column(String(100), unique=True)
+    dispatched_at = Column(DateTime(timezone=True))
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class AlertTypes(str, Enum):
+    CREDIT_CARD_LIMIT = "credit_card_limit"
+    BUDGET_EXCEEDED = "budget_exceeded"
@@ -0,0 +1,134 @@
+"""Alerts Repositories Module"""
+
+from typing import Any, Dict, Iterable, List, Tuple
+
+from sqlalchemy import Numeric, and_, cast, func, literal, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm.session import Session
+from sqlalchemy.sql import desc
+
+from app.solomon.alerts.domain.models import Alert
+from app.solomon.alerts.domain.options import AlertTypes
+from app.solomon.transactions.domain.models import Budget, MonthlyRollup
+
+
+class AlertRepository:
+    """Alerts repository. It is used to interact with the database."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def commit(self):
+        """Commit the current transaction."""
+        self.session.commit()
+
+    def get_all(self, user_id: str, limit: int) -> List[Alert]:
+        """Get the most recent alerts of a user."""
+        return list(
+            self.session.scalars(
+                select(Alert)
+                .where(Alert.user_id == user_id)
+                .order_by(desc(Alert.created_at), Alert.id)
+                .limit(limit)
+            )
+        )
+
+    def queue(self, alerts: List[Dict[str, Any]]) -> None:
+        """
+        Insert alerts into the outbox, in the current database transaction, skipping
+        the ones whose ``dedupe_key`` was already queued.
+        """
+        if not alerts:
+            return
+        self.session.execute(
+            insert(Alert)
+            .values(alerts)
+            .on_conflict_do_nothing(index_elements=[Alert.dedupe_key])
+        )
+
+    def queue_budget_alerts(self, months: Iterable[Tuple[str, str, Any]]) -> None:
+        """
+        Queue an alert for each budget whose spending reached its threshold in one
+        of the given months, at most once per budget and month.
+
+        Parameters
+        ----------
+        months : Iterable[Tuple[str, str, Any]]
+            The ``(user_id, category_id, month)`` keys of the expense rollups that
+            were just incremented.
+        """
+        keys = list(set(months))
+        if not keys:
+            return
+
+        spent = func.sum(MonthlyRollup.total)
+        rows = (
+            select(
+                func.gen_random_uuid(),
+                Budget.user_id,
+                literal(AlertTypes.BUDGET_EXCEEDED.value),
+                func.jsonb_build_object(
+                    "budget_id",
+                    Budget.id,
+                    "category_id",
+                    Budget.category_id,
+                    "month",
+                    MonthlyRollup.month,
+                    "amount",
+                    Budget.amount,
+                    "spent",
+                    func.round(cast(spent, Numeric), 2),
+                    "threshold",
+                    Budget.alert_threshold,
+                ),
+                func.concat("budget:", Budget.id, ":", MonthlyRollup.month),
+                func.now(),
+            )
+            .join(
+                MonthlyRollup,
+                and_(
+                    MonthlyRollup.user_id == Budget.user_id,
+                    MonthlyRollup.category_id == Budget.category_id,
+                    MonthlyRollup.is_revenue.is_(False),
+                ),
+            )
+            .where(
+                tuple_(Budget.user_id, Budget.category_id, MonthlyRollup.month).in_(
+                    keys
+                )
+            )
+            .group_by(Budget.id, MonthlyRollup.month)
+            .having(spent >= Budget.amount * Budget.alert_threshold / 100.0)
+        )
+        self.session.execute(
+            insert(Alert)
+            .from_select(
+                ["id", "user_id", "type", "payload", "dedupe_key", "updated_at"],
+                rows,
+            )
+            .on_conflict_do_nothing(index_elements=[Alert.dedupe_key])
+        )
+
+    def get_pending(self, limit: int) -> List[Alert]:
+        """
+        Get and lock the oldest alerts not dispatched yet. Alerts locked by another
+        dispatcher are skipped, so several dispatchers can drain the outbox at once.
+        """
+        return list(
+            self.session.scalars(
+                select(Alert)
+                .where(Alert.dispatched_at.is_(None))
+                .order_by(Alert.created_at, Alert.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            )
+        )
+
+    def mark_dispatched(self, alert_ids: List[str]) -> None:
+        """Mark alerts as dispatched."""
+        self.session.execute(
+            update(Alert)
+            .where(Alert.id.in_(alert_ids))
+            .values(dispatched_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
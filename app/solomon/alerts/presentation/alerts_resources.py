@@ -0,0 +1,36 @@
+from fastapi import APIRouter, Depends, Query
+
+from app.solomon.alerts.application.dependencies import get_alert_service
+from app.solomon.alerts.application.services import AlertService
+from app.solomon.alerts.presentation.models import AlertsResponseMapper
+from app.solomon.auth.application.security import get_current_user
+from app.solomon.auth.presentation.models import UserTokenAuthenticated
+
+alert_router = APIRouter()
+
+
+@alert_router.get("/")
+async def get_alerts(
+    limit: int = Query(50, ge=1, le=200),
+    alert_service: AlertService = Depends(get_alert_service),
+    current_user: UserTokenAuthenticated = Depends(get_current_user),
+) -> AlertsResponseMapper:
+    """
+    Get the current user's most recent alerts.
+
+    Parameters
+    ----------
+    limit : int
+        Maximum number of alerts, by default 50.
+    alert_service : AlertService, optional
+        The service to be used to get the alerts, by default
+        Depends(get_alert_service)
+    current_user : UserTokenAuthenticated, optional
+        The current user, by default Depends(get_current_user)
+
+    Returns
+    -------
+    AlertsResponseMapper
+        The alerts, most recent first.
+    """
+    return alert_service.get_alerts(current_user.id, limit)
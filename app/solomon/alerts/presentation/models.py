@@ -0,0 +1,40 @@
+import datetime
+from typing import Any, Dict, List, Optional, Self
+
+from pydantic import BaseModel, ConfigDict
+
+from app.solomon.alerts.domain.models import Alert
+from app.solomon.common.models import ResponseMapper
+
+
+class AlertMapper(BaseModel):
+    """Mapper model for alerts"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    type: str
+    payload: Dict[str, Any]
+    created_at: datetime.datetime
+    dispatched_at: Optional[datetime.datetime] = None
+
+
+class AlertsResponseMapper(ResponseMapper[List[AlertMapper]]):
+    """Response model for alerts"""
+
+    @classmethod
+    def create(cls, alerts: List[Alert]) -> Self:
+        """
+        Create an AlertsResponseMapper instance.
+
+        Parameters
+        ----------
+        alerts : List[Alert]
+            The alerts to be mapped.
+
+        Returns
+        -------
+        AlertsResponseMapper
+            An AlertsResponseMapper instance containing the mapped alerts.
+        """
+        return cls(data=[AlertMapper.model_validate(alert) for alert in alerts])
@@ -0,0 +1,17 @@
+from fastapi import Depends
+
+from app.solomon.analytics.application.services import AnalyticsService
+from app.solomon.analytics.infrastructure.snapshots import SnapshotStore
+from app.solomon.infrastructure.config import SNAPSHOTS_PATH
+
+
+def get_snapshot_store() -> SnapshotStore:
+    """Factory for SnapshotStore"""
+    return SnapshotStore(SNAPSHOTS_PATH)
+
+
+def get_analytics_service(
+    snapshot_store: SnapshotStore = Depends(get_snapshot_store),
+) -> AnalyticsService:
+    """Factory for AnalyticsService"""
+    return AnalyticsService(snapshot_store)
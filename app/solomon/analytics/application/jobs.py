@@ -0,0 +1,33 @@
+"""Analytics Jobs Module"""
+
+from typing import List, Optional
+
+from app.solomon.analytics.application.services import SnapshotService
+from app.solomon.analytics.infrastructure.repositories import SnapshotRepository
+from app.solomon.analytics.infrastructure.snapshots import SnapshotStore
+from app.solomon.infrastructure.config import JOBS_CONCURRENCY, SNAPSHOTS_PATH
+from app.solomon.infrastructure.database import create_session
+from app.solomon.infrastructure.scheduler import run_in_batches
+from app.solomon.users.application.jobs import next_user_batch
+
+
+def snapshot_user_entries(
+    user_ids: List[str], store: Optional[SnapshotStore] = None
+) -> int:
+    """Sync the analytics snapshots of a batch of users."""
+    store = store or SnapshotStore(SNAPSHOTS_PATH)
+    with create_session() as session:
+        service = SnapshotService(SnapshotRepository(session), store)
+        for user_id in user_ids:
+            service.sync(user_id)
+    return len(user_ids)
+
+
+async def snapshot_entries() -> int:
+    """
+    Sync the analytics snapshots of every user, in batches of ``JOBS_BATCH_SIZE``
+    users with at most ``JOBS_CONCURRENCY`` batches running at a time.
+    """
+    return await run_in_batches(
+        next_user_batch, snapshot_user_entries, JOBS_CONCURRENCY
+    )
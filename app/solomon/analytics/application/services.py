@@ -0,0 +1,94 @@
+from collections import defaultdict
+
+import pyarrow as pa
+
+from app.solomon.analytics.domain.models import SnapshotState
+from app.solomon.analytics.infrastructure.repositories import SnapshotRepository
+from app.solomon.analytics.infrastructure.snapshots import ENTRY_SCHEMA, SnapshotStore
+from app.solomon.analytics.presentation.models import (
+    AnalyticsSummaryParams,
+    AnalyticsSummaryResponseMapper,
+)
+from app.solomon.transactions.domain.options import SummaryGroups
+
+GROUP_COLUMNS = {
+    SummaryGroups.MONTH: "month",
+    SummaryGroups.CATEGORY: "category_id",
+    SummaryGroups.KIND: "kind",
+    SummaryGroups.CREDIT_CARD: "credit_card_id",
+    SummaryGroups.IS_REVENUE: "is_revenue",
+}
+
+
+class SnapshotService:
+    """Service keeping the analytics snapshots in sync with the database"""
+
+    def __init__(
+        self, snapshot_repository: SnapshotRepository, snapshot_store: SnapshotStore
+    ):
+        self.snapshot_repository = snapshot_repository
+        self.snapshot_store = snapshot_store
+
+    def sync(self, user_id: str) -> int:
+        """
+        Rewrite the months of a user's snapshot whose entries changed since the last
+        sync, comparing the fingerprint of each month in the database with the one
+        saved with the snapshot. Months without entries anymore are removed.
+
+        Returns
+        -------
+        int
+            The number of months written or removed.
+        """
+        synced_at = self.snapshot_repository.get_now()
+        state = self.snapshot_store.get_state(user_id)
+        fingerprints = self.snapshot_repository.get_month_fingerprints(user_id)
+        changed = sorted(
+            month
+            for month in fingerprints.keys() | state.months.keys()
+            if fingerprints.get(month) != state.months.get(month)
+        )
+
+        entries = defaultdict(list)
+        for row in self.snapshot_repository.get_entries(user_id, changed):
+            entry = row._asdict()
+            entries[entry.pop("month")].append(entry)
+        for month in changed:
+            self.snapshot_store.write_month(
+                user_id,
+                month,
+                pa.Table.from_pylist(entries[month], schema=ENTRY_SCHEMA),
+            )
+
+        self.snapshot_store.save_state(
+            user_id, SnapshotState(synced_at=synced_at, months=fingerprints)
+        )
+        return len(changed)
+
+
+class AnalyticsService:
+    """Service for the analytics queries run on the snapshots"""
+
+    def __init__(self, snapshot_store: SnapshotStore):
+        self.snapshot_store = snapshot_store
+
+    def summarize(
+        self, user_id: str, params: AnalyticsSummaryParams
+    ) -> AnalyticsSummaryResponseMapper:
+        """
+        Sum a user's snapshot entries grouped by the requested dimensions.
+
+        Raises
+        ------
+        InvalidFilter
+            If a dimension is unknown.
+        SnapshotNotFound
+            If the user's entries were never synced.
+        """
+        group_by = [GROUP_COLUMNS[group] for group in params.to_groups()]
+        rows = self.snapshot_store.summarize(
+            user_id, group_by, params.start, params.end, params.is_revenue
+        )
+        return AnalyticsSummaryResponseMapper.create(
+            rows, self.snapshot_store.get_state(user_id).synced_at
+        )
@@ -0,0 +1,4 @@
+class SnapshotNotFound(Exception):
+    """Exception class for users without an analytics snapshot yet"""
+
+    pass
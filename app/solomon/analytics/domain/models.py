@@ -0,0 +1,25 @@
+"""Analytics Domain Models"""
+
+from datetime import date, datetime
+from typing import Dict, NamedTuple, Optional
+
+
+class MonthFingerprint(NamedTuple):
+    """
+    Number, total and last update of a user's entries in a month.
+
+    A month is written again to the snapshot when its fingerprint changes: the last
+    ``updated_at`` catches new and updated entries, the number and total catch
+    deleted ones.
+    """
+
+    count: int
+    total: float
+    updated_at: Optional[datetime]
+
+
+class SnapshotState(NamedTuple):
+    """Fingerprint of each month of a user's snapshot as of its last sync."""
+
+    synced_at: Optional[datetime]
+    months: Dict[date, MonthFingerprint]
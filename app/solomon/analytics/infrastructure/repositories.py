@@ -0,0 +1,90 @@
+"""Analytics Repositories Module"""
+
+from datetime import date, datetime
+from typing import Dict, Iterable, List
+
+from sqlalchemy import Date, DateTime, Row, Select, cast, func, select
+from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.solomon.analytics.domain.models import MonthFingerprint
+from app.solomon.transactions.infrastructure.repositories import (
+    LedgerInstallment,
+    LedgerTransaction,
+    entry_date,
+    money,
+)
+
+ENTRY_DATE = entry_date(LedgerInstallment, LedgerTransaction)
+ENTRY_AMOUNT = func.coalesce(LedgerInstallment.amount, LedgerTransaction.amount)
+ENTRY_MONTH = cast(func.date_trunc("month", cast(ENTRY_DATE, DateTime)), Date)
+
+
+class SnapshotRepository:
+    """
+    Repository of the entries copied to the analytics snapshots. Entries are
+    installments and transactions without installments, in the month they fall
+    due, archived ones included; undated fixed transactions are left out.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def get_now(self) -> datetime:
+        """Get the start time of the current database transaction."""
+        return self.session.scalar(select(func.now()))
+
+    def get_month_fingerprints(self, user_id: str) -> Dict[date, MonthFingerprint]:
+        """Get the number, total and last update of a user's entries per month."""
+        updated_at = func.greatest(
+            LedgerTransaction.updated_at, LedgerInstallment.updated_at
+        )
+        rows = self.session.execute(
+            self._entries(
+                user_id,
+                ENTRY_MONTH,
+                func.count(),
+                money(func.sum(ENTRY_AMOUNT)),
+                func.max(updated_at),
+            ).group_by(ENTRY_MONTH)
+        )
+        return {
+            month: MonthFingerprint(count=count, total=total, updated_at=last)
+            for month, count, total, last in rows
+        }
+
+    def get_entries(self, user_id: str, months: Iterable[date]) -> List[Row]:
+        """Get a user's entries in the given months, with their month."""
+        return list(
+            self.session.execute(
+                self._entries(
+                    user_id,
+                    ENTRY_MONTH.label("month"),
+                    LedgerTransaction.id.label("transaction_id"),
+                    LedgerInstallment.installment_number,
+                    LedgerTransaction.description,
+                    LedgerTransaction.category_id,
+                    LedgerTransaction.credit_card_id,
+                    LedgerTransaction.kind,
+                    LedgerTransaction.is_fixed,
+                    LedgerTransaction.is_revenue,
+                    ENTRY_DATE.label("date"),
+                    ENTRY_AMOUNT.label("amount"),
+                    LedgerInstallment.invoice_period,
+                )
+                .where(ENTRY_MONTH.in_(list(months)))
+                .order_by(ENTRY_DATE, LedgerTransaction.id)
+            )
+        )
+
+    @staticmethod
+    def _entries(user_id: str, *columns: ColumnElement) -> Select:
+        return (
+            select(*columns)
+            .select_from(LedgerTransaction)
+            .outerjoin(
+                LedgerInstallment,
+                LedgerInstallment.transaction_id == LedgerTransaction.id,
+            )
+            .where(LedgerTransaction.user_id == user_id, ENTRY_DATE.is_not(None))
+        )
@@ -0,0 +1,203 @@
+"""Analytics Snapshots Module"""
+
+import functools
+import json
+import operator
+import os
+import shutil
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from app.solomon.analytics.domain.exceptions import SnapshotNotFound
+from app.solomon.analytics.domain.models import MonthFingerprint, SnapshotState
+
+ENTRY_SCHEMA = pa.schema(
+    [
+        ("transaction_id", pa.string()),
+        ("installment_number", pa.int32()),
+        ("description", pa.string()),
+        ("category_id", pa.string()),
+        ("credit_card_id", pa.string()),
+        ("kind", pa.string()),
+        ("is_fixed", pa.bool_()),
+        ("is_revenue", pa.bool_()),
+        ("date", pa.date32()),
+        ("amount", pa.float64()),
+        ("invoice_period", pa.date32()),
+    ]
+)
+"""Columns of the entries stored in each month file."""
+
+MONTH_PARTITIONING = ds.partitioning(pa.schema([("month", pa.date32())]), flavor="hive")
+
+
+class SnapshotStore:
+    """
+    Parquet snapshots of the users' ledger entries on local disk.
+
+    Each user has a directory with one Parquet file per month, in a hive style
+    ``month=YYYY-MM-DD`` directory, and a ``_state.json`` file with the fingerprint
+    of each month as of the last sync. Month files are written under a temporary
+    name and then renamed, so readers never see a partially written month.
+
+    Parameters
+    ----------
+    root : str
+        The directory holding the snapshots of every user.
+    """
+
+    STATE_FILE = "_state.json"
+    ENTRIES_FILE = "entries.parquet"
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+
+    def get_state(self, user_id: str) -> SnapshotState:
+        """Get the state of a user's snapshot, empty if it was never synced."""
+        path = self._user_path(user_id) / self.STATE_FILE
+        if not path.exists():
+            return SnapshotState(synced_at=None, months={})
+
+        state = json.loads(path.read_text())
+        return SnapshotState(
+            synced_at=datetime.fromisoformat(state["synced_at"]),
+            months={
+                date.fromisoformat(month): MonthFingerprint(
+                    count=count,
+                    total=total,
+                    updated_at=updated_at and datetime.fromisoformat(updated_at),
+                )
+                for month, (count, total, updated_at) in state["months"].items()
+            },
+        )
+
+    def save_state(self, user_id: str, state: SnapshotState) -> None:
+        """Replace the state of a user's snapshot."""
+        content = json.dumps(
+            {
+                "synced_at": state.synced_at.isoformat(),
+                "months": {
+                    month.isoformat(): [
+                        fingerprint.count,
+                        fingerprint.total,
+                        fingerprint.updated_at and fingerprint.updated_at.isoformat(),
+                    ]
+                    for month, fingerprint in sorted(state.months.items())
+                },
+            }
+        )
+        directory = self._user_path(user_id)
+        directory.mkdir(parents=True, exist_ok=True)
+        temporary = directory / f".{self.STATE_FILE}.tmp"
+        temporary.write_text(content)
+        os.replace(temporary, directory / self.STATE_FILE)
+
+    def write_month(self, user_id: str, month: date, entries: pa.Table) -> None:
+        """
+        Replace the entries of a month of a user's snapshot. The month is removed
+        when there are no entries.
+        """
+        directory = self._user_path(user_id) / f"month={month.isoformat()}"
+        if not entries.num_rows:
+            shutil.rmtree(directory, ignore_errors=True)
+            return
+
+        directory.mkdir(parents=True, exist_ok=True)
+        temporary = directory / f".{self.ENTRIES_FILE}.tmp"
+        pq.write_table(entries, temporary)
+        os.replace(temporary, directory / self.ENTRIES_FILE)
+
+    def get_dataset(self, user_id: str) -> ds.Dataset:
+        """
+        Get a user's snapshot as a dataset with a ``month`` column.
+
+        Raises
+        ------
+        SnapshotNotFound
+            If the user's entries were never synced.
+        """
+        path = self._user_path(user_id)
+        if not (path / self.STATE_FILE).exists():
+            raise SnapshotNotFound("No analytics snapshot yet.")
+
+        return ds.dataset(
+            path,
+            schema=ENTRY_SCHEMA.append(pa.field("month", pa.date32())),
+            format="parquet",
+            partitioning=MONTH_PARTITIONING,
+        )
+
+    def summarize(
+        self,
+        user_id: str,
+        group_by: List[str],
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+        is_revenue: Optional[bool] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Sum the amounts of a user's snapshot entries grouped by the given columns.
+
+        The query runs on the Parquet files with the Arrow compute engine: the date
+        filters skip the month directories out of the range, only the needed
+        columns are read, and the grouping is a vectorized hash aggregation.
+
+        Parameters
+        ----------
+        user_id : str
+            The ID of the user that owns the entries.
+        group_by : List[str]
+            Columns to group by, any of ``month`` and the entry columns.
+        start, end : date, optional
+            First and last day of the entries.
+        is_revenue : bool, optional
+            Only sum revenues or expenses.
+
+        Returns
+        -------
+        List[Dict[str, Any]]
+            The group columns, ``total`` and ``count`` of each group, ordered by
+            the group columns.
+
+        Raises
+        ------
+        SnapshotNotFound
+            If the user's entries were never synced.
+        """
+        dataset = self.get_dataset(user_id)
+        criteria = []
+        if start is not None:
+            criteria += [
+                ds.field("month") >= start.replace(day=1),
+                ds.field("date") >= start,
+            ]
+        if end is not None:
+            criteria += [ds.field("month") <= end, ds.field("date") <= end]
+        if is_revenue is not None:
+            criteria.append(ds.field("is_revenue") == is_revenue)
+
+        table = dataset.to_table(
+            columns=[*group_by, "amount"],
+            filter=functools.reduce(operator.and_, criteria) if criteria else None,
+        )
+        totals = (
+            table.group_by(group_by)
+            .aggregate([("amount", "sum"), ("amount", "count")])
+            .sort_by([(column, "ascending") for column in group_by])
+        )
+        return [
+            {
+                **{column: row[column] for column in group_by},
+                "total": round(row["amount_sum"], 2),
+                "count": row["amount_count"],
+            }
+            for row in totals.to_pylist()
+        ]
+
+    def _user_path(self, user_id: str) -> Path:
+        return self.root / str(user_id)
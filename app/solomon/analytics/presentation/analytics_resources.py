@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, HTTPException
+from starlette import status
+
+from app.solomon.analytics.application.dependencies import get_analytics_service
+from app.solomon.analytics.application.services import AnalyticsService
+from app.solomon.analytics.domain.exceptions import SnapshotNotFound
+from app.solomon.analytics.presentation.models import (
+    AnalyticsSummaryParams,
+    AnalyticsSummaryResponseMapper,
+)
+from app.solomon.auth.application.security import get_current_user
+from app.solomon.auth.presentation.models import UserTokenAuthenticated
+from app.solomon.common.exceptions import InvalidFilter
+
+analytics_router = APIRouter()
+
+
+@analytics_router.get("/summary")
+async def summarize_entries(
+    params: AnalyticsSummaryParams = Depends(),
+    analytics_service: AnalyticsService = Depends(get_analytics_service),
+    current_user: UserTokenAuthenticated = Depends(get_current_user),
+) -> AnalyticsSummaryResponseMapper:
+    """
+    Sum the current user's entries grouped by month, category, kind, credit card
+    and/or revenue, from the analytics snapshot instead of the database.
+
+    Parameters
+    ----------
+    params : AnalyticsSummaryParams
+        The dimensions to group by and the entries to include.
+    analytics_service : AnalyticsService, optional
+        The service to be used to summarize the entries, by default
+        Depends(get_analytics_service)
+    current_user : UserTokenAuthenticated, optional
+        The current user, by default Depends(get_current_user)
+
+    Returns
+    -------
+    AnalyticsSummaryResponseMapper
+        One total and count per group, as of the last sync of the snapshot.
+    """
+    try:
+        return analytics_service.summarize(current_user.id, params)
+    except InvalidFilter as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
+    except SnapshotNotFound as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
@@ -0,0 +1,59 @@
+import datetime
+from typing import Any, Dict, List, Optional, Self
+
+from pydantic import BaseModel
+
+from app.solomon.common.models import ResponseMapper
+from app.solomon.transactions.presentation.models import (
+    TransactionSummary,
+    TransactionSummaryParams,
+)
+
+
+class AnalyticsSummaryParams(TransactionSummaryParams):
+    """
+    Query string parameters for analytics summaries
+
+    ``group_by`` takes the same dimensions as the transactions summary. ``start``
+    and ``end`` bound the entry dates.
+    """
+
+    start: Optional[datetime.date] = None
+    end: Optional[datetime.date] = None
+    is_revenue: Optional[bool] = None
+
+
+class AnalyticsSummary(BaseModel):
+    """Response model for an analytics summary"""
+
+    synced_at: datetime.datetime
+    groups: List[TransactionSummary]
+
+
+class AnalyticsSummaryResponseMapper(ResponseMapper[AnalyticsSummary]):
+    """Response model for analytics summaries"""
+
+    @classmethod
+    def create(cls, rows: List[Dict[str, Any]], synced_at: datetime.datetime) -> Self:
+        """
+        Create an AnalyticsSummaryResponseMapper instance.
+
+        Parameters
+        ----------
+        rows : List[Dict[str, Any]]
+            Summary rows with the group columns, ``total`` and ``count``.
+        synced_at : datetime.datetime
+            When the snapshot was last synced.
+
+        Returns
+        -------
+        AnalyticsSummaryResponseMapper
+            An AnalyticsSummaryResponseMapper instance with the groups and the time
+            of the snapshot.
+        """
+        return cls(
+            data=AnalyticsSummary(
+                synced_at=synced_at,
+                groups=[TransactionSummary.model_validate(row) for row in rows],
+            )
+        )
@@ -1,14 +1,12 @@
 from fastapi import Depends
 
 from app.solomon.auth.application.services import AuthService
-from app.solomon.infrastructure.database import get_repository
-from app.solomon.users.infrastructure.repositories import UserRepository
-
-get_user_repository = get_repository(UserRepository)
+from app.solomon.users.application.dependencies import get_sharded_user_repository
+from app.solomon.users.infrastructure.repositories import ShardedUserRepository
 
 
 def get_auth_service(
-    user_repository: UserRepository = Depends(get_user_repository),
+    user_repository: ShardedUserRepository = Depends(get_sharded_user_repository),
 ) -> AuthService:
     """Factory for AuthService"""
     return AuthService(user_repository)
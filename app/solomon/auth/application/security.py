@@ -1,10 +1,10 @@
 import datetime
 import time
-from typing import Any
+from typing import Any, Optional
 
 import bcrypt
 import jwt
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jwt import PyJWTError
 from starlette.status import HTTP_401_UNAUTHORIZED
@@ -139,6 +139,30 @@ def verify_token(token: str, secret_key: str = SECRET_KEY) -> Any:
         raise
 
 
+def get_token_user_id(request: Request) -> Optional[str]:
+    """
+    Get the id of the user of a request from its bearer token, without looking
+    the user up.
+
+    Parameters
+    ----------
+    request : Request
+        The request
+
+    Returns
+    -------
+    str, optional
+        User ID, None if the request has no valid token
+    """
+    scheme, _, credentials = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer":
+        return None
+    try:
+        return verify_token(credentials)["sub"]
+    except (ExpiredTokenError, PyJWTError, KeyError):
+        return None
+
+
 async def get_current_user(
     token: HTTPAuthorizationCredentials = Depends(security),
     user_repository: UserRepository = Depends(get_user_repository),
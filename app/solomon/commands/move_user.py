@@ -0,0 +1,190 @@
+"""Move User Command
+
+Move the rows of a user from their shard to another one while the application keeps
+serving them. Their writes are refused while the rows are copied, then the user's
+pin in the shard directory is flipped to the new shard and the rows are deleted from
+the old one.
+
+Usage: python -m app.solomon.commands.move_user --user-id ID --shard NAME [--grace S]
+"""
+
+import argparse
+import logging
+import time
+from typing import Dict, List, Tuple
+
+from sqlalchemy import Table, delete, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import ColumnElement
+
+import app.solomon.models  # noqa: F401
+from app.solomon.infrastructure.config import SHARD_PIN_TTL
+from app.solomon.infrastructure.database import SHARDS, Base, create_session
+from app.solomon.infrastructure.shards import ShardRepository
+
+logger = logging.getLogger(__name__)
+
+# tables on every shard, not owned by a user
+SHARED_TABLES = {"categories"}
+
+# tables with a user_id that are not moved: the one filled by triggers on the
+# transactions table, and the shard directory itself
+SKIPPED_TABLES = {"transaction_view", "user_shards"}
+
+# installment tables of each transactions table, their rows have no user_id
+INSTALLMENT_TABLES = {
+    "transactions": "installments",
+    "transactions_archive": "installments_archive",
+}
+
+BATCH_SIZE = 1000
+
+
+def user_tables(user_id: str) -> List[Tuple[Table, ColumnElement[bool]]]:
+    """
+    Get the tables holding rows of a user, each with the criteria selecting them,
+    every table after the tables it references.
+    """
+    tables = Base.metadata.tables
+    selected = [(tables["users"], tables["users"].c.id == user_id)]
+    for table in Base.metadata.sorted_tables:
+        if "user_id" not in table.c or table.name in SKIPPED_TABLES:
+            continue
+
+        selected.append((table, table.c.user_id == user_id))
+        if table.name in INSTALLMENT_TABLES:
+            installments = tables[INSTALLMENT_TABLES[table.name]]
+            transaction_ids = select(table.c.id).where(table.c.user_id == user_id)
+            selected.append(
+                (installments, installments.c.transaction_id.in_(transaction_ids))
+            )
+    return selected
+
+
+def copy_rows(source: Session, target: Session, user_id: str) -> Dict[str, int]:
+    """
+    Copy the rows of a user, and the shared rows missing on the target, from one
+    shard to another. The changes are left for the caller to commit.
+
+    Returns
+    -------
+    Dict[str, int]
+        The number of rows of the user copied to each table.
+    """
+    for name in SHARED_TABLES:
+        table = Base.metadata.tables[name]
+        for rows in (
+            source.execute(select(table).execution_options(yield_per=BATCH_SIZE))
+            .mappings()
+            .partitions()
+        ):
+            target.execute(pg_insert(table).on_conflict_do_nothing(), rows)
+
+    copied = {}
+    for table, criteria in user_tables(user_id):
+        # generated columns are computed again by the insert
+        columns = [column for column in table.columns if column.computed is None]
+        copied[table.name] = 0
+        for rows in (
+            source.execute(
+                select(*columns).where(criteria).execution_options(yield_per=BATCH_SIZE)
+            )
+            .mappings()
+            .partitions()
+        ):
+            target.execute(insert(table), rows)
+            copied[table.name] += len(rows)
+    return copied
+
+
+def delete_rows(session: Session, user_id: str) -> None:
+    """
+    Delete the rows of a user from a shard. The changes are left for the caller to
+    commit.
+    """
+    for table, criteria in reversed(user_tables(user_id)):
+        session.execute(delete(table).where(criteria))
+
+
+def move_user(
+    user_id: str, shard: str, grace: float = 5.0, pin_ttl: float = SHARD_PIN_TTL
+) -> Dict[str, int]:
+    """
+    Move the rows of a user to another shard.
+
+    The user is first marked as moving, so the application refuses their writes,
+    and the command waits ``grace`` seconds for the writes already started to
+    finish. The rows are then copied in a single transaction on the target shard,
+    the user is placed on it and, once the placements cached by the application
+    for ``pin_ttl`` seconds have expired, the rows are deleted from the source
+    shard. Reads keep being served from the source shard until then. If the copy
+    fails, the user is placed back on the source shard.
+
+    Parameters
+    ----------
+    user_id : str
+        The ID of the user to move.
+    shard : str
+        The name of the target shard.
+    grace : float
+        Seconds to wait for the user's ongoing writes.
+    pin_ttl : float
+        Seconds the application caches the placement of a user for its reads.
+
+    Returns
+    -------
+    Dict[str, int]
+        The number of rows of the user moved in each table.
+
+    Raises
+    ------
+    ValueError
+        If the shard is unknown or the user is already on it.
+    """
+    with create_session(SHARDS.default) as session:
+        directory = ShardRepository(session)
+        source = directory.locate(user_id).shard
+        if shard not in SHARDS.urls or shard == source:
+            raise ValueError(f"Cannot move user {user_id} from {source} to {shard}")
+
+        directory.place(user_id, source, is_moving=True)
+        directory.commit()
+        time.sleep(grace)
+
+        try:
+            with create_session(source) as source_session, create_session(
+                shard
+            ) as target_session:
+                moved = copy_rows(source_session, target_session, user_id)
+                target_session.commit()
+        except Exception:
+            directory.place(user_id, source)
+            directory.commit()
+            raise
+
+        directory.place(user_id, shard)
+        directory.commit()
+
+    time.sleep(pin_ttl)
+    with create_session(source) as source_session:
+        delete_rows(source_session, user_id)
+        source_session.commit()
+
+    logger.info("Moved user %s from %s to %s: %s", user_id, source, shard, moved)
+    return moved
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--user-id", required=True)
+    parser.add_argument("--shard", required=True, choices=SHARDS.names)
+    parser.add_argument("--grace", type=float, default=5.0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    move_user(args.user_id, args.shard, args.grace)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Rebuild Monthly Rollups Command
+
+Recompute ``monthly_rollups`` and ``balances`` from the transactions, in batches
+of users. Each batch is replaced in its own database transaction, so the command can
+be interrupted and run again at any time. It runs on one shard, the default one
+unless another is given.
+
+Usage: python -m app.solomon.commands.rebuild_rollups [--batch-size N] [--user-id ID]
+    [--shard NAME]
+"""
+
+import argparse
+import logging
+from typing import Iterator, List, Optional
+
+from sqlalchemy.orm import Session
+
+import app.solomon.models  # noqa: F401
+from app.solomon.infrastructure.database import SHARDS, create_session
+from app.solomon.transactions.infrastructure.repositories import (
+    TransactionRepository,
+)
+from app.solomon.users.infrastructure.repositories import UserRepository
+
+logger = logging.getLogger(__name__)
+
+
+def iter_user_batches(session: Session, batch_size: int) -> Iterator[List[str]]:
+    """Yield the ids of all users in batches, paginating by id."""
+    repository = UserRepository(session)
+    last_id = None
+    while True:
+        user_ids = repository.get_ids_after(last_id, batch_size)
+        if not user_ids:
+            return
+
+        yield user_ids
+        last_id = user_ids[-1]
+
+
+def rebuild_rollups(
+    session: Session, batch_size: int = 500, user_id: Optional[str] = None
+) -> int:
+    """
+    Rebuild the monthly rollups and balances of every user, or of a single one.
+
+    Returns
+    -------
+    int
+        The number of users whose rollups were rebuilt.
+    """
+    repository = TransactionRepository(session)
+    batches = [[user_id]] if user_id else iter_user_batches(session, batch_size)
+
+    rebuilt = 0
+    for user_ids in batches:
+        repository.rebuild_rollups(user_ids)
+        repository.commit()
+        rebuilt += len(user_ids)
+        logger.info("Rebuilt monthly rollups of %s users", rebuilt)
+
+    return rebuilt
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--user-id")
+    parser.add_argument("--shard", choices=SHARDS.names)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    with create_session(args.shard) as session:
+        rebuild_rollups(session, args.batch_size, args.user_id)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,3 +2,9 @@ class ExcelGenerationError(Exception):
     """Exception class for excel file generator"""
 
     pass
+
+
+class InvalidFilter(Exception):
+    """Exception class for filters rejected by a model's filter whitelist"""
+
+    pass
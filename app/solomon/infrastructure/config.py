@@ -1,5 +1,6 @@
 """App CONFIG ENVS"""
 
+import json
 import os
 
 from dotenv import load_dotenv
@@ -12,5 +13,60 @@ else:
     load_dotenv(dotenv_path=".env")
 
 DATABASE_URL = os.getenv("DATABASE_URL", "")
+
+# databases the users are spread over, by name: the default shard on DATABASE_URL
+# and the ones in DATABASE_SHARDS, a JSON object of name to URL. User ids are hashed
+# into the buckets of SHARD_MAP, a JSON list with the shard of each bucket
+DATABASE_SHARDS = {
+    "main": DATABASE_URL,
+    **json.loads(os.getenv("DATABASE_SHARDS") or "{}"),
+}
+SHARD_MAP = json.loads(os.getenv("SHARD_MAP") or "[]") or list(DATABASE_SHARDS)
+# seconds a worker routes the reads of a user with their cached shard placement
+SHARD_PIN_TTL = int(os.getenv("SHARD_PIN_TTL", "30"))
+
+# read replicas of each shard, as a JSON object of shard name to a list of URLs. The
+# reads of a user stay on the primary for READ_YOUR_WRITES_WINDOW seconds after
+# their last write, which should exceed the replication lag
+DATABASE_REPLICAS = json.loads(os.getenv("DATABASE_REPLICAS") or "{}")
+READ_YOUR_WRITES_WINDOW = float(os.getenv("READ_YOUR_WRITES_WINDOW", "5"))
 EXPIRES_AT = int(os.getenv("EXPIRES_AT", "84600"))
 SECRET_KEY = os.getenv("SECRET_KEY", "")
+
+AUTOCOMPLETE_MAX_USERS = int(os.getenv("AUTOCOMPLETE_MAX_USERS", "10000"))
+AUTOCOMPLETE_TTL = int(os.getenv("AUTOCOMPLETE_TTL", "600"))
+
+# 'rows' stores one row per installment, 'compact' only the schedule
+INSTALLMENT_STORAGE = os.getenv("INSTALLMENT_STORAGE", "rows")
+
+SCHEDULER_ENABLED = os.getenv("SCHEDULER_ENABLED", "false").lower() == "true"
+SCHEDULER_POLL_INTERVAL = int(os.getenv("SCHEDULER_POLL_INTERVAL", "60"))
+JOBS_BATCH_SIZE = int(os.getenv("JOBS_BATCH_SIZE", "200"))
+JOBS_CONCURRENCY = int(os.getenv("JOBS_CONCURRENCY", "4"))
+REPORTS_INTERVAL = int(os.getenv("REPORTS_INTERVAL", "86400"))
+INVOICE_CLOSING_INTERVAL = int(os.getenv("INVOICE_CLOSING_INTERVAL", "3600"))
+CREDIT_CARD_RECONCILIATION_INTERVAL = int(
+    os.getenv("CREDIT_CARD_RECONCILIATION_INTERVAL", "86400")
+)
+RECURRING_MATERIALIZATION_INTERVAL = int(
+    os.getenv("RECURRING_MATERIALIZATION_INTERVAL", "86400")
+)
+ROLLUP_RECONCILIATION_INTERVAL = int(
+    os.getenv("ROLLUP_RECONCILIATION_INTERVAL", "86400")
+)
+ALERTS_DISPATCH_INTERVAL = int(os.getenv("ALERTS_DISPATCH_INTERVAL", "60"))
+ALERTS_BATCH_SIZE = int(os.getenv("ALERTS_BATCH_SIZE", "500"))
+SNAPSHOTS_INTERVAL = int(os.getenv("SNAPSHOTS_INTERVAL", "3600"))
+PARTITIONS_INTERVAL = int(os.getenv("PARTITIONS_INTERVAL", "86400"))
+ARCHIVING_INTERVAL = int(os.getenv("ARCHIVING_INTERVAL", "86400"))
+
+# months after the current one whose partitions are created ahead of time
+PARTITIONS_AHEAD = int(os.getenv("PARTITIONS_AHEAD", "12"))
+
+# months before the current one kept in the transactions tables, older transactions
+# are moved to the archive tables by chunks of ARCHIVE_BATCH_SIZE transactions
+ARCHIVE_AFTER_MONTHS = int(os.getenv("ARCHIVE_AFTER_MONTHS", "24"))
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "500"))
+
+# directory of the per-user Parquet snapshots queried by the analytics endpoints
+SNAPSHOTS_PATH = os.getenv("SNAPSHOTS_PATH", "snapshots")
@@ -1,18 +1,38 @@
 """Database Infrastructure Module"""
 
+import hashlib
+from contextvars import ContextVar
+from functools import lru_cache
 from typing import Any, Dict, Generic, List, Optional, TypeVar
 from uuid import uuid4
 
 from fastapi import Depends
+from fastapi_pagination.api import create_page
 from fastapi_pagination.bases import AbstractParams
-from fastapi_pagination.ext.sqlalchemy import paginate
+from fastapi_pagination.ext.sqlalchemy import paginate, paginate_query
+from fastapi_pagination.utils import verify_params
 from fastapi_sqlalchemy import db
-from sqlalchemy import Column, DateTime, func
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Engine,
+    Select,
+    create_engine,
+    func,
+    literal,
+    select,
+)
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.declarative import declared_attr
-from sqlalchemy.orm import Query, Session, declarative_base
+from sqlalchemy.orm import Session, declarative_base
+from sqlalchemy.sql.elements import ColumnElement
 
 from app.solomon.common.models import PaginatedResponse
+from app.solomon.infrastructure.config import (
+    DATABASE_REPLICAS,
+    DATABASE_SHARDS,
+    SHARD_MAP,
+)
 
 Base = declarative_base()
 
@@ -20,9 +40,18 @@ Base = declarative_base()
 T = TypeVar("T")
 
 
-class CustomQuery(Query, Generic[T]):
+class CustomQuery(Generic[T]):
+    """
+    Thin wrapper around a SQLAlchemy 2.0 ``Select`` statement.
+
+    Filter values are always rendered as bound parameters (booleans included, which
+    SQLAlchemy would otherwise inline as constants), so two statements built from the
+    same set of filter keys share the same cache key and the compiled SQL is reused
+    from the engine's compiled cache instead of being compiled again.
+    """
+
     OPERATORS = {
-        "eq": lambda field, value: field == value,
+        "eq": lambda field, value: field == literal(value, field.type),
         "in": lambda field, value: field.in_(value),
         "like": lambda field, value: field.like(value),
         "ilike": lambda field, value: field.ilike(value),
@@ -30,10 +59,88 @@ class CustomQuery(Query, Generic[T]):
         "lt": lambda field, value: field < value,
         "gte": lambda field, value: field >= value,
         "lte": lambda field, value: field <= value,
+        "between": lambda field, value: field.between(value[0], value[1]),
     }
 
+    def __init__(
+        self,
+        session: Session,
+        statement: Select,
+        count_statement: Optional[Select] = None,
+    ):
+        self.session = session
+        self.statement = statement
+        self.count_statement = count_statement
+
+    def _with(self, statement: Select) -> "CustomQuery[T]":
+        return CustomQuery(session=self.session, statement=statement)
+
+    def filter(self, *criteria: ColumnElement[bool]) -> "CustomQuery[T]":
+        """Return a new query with the given criteria added to the WHERE clause."""
+        return self._with(self.statement.where(*criteria))
+
+    def order_by(self, *clauses: Any) -> "CustomQuery[T]":
+        """Return a new query with the given ORDER BY clauses."""
+        return self._with(self.statement.order_by(*clauses))
+
     def all(self) -> List[T]:
-        return super().all()
+        return list(self.session.scalars(self.statement).unique().all())
+
+    def first(self) -> Optional[T]:
+        return self.session.scalars(self.statement.limit(1)).first()
+
+    @classmethod
+    def build_criteria(
+        cls,
+        model: T,
+        filters: Dict[str, Any],
+        columns: Optional[Dict[str, ColumnElement]] = None,
+    ) -> List[ColumnElement[bool]]:
+        """
+        Build the list of WHERE criteria for the given dictionary of filters.
+
+        Parameters
+        ----------
+        model : T
+            The model to which filters will be applied.
+        filters : dict
+            A dictionary containing filters to be applied, in the form
+            '<field>__<operator>'.
+        columns : dict, optional
+            Expressions to filter on instead of the model attributes of the same
+            name, for statements that select derived columns.
+
+        Returns
+        -------
+        List[ColumnElement[bool]]
+            The criteria, one per filter.
+
+        Raises
+        ------
+        ValueError
+            If an invalid operator is provided for a field or if no operator is
+            specified for a field.
+        """
+        criteria = []
+        for attribute, value in filters.items():
+            if "__" not in attribute:
+                raise ValueError(
+                    f"No operator specified for field '{attribute}'"
+                )
+
+            field_name, operator_name = attribute.split("__")
+            operator = cls.OPERATORS.get(operator_name)
+            if operator is None:
+                raise ValueError(
+                    f"Invalid operator '{operator_name}' for field '{field_name}'"
+                )
+
+            field = (columns or {}).get(field_name)
+            if field is None:
+                field = getattr(model, field_name)
+            criteria.append(operator(field, value))
+
+        return criteria
 
     def apply_filters(
         self, model: T, filters: Dict[str, Any]
@@ -66,28 +173,19 @@ class CustomQuery(Query, Generic[T]):
         This method applies filters to the model based on the given dictionary. Each
         filter is specified in the form of '<field>__<operator>', where <field> is the
         attribute of the model and <operator> is the comparison operator. Supported
-        comparison operators include 'eq' (equal), 'neq' (not equal),
-        'gt' (greater than), 'lt' (less than), 'gte' (greater than or equal), and
-        'lte' (less than or equal).
-        """
-        for attribute, value in filters.items():
-            if "__" in attribute:
-                field_name, operator_name = attribute.split("__")
-                operator = self.OPERATORS[operator_name]
-                if operator is None:
-                    raise ValueError(
-                        f"Invalid operator '{operator_name}' for field '{field_name}'"
-                    )
-            else:
-                raise ValueError(
-                    f"No operator specified for field '{attribute}'"
-                )
+        comparison operators include 'eq' (equal), 'in' (contained in),
+        'like'/'ilike' (pattern match), 'gt' (greater than), 'lt' (less than),
+        'gte' (greater than or equal), 'lte' (less than or equal) and 'between'
+        (inclusive range given as a pair of values).
 
-            field = getattr(model, field_name)
-            operator_func = operator(field, value)
-            self = self.filter(operator_func)
+        All criteria are added in a single ``where`` call, and since values are bound
+        parameters the statement's cache key only depends on the filter keys.
+        """
+        criteria = self.build_criteria(model, filters)
+        if not criteria:
+            return self
 
-        return self
+        return self.filter(*criteria)
 
     def paginate(
         self, params: Optional[AbstractParams]
@@ -112,13 +210,123 @@ class CustomQuery(Query, Generic[T]):
         results.
 
         If no parameters are provided, default pagination parameters may be used.
+
+        The total is counted with ``count_statement`` when given, e.g. when the
+        page is read from only part of the rows the query stands for.
         """
-        return paginate(self, params)
+        if self.count_statement is None:
+            return paginate(self.session, self.statement, params)
+
+        params, _ = verify_params(params, "limit-offset")
+        statement = paginate_query(self.statement, params)
+        items = list(self.session.scalars(statement).unique().all())
+        total = self.session.scalar(self.count_statement)
+        return create_page(items, total=total, params=params)
+
+
+def select_query(session: Session, model: T) -> CustomQuery[T]:
+    """Start a CustomQuery selecting the given model."""
+    return CustomQuery(session=session, statement=select(model))
+
+
+class ShardMap:
+    """
+    The databases the users are spread over.
+
+    Every row of a user (their cards, transactions, rollups...) lives on the same
+    shard, so a request only ever talks to one database. User ids are hashed into
+    a fixed number of buckets and each bucket is assigned to a shard, so adding a
+    shard means reassigning some buckets and moving their users, not rehashing
+    every user.
+
+    The first shard is the default one. It holds the scheduler's bookkeeping and
+    the pins of the users moved away from the shard of their bucket.
+
+    Parameters
+    ----------
+    urls : Dict[str, str]
+        The URL of each shard by name, the default one first.
+    buckets : List[str]
+        The shard of each bucket.
+    replicas : Dict[str, List[str]], optional
+        The URLs of the read replicas of each shard that has some.
+    """
+
+    def __init__(
+        self,
+        urls: Dict[str, str],
+        buckets: List[str],
+        replicas: Optional[Dict[str, List[str]]] = None,
+    ):
+        unknown = (set(buckets) | set(replicas or {})) - set(urls)
+        if not urls or not buckets or unknown:
+            raise ValueError(f"Invalid shard map, unknown shards: {unknown}")
+
+        self.urls = urls
+        self.buckets = buckets
+        self.replicas = replicas or {}
+
+    @property
+    def names(self) -> List[str]:
+        return list(self.urls)
+
+    @property
+    def default(self) -> str:
+        return self.names[0]
+
+    def shard_for(self, user_id: str) -> str:
+        """Get the shard of the bucket of a user."""
+        digest = hashlib.md5(str(user_id).encode()).digest()
+        return self.buckets[int.from_bytes(digest[:8], "big") % len(self.buckets)]
+
+
+SHARDS = ShardMap(DATABASE_SHARDS, SHARD_MAP, DATABASE_REPLICAS)
+
+current_shard: ContextVar[Optional[str]] = ContextVar("current_shard", default=None)
+"""Shard used by the sessions created without naming one, e.g. by a running job."""
+
+request_session: ContextVar[Optional[Session]] = ContextVar(
+    "request_session", default=None
+)
+"""
+Session of the current request when it is not served by the primary of the default
+shard, i.e. when its user is on another shard or it is read from a replica.
+"""
 
 
 def get_db_session() -> Session:
-    """Get the current database session."""
-    return db.session
+    """
+    Get the current database session, on the shard of the request's user and, for
+    the reads routed to a replica, on a replica of the shard.
+    """
+    session = request_session.get()
+    return db.session if session is None else session
+
+
+@lru_cache
+def _create_engine(url: str) -> Engine:
+    return create_engine(url)
+
+
+def get_engine(shard: Optional[str] = None) -> Engine:
+    """
+    Get the engine used outside of requests, e.g. by commands and jobs, of the
+    given shard, else of the current one, else of the default one.
+    """
+    return _create_engine(SHARDS.urls[shard or current_shard.get() or SHARDS.default])
+
+
+def create_session(shard: Optional[str] = None) -> Session:
+    """Create a session outside of a request. The caller must close it."""
+    return Session(get_engine(shard))
+
+
+def create_replica_session(url: str) -> Session:
+    """
+    Create a read-only session on a replica, so that a write fails right away
+    instead of on a stale copy. The caller must close it.
+    """
+    return Session(_create_engine(url).execution_options(postgresql_readonly=True))
 
 
 def get_repository(repo_class, session=None):
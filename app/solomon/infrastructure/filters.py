@@ -0,0 +1,159 @@
+"""Filter Whitelist Module"""
+
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, TypeVar
+
+from sqlalchemy import or_
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.solomon.common.exceptions import InvalidFilter
+from app.solomon.infrastructure.database import CustomQuery
+
+T = TypeVar("T")
+
+FilterTerm = Tuple[str, Any]
+
+
+class FilterWhitelist:
+    """
+    Per-model whitelist of filterable fields and the operators allowed on each.
+
+    The whitelist reads the model's table metadata to know which fields are covered
+    by an index. Equality operators are accepted on any whitelisted field, but range
+    and pattern operators on an unindexed field can only be evaluated by scanning
+    every candidate row, so they are rejected unless the same request also narrows
+    the rows through an indexed field, or the caller explicitly opts in.
+
+    Parameters
+    ----------
+    model : T
+        The model whose columns are filtered.
+    fields : dict
+        Mapping of field name to the set of allowed operator names.
+    """
+
+    SCAN_OPERATORS = {"gt", "lt", "gte", "lte", "between", "like", "ilike"}
+
+    def __init__(self, model: T, fields: Dict[str, Set[str]]):
+        self.model = model
+        self.fields = fields
+        self.indexed_fields = self._get_indexed_fields(model)
+
+    @staticmethod
+    def _get_indexed_fields(model: T) -> Set[str]:
+        table = model.__table__
+        indexed = {column.name for column in table.primary_key.columns}
+        for index in table.indexes:
+            indexed.update(column.name for column in index.columns)
+        return indexed
+
+    def criteria(
+        self,
+        filters: Dict[str, Any],
+        or_groups: Optional[List[List[FilterTerm]]] = None,
+        allow_unindexed: bool = False,
+        columns: Optional[Dict[str, ColumnElement]] = None,
+    ) -> List[ColumnElement[bool]]:
+        """
+        Validate the filters and build the WHERE criteria for them.
+
+        Parameters
+        ----------
+        filters : dict
+            Filters in the '<field>__<operator>' form, combined with AND.
+        or_groups : list of list of (str, Any), optional
+            Groups of terms in the same form. The terms of a group are combined with
+            OR and the groups are combined with AND.
+        allow_unindexed : bool
+            Accept scan operators on unindexed fields even when nothing else in the
+            request narrows the rows through an index.
+        columns : dict, optional
+            Expressions to filter on instead of the model attributes of the same
+            name. See ``CustomQuery.build_criteria``.
+
+        Returns
+        -------
+        List[ColumnElement[bool]]
+            The criteria to be added to the statement.
+
+        Raises
+        ------
+        InvalidFilter
+            If a field or operator is not whitelisted, or if an unindexed scan is
+            requested without opting in.
+        """
+        or_groups = or_groups or []
+
+        for key, value in filters.items():
+            self._validate_term(key, value)
+        for group in or_groups:
+            for key, value in group:
+                self._validate_term(key, value)
+
+        if not allow_unindexed:
+            self._validate_index_usage(filters.keys(), or_groups)
+
+        criteria = CustomQuery.build_criteria(self.model, filters, columns)
+        for group in or_groups:
+            criteria.append(
+                or_(
+                    *(
+                        CustomQuery.build_criteria(
+                            self.model, {key: value}, columns
+                        )[0]
+                        for key, value in group
+                    )
+                )
+            )
+
+        return criteria
+
+    def _validate_term(self, key: str, value: Any) -> None:
+        field_name, _, operator_name = key.partition("__")
+        if field_name not in self.fields:
+            raise InvalidFilter(f"Filtering by '{field_name}' is not allowed")
+
+        if operator_name not in self.fields[field_name]:
+            raise InvalidFilter(
+                f"Invalid operator '{operator_name}' for field '{field_name}'"
+            )
+
+        if operator_name == "between" and len(value) != 2:
+            raise InvalidFilter(
+                f"'{key}' expects exactly two values, got {len(value)}"
+            )
+
+    def _validate_index_usage(
+        self, keys: Iterable[str], or_groups: List[List[FilterTerm]]
+    ) -> None:
+        keys = list(keys)
+        narrowed = any(self._is_indexed(key) for key in keys) or any(
+            group and all(self._is_indexed(key) for key, _ in group)
+            for group in or_groups
+        )
+        if narrowed:
+            return
+
+        scans = [key for key in keys if self._is_scan(key)] + [
+            key for group in or_groups for key, _ in group if self._is_scan(key)
+        ]
+        if scans:
+            raise InvalidFilter(
+                f"Filters {', '.join(sorted(set(scans)))} need an indexed filter "
+                f"({', '.join(sorted(self.indexed_filter_fields))}) in the same "
+                "request, or 'allow_unindexed' set to true"
+            )
+
+    @property
+    def indexed_filter_fields(self) -> Set[str]:
+        """Whitelisted fields that are covered by an index."""
+        return set(self.fields) & self.indexed_fields
+
+    def _is_indexed(self, key: str) -> bool:
+        return key.partition("__")[0] in self.indexed_fields
+
+    def _is_scan(self, key: str) -> bool:
+        field_name, _, operator_name = key.partition("__")
+        return (
+            field_name not in self.indexed_fields
+            and operator_name in self.SCAN_OPERATORS
+        )
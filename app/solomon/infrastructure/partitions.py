@@ -0,0 +1,167 @@
+"""Table Partitions Module"""
+
+import re
+from datetime import date
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+PARTITION_NAME = re.compile(r"_p(\d{4})_(\d{2})$")
+
+
+def month_partition(table: str, month: date) -> str:
+    """Name of the partition of ``table`` holding the rows of ``month``."""
+    return f"{table}_p{month:%Y_%m}"
+
+
+def default_partition(table: str) -> str:
+    """Name of the partition of ``table`` holding the rows of no other partition."""
+    return f"{table}_default"
+
+
+def undated_partition(table: str) -> str:
+    """Name of the partition of ``table`` holding the rows without a date."""
+    return f"{table}_undated"
+
+
+def is_partition(name: str) -> bool:
+    """Whether ``name`` is the name of a month, default or undated partition."""
+    return bool(PARTITION_NAME.search(name)) or name.endswith(("_default", "_undated"))
+
+
+def next_month(month: date) -> date:
+    """First day of the month after ``month``."""
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+class PartitionRepository:
+    """
+    Repository of the monthly partitions of tables partitioned by range of their
+    ``date`` column.
+
+    Each partitioned table has one partition per month, named by
+    ``month_partition``, and a default partition for the rows of every other month.
+    Tables with rows without a date (see ``OptionalDate``) keep them in a partition
+    named by ``undated_partition``. A month is dropped from the table, e.g. to
+    archive it, with ``ALTER TABLE ... DETACH PARTITION``, without touching the
+    other months.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def commit(self):
+        """Commit the current transaction."""
+        self.session.commit()
+
+    def get_months(self, table: str) -> List[date]:
+        """Get the months that have a partition of their own, in order."""
+        names = self.session.scalars(
+            text(
+                "SELECT child.relname FROM pg_inherits "
+                "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+                "WHERE pg_inherits.inhparent = CAST(:table AS regclass)"
+            ),
+            {"table": table},
+        )
+        return sorted(
+            date(int(match[1]), int(match[2]), 1)
+            for match in map(PARTITION_NAME.search, names)
+            if match
+        )
+
+    def ensure_partitions(self, table: str, start: date, end: date) -> List[date]:
+        """
+        Create the missing partitions of the months from ``start`` to ``end``, and
+        of the months whose rows were stored in the default partition because
+        their partition did not exist yet.
+
+        Postgres refuses to add a partition whose rows are in the default one, so
+        when the default partition holds rows of its month, a new partition is
+        created as a table of its own, the rows are moved into it and it is then
+        attached to the partitioned table. The foreign keys are deferred until the
+        end of the database transaction in the meantime, since the moved rows are
+        not part of the table until it is attached. The changes are left for the
+        caller to commit.
+
+        Parameters
+        ----------
+        table : str
+            The partitioned table.
+        start, end : date
+            Days of the first and last months to create a partition for.
+
+        Returns
+        -------
+        List[date]
+            The months whose partition was created.
+        """
+        existing = set(self.get_months(table))
+        months = set(
+            self.session.scalars(
+                text(
+                    "SELECT DISTINCT CAST(date_trunc('month', date) AS date) "
+                    f"FROM {default_partition(table)} WHERE date IS NOT NULL"
+                )
+            )
+        )
+        month = start.replace(day=1)
+        while month <= end:
+            months.add(month)
+            month = next_month(month)
+
+        created = sorted(months - existing)
+        for month in created:
+            self._create_partition(table, month)
+        return created
+
+    def _create_partition(self, table: str, month: date) -> None:
+        partition = month_partition(table, month)
+        default = default_partition(table)
+        bounds = {"start": month, "end": next_month(month)}
+        in_month = "date >= :start AND date < :end"
+
+        values = (
+            f"FOR VALUES FROM ('{month.isoformat()}') "
+            f"TO ('{next_month(month).isoformat()}')"
+        )
+
+        moves_rows = self.session.scalar(
+            text(f"SELECT EXISTS (SELECT FROM {default} WHERE {in_month})"), bounds
+        )
+        if not moves_rows:
+            self.session.execute(
+                text(f"CREATE TABLE {partition} PARTITION OF {table} {values}")
+            )
+            return
+
+        self.session.execute(text("SET CONSTRAINTS ALL DEFERRED"))
+        self.session.execute(
+            text(
+                f"CREATE TABLE {partition} "
+                f"(LIKE {table} INCLUDING DEFAULTS INCLUDING GENERATED)"
+            )
+        )
+        # generated columns are computed again by the insert
+        columns = ", ".join(
+            self.session.scalars(
+                text(
+                    "SELECT column_name FROM information_schema.columns "
+                    "WHERE table_name = :table AND is_generated = 'NEVER' "
+                    "ORDER BY ordinal_position"
+                ),
+                {"table": table},
+            )
+        )
+        self.session.execute(
+            text(
+                f"WITH moved AS (DELETE FROM {default} WHERE {in_month} "
+                f"RETURNING {columns}) "
+                f"INSERT INTO {partition} ({columns}) SELECT {columns} FROM moved"
+            ),
+            bounds,
+        )
+        self.session.execute(
+            text(f"ALTER TABLE {table} ATTACH PARTITION {partition} {values}")
+        )
@@ -0,0 +1,155 @@
+"""Read Replicas Module"""
+
+import random
+from datetime import timedelta
+from typing import Callable, Iterable, Optional
+
+from sqlalchemy import Column, DateTime, func, select
+from sqlalchemy.dialects.postgresql import UUID, insert
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp
+
+from app.solomon.infrastructure.config import READ_YOUR_WRITES_WINDOW
+from app.solomon.infrastructure.database import (
+    SHARDS,
+    Base,
+    create_replica_session,
+    create_session,
+    current_shard,
+    request_session,
+)
+from app.solomon.infrastructure.shards import SAFE_METHODS
+
+
+class UserWrite(Base):
+    """Time of the last successful write request of a user"""
+
+    __tablename__ = "user_writes"
+
+    user_id = Column(UUID(as_uuid=False), primary_key=True)
+    written_at = Column(DateTime(timezone=True), nullable=False)
+
+
+class WriteRepository:
+    """
+    Repository of the last writes of the users, kept on the primary of their shard,
+    so that every worker sees them. Times are taken from the database clock.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def commit(self):
+        """Commit the current transaction."""
+        self.session.commit()
+
+    def mark(self, user_id: str) -> None:
+        """Record a write of a user, now."""
+        statement = insert(UserWrite).values(user_id=user_id, written_at=func.now())
+        self.session.execute(
+            statement.on_conflict_do_update(
+                index_elements=[UserWrite.user_id],
+                set_={"written_at": statement.excluded.written_at},
+            )
+        )
+
+    def wrote_within(self, user_id: str, seconds: float) -> bool:
+        """Whether a user wrote in the last ``seconds`` seconds."""
+        return self.session.scalar(
+            select(
+                select(UserWrite)
+                .where(
+                    UserWrite.user_id == user_id,
+                    UserWrite.written_at > func.now() - timedelta(seconds=seconds),
+                )
+                .exists()
+            )
+        )
+
+
+class ReplicaMiddleware(BaseHTTPMiddleware):
+    """
+    Serve the reads of some routes from the replicas of the request's shard.
+
+    Read requests under one of the ``prefixes`` get a read-only session on a
+    random replica from ``get_db_session``, unless their user wrote in the last
+    ``window`` seconds, whose reads stay on the primary so that they see their own
+    writes. Every other request is served by the primary. Nothing is done for the
+    shards without replicas.
+
+    The successful writes of a user are recorded in ``user_writes`` on the primary
+    of their shard, which the reads under the ``prefixes`` look up, so the
+    guarantee holds whichever worker serves them.
+
+    Must be added before ``ShardMiddleware``, so that it runs once the shard of
+    the request is known.
+
+    Parameters
+    ----------
+    app : ASGIApp
+        The application.
+    get_user_id : Callable[[Request], Optional[str]]
+        Returns the id of the authenticated user of a request, if any.
+    prefixes : Iterable[str]
+        Path prefixes of the routes whose reads may be served by a replica.
+    window : float
+        Seconds after a write during which the user's reads stay on the primary.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        get_user_id: Callable[[Request], Optional[str]],
+        prefixes: Iterable[str],
+        window: float = READ_YOUR_WRITES_WINDOW,
+    ):
+        super().__init__(app)
+        self.get_user_id = get_user_id
+        self.prefixes = tuple(prefixes)
+        self.window = window
+
+    def wrote_recently(self, shard: str, user_id: str) -> bool:
+        """Whether a user wrote in the last ``window`` seconds."""
+        with create_session(shard) as session:
+            return WriteRepository(session).wrote_within(user_id, self.window)
+
+    @staticmethod
+    def mark_written(shard: str, user_id: str) -> None:
+        """Record a write of a user, now."""
+        with create_session(shard) as session:
+            repository = WriteRepository(session)
+            repository.mark(user_id)
+            repository.commit()
+
+    async def dispatch(
+        self, request: Request, call_next: RequestResponseEndpoint
+    ) -> Response:
+        shard = current_shard.get() or SHARDS.default
+        replicas = SHARDS.replicas.get(shard)
+        if not replicas:
+            return await call_next(request)
+
+        user_id = self.get_user_id(request)
+        if request.method not in SAFE_METHODS:
+            response = await call_next(request)
+            # the window starts once the write is over, failed writes change nothing
+            if user_id is not None and 200 <= response.status_code < 300:
+                await run_in_threadpool(self.mark_written, shard, user_id)
+            return response
+
+        if not request.url.path.startswith(self.prefixes) or (
+            user_id is not None
+            and await run_in_threadpool(self.wrote_recently, shard, user_id)
+        ):
+            return await call_next(request)
+
+        with create_replica_session(random.choice(replicas)) as session:
+            token = request_session.set(session)
+            try:
+                return await call_next(request)
+            finally:
+                request_session.reset(token)
@@ -0,0 +1,277 @@
+"""Background Scheduler Module"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from typing import Awaitable, Callable, Iterable, List, Optional
+
+from sqlalchemy import Column, DateTime, Float, Integer, String, func, select
+from sqlalchemy.engine import Connection
+
+from app.solomon.infrastructure.database import (
+    SHARDS,
+    BaseModel,
+    create_session,
+    current_shard,
+    get_engine,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatus(str, Enum):
+    RUNNING = "running"
+    SUCCESS = "success"
+    FAILED = "failed"
+
+
+class JobRun(BaseModel):
+    """Last run of a scheduled job"""
+
+    __tablename__ = "job_runs"
+
+    name = Column(String(50), nullable=False, unique=True)
+    status = Column(String(20), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    finished_at = Column(DateTime(timezone=True))
+    duration = Column(Float)
+    processed = Column(Integer)
+    error = Column(String)
+    last_success_at = Column(DateTime(timezone=True))
+
+
+class ScheduledJob:
+    """
+    A job run by the ``Scheduler`` every ``interval`` seconds.
+
+    Parameters
+    ----------
+    name : str
+        Unique name of the job, also used as its advisory lock key.
+    interval : int
+        Seconds between the starts of two runs.
+    run : Callable[[], Awaitable[int]]
+        Coroutine function doing the work. It returns how many items (e.g. users)
+        it processed.
+    """
+
+    def __init__(self, name: str, interval: int, run: Callable[[], Awaitable[int]]):
+        self.name = name
+        self.interval = interval
+        self.run = run
+
+
+class Scheduler:
+    """
+    In-process asyncio scheduler for periodic jobs.
+
+    Every web worker may start its own scheduler. Before running a job, a worker
+    takes a Postgres advisory lock named after it and checks in ``job_runs`` that
+    the job is due, so each run happens in a single worker even when all of them
+    wake up at the same time. The locks and ``job_runs`` are on the default shard,
+    and a run goes through every shard in turn.
+
+    Parameters
+    ----------
+    jobs : Iterable[ScheduledJob]
+        The jobs to be run.
+    poll_interval : int
+        Seconds between two checks of whether a job is due.
+    """
+
+    def __init__(self, jobs: Iterable[ScheduledJob], poll_interval: int = 60):
+        self.jobs = list(jobs)
+        self.poll_interval = poll_interval
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        """Start polling the jobs in the running event loop."""
+        self._tasks = [asyncio.create_task(self._loop(job)) for job in self.jobs]
+
+    async def stop(self) -> None:
+        """Cancel the polling tasks, interrupting the jobs that are running."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _loop(self, job: ScheduledJob) -> None:
+        while True:
+            try:
+                await self.run_if_due(job)
+            except Exception:
+                logger.exception("Could not schedule job %s", job.name)
+            await asyncio.sleep(self.poll_interval)
+
+    async def run_if_due(self, job: ScheduledJob) -> bool:
+        """
+        Run the job if it is due and no other worker is running it.
+
+        Returns
+        -------
+        bool
+            Whether the job was run.
+        """
+        connection = await asyncio.to_thread(get_engine(SHARDS.default).connect)
+        try:
+            if not await asyncio.to_thread(_try_lock, connection, job.name):
+                return False
+            try:
+                if not await asyncio.to_thread(_is_due, job):
+                    return False
+                await self._run(job)
+                return True
+            finally:
+                await asyncio.to_thread(_unlock, connection, job.name)
+        finally:
+            await asyncio.to_thread(connection.close)
+
+    async def _run(self, job: ScheduledJob) -> None:
+        await asyncio.to_thread(_record_start, job.name)
+        started = time.perf_counter()
+        try:
+            processed = await run_on_shards(job.run)
+        except Exception as e:
+            logger.exception("Job %s failed", job.name)
+            await asyncio.to_thread(
+                _record_finish,
+                job.name,
+                JobStatus.FAILED,
+                time.perf_counter() - started,
+                error=repr(e),
+            )
+        else:
+            await asyncio.to_thread(
+                _record_finish,
+                job.name,
+                JobStatus.SUCCESS,
+                time.perf_counter() - started,
+                processed=processed,
+            )
+
+
+async def run_on_shards(run: Callable[[], Awaitable[int]]) -> int:
+    """
+    Run a job on every shard in turn, with the sessions it creates without naming
+    a shard bound to the shard being processed.
+
+    Returns
+    -------
+    int
+        The total number of items processed.
+    """
+    processed = 0
+    for shard in SHARDS.names:
+        token = current_shard.set(shard)
+        try:
+            processed += await run()
+        finally:
+            current_shard.reset(token)
+    return processed
+
+
+async def run_in_batches(
+    next_batch: Callable[[Optional[str]], List[str]],
+    process: Callable[[List[str]], int],
+    concurrency: int,
+) -> int:
+    """
+    Process keys in batches, running at most ``concurrency`` batches at a time.
+
+    Batches are fetched lazily, so only the batches being processed are in memory.
+    Both callables are blocking and run in threads, each batch in its own database
+    transaction.
+
+    Parameters
+    ----------
+    next_batch : Callable[[Optional[str]], List[str]]
+        Returns the batch of keys following the given last key (``None`` for the
+        first batch), or an empty list when there are no more keys.
+    process : Callable[[List[str]], int]
+        Processes a batch and returns how many items it processed.
+    concurrency : int
+        Maximum number of batches processed at the same time.
+
+    Returns
+    -------
+    int
+        The total number of items processed.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def process_batch(batch: List[str]) -> int:
+        try:
+            return await asyncio.to_thread(process, batch)
+        finally:
+            semaphore.release()
+
+    tasks = []
+    last_key = None
+    while True:
+        await semaphore.acquire()
+        batch = await asyncio.to_thread(next_batch, last_key)
+        if not batch:
+            semaphore.release()
+            break
+        tasks.append(asyncio.create_task(process_batch(batch)))
+        last_key = batch[-1]
+
+    return sum(await asyncio.gather(*tasks))
+
+
+def _try_lock(connection: Connection, name: str) -> bool:
+    locked = connection.scalar(select(func.pg_try_advisory_lock(func.hashtext(name))))
+    # the lock belongs to the connection, so it outlives the transaction
+    connection.commit()
+    return locked
+
+
+def _unlock(connection: Connection, name: str) -> None:
+    connection.scalar(select(func.pg_advisory_unlock(func.hashtext(name))))
+    connection.commit()
+
+
+def _is_due(job: ScheduledJob) -> bool:
+    with create_session(SHARDS.default) as session:
+        started_at = session.scalar(
+            select(JobRun.started_at).where(JobRun.name == job.name)
+        )
+    if started_at is None:
+        return True
+    return datetime.now(timezone.utc) - started_at >= timedelta(seconds=job.interval)
+
+
+def _record_start(name: str) -> None:
+    with create_session(SHARDS.default) as session:
+        run = session.scalar(select(JobRun).where(JobRun.name == name))
+        if run is None:
+            run = JobRun(name=name)
+            session.add(run)
+        run.status = JobStatus.RUNNING.value
+        run.started_at = datetime.now(timezone.utc)
+        run.finished_at = None
+        run.duration = None
+        run.processed = None
+        run.error = None
+        session.commit()
+
+
+def _record_finish(
+    name: str,
+    job_status: JobStatus,
+    duration: float,
+    processed: Optional[int] = None,
+    error: Optional[str] = None,
+) -> None:
+    with create_session(SHARDS.default) as session:
+        run = session.scalar(select(JobRun).where(JobRun.name == name))
+        run.status = job_status.value
+        run.finished_at = datetime.now(timezone.utc)
+        run.duration = duration
+        run.processed = processed
+        run.error = error
+        if job_status == JobStatus.SUCCESS:
+            run.last_success_at = run.finished_at
+        session.commit()
@@ -0,0 +1,205 @@
+"""Database Shards Module"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, NamedTuple, Optional, Tuple
+
+from sqlalchemy import Boolean, Column, DateTime, String, delete, func
+from sqlalchemy.dialects.postgresql import UUID, insert
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.status import HTTP_503_SERVICE_UNAVAILABLE
+from starlette.types import ASGIApp
+
+from app.solomon.infrastructure.config import SHARD_PIN_TTL
+from app.solomon.infrastructure.database import (
+    SHARDS,
+    Base,
+    create_session,
+    current_shard,
+    request_session,
+)
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class UserShard(Base):
+    """Pin of a user to a shard other than the one of their bucket"""
+
+    __tablename__ = "user_shards"
+
+    user_id = Column(UUID(as_uuid=False), primary_key=True)
+    shard = Column(String(50), nullable=False)
+    is_moving = Column(Boolean, nullable=False, default=False)
+    updated_at = Column(
+        DateTime(timezone=True), default=func.now(), onupdate=func.now()
+    )
+
+
+class Placement(NamedTuple):
+    """Where a user's rows are, and whether they are being moved elsewhere."""
+
+    shard: str
+    is_moving: bool
+
+
+class ShardRepository:
+    """
+    Repository of the directory of the users placed on a shard other than the one
+    of their bucket. The directory is on the default shard and only holds the pins
+    of moved users, every other user is on the shard of their bucket.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def commit(self):
+        """Commit the current transaction."""
+        self.session.commit()
+
+    def locate(self, user_id: str) -> Placement:
+        """Get the placement of a user."""
+        pin = self.session.get(UserShard, user_id)
+        if pin is None:
+            return Placement(shard=SHARDS.shard_for(user_id), is_moving=False)
+        return Placement(shard=pin.shard, is_moving=pin.is_moving)
+
+    def place(self, user_id: str, shard: str, is_moving: bool = False) -> None:
+        """
+        Place a user on a shard. The pin is removed when the user is back on the
+        shard of their bucket.
+        """
+        if shard == SHARDS.shard_for(user_id) and not is_moving:
+            self.session.execute(delete(UserShard).where(UserShard.user_id == user_id))
+            return
+
+        statement = insert(UserShard).values(
+            user_id=user_id, shard=shard, is_moving=is_moving
+        )
+        self.session.execute(
+            statement.on_conflict_do_update(
+                index_elements=[UserShard.user_id],
+                set_={
+                    "shard": statement.excluded.shard,
+                    "is_moving": statement.excluded.is_moving,
+                    "updated_at": func.now(),
+                },
+            )
+        )
+
+
+def locate_user(user_id: str) -> Placement:
+    """Get the placement of a user from the directory on the default shard."""
+    with create_session(SHARDS.default) as session:
+        return ShardRepository(session).locate(user_id)
+
+
+class PlacementCache:
+    """
+    Placements of the users served recently by this worker, each kept ``ttl``
+    seconds, so that their reads are routed without a lookup in the directory.
+    Entries are kept in the order they were stored, so the expired ones are dropped
+    from the front as new ones come in.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._placements: "OrderedDict[str, Tuple[float, Placement]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str) -> Optional[Placement]:
+        """Get the cached placement of a user, unless it expired."""
+        with self._lock:
+            cached = self._placements.get(user_id)
+            if cached is None or time.monotonic() - cached[0] > self.ttl:
+                return None
+            return cached[1]
+
+    def put(self, user_id: str, placement: Placement) -> None:
+        """Cache the placement of a user."""
+        now = time.monotonic()
+        with self._lock:
+            self._placements[user_id] = (now, placement)
+            self._placements.move_to_end(user_id)
+            while now - next(iter(self._placements.values()))[0] > self.ttl:
+                self._placements.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all cached placements."""
+        with self._lock:
+            self._placements.clear()
+
+
+shard_placements = PlacementCache(ttl=SHARD_PIN_TTL)
+
+
+class ShardMiddleware(BaseHTTPMiddleware):
+    """
+    Route the requests of a user to their shard.
+
+    The requests of users on another shard than the default one get a session on
+    that shard from ``get_db_session``, so every repository works on the user's
+    shard. Writes of a user being moved are refused with a 503 and a
+    ``Retry-After`` header until the move is over. Nothing is done when there is
+    a single shard.
+
+    Reads are routed with the placement cached in ``shard_placements``, which may
+    lag a move by ``SHARD_PIN_TTL`` seconds. Writes always look the placement up in
+    the directory, so they are refused as soon as a move starts.
+
+    Parameters
+    ----------
+    app : ASGIApp
+        The application.
+    get_user_id : Callable[[Request], Optional[str]]
+        Returns the id of the authenticated user of a request, if any.
+    retry_after : int
+        Seconds after which a refused write may be retried.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        get_user_id: Callable[[Request], Optional[str]],
+        retry_after: int = 5,
+    ):
+        super().__init__(app)
+        self.get_user_id = get_user_id
+        self.retry_after = retry_after
+
+    async def dispatch(
+        self, request: Request, call_next: RequestResponseEndpoint
+    ) -> Response:
+        user_id = self.get_user_id(request) if len(SHARDS.names) > 1 else None
+        if user_id is None:
+            return await call_next(request)
+
+        is_write = request.method not in SAFE_METHODS
+        placement = None if is_write else shard_placements.get(user_id)
+        if placement is None:
+            placement = await run_in_threadpool(locate_user, user_id)
+            shard_placements.put(user_id, placement)
+
+        if placement.is_moving and is_write:
+            return JSONResponse(
+                {"detail": "The user's data is being moved, retry later."},
+                status_code=HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": str(self.retry_after)},
+            )
+        if placement.shard == SHARDS.default:
+            return await call_next(request)
+
+        with create_session(placement.shard) as session:
+            shard_token = current_shard.set(placement.shard)
+            session_token = request_session.set(session)
+            try:
+                return await call_next(request)
+            finally:
+                request_session.reset(session_token)
+                current_shard.reset(shard_token)
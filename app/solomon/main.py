@@ -1,20 +1,89 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi_sqlalchemy import DBSessionMiddleware
 
-from app.solomon.infrastructure.config import DATABASE_URL
-from app.solomon.infrastructure.database import CustomQuery
+from app.solomon.alerts.application.jobs import dispatch_alerts
+from app.solomon.analytics.application.jobs import snapshot_entries
+from app.solomon.auth.application.security import get_token_user_id
+from app.solomon.infrastructure.config import (
+    ALERTS_DISPATCH_INTERVAL,
+    ARCHIVING_INTERVAL,
+    CREDIT_CARD_RECONCILIATION_INTERVAL,
+    DATABASE_URL,
+    INVOICE_CLOSING_INTERVAL,
+    PARTITIONS_INTERVAL,
+    RECURRING_MATERIALIZATION_INTERVAL,
+    REPORTS_INTERVAL,
+    ROLLUP_RECONCILIATION_INTERVAL,
+    SCHEDULER_ENABLED,
+    SCHEDULER_POLL_INTERVAL,
+    SNAPSHOTS_INTERVAL,
+)
+from app.solomon.infrastructure.replicas import ReplicaMiddleware
+from app.solomon.infrastructure.scheduler import ScheduledJob, Scheduler
+from app.solomon.infrastructure.shards import ShardMiddleware
+from app.solomon.reports.application.jobs import refresh_reports
 from app.solomon.routes.routes import init_routes
+from app.solomon.transactions.application.jobs import (
+    archive_transactions,
+    close_invoices,
+    ensure_partitions,
+    materialize_recurring_transactions,
+    reconcile_credit_cards,
+    reconcile_rollups,
+)
+
+scheduler = Scheduler(
+    [
+        ScheduledJob("reports", REPORTS_INTERVAL, refresh_reports),
+        ScheduledJob("close_invoices", INVOICE_CLOSING_INTERVAL, close_invoices),
+        ScheduledJob(
+            "reconcile_credit_cards",
+            CREDIT_CARD_RECONCILIATION_INTERVAL,
+            reconcile_credit_cards,
+        ),
+        ScheduledJob(
+            "materialize_recurring_transactions",
+            RECURRING_MATERIALIZATION_INTERVAL,
+            materialize_recurring_transactions,
+        ),
+        ScheduledJob(
+            "reconcile_rollups", ROLLUP_RECONCILIATION_INTERVAL, reconcile_rollups
+        ),
+        ScheduledJob("dispatch_alerts", ALERTS_DISPATCH_INTERVAL, dispatch_alerts),
+        ScheduledJob("snapshot_entries", SNAPSHOTS_INTERVAL, snapshot_entries),
+        ScheduledJob("ensure_partitions", PARTITIONS_INTERVAL, ensure_partitions),
+        ScheduledJob("archive_transactions", ARCHIVING_INTERVAL, archive_transactions),
+    ],
+    poll_interval=SCHEDULER_POLL_INTERVAL,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if SCHEDULER_ENABLED:
+        scheduler.start()
+    yield
+    await scheduler.stop()
+
 
 app = FastAPI(
     title="Solomon API",
     docs_url="/api/docs",
     redoc_url="/api/redoc",
+    lifespan=lifespan,
 )
 
 init_routes(app)
 
+app.add_middleware(
+    ReplicaMiddleware,
+    get_user_id=get_token_user_id,
+    prefixes=["/transactions", "/credit-cards", "/categories"],
+)
+app.add_middleware(ShardMiddleware, get_user_id=get_token_user_id)
 app.add_middleware(
     DBSessionMiddleware,
     db_url=DATABASE_URL,
-    session_args={"query_cls": CustomQuery},
 )
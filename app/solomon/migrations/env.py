@@ -3,7 +3,8 @@ from logging.config import fileConfig
 from alembic import context
 from sqlalchemy import engine_from_config, pool
 
-from app.solomon.infrastructure.config import DATABASE_URL
+from app.solomon.infrastructure.database import SHARDS
+from app.solomon.infrastructure.partitions import is_partition
 from app.solomon.models import *  # noqa
 
 # this is the Alembic Config object, which provides
@@ -15,10 +16,10 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
-config.set_main_option(
-    "sqlalchemy.url",
-    DATABASE_URL,
-)
+# the shard to migrate is chosen with ``alembic -x shard=<name>``, by default the
+# default shard
+shard = context.get_x_argument(as_dictionary=True).get("shard", SHARDS.default)
+config.set_main_option("sqlalchemy.url", SHARDS.urls[shard])
 
 # add your model's MetaData object here
 # for 'autogenerate' support
@@ -26,6 +27,19 @@ config.set_main_option(
 # target_metadata = mymodel.Base.metadata
 target_metadata = BaseModel.metadata
 
+
+def include_name(name, type_, parent_names) -> bool:
+    """Leave the partitions of partitioned tables out of autogenerate."""
+    return not (type_ == "table" and is_partition(name))
+
+
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    """Leave out the foreign keys Postgres clones onto referenced partitions."""
+    if type_ == "foreign_key_constraint":
+        return not is_partition(object.referred_table.name)
+    return True
+
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -48,6 +62,8 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_name=include_name,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -70,7 +86,10 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            include_name=include_name,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
@@ -0,0 +1,383 @@
+"""partition_transactions_and_installments
+
+Revision ID: 60a9867ebd73
+Revises: 3af8a1fc5bda
+Create Date: 2026-10-19 15:36:42.844263
+
+"""
+from datetime import date
+from typing import Iterable, Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "60a9867ebd73"
+down_revision: Union[str, None] = "3af8a1fc5bda"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# months after the current one that get a partition right away
+PARTITIONS_AHEAD = 12
+
+# date of the fixed transactions without a date, see OptionalDate
+UNDATED = "DATE '0001-01-01'"
+
+TRANSACTION_COLUMNS = """
+    id, created_at, updated_at, description, amount, is_fixed, is_revenue, date,
+    recurring_day, kind, installments_number, installment_amount,
+    installment_remainder, category_id, user_id, credit_card_id,
+    source_transaction_id, period
+"""
+
+INSTALLMENT_COLUMNS = """
+    id, created_at, updated_at, date, installment_number, amount, invoice_period,
+    transaction_id, credit_card_id
+"""
+
+VIEW_COLUMNS = """
+    id, user_id, description, amount, is_fixed, is_revenue, date, recurring_day,
+    kind, category_id, category_description, credit_card_id, credit_card_name,
+    source_transaction_id
+"""
+
+
+def next_month(month: date) -> date:
+    return date(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def create_transactions(partitioned: bool) -> None:
+    if partitioned:
+        date_column = sa.Column(
+            "date", sa.Date(), server_default=sa.text(UNDATED), nullable=False
+        )
+        kwargs = {"postgresql_partition_by": "RANGE (date)"}
+    else:
+        date_column = sa.Column("date", sa.Date(), nullable=True)
+        kwargs = {}
+
+    op.create_table(
+        "transactions",
+        sa.Column("id", sa.UUID(as_uuid=False), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("description", sa.String(length=50), nullable=False),
+        sa.Column("amount", sa.Float(), nullable=False),
+        sa.Column("is_fixed", sa.Boolean(), nullable=False),
+        sa.Column("is_revenue", sa.Boolean(), nullable=False),
+        date_column,
+        sa.Column("recurring_day", sa.Integer(), nullable=True),
+        sa.Column("kind", sa.String(length=20), nullable=False),
+        sa.Column("installments_number", sa.Integer(), nullable=True),
+        sa.Column("installment_amount", sa.Float(), nullable=True),
+        sa.Column("installment_remainder", sa.Float(), nullable=True),
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('simple', description)", persisted=True),
+            nullable=True,
+        ),
+        sa.Column("category_id", sa.UUID(as_uuid=False), nullable=True),
+        sa.Column("user_id", sa.UUID(as_uuid=False), nullable=False),
+        sa.Column("credit_card_id", sa.UUID(as_uuid=False), nullable=True),
+        sa.Column("source_transaction_id", sa.UUID(as_uuid=False), nullable=True),
+        sa.Column("period", sa.Date(), nullable=True),
+        sa.ForeignKeyConstraint(
+            ["category_id"], ["categories.id"], name="transactions_category_id_fkey"
+        ),
+        sa.ForeignKeyConstraint(
+            ["credit_card_id"],
+            ["credit_cards.id"],
+            name="transactions_credit_card_id_fkey",
+        ),
+        sa.ForeignKeyConstraint(
+            ["user_id"], ["users.id"], name="transactions_user_id_fkey"
+        ),
+        **kwargs,
+    )
+
+
+def create_installments(partitioned: bool) -> None:
+    if partitioned:
+        columns = [sa.Column("transaction_date", sa.Date(), nullable=False)]
+        kwargs = {"postgresql_partition_by": "RANGE (date)"}
+    else:
+        columns, kwargs = [], {}
+
+    op.create_table(
+        "installments",
+        sa.Column("id", sa.UUID(as_uuid=False), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("installment_number", sa.Integer(), nullable=False),
+        sa.Column("amount", sa.Float(), nullable=False),
+        sa.Column("invoice_period", sa.Date(), nullable=True),
+        sa.Column("transaction_id", sa.UUID(as_uuid=False), nullable=False),
+        sa.Column("credit_card_id", sa.UUID(as_uuid=False), nullable=True),
+        *columns,
+        sa.ForeignKeyConstraint(
+            ["credit_card_id"],
+            ["credit_cards.id"],
+            name="installments_credit_card_id_fkey",
+        ),
+        **kwargs,
+    )
+
+
+def create_indexes() -> None:
+    op.create_index("ix_transactions_user_id_date", "transactions", ["user_id", "date"])
+    op.create_index(
+        "ix_transactions_user_id_category_id",
+        "transactions",
+        ["user_id", "category_id"],
+    )
+    op.create_index(
+        "ix_transactions_user_id_credit_card_id",
+        "transactions",
+        ["user_id", "credit_card_id"],
+    )
+    op.create_index(
+        "ix_transactions_credit_card_id_compact_installments",
+        "transactions",
+        ["credit_card_id"],
+        postgresql_where=sa.text("installments_number IS NOT NULL"),
+    )
+    op.create_index(
+        "ix_transactions_search_vector",
+        "transactions",
+        ["search_vector"],
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "ix_transactions_description_trgm",
+        "transactions",
+        ["description"],
+        postgresql_using="gin",
+        postgresql_ops={"description": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_installments_transaction_id", "installments", ["transaction_id"]
+    )
+    op.create_index(
+        "ix_installments_credit_card_id_invoice_period",
+        "installments",
+        ["credit_card_id", "invoice_period"],
+    )
+
+
+def create_view_triggers() -> None:
+    for event in ("INSERT", "UPDATE"):
+        op.execute(
+            f"""
+            CREATE TRIGGER transaction_view_{event.lower()}
+            AFTER {event} ON transactions
+            REFERENCING NEW TABLE AS changed
+            FOR EACH STATEMENT EXECUTE FUNCTION transaction_view_upsert()
+            """
+        )
+    op.execute(
+        """
+        CREATE TRIGGER transaction_view_delete
+        AFTER DELETE ON transactions
+        REFERENCING OLD TABLE AS removed
+        FOR EACH STATEMENT EXECUTE FUNCTION transaction_view_delete()
+        """
+    )
+
+
+def replace_view_upsert(date_column: str) -> None:
+    op.execute(
+        f"""
+        CREATE OR REPLACE FUNCTION transaction_view_upsert() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO transaction_view ({VIEW_COLUMNS})
+            SELECT t.id, t.user_id, t.description, t.amount, t.is_fixed,
+                   t.is_revenue, {date_column}, t.recurring_day, t.kind,
+                   t.category_id, c.description, t.credit_card_id, cc.name,
+                   t.source_transaction_id
+            FROM changed t
+            LEFT JOIN categories c ON c.id = t.category_id
+            LEFT JOIN credit_cards cc ON cc.id = t.credit_card_id
+            ON CONFLICT (id) DO UPDATE SET
+                user_id = excluded.user_id,
+                description = excluded.description,
+                amount = excluded.amount,
+                is_fixed = excluded.is_fixed,
+                is_revenue = excluded.is_revenue,
+                date = excluded.date,
+                recurring_day = excluded.recurring_day,
+                kind = excluded.kind,
+                category_id = excluded.category_id,
+                category_description = excluded.category_description,
+                credit_card_id = excluded.credit_card_id,
+                credit_card_name = excluded.credit_card_name,
+                source_transaction_id = excluded.source_transaction_id;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+
+
+def select_list(columns: str, **expressions: str) -> str:
+    names = [name.strip() for name in columns.split(",")]
+    return ", ".join(expressions.get(name, name) for name in names)
+
+
+def copy_rows(table: str, source: str, columns: str, rows: str = "") -> None:
+    op.execute(
+        f"INSERT INTO {table} ({columns}) "
+        f"{rows or f'SELECT {columns} FROM {source}'}"
+    )
+
+
+def create_partitions(table: str, months: Iterable[date]) -> None:
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+    if table == "transactions":
+        op.execute(
+            f"CREATE TABLE {table}_undated PARTITION OF {table} FOR VALUES "
+            "FROM (MINVALUE) TO ('0001-01-02')"
+        )
+    for month in months:
+        op.execute(
+            f"CREATE TABLE {table}_p{month:%Y_%m} PARTITION OF {table} FOR VALUES "
+            f"FROM ('{month.isoformat()}') TO ('{next_month(month).isoformat()}')"
+        )
+
+
+def upgrade() -> None:
+    # a primary key or unique constraint on a partitioned table must include the
+    # partition key, so fixed transactions without a date get UNDATED and the
+    # installments reference the (id, date) key of their transaction
+    for event in ("insert", "update", "delete"):
+        op.execute(f"DROP TRIGGER transaction_view_{event} ON transactions")
+    op.rename_table("transactions", "transactions_unpartitioned")
+    op.rename_table("installments", "installments_unpartitioned")
+
+    months = set(
+        op.get_bind().scalars(
+            sa.text(
+                """
+                SELECT CAST(date_trunc('month', date) AS date)
+                FROM transactions_unpartitioned WHERE date IS NOT NULL
+                UNION
+                SELECT CAST(date_trunc('month', date) AS date)
+                FROM installments_unpartitioned
+                """
+            )
+        )
+    )
+    month = date.today().replace(day=1)
+    for _ in range(PARTITIONS_AHEAD + 1):
+        months.add(month)
+        month = next_month(month)
+
+    create_transactions(partitioned=True)
+    create_installments(partitioned=True)
+    for table in ("transactions", "installments"):
+        create_partitions(table, sorted(months))
+
+    copy_rows(
+        "transactions",
+        "transactions_unpartitioned",
+        TRANSACTION_COLUMNS,
+        f"""
+        SELECT {select_list(TRANSACTION_COLUMNS, date=f"coalesce(date, {UNDATED})")}
+        FROM transactions_unpartitioned
+        """,
+    )
+    copy_rows(
+        "installments",
+        "installments_unpartitioned",
+        f"{INSTALLMENT_COLUMNS}, transaction_date",
+        f"""
+        SELECT {INSTALLMENT_COLUMNS}, (
+            SELECT coalesce(t.date, {UNDATED}) FROM transactions_unpartitioned t
+            WHERE t.id = i.transaction_id
+        )
+        FROM installments_unpartitioned i
+        """,
+    )
+    op.drop_table("installments_unpartitioned")
+    op.drop_table("transactions_unpartitioned")
+
+    create_indexes()
+    op.create_primary_key("transactions_pkey", "transactions", ["id", "date"])
+    op.create_primary_key("installments_pkey", "installments", ["id", "date"])
+    op.create_unique_constraint(
+        "uq_transactions_source_transaction_id_period",
+        "transactions",
+        ["source_transaction_id", "period", "date"],
+    )
+    op.create_foreign_key(
+        "installments_transaction_id_fkey",
+        "installments",
+        "transactions",
+        ["transaction_id", "transaction_date"],
+        ["id", "date"],
+        onupdate="CASCADE",
+        deferrable=True,
+    )
+    replace_view_upsert(f"NULLIF(t.date, {UNDATED})")
+    create_view_triggers()
+
+
+def downgrade() -> None:
+    for event in ("insert", "update", "delete"):
+        op.execute(f"DROP TRIGGER transaction_view_{event} ON transactions")
+    op.rename_table("transactions", "transactions_partitioned")
+    op.rename_table("installments", "installments_partitioned")
+
+    create_transactions(partitioned=False)
+    create_installments(partitioned=False)
+    copy_rows(
+        "transactions",
+        "transactions_partitioned",
+        TRANSACTION_COLUMNS,
+        f"""
+        SELECT {select_list(TRANSACTION_COLUMNS, date=f"nullif(date, {UNDATED})")}
+        FROM transactions_partitioned
+        """,
+    )
+    copy_rows("installments", "installments_partitioned", INSTALLMENT_COLUMNS)
+    op.drop_table("installments_partitioned")
+    op.drop_table("transactions_partitioned")
+
+    create_indexes()
+    op.create_primary_key("transactions_pkey", "transactions", ["id"])
+    op.create_primary_key("installments_pkey", "installments", ["id"])
+    op.create_unique_constraint(
+        "uq_transactions_source_transaction_id_period",
+        "transactions",
+        ["source_transaction_id", "period"],
+    )
+    op.create_foreign_key(
+        "transactions_source_transaction_id_fkey",
+        "transactions",
+        "transactions",
+        ["source_transaction_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+    op.create_foreign_key(
+        "installments_transaction_id_fkey",
+        "installments",
+        "transactions",
+        ["transaction_id"],
+        ["id"],
+    )
+    replace_view_upsert("t.date")
+    create_view_triggers()
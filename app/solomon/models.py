@@ -1,3 +1,8 @@
 # flake8: noqa
 from app.solomon.users.domain.models import User  # noqa
 from app.solomon.transactions.domain.models import * # noqa
+from app.solomon.reports.domain.models import * # noqa
+from app.solomon.alerts.domain.models import * # noqa
+from app.solomon.infrastructure.scheduler import JobRun  # noqa
+from app.solomon.infrastructure.shards import UserShard  # noqa
+from app.solomon.infrastructure.replicas import UserWrite  # noqa
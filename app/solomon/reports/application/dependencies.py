@@ -0,0 +1,14 @@
+from fastapi import Depends
+
+from app.solomon.infrastructure.database import get_repository
+from app.solomon.reports.application.services import ReportService
+from app.solomon.reports.infrastructure.repositories import ReportRepository
+
+get_report_repository = get_repository(ReportRepository)
+
+
+def get_report_service(
+    report_repository: ReportRepository = Depends(get_report_repository),
+) -> ReportService:
+    """Factory for ReportService"""
+    return ReportService(report_repository)
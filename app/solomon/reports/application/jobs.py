@@ -0,0 +1,29 @@
+"""Reports Jobs Module"""
+
+from typing import List
+
+from app.solomon.infrastructure.config import JOBS_CONCURRENCY
+from app.solomon.infrastructure.database import create_session
+from app.solomon.infrastructure.scheduler import run_in_batches
+from app.solomon.reports.infrastructure.repositories import ReportRepository
+from app.solomon.users.application.jobs import next_user_batch
+
+
+def refresh_user_reports(user_ids: List[str]) -> int:
+    """Recompute all reports of a batch of users in a single transaction."""
+    with create_session() as session:
+        repository = ReportRepository(session)
+        repository.refresh_category_trends(user_ids)
+        repository.refresh_card_utilizations(user_ids)
+        repository.commit()
+    return len(user_ids)
+
+
+async def refresh_reports() -> int:
+    """
+    Recompute the reports of every user, in batches of ``JOBS_BATCH_SIZE`` users
+    with at most ``JOBS_CONCURRENCY`` batches running at a time.
+    """
+    return await run_in_batches(
+        next_user_batch, refresh_user_reports, JOBS_CONCURRENCY
+    )
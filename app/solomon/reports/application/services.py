@@ -0,0 +1,35 @@
+from typing import Optional
+
+from app.solomon.reports.infrastructure.repositories import ReportRepository
+from app.solomon.reports.presentation.models import (
+    CardUtilizationsResponseMapper,
+    CategoryTrendsResponseMapper,
+    JobRunsResponseMapper,
+)
+
+
+class ReportService:
+    """Service for the precomputed reports"""
+
+    def __init__(self, report_repository: ReportRepository):
+        self.report_repository = report_repository
+
+    def get_category_trends(
+        self, user_id: str, year: int
+    ) -> CategoryTrendsResponseMapper:
+        """Get the category trends of a user for a year."""
+        return CategoryTrendsResponseMapper.create(
+            self.report_repository.get_category_trends(user_id, year)
+        )
+
+    def get_card_utilizations(
+        self, user_id: str, credit_card_id: Optional[str] = None
+    ) -> CardUtilizationsResponseMapper:
+        """Get the monthly utilization of a user's credit cards."""
+        return CardUtilizationsResponseMapper.create(
+            self.report_repository.get_card_utilizations(user_id, credit_card_id)
+        )
+
+    def get_job_runs(self) -> JobRunsResponseMapper:
+        """Get the timings and status of the last run of every scheduled job."""
+        return JobRunsResponseMapper.create(self.report_repository.get_job_runs())
@@ -0,0 +1,53 @@
+from sqlalchemy import Boolean, Column, Date, Float, ForeignKey, Index, Integer
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.solomon.infrastructure.database import BaseModel
+
+
+class CategoryTrend(BaseModel):
+    """
+    Category trend model
+
+    Yearly total of a user's category, next to the total of the previous year.
+    Precomputed by the reports job.
+    """
+
+    __tablename__ = "category_trends"
+    __table_args__ = (Index("ix_category_trends_user_id_year", "user_id", "year"),)
+
+    user_id = Column(UUID(as_uuid=False), ForeignKey("users.id"), nullable=False)
+    category_id = Column(UUID(as_uuid=False), ForeignKey("categories.id"))
+    is_revenue = Column(Boolean, nullable=False)
+    year = Column(Integer, nullable=False)
+    total = Column(Float, nullable=False)
+    previous_total = Column(Float)
+
+
+class CardUtilization(BaseModel):
+    """
+    Card utilization model
+
+    Monthly total charged to a user's credit card and the share of its limit it
+    takes. Precomputed by the reports job.
+    """
+
+    __tablename__ = "card_utilizations"
+    __table_args__ = (
+        Index(
+            "ix_card_utilizations_user_id_credit_card_id_month",
+            "user_id",
+            "credit_card_id",
+            "month",
+        ),
+    )
+
+    user_id = Column(UUID(as_uuid=False), ForeignKey("users.id"), nullable=False)
+    credit_card_id = Column(
+        UUID(as_uuid=False),
+        ForeignKey("credit_cards.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    month = Column(Date, nullable=False)
+    total = Column(Float, nullable=False)
+    limit = Column(Float, nullable=False)
+    utilization = Column(Float)
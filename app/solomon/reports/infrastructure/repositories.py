@@ -0,0 +1,185 @@
+"""Reports Repositories Module"""
+
+from typing import List, Optional
+
+from sqlalchemy import Date, DateTime, Integer, case, cast, delete, func, select
+from sqlalchemy.orm.session import Session
+from sqlalchemy.sql import desc
+
+from app.solomon.infrastructure.scheduler import JobRun
+from app.solomon.reports.domain.models import CardUtilization, CategoryTrend
+from app.solomon.transactions.domain.models import (
+    CreditCard,
+    MonthlyRollup,
+    Transaction,
+)
+from app.solomon.transactions.infrastructure.repositories import (
+    ExpandedInstallment,
+    entry_date,
+)
+
+
+class ReportRepository:
+    """Reports repository. It is used to interact with the database."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def commit(self):
+        """Commit the current transaction."""
+        self.session.commit()
+
+    def get_category_trends(self, user_id: str, year: int) -> List[CategoryTrend]:
+        """Get the precomputed category trends of a user for a year."""
+        return list(
+            self.session.scalars(
+                select(CategoryTrend)
+                .where(CategoryTrend.user_id == user_id, CategoryTrend.year == year)
+                .order_by(CategoryTrend.is_revenue, desc(CategoryTrend.total))
+            )
+        )
+
+    def get_card_utilizations(
+        self, user_id: str, credit_card_id: Optional[str] = None
+    ) -> List[CardUtilization]:
+        """Get the precomputed monthly utilization of a user's credit cards."""
+        statement = select(CardUtilization).where(CardUtilization.user_id == user_id)
+        if credit_card_id is not None:
+            statement = statement.where(
+                CardUtilization.credit_card_id == credit_card_id
+            )
+        return list(
+            self.session.scalars(
+                statement.order_by(
+                    CardUtilization.credit_card_id, CardUtilization.month
+                )
+            )
+        )
+
+    def get_job_runs(self) -> List[JobRun]:
+        """Get the last run of every scheduled job."""
+        return list(self.session.scalars(select(JobRun).order_by(JobRun.name)))
+
+    def refresh_category_trends(self, user_ids: List[str]) -> None:
+        """
+        Recompute the category trends of the given users from the monthly rollups.
+
+        The previous total is only filled in when the category has entries in the
+        year right before.
+        """
+        self.session.execute(
+            delete(CategoryTrend).where(CategoryTrend.user_id.in_(user_ids))
+        )
+
+        year = cast(func.extract("year", MonthlyRollup.month), Integer)
+        yearly = (
+            select(
+                MonthlyRollup.user_id,
+                MonthlyRollup.category_id,
+                MonthlyRollup.is_revenue,
+                year.label("year"),
+                func.sum(MonthlyRollup.total).label("total"),
+            )
+            .where(MonthlyRollup.user_id.in_(user_ids), MonthlyRollup.count > 0)
+            .group_by(
+                MonthlyRollup.user_id,
+                MonthlyRollup.category_id,
+                MonthlyRollup.is_revenue,
+                year,
+            )
+            .subquery()
+        )
+        window = {
+            "partition_by": [
+                yearly.c.user_id,
+                yearly.c.category_id,
+                yearly.c.is_revenue,
+            ],
+            "order_by": yearly.c.year,
+        }
+        previous_total = case(
+            (
+                func.lag(yearly.c.year).over(**window) == yearly.c.year - 1,
+                func.lag(yearly.c.total).over(**window),
+            ),
+        )
+        rows = select(
+            func.gen_random_uuid(),
+            yearly.c.user_id,
+            yearly.c.category_id,
+            yearly.c.is_revenue,
+            yearly.c.year,
+            yearly.c.total,
+            previous_total,
+        )
+        self.session.execute(
+            CategoryTrend.__table__.insert().from_select(
+                [
+                    "id",
+                    "user_id",
+                    "category_id",
+                    "is_revenue",
+                    "year",
+                    "total",
+                    "previous_total",
+                ],
+                rows,
+            )
+        )
+
+    def refresh_card_utilizations(self, user_ids: List[str]) -> None:
+        """
+        Recompute the monthly utilization of the given users' credit cards.
+
+        Installments are charged in the month they fall due.
+        """
+        self.session.execute(
+            delete(CardUtilization).where(CardUtilization.user_id.in_(user_ids))
+        )
+
+        month = cast(func.date_trunc("month", cast(entry_date(), DateTime)), Date)
+        total = func.sum(
+            func.coalesce(ExpandedInstallment.amount, Transaction.amount)
+        )
+        rows = (
+            select(
+                func.gen_random_uuid(),
+                Transaction.user_id,
+                Transaction.credit_card_id,
+                month,
+                total,
+                CreditCard.limit,
+                total / func.nullif(CreditCard.limit, 0),
+            )
+            .select_from(Transaction)
+            .join(CreditCard, CreditCard.id == Transaction.credit_card_id)
+            .outerjoin(
+                ExpandedInstallment,
+                ExpandedInstallment.transaction_id == Transaction.id,
+            )
+            .where(
+                Transaction.user_id.in_(user_ids),
+                Transaction.is_revenue.is_(False),
+                entry_date().is_not(None),
+            )
+            .group_by(
+                Transaction.user_id,
+                Transaction.credit_card_id,
+                month,
+                CreditCard.limit,
+            )
+        )
+        self.session.execute(
+            CardUtilization.__table__.insert().from_select(
+                [
+                    "id",
+                    "user_id",
+                    "credit_card_id",
+                    "month",
+                    "total",
+                    "limit",
+                    "utilization",
+                ],
+                rows,
+            )
+        )
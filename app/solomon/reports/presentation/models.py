@@ -0,0 +1,116 @@
+import datetime
+from typing import List, Optional, Self
+
+from pydantic import BaseModel, ConfigDict
+
+from app.solomon.common.models import ResponseMapper
+from app.solomon.infrastructure.scheduler import JobRun
+from app.solomon.reports.domain.models import CardUtilization, CategoryTrend
+
+
+class CategoryTrendMapper(BaseModel):
+    """Mapper model for category trends"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    category_id: Optional[str] = None
+    is_revenue: bool
+    year: int
+    total: float
+    previous_total: Optional[float] = None
+
+
+class CategoryTrendsResponseMapper(ResponseMapper[List[CategoryTrendMapper]]):
+    """Response model for category trends"""
+
+    @classmethod
+    def create(cls, trends: List[CategoryTrend]) -> Self:
+        """
+        Create a CategoryTrendsResponseMapper instance.
+
+        Parameters
+        ----------
+        trends : List[CategoryTrend]
+            The category trends to be mapped.
+
+        Returns
+        -------
+        CategoryTrendsResponseMapper
+            A CategoryTrendsResponseMapper instance containing the mapped trends.
+        """
+        return cls(data=[CategoryTrendMapper.model_validate(trend) for trend in trends])
+
+
+class CardUtilizationMapper(BaseModel):
+    """Mapper model for card utilizations"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    credit_card_id: str
+    month: datetime.date
+    total: float
+    limit: float
+    utilization: Optional[float] = None
+
+
+class CardUtilizationsResponseMapper(ResponseMapper[List[CardUtilizationMapper]]):
+    """Response model for card utilizations"""
+
+    @classmethod
+    def create(cls, utilizations: List[CardUtilization]) -> Self:
+        """
+        Create a CardUtilizationsResponseMapper instance.
+
+        Parameters
+        ----------
+        utilizations : List[CardUtilization]
+            The card utilizations to be mapped.
+
+        Returns
+        -------
+        CardUtilizationsResponseMapper
+            A CardUtilizationsResponseMapper instance containing the mapped
+            utilizations.
+        """
+        return cls(
+            data=[
+                CardUtilizationMapper.model_validate(utilization)
+                for utilization in utilizations
+            ]
+        )
+
+
+class JobRunMapper(BaseModel):
+    """Mapper model for scheduled job runs"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    name: str
+    status: str
+    started_at: datetime.datetime
+    finished_at: Optional[datetime.datetime] = None
+    duration: Optional[float] = None
+    processed: Optional[int] = None
+    error: Optional[str] = None
+    last_success_at: Optional[datetime.datetime] = None
+
+
+class JobRunsResponseMapper(ResponseMapper[List[JobRunMapper]]):
+    """Response model for scheduled job runs"""
+
+    @classmethod
+    def create(cls, runs: List[JobRun]) -> Self:
+        """
+        Create a JobRunsResponseMapper instance.
+
+        Parameters
+        ----------
+        runs : List[JobRun]
+            The job runs to be mapped.
+
+        Returns
+        -------
+        JobRunsResponseMapper
+            A JobRunsResponseMapper instance containing the mapped runs.
+        """
+        return cls(data=[JobRunMapper.model_validate(run) for run in runs])
@@ -0,0 +1,94 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Query
+
+from app.solomon.auth.application.security import get_current_user
+from app.solomon.auth.presentation.models import UserTokenAuthenticated
+from app.solomon.reports.application.dependencies import get_report_service
+from app.solomon.reports.application.services import ReportService
+from app.solomon.reports.presentation.models import (
+    CardUtilizationsResponseMapper,
+    CategoryTrendsResponseMapper,
+    JobRunsResponseMapper,
+)
+
+report_router = APIRouter()
+
+
+@report_router.get("/category-trends")
+async def get_category_trends(
+    year: int = Query(..., ge=1900, le=9999),
+    report_service: ReportService = Depends(get_report_service),
+    current_user: UserTokenAuthenticated = Depends(get_current_user),
+) -> CategoryTrendsResponseMapper:
+    """
+    Get the yearly totals of the current user's categories, next to the totals of
+    the previous year.
+
+    Parameters
+    ----------
+    year : int
+        The year of the totals.
+    report_service : ReportService, optional
+        The service to be used to get the report, by default
+        Depends(get_report_service)
+    current_user : UserTokenAuthenticated, optional
+        The current user, by default Depends(get_current_user)
+
+    Returns
+    -------
+    CategoryTrendsResponseMapper
+        The category trends, as of the last run of the reports job.
+    """
+    return report_service.get_category_trends(current_user.id, year)
+
+
+@report_router.get("/card-utilization")
+async def get_card_utilizations(
+    credit_card_id: Optional[str] = None,
+    report_service: ReportService = Depends(get_report_service),
+    current_user: UserTokenAuthenticated = Depends(get_current_user),
+) -> CardUtilizationsResponseMapper:
+    """
+    Get the monthly utilization history of the current user's credit cards.
+
+    Parameters
+    ----------
+    credit_card_id : str, optional
+        Only return the history of this credit card.
+    report_service : ReportService, optional
+        The service to be used to get the report, by default
+        Depends(get_report_service)
+    current_user : UserTokenAuthenticated, optional
+        The current user, by default Depends(get_current_user)
+
+    Returns
+    -------
+    CardUtilizationsResponseMapper
+        The card utilizations, as of the last run of the reports job.
+    """
+    return report_service.get_card_utilizations(current_user.id, credit_card_id)
+
+
+@report_router.get("/jobs")
+async def get_job_runs(
+    report_service: ReportService = Depends(get_report_service),
+    current_user: UserTokenAuthenticated = Depends(get_current_user),
+) -> JobRunsResponseMapper:
+    """
+    Get the status and timings of the last run of each scheduled job.
+
+    Parameters
+    ----------
+    report_service : ReportService, optional
+        The service to be used to get the job runs, by default
+        Depends(get_report_service)
+    current_user : UserTokenAuthenticated, optional
+        The current user, by default Depends(get_current_user)
+
+    Returns
+    -------
+    JobRunsResponseMapper
+        One run per job.
+    """
+    return report_service.get_job_runs()
@@ -1,6 +1,10 @@
 from fastapi import APIRouter, FastAPI
 
+from app.solomon.alerts.presentation.alerts_resources import alert_router
+from app.solomon.analytics.presentation.analytics_resources import analytics_router
 from app.solomon.auth.presentation.resources import router as auth_router
+from app.solomon.reports.presentation.reports_resources import report_router
+from app.solomon.transactions.presentation.budgets_resources import budget_router
 from app.solomon.transactions.presentation.categories_resources import (
     category_router,
 )
@@ -41,3 +45,7 @@ def init_routes(app: FastAPI) -> None:
     app.include_router(
         transaction_router, prefix="/transactions", tags=["transactions"]
     )
+    app.include_router(budget_router, prefix="/budgets", tags=["budgets"])
+    app.include_router(alert_router, prefix="/alerts", tags=["alerts"])
+    app.include_router(report_router, prefix="/reports", tags=["reports"])
+    app.include_router(analytics_router, prefix="/analytics", tags=["analytics"])
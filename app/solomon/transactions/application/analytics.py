@@ -0,0 +1,78 @@
+"""Spend Analytics Module"""
+
+from datetime import date, timedelta
+from typing import List, NamedTuple, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from app.solomon.transactions.domain.options import AnalyticsPeriods
+
+
+class SpendSeries(NamedTuple):
+    """Spend series of several categories over the same buckets."""
+
+    buckets: List[date]
+    categories: List[Optional[str]]
+    totals: np.ndarray
+    rolling_mean: np.ndarray
+    rolling_std: np.ndarray
+
+
+def rolling_spend(
+    start: date,
+    end: date,
+    period: AnalyticsPeriods,
+    window: int,
+    categories: Sequence[Optional[str]],
+    totals: Sequence[Sequence[float]],
+) -> SpendSeries:
+    """
+    Compute the rolling mean and standard deviation of spend series.
+
+    The series are laid out as the columns of a single frame, one row per bucket,
+    so each statistic is one vectorized rolling operation over every category.
+    Windows shorter than ``window`` at the start of the range use the buckets
+    available; the standard deviation of a single bucket is undefined (``NaN``).
+
+    Parameters
+    ----------
+    start, end : date
+        First and last day of the range.
+    period : AnalyticsPeriods
+        The size of the buckets.
+    window : int
+        Number of buckets of the rolling window.
+    categories : Sequence[Optional[str]]
+        The category of each series.
+    totals : Sequence[Sequence[float]]
+        The total of each bucket, one sequence of the same length per category.
+
+    Returns
+    -------
+    SpendSeries
+        The buckets and, for each category, its totals and rolling statistics with
+        one row per category.
+    """
+    step = timedelta(days=period.days)
+    first = period.first_bucket(start)
+    buckets = (end - first) // step + 1
+
+    frame = pd.DataFrame(
+        np.asarray(totals, dtype=np.float64).reshape(len(categories), buckets).T
+    )
+    rolling = frame.rolling(window, min_periods=1)
+    return SpendSeries(
+        buckets=[first + step * index for index in range(buckets)],
+        categories=list(categories),
+        totals=frame.to_numpy().T.round(2),
+        rolling_mean=rolling.mean().to_numpy().T.round(2),
+        rolling_std=rolling.std().to_numpy().T.round(2),
+    )
+
+
+def to_list(values: np.ndarray) -> List[Optional[float]]:
+    """Convert an array to a list, ``NaN`` becoming ``None``."""
+    items = values.astype(object)
+    items[np.isnan(values)] = None
+    return items.tolist()
@@ -0,0 +1,206 @@
+import heapq
+import threading
+import time
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from typing import Callable, Dict, List, Tuple
+
+from app.solomon.infrastructure.config import (
+    AUTOCOMPLETE_MAX_USERS,
+    AUTOCOMPLETE_TTL,
+)
+
+
+class DescriptionIndex:
+    """
+    Prefix index over the distinct descriptions of a single user.
+
+    Descriptions are kept in a sorted array of case-folded keys, so all the
+    descriptions starting with a prefix form a contiguous slice found with a binary
+    search. Each key keeps how many transactions used it and the spelling to be
+    suggested.
+    """
+
+    def __init__(self, counts: Dict[str, int]):
+        self._entries: Dict[str, Tuple[str, int]] = {}
+        for description, count in counts.items():
+            self._count(description, count)
+
+        self._keys: List[str] = sorted(self._entries)
+
+    @staticmethod
+    def _normalize(description: str) -> str:
+        return description.strip().casefold()
+
+    def add(self, description: str, count: int = 1) -> None:
+        """
+        Count one more use of a description.
+
+        Parameters
+        ----------
+        description : str
+            The transaction description.
+        count : int
+            How many uses to add.
+        """
+        key = self._count(description, count)
+        if key is not None and self._entries[key][1] == count:
+            insort(self._keys, key)
+
+    def remove(self, description: str, count: int = 1) -> None:
+        """
+        Count one less use of a description, dropping it when no use is left.
+
+        Parameters
+        ----------
+        description : str
+            The transaction description.
+        count : int
+            How many uses to remove.
+        """
+        key = self._normalize(description)
+        if key not in self._entries:
+            return
+
+        spelling, current = self._entries[key]
+        if current > count:
+            self._entries[key] = (spelling, current - count)
+            return
+
+        del self._entries[key]
+        del self._keys[bisect_left(self._keys, key)]
+
+    def _count(self, description: str, count: int) -> str | None:
+        key = self._normalize(description)
+        if not key:
+            return None
+
+        spelling, current = self._entries.get(key, (description, 0))
+        if current < count:
+            # the most used spelling wins among case variants
+            spelling = description
+        self._entries[key] = (spelling, current + count)
+        return key
+
+    def suggest(self, prefix: str, limit: int) -> List[Tuple[str, int]]:
+        """
+        Return the most used descriptions starting with a prefix.
+
+        Parameters
+        ----------
+        prefix : str
+            The typed prefix, matched case-insensitively.
+        limit : int
+            Maximum number of suggestions.
+
+        Returns
+        -------
+        List[Tuple[str, int]]
+            Pairs of description and use count, most used first.
+        """
+        prefix = self._normalize(prefix)
+        start = bisect_left(self._keys, prefix)
+        end = bisect_left(self._keys, prefix + "\U0010ffff", lo=start)
+
+        matches = (self._entries[key] for key in self._keys[start:end])
+        return heapq.nsmallest(limit, matches, key=lambda item: (-item[1], item[0]))
+
+
+class DescriptionAutocomplete:
+    """
+    Per-user description indexes kept in memory, bounded by an LRU over users.
+
+    An index is built lazily from the database the first time a user asks for
+    suggestions, and kept up to date with ``record`` and ``forget`` as transactions
+    are created and their descriptions change.
+    Since every worker process has its own cache, indexes are rebuilt after
+    ``ttl`` seconds so that writes served by other workers show up eventually.
+    """
+
+    def __init__(self, max_users: int, ttl: int):
+        self.max_users = max_users
+        self.ttl = ttl
+        self._indexes: "OrderedDict[str, Tuple[float, DescriptionIndex]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def suggest(
+        self,
+        user_id: str,
+        prefix: str,
+        limit: int,
+        loader: Callable[[], Dict[str, int]],
+    ) -> List[Tuple[str, int]]:
+        """
+        Return the user's most used descriptions starting with a prefix.
+
+        Parameters
+        ----------
+        user_id : str
+            The ID of the user.
+        prefix : str
+            The typed prefix.
+        limit : int
+            Maximum number of suggestions.
+        loader : Callable[[], Dict[str, int]]
+            Loads the user's description counts when the index is not cached.
+
+        Returns
+        -------
+        List[Tuple[str, int]]
+            Pairs of description and use count, most used first.
+        """
+        with self._lock:
+            index = self._get(user_id)
+
+        if index is None:
+            index = DescriptionIndex(loader())
+            with self._lock:
+                self._put(user_id, index)
+
+        with self._lock:
+            return index.suggest(prefix, limit)
+
+    def record(self, user_id: str, description: str, count: int = 1) -> None:
+        """Count new uses of a description in the user's index, if it is cached."""
+        with self._lock:
+            index = self._get(user_id)
+            if index is not None:
+                index.add(description, count)
+
+    def forget(self, user_id: str, description: str, count: int = 1) -> None:
+        """Count uses of a description less in the user's index, if it is cached."""
+        with self._lock:
+            index = self._get(user_id)
+            if index is not None:
+                index.remove(description, count)
+
+    def clear(self) -> None:
+        """Drop all cached indexes."""
+        with self._lock:
+            self._indexes.clear()
+
+    def _get(self, user_id: str) -> DescriptionIndex | None:
+        cached = self._indexes.get(user_id)
+        if cached is None:
+            return None
+
+        built_at, index = cached
+        if time.monotonic() - built_at > self.ttl:
+            del self._indexes[user_id]
+            return None
+
+        self._indexes.move_to_end(user_id)
+        return index
+
+    def _put(self, user_id: str, index: DescriptionIndex) -> None:
+        self._indexes[user_id] = (time.monotonic(), index)
+        self._indexes.move_to_end(user_id)
+        while len(self._indexes) > self.max_users:
+            self._indexes.popitem(last=False)
+
+
+description_autocomplete = DescriptionAutocomplete(
+    max_users=AUTOCOMPLETE_MAX_USERS, ttl=AUTOCOMPLETE_TTL
+)
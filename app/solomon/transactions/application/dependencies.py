@@ -2,11 +2,13 @@ from fastapi import Depends
 
 from app.solomon.infrastructure.database import get_repository
 from app.solomon.transactions.application.services import (
+    BudgetService,
     CategoryService,
     CreditCardService,
     TransactionService,
 )
 from app.solomon.transactions.infrastructure.repositories import (
+    BudgetRepository,
     CategoryRepository,
     CreditCardRepository,
     TransactionRepository,
@@ -15,6 +17,7 @@ from app.solomon.transactions.infrastructure.repositories import (
 get_credit_card_repository = get_repository(CreditCardRepository)
 get_category_repository = get_repository(CategoryRepository)
 get_transaction_repository = get_repository(TransactionRepository)
+get_budget_repository = get_repository(BudgetRepository)
 
 
 def get_credit_card_service(
@@ -36,3 +39,11 @@ def get_transaction_service(
 ) -> TransactionService:
     """Factory for TransactionService"""
     return TransactionService(transaction_repository)
+
+
+def get_budget_service(
+    budget_repository: BudgetRepository = Depends(get_budget_repository),
+    category_repository: CategoryRepository = Depends(get_category_repository),
+) -> BudgetService:
+    """Factory for BudgetService"""
+    return BudgetService(budget_repository, category_repository)
@@ -0,0 +1,118 @@
+"""Cash Flow Forecast Module"""
+
+from datetime import date
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class CashFlow(NamedTuple):
+    """Monthly cash flow, one item per month of the grid."""
+
+    months: List[date]
+    inflow: np.ndarray
+    outflow: np.ndarray
+
+    @property
+    def net(self) -> np.ndarray:
+        return self.inflow - self.outflow
+
+
+def columns(rows: Iterable[Tuple], width: int) -> List[Tuple]:
+    """Transpose query rows into one tuple per column."""
+    return list(zip(*rows)) or [()] * width
+
+
+def month_offsets(dates: Sequence[Optional[date]], start: date) -> np.ndarray:
+    """
+    Number of months between ``start`` and each date, ``-1`` for missing dates.
+
+    The offsets are computed from the year and month of each date, which is much
+    faster than converting the dates to ``datetime64``.
+    """
+    base = _month_number(start)
+    return np.fromiter(
+        (-1 if day is None else _month_number(day) - base for day in dates),
+        dtype=np.int64,
+        count=len(dates),
+    )
+
+
+def project_cash_flow(
+    start: date,
+    months: int,
+    installment_periods: Sequence[date],
+    installment_amounts: Sequence[float],
+    installment_is_revenue: Sequence[bool],
+    fixed_dates: Sequence[Optional[date]],
+    fixed_amounts: Sequence[float],
+    fixed_is_revenue: Sequence[bool],
+) -> CashFlow:
+    """
+    Project installments and fixed transactions onto a grid of months.
+
+    Every installment falls on a single month of the grid. Fixed transactions repeat
+    every month, from the month of their date (or from the start of the grid when
+    they have no date) to the end of the grid. Both are computed with array
+    operations: installments with a weighted ``bincount`` of their month offsets and
+    fixed transactions with the cumulative sum of the amounts starting at each month.
+
+    Parameters
+    ----------
+    start : date
+        Any day of the first month of the grid.
+    months : int
+        Number of months of the grid.
+    installment_periods, installment_amounts, installment_is_revenue
+        Month, amount and direction of each installment.
+    fixed_dates, fixed_amounts, fixed_is_revenue
+        First date, amount and direction of each fixed transaction.
+
+    Returns
+    -------
+    CashFlow
+        The months of the grid with their inflow and outflow.
+    """
+    grid = [
+        date(year, month + 1, 1)
+        for year, month in (
+            divmod(_month_number(start) + offset, 12) for offset in range(months)
+        )
+    ]
+
+    offsets = month_offsets(installment_periods, start)
+    amounts = np.asarray(installment_amounts, dtype=np.float64)
+    is_revenue = np.asarray(installment_is_revenue, dtype=bool)
+    in_grid = (offsets >= 0) & (offsets < months)
+    installment_inflow = _monthly_totals(offsets, amounts, in_grid & is_revenue, months)
+    installment_outflow = _monthly_totals(
+        offsets, amounts, in_grid & ~is_revenue, months
+    )
+
+    # fixed transactions that started before the grid repeat from its first month
+    offsets = np.clip(month_offsets(fixed_dates, start), 0, None)
+    amounts = np.asarray(fixed_amounts, dtype=np.float64)
+    is_revenue = np.asarray(fixed_is_revenue, dtype=bool)
+    in_grid = offsets < months
+    fixed_inflow = np.cumsum(
+        _monthly_totals(offsets, amounts, in_grid & is_revenue, months)
+    )
+    fixed_outflow = np.cumsum(
+        _monthly_totals(offsets, amounts, in_grid & ~is_revenue, months)
+    )
+
+    return CashFlow(
+        months=grid,
+        inflow=np.round(installment_inflow + fixed_inflow, 2),
+        outflow=np.round(installment_outflow + fixed_outflow, 2),
+    )
+
+
+def _monthly_totals(
+    offsets: np.ndarray, amounts: np.ndarray, mask: np.ndarray, months: int
+) -> np.ndarray:
+    return np.bincount(offsets[mask], weights=amounts[mask], minlength=months)[:months]
+
+
+def _month_number(day: date) -> int:
+    return day.year * 12 + day.month - 1
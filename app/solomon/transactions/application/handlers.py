@@ -1,10 +1,16 @@
 import logging
-from datetime import datetime, date
-from typing import List
+from datetime import date
+from typing import List, Optional
 
 from dateutil.relativedelta import relativedelta
 
-from app.solomon.transactions.domain.models import Installment, Transaction
+from app.solomon.infrastructure.config import INSTALLMENT_STORAGE
+from app.solomon.transactions.domain.models import (
+    Installment,
+    InstallmentSchedule,
+    Transaction,
+)
+from app.solomon.transactions.domain.options import InstallmentStorage
 from app.solomon.transactions.presentation.models import (
     InstallmentCreate,
     TransactionCreate,
@@ -17,10 +23,18 @@ class CreditCardTransactionHandler:
     """
     Credit card transaction handler. It is used to create a transaction and its
     installments.
+
+    With the ``compact`` installment storage, only the installment schedule is
+    stored on the transaction instead of one ``Installment`` row per installment.
     """
 
-    def __init__(self, transaction_repository):
+    def __init__(
+        self,
+        transaction_repository,
+        storage: Optional[InstallmentStorage] = None,
+    ):
         self.transaction_repository = transaction_repository
+        self.storage = storage or InstallmentStorage(INSTALLMENT_STORAGE)
 
     def process_transaction(
         self, transaction: TransactionCreate
@@ -44,17 +58,24 @@ class CreditCardTransactionHandler:
             Created transaction
         """
         try:
-            installments = InstallmentHandler.generate_installments(transaction)
             transaction_model = (
                 CreditCardTransactionHandler._map_transaction_to_domain(
                     transaction
                 )
             )  # noqa
-            installments_models = (
-                CreditCardTransactionHandler._map_installments_to_domain(
-                    installments
-                )
-            )  # noqa
+            if self.storage == InstallmentStorage.COMPACT:
+                schedule = InstallmentHandler.get_schedule(transaction)
+                transaction_model.installments_number = schedule.number
+                transaction_model.installment_amount = schedule.amount
+                transaction_model.installment_remainder = schedule.remainder
+                installments_models = []
+            else:
+                installments = InstallmentHandler.generate_installments(transaction)
+                installments_models = (
+                    CreditCardTransactionHandler._map_installments_to_domain(
+                        installments
+                    )
+                )  # noqa
 
             response = self.transaction_repository.create_with_installments(
                 transaction=transaction_model, installments=installments_models
@@ -89,6 +110,45 @@ class CreditCardTransactionHandler:
 class InstallmentHandler:
     """Installment handler. It is used to generate installments for a transaction."""
 
+    @classmethod
+    def get_schedule(cls, transaction: TransactionCreate) -> InstallmentSchedule:
+        """
+        Split a transaction amount into equal monthly installments.
+
+        Parameters
+        ----------
+        transaction : TransactionCreate
+            The transaction for which installments need to be generated.
+
+        Returns
+        -------
+        InstallmentSchedule
+            The first date, number, amount and remainder of the installments.
+        """
+        return cls.create_schedule(
+            transaction.amount, transaction.date, transaction.installments_number
+        )
+
+    @classmethod
+    def create_schedule(
+        cls, amount: float, first_date: date, number: Optional[int]
+    ) -> InstallmentSchedule:
+        """
+        Split an amount into ``number`` equal monthly installments from
+        ``first_date`` on, a single one when no number is given.
+
+        The installment amount is rounded to cents and the last installment adds
+        the remainder, so the installments add up to the amount.
+        """
+        number = number or 1
+        installment_amount = round(amount / number, 2)
+        return InstallmentSchedule(
+            first_date=first_date,
+            number=number,
+            amount=installment_amount,
+            remainder=round(amount - installment_amount * number, 2),
+        )
+
     @classmethod
     def generate_installments(
         cls, transaction: TransactionCreate
@@ -107,20 +167,19 @@ class InstallmentHandler:
             A list of InstallmentCreate objects representing the generated installments.
         """
 
-        if not transaction.installments_number:
-            transaction.installments_number = 1
-
-        installments_amount = round(
-            transaction.amount / transaction.installments_number, 2
-        )
+        schedule = cls.get_schedule(transaction)
 
         installments_dates = cls._generate_installment_dates(
-            transaction.date, transaction.installments_number
+            schedule.first_date, schedule.number
         )
 
         installments = [
             InstallmentCreate(
-                amount=installments_amount,
+                amount=(
+                    round(schedule.amount + schedule.remainder, 2)
+                    if i == schedule.number - 1
+                    else schedule.amount
+                ),
                 installment_number=i + 1,
                 date=date,
             )
@@ -132,11 +191,10 @@ class InstallmentHandler:
     @classmethod
     def _generate_installment_dates(
         cls, start_date: date, num_installments: int
-    ) -> List[datetime]:
-        dates = [start_date]
-
-        for _ in range(1, num_installments):
-            next_month = dates[-1] + relativedelta(months=1)
-            dates.append(next_month)
-
-        return dates
+    ) -> List[date]:
+        # counted from the first date, so a purchase on the 31st keeps falling on
+        # the last day of shorter months, as in the compact schedule expansion
+        return [
+            start_date + relativedelta(months=month)
+            for month in range(num_installments)
+        ]
@@ -0,0 +1,185 @@
+"""Transactions Jobs Module"""
+
+import asyncio
+import logging
+from datetime import date
+from typing import List
+
+from app.solomon.infrastructure.config import (
+    ARCHIVE_AFTER_MONTHS,
+    ARCHIVE_BATCH_SIZE,
+    JOBS_CONCURRENCY,
+    PARTITIONS_AHEAD,
+)
+from app.solomon.infrastructure.database import create_session
+from app.solomon.infrastructure.partitions import (
+    PartitionRepository,
+    month_partition,
+    next_month,
+)
+from app.solomon.infrastructure.scheduler import run_in_batches
+from app.solomon.transactions.domain.models import Installment, Transaction
+from app.solomon.transactions.infrastructure.repositories import (
+    CreditCardRepository,
+    TransactionRepository,
+)
+from app.solomon.users.application.jobs import next_user_batch
+
+logger = logging.getLogger(__name__)
+
+PARTITIONED_TABLES = (Transaction.__tablename__, Installment.__tablename__)
+
+
+def close_user_invoices(user_ids: List[str]) -> int:
+    """Close the invoices of a batch of users that closed by today."""
+    with create_session() as session:
+        repository = CreditCardRepository(session)
+        closed = repository.close_invoices(user_ids, date.today())
+        repository.commit()
+    return closed
+
+
+def reconcile_user_credit_cards(user_ids: List[str]) -> int:
+    """Correct the committed amount of a batch of users' credit cards."""
+    with create_session() as session:
+        repository = CreditCardRepository(session)
+        corrected = repository.reconcile_committed(user_ids)
+        repository.commit()
+
+    if corrected:
+        logger.warning(
+            "Corrected drifted committed amount of credit cards %s",
+            ", ".join(corrected),
+        )
+    return len(corrected)
+
+
+def reconcile_user_rollups(user_ids: List[str]) -> int:
+    """Rebuild the monthly rollups of a batch of users that drifted."""
+    with create_session() as session:
+        repository = TransactionRepository(session)
+        drifted = repository.reconcile_rollups(user_ids)
+        repository.commit()
+
+    if drifted:
+        logger.warning(
+            "Rebuilt drifted monthly rollups of users %s", ", ".join(drifted)
+        )
+    return len(drifted)
+
+
+def materialize_user_recurring_transactions(user_ids: List[str]) -> int:
+    """Materialize this month's occurrences of a batch of users' fixed transactions."""
+    with create_session() as session:
+        repository = TransactionRepository(session)
+        inserted = repository.materialize_occurrences(
+            user_ids, date.today().replace(day=1)
+        )
+        repository.commit()
+    return inserted
+
+
+def archive_horizon(today: date) -> date:
+    """First day of the oldest month kept out of the archive on ``today``."""
+    months = today.year * 12 + today.month - 1 - ARCHIVE_AFTER_MONTHS
+    return date(months // 12, months % 12 + 1, 1)
+
+
+def archive_user_transactions(user_ids: List[str]) -> int:
+    """
+    Archive the transactions of a batch of users older than the archive horizon,
+    committing every ``ARCHIVE_BATCH_SIZE`` transactions so that no lock is held
+    for long.
+    """
+    before = archive_horizon(date.today())
+    archived = 0
+    with create_session() as session:
+        repository = TransactionRepository(session)
+        while True:
+            moved = repository.archive(user_ids, before, ARCHIVE_BATCH_SIZE)
+            repository.commit()
+            archived += moved
+            if moved < ARCHIVE_BATCH_SIZE:
+                return archived
+
+
+def create_partitions(today: date) -> int:
+    """
+    Create the missing monthly partitions of the partitioned tables, from the month
+    of ``today`` to ``PARTITIONS_AHEAD`` months later.
+    """
+    start = end = today.replace(day=1)
+    for _ in range(PARTITIONS_AHEAD):
+        end = next_month(end)
+
+    with create_session() as session:
+        repository = PartitionRepository(session)
+        created = [
+            month_partition(table, month)
+            for table in PARTITIONED_TABLES
+            for month in repository.ensure_partitions(table, start, end)
+        ]
+        repository.commit()
+
+    if created:
+        logger.info("Created partitions %s", ", ".join(created))
+    return len(created)
+
+
+async def close_invoices() -> int:
+    """
+    Release the installments of closed invoices from the committed amount of every
+    credit card. Returns the number of credit cards with newly closed invoices.
+    """
+    return await run_in_batches(
+        next_user_batch, close_user_invoices, JOBS_CONCURRENCY
+    )
+
+
+async def reconcile_credit_cards() -> int:
+    """
+    Detect and correct drift in the committed amount of every credit card. Returns
+    the number of credit cards corrected.
+    """
+    return await run_in_batches(
+        next_user_batch, reconcile_user_credit_cards, JOBS_CONCURRENCY
+    )
+
+
+async def materialize_recurring_transactions() -> int:
+    """
+    Insert this month's occurrence of every fixed transaction as a transaction of
+    its own. Returns the number of transactions inserted.
+    """
+    return await run_in_batches(
+        next_user_batch, materialize_user_recurring_transactions, JOBS_CONCURRENCY
+    )
+
+
+async def reconcile_rollups() -> int:
+    """
+    Verify the monthly rollups, which budgets are checked against, and rebuild the
+    ones that drifted from the transactions. Returns the number of users rebuilt.
+    """
+    return await run_in_batches(
+        next_user_batch, reconcile_user_rollups, JOBS_CONCURRENCY
+    )
+
+
+async def archive_transactions() -> int:
+    """
+    Move the transactions and installments older than ``ARCHIVE_AFTER_MONTHS``
+    months to the archive tables. Returns the number of transactions archived.
+    """
+    return await run_in_batches(
+        next_user_batch, archive_user_transactions, JOBS_CONCURRENCY
+    )
+
+
+async def ensure_partitions() -> int:
+    """
+    Create the partitions of the coming months of the transactions and
+    installments, so that new rows are not stored in the default partitions.
+    Returns the number of partitions created.
+    """
+    return await asyncio.to_thread(create_partitions, date.today())
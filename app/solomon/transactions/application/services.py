@@ -1,41 +1,72 @@
+from datetime import date
 from io import BytesIO
-from typing import List
+from typing import List, Optional
 
 from fastapi_pagination import Params
 
 from app.solomon.common.data_transformation import DataTransformationError
-from app.solomon.common.exceptions import ExcelGenerationError
+from app.solomon.common.exceptions import ExcelGenerationError, InvalidFilter
 from app.solomon.common.file_exporter import ExcelExporter
+from app.solomon.transactions.application.analytics import rolling_spend
+from app.solomon.transactions.application.autocomplete import (
+    DescriptionAutocomplete,
+    description_autocomplete,
+)
+from app.solomon.transactions.application.forecast import (
+    columns,
+    project_cash_flow,
+)
 from app.solomon.transactions.application.handlers import (
     CreditCardTransactionHandler,
+    InstallmentHandler,
 )
 from app.solomon.transactions.application.transforms import (
     ExportExcelTransformation,
 )
 from app.solomon.transactions.domain.exceptions import (
+    BudgetAlreadyExists,
+    BudgetNotFound,
     CategoryNotFound,
     CreditCardNotFound,
     NoTransactionsFound,
     TransactionNotFound,
 )
 from app.solomon.transactions.domain.models import (
+    Budget,
     CreditCard,
+    Installment,
 )
 from app.solomon.transactions.domain.options import Kinds
 from app.solomon.transactions.infrastructure.repositories import (
+    BudgetRepository,
     CategoryRepository,
     CreditCardRepository,
     TransactionRepository,
 )
 from app.solomon.transactions.presentation.models import (
+    BalanceResponseMapper,
+    BudgetCreate,
+    BudgetResponseMapper,
+    BudgetsResponseMapper,
+    BudgetUpdate,
+    BulkOperationResponseMapper,
+    CashFlowForecastResponseMapper,
     CategoriesResponseMapper,
     CategoryResponseMapper,
+    DescriptionSuggestionsResponseMapper,
     PaginatedTransactionResponseMapper,
+    SpendAnalyticsParams,
+    SpendAnalyticsResponseMapper,
     Transaction,
+    TransactionBulkUpdate,
     TransactionCreate,
     TransactionFilters,
     TransactionResponseMapper,
     TransactionsResponseMapper,
+    TransactionSummaryParams,
+    TransactionSummaryResponseMapper,
+    TransactionUpdate,
+    TransactionViewMapper,
 )
 
 
@@ -125,6 +156,31 @@ class CreditCardService:
         credit_card = self.get_credit_card(credit_card_id, user_id)
         return self.credit_card_repository.update(credit_card, **kwargs)
 
+    def get_invoice(
+        self, credit_card_id: str, user_id: str, period: date
+    ) -> List[Installment]:
+        """
+        Retrieve the installments billed on a credit card invoice.
+
+        Parameters
+        ----------
+        credit_card_id : str
+            The ID of the credit card.
+        user_id: str
+            The ID of the user that owns the credit card.
+        period : date
+            The first day of the invoice month.
+
+        Returns
+        -------
+        List[Installment]
+            The installments of the invoice, with their transactions.
+        """
+        credit_card = self.get_credit_card(credit_card_id, user_id)
+        return self.credit_card_repository.get_invoice_installments(
+            credit_card.id, period
+        )
+
     def delete_credit_card(
         self, credit_card_id: str, user_id: str
     ) -> CreditCard:
@@ -175,11 +231,151 @@ class CategoryService:
         return CategoryResponseMapper.create(category=category)
 
 
+class BudgetService:
+    """Service for handling Budget business logic."""
+
+    def __init__(
+        self,
+        budget_repository: BudgetRepository,
+        category_repository: CategoryRepository,
+    ) -> None:
+        self.budget_repository = budget_repository
+        self.category_repository = category_repository
+
+    def get_budgets(self, user_id: str, month: date) -> BudgetsResponseMapper:
+        """
+        Get the user's budgets with their spending in a month.
+
+        Parameters
+        ----------
+        user_id : str
+            The ID of the user that owns the budgets.
+        month : date
+            The first day of the month.
+
+        Returns
+        -------
+        BudgetsResponseMapper
+            The status of each budget.
+        """
+        rows = self.budget_repository.get_statuses(user_id, month)
+        return BudgetsResponseMapper.create(rows, month)
+
+    def get_budget(
+        self, budget_id: str, user_id: str, month: date
+    ) -> BudgetResponseMapper:
+        """
+        Get a budget with its spending in a month.
+
+        Parameters
+        ----------
+        budget_id : str
+            The ID of the budget.
+        user_id : str
+            The ID of the user that owns the budget.
+        month : date
+            The first day of the month.
+
+        Returns
+        -------
+        BudgetResponseMapper
+            The status of the budget.
+
+        Raises
+        ------
+        BudgetNotFound
+            If the user has no budget with the given ID.
+        """
+        rows = self.budget_repository.get_statuses(user_id, month, budget_id)
+        if not rows:
+            raise BudgetNotFound("Budget not found.")
+
+        budget, spent = rows[0]
+        return BudgetResponseMapper.create(budget, spent, month)
+
+    def create_budget(
+        self, user_id: str, budget: BudgetCreate, month: date
+    ) -> BudgetResponseMapper:
+        """
+        Create a budget for a category.
+
+        Parameters
+        ----------
+        user_id : str
+            The ID of the user that owns the budget.
+        budget : BudgetCreate
+            The budget to be created.
+        month : date
+            The first day of the month whose spending is returned.
+
+        Returns
+        -------
+        BudgetResponseMapper
+            The status of the created budget.
+
+        Raises
+        ------
+        CategoryNotFound
+            If the category does not exist.
+        BudgetAlreadyExists
+            If the user already has a budget for the category.
+        """
+        if not self.category_repository.get_by_id(budget.category_id):
+            raise CategoryNotFound("Category not found.")
+        if self.budget_repository.get_by_category(budget.category_id, user_id):
+            raise BudgetAlreadyExists("There is already a budget for this category.")
+
+        created_budget = self.budget_repository.create(
+            **budget.model_dump(), user_id=user_id
+        )
+        return self.get_budget(created_budget.id, user_id, month)
+
+    def update_budget(
+        self, budget_id: str, user_id: str, budget_update: BudgetUpdate, month: date
+    ) -> BudgetResponseMapper:
+        """
+        Update the amount of a budget.
+
+        Raises
+        ------
+        BudgetNotFound
+            If the user has no budget with the given ID.
+        """
+        budget = self._get_budget(budget_id, user_id)
+        self.budget_repository.update(
+            budget, **budget_update.model_dump(exclude_none=True)
+        )
+        return self.get_budget(budget_id, user_id, month)
+
+    def delete_budget(self, budget_id: str, user_id: str) -> Budget:
+        """
+        Delete a budget.
+
+        Raises
+        ------
+        BudgetNotFound
+            If the user has no budget with the given ID.
+        """
+        budget = self._get_budget(budget_id, user_id)
+        return self.budget_repository.delete(budget)
+
+    def _get_budget(self, budget_id: str, user_id: str) -> Budget:
+        budget = self.budget_repository.get_by_id(budget_id, user_id)
+        if not budget:
+            raise BudgetNotFound("Budget not found.")
+        return budget
+
+
 class TransactionService:
     """Transactions Services class"""
 
-    def __init__(self, transaction_repository: TransactionRepository) -> None:
+    def __init__(
+        self,
+        transaction_repository: TransactionRepository,
+        autocomplete: DescriptionAutocomplete = description_autocomplete,
+    ) -> None:
         self.transaction_repository = transaction_repository
+        self.autocomplete = autocomplete
 
     def create_transaction(
         self, transaction: TransactionCreate
@@ -205,6 +401,7 @@ class TransactionService:
             If any other error occurs.
         """
         created_transaction = self._handle_transaction(transaction)
+        self.autocomplete.record(transaction.user_id, transaction.description)
         return TransactionResponseMapper.create(transaction=created_transaction)
 
     def get_transaction(
@@ -234,6 +431,164 @@ class TransactionService:
 
         return TransactionResponseMapper.create(transaction=transaction)
 
+    def update_transaction(
+        self,
+        transaction_id: str,
+        user_id: str,
+        transaction_update: TransactionUpdate,
+    ) -> TransactionResponseMapper:
+        """
+        Update a transaction.
+
+        When the amount, date or number of installments of a credit card purchase
+        change, its installments are regenerated with the rules of
+        ``InstallmentHandler``.
+
+        Parameters
+        ----------
+        transaction_id : str
+            The ID of the transaction to update.
+        user_id : str
+            The ID of the user that owns the transaction.
+        transaction_update : TransactionUpdate
+            The new data for the transaction.
+
+        Returns
+        -------
+        TransactionResponseMapper
+            The updated transaction, with its installments.
+
+        Raises
+        ------
+        TransactionNotFound
+            If the user has no transaction with the given ID.
+        """
+        transaction = self.transaction_repository.get_by_id(
+            transaction_id=transaction_id, user_id=user_id
+        )
+        if not transaction:
+            raise TransactionNotFound("Transaction not found.")
+
+        changes = transaction_update.model_dump(
+            exclude_none=True, exclude={"installments_number"}
+        )
+        schedule = None
+        is_purchase = transaction.kind == Kinds.CREDIT and not transaction.is_fixed
+        reschedules = "amount" in changes or "date" in changes
+        if is_purchase and (reschedules or transaction_update.installments_number):
+            schedule = InstallmentHandler.create_schedule(
+                changes.get("amount", transaction.amount),
+                changes.get("date", transaction.date),
+                transaction_update.installments_number
+                or len(transaction.installments),
+            )
+
+        description = transaction.description
+        updated_transaction = self.transaction_repository.update(
+            transaction, schedule, **changes
+        )
+        if changes.get("description", description) != description:
+            self.autocomplete.forget(user_id, description)
+            self.autocomplete.record(user_id, changes["description"])
+        return TransactionResponseMapper.create(transaction=updated_transaction)
+
+    def bulk_update_transactions(
+        self,
+        user_id: str,
+        filters: TransactionFilters,
+        transaction_update: TransactionBulkUpdate,
+        dry_run: bool = False,
+    ) -> BulkOperationResponseMapper:
+        """
+        Update every transaction of the user matching the filters.
+
+        Parameters
+        ----------
+        user_id : str
+            The ID of the user that owns the transactions.
+        filters : TransactionFilters
+            The filters selecting the transactions to update.
+        transaction_update : TransactionBulkUpdate
+            The new data for the transactions.
+        dry_run : bool
+            Only count the transactions that would be updated.
+
+        Returns
+        -------
+        BulkOperationResponseMapper
+            The number of updated transactions.
+
+        Raises
+        ------
+        InvalidFilter
+            If there are no filters or they are rejected by the transactions
+            whitelist.
+        """
+        arguments = self._bulk_arguments(user_id, filters)
+        if dry_run:
+            count = self.transaction_repository.count_matching(**arguments)
+            return BulkOperationResponseMapper.create(count, dry_run)
+
+        changes = transaction_update.model_dump(exclude_none=True)
+        replaced = {}
+        if "description" in changes:
+            replaced = self.transaction_repository.get_matching_description_counts(
+                **arguments
+            )
+        count = self.transaction_repository.update_matching(**arguments, **changes)
+        if count and "description" in changes:
+            for description, uses in replaced.items():
+                self.autocomplete.forget(user_id, description, uses)
+            self.autocomplete.record(user_id, changes["description"], count)
+        return BulkOperationResponseMapper.create(count, dry_run)
+
+    def bulk_delete_transactions(
+        self, user_id: str, filters: TransactionFilters, dry_run: bool = False
+    ) -> BulkOperationResponseMapper:
+        """
+        Delete every transaction of the user matching the filters, with their
+        installments.
+
+        Parameters
+        ----------
+        user_id : str
+            The ID of the user that owns the transactions.
+        filters : TransactionFilters
+            The filters selecting the transactions to delete.
+        dry_run : bool
+            Only count the transactions that would be deleted.
+
+        Returns
+        -------
+        BulkOperationResponseMapper
+            The number of deleted transactions.
+
+        Raises
+        ------
+        InvalidFilter
+            If there are no filters or they are rejected by the transactions
+            whitelist.
+        """
+        arguments = self._bulk_arguments(user_id, filters)
+        if dry_run:
+            count = self.transaction_repository.count_matching(**arguments)
+        else:
+            count = self.transaction_repository.delete_matching(**arguments)
+        return BulkOperationResponseMapper.create(count, dry_run)
+
+    @staticmethod
+    def _bulk_arguments(user_id: str, filters: TransactionFilters) -> dict:
+        # virtual occurrences are not stored, so they cannot be updated or deleted
+        if filters.expand_fixed:
+            raise InvalidFilter("expand_fixed is not supported by bulk operations")
+        return dict(
+            user_id=user_id,
+            filters=filters.to_filters(),
+            or_groups=filters.to_or_groups(),
+            allow_unindexed=filters.allow_unindexed,
+            search=filters.search,
+        )
+
     def get_transactions(
         self,
         user_id: str,
@@ -256,19 +611,207 @@ class TransactionService:
         -------
         PaginatedTransactionResponseMapper
             A paginated list of filtered transactions.
+
+        Raises
+        ------
+        InvalidFilter
+            If the filters are rejected by the transactions whitelist, or if fixed
+            transactions are expanded without a bounded date range.
         """
-        paginated_transaction = self.transaction_repository.get_all(
-            user_id=user_id, filters=filters.model_dump(exclude_none=True)
-        ).paginate(pagination_params)
+        arguments = dict(
+            user_id=user_id,
+            filters=filters.to_filters(),
+            or_groups=filters.to_or_groups(),
+            allow_unindexed=filters.allow_unindexed,
+            search=filters.search,
+        )
+        if filters.expand_fixed:
+            paginated_transaction = (
+                self.transaction_repository.get_all_with_occurrences(**arguments)
+                .paginate(pagination_params)
+            )
+            items = [
+                TransactionViewMapper.create_occurrence(transaction, day, is_virtual)
+                for transaction, day, is_virtual in paginated_transaction.items
+            ]
+        else:
+            paginated_transaction = self.transaction_repository.get_all(
+                **arguments,
+                latest=pagination_params.page * pagination_params.size,
+            ).paginate(pagination_params)
+            items = paginated_transaction.items
 
         return PaginatedTransactionResponseMapper.create(
-            items=paginated_transaction.items,
+            items=items,
             page=paginated_transaction.page,
             pages=paginated_transaction.pages,
             size=paginated_transaction.size,
             total=paginated_transaction.total,
         )
 
+    def summarize_transactions(
+        self,
+        user_id: str,
+        params: TransactionSummaryParams,
+        filters: TransactionFilters,
+    ) -> TransactionSummaryResponseMapper:
+        """
+        Sum the user's transactions grouped by the requested dimensions.
+
+        Parameters
+        ----------
+        user_id : str
+            The ID of the user that owns the transactions.
+        params : TransactionSummaryParams
+            The dimensions to group by.
+        filters : TransactionFilters
+            The filters to be applied to the summarized transactions.
+
+        Returns
+        -------
+        TransactionSummaryResponseMapper
+            One total and count per group.
+
+        Raises
+        ------
+        InvalidFilter
+            If the filters or dimensions are invalid.
+        """
+        rows = self.transaction_repository.summarize(
+            user_id=user_id,
+            group_by=params.to_groups(),
+            filters=filters.to_filters(),
+            or_groups=filters.to_or_groups(),
+            allow_unindexed=filters.allow_unindexed,
+            search=filters.search,
+            expand_fixed=filters.expand_fixed,
+        )
+        return TransactionSummaryResponseMapper.create(rows)
+
+    def forecast_cash_flow(
+        self, user_id: str, months: int
+    ) -> CashFlowForecastResponseMapper:
+        """
+        Forecast the user's monthly inflow and outflow from the current month on.
+
+        Parameters
+        ----------
+        user_id : str
+            The ID of the user that owns the transactions.
+        months : int
+            Number of months to forecast.
+
+        Returns
+        -------
+        CashFlowForecastResponseMapper
+            Inflow, outflow and net of each month.
+        """
+        start = date.today().replace(day=1)
+        installments = self.transaction_repository.get_future_installments(
+            user_id, start
+        )
+        fixed_transactions = self.transaction_repository.get_fixed_transactions(
+            user_id
+        )
+        cash_flow = project_cash_flow(
+            start,
+            months,
+            *columns(installments, 3),
+            *columns(fixed_transactions, 3),
+        )
+        return CashFlowForecastResponseMapper.create(cash_flow)
+
+    def get_spend_analytics(
+        self, user_id: str, params: SpendAnalyticsParams
+    ) -> SpendAnalyticsResponseMapper:
+        """
+        Get the user's daily or weekly expenses per category with their rolling mean
+        and standard deviation, and the expenses that are outliers for their
+        category.
+
+        Parameters
+        ----------
+        user_id : str
+            The ID of the user that owns the transactions.
+        params : SpendAnalyticsParams
+            The range, bucket size, rolling window and outlier threshold.
+
+        Returns
+        -------
+        SpendAnalyticsResponseMapper
+            The spend series of each category and the outliers.
+
+        Raises
+        ------
+        InvalidFilter
+            If the range is invalid.
+        """
+        start, end = params.to_range()
+        rows = self.transaction_repository.get_spend_series(
+            user_id, start, end, params.period
+        )
+        spend = rolling_spend(
+            start, end, params.period, params.window, *columns(rows, 2)
+        )
+        outliers = self.transaction_repository.get_spend_outliers(
+            user_id, start, end, params.threshold
+        )
+        return SpendAnalyticsResponseMapper.create(
+            params.period, params.window, spend, outliers
+        )
+
+    def get_balance(
+        self, user_id: str, as_of: Optional[date] = None
+    ) -> BalanceResponseMapper:
+        """
+        Get the user's balance, revenues counted as positive and expenses as
+        negative. Credit card purchases are not part of it.
+
+        Parameters
+        ----------
+        user_id : str
+            The ID of the user that owns the transactions.
+        as_of : date, optional
+            The last day included in the balance, by default every transaction.
+
+        Returns
+        -------
+        BalanceResponseMapper
+            The total balance and the balance of each kind of transaction.
+        """
+        rows = self.transaction_repository.get_balance(user_id, as_of)
+        return BalanceResponseMapper.create(rows, as_of)
+
+    def autocomplete_descriptions(
+        self, user_id: str, prefix: str, limit: int
+    ) -> DescriptionSuggestionsResponseMapper:
+        """
+        Suggest descriptions from the user's past transactions.
+
+        Parameters
+        ----------
+        user_id : str
+            The ID of the user that owns the transactions.
+        prefix : str
+            The typed prefix, matched case-insensitively.
+        limit : int
+            Maximum number of suggestions.
+
+        Returns
+        -------
+        DescriptionSuggestionsResponseMapper
+            The descriptions starting with the prefix, most used first.
+        """
+        suggestions = self.autocomplete.suggest(
+            user_id,
+            prefix,
+            limit,
+            loader=lambda: self.transaction_repository.get_description_counts(
+                user_id
+            ),
+        )
+        return DescriptionSuggestionsResponseMapper.create(suggestions)
+
     def export_transactions(
         self, user_id: str, filters: TransactionFilters
     ) -> BytesIO:
@@ -288,6 +831,7 @@ class TransactionService:
 
         Raises
         ------
+            InvalidFilter: If the filters are rejected by the transactions whitelist.
             NoTransactionsFound: If no transactions were found for the provided filters.
             DataTransformationError: If an error occurs during data transformation.
             ExcelGenerationError: If an error occurs during the generation of the Excel
@@ -295,10 +839,12 @@ class TransactionService:
             Exception: For any other unexpected errors.
         """
         try:
-            filters_dict = filters.model_dump(exclude_none=True)
-
             transactions = self.transaction_repository.get_all(
-                user_id=user_id, filters=filters_dict
+                user_id=user_id,
+                filters=filters.to_filters(),
+                or_groups=filters.to_or_groups(),
+                allow_unindexed=filters.allow_unindexed,
+                search=filters.search,
             ).all()
 
             if not transactions:
@@ -316,6 +862,7 @@ class TransactionService:
             excel_file = ExcelExporter.export(dataframe_transactions)
             return excel_file
         except (
+            InvalidFilter,
             NoTransactionsFound,
             DataTransformationError,
             ExcelGenerationError,
@@ -331,8 +878,11 @@ class TransactionService:
             handler = CreditCardTransactionHandler(self.transaction_repository)
             return handler.process_transaction(transaction)
 
+        # only credit purchases are split into installments
         created_transaction = self.transaction_repository.create(
-            **transaction.model_dump(exclude_none=True)
+            **transaction.model_dump(
+                exclude_none=True, exclude={"installments_number"}
+            )
         )
 
         return created_transaction
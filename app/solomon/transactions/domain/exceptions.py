@@ -20,3 +20,15 @@ class NoTransactionsFound(Exception):
     """Transactions not found for filters"""
 
     pass
+
+
+class BudgetNotFound(Exception):
+    """Budget not found exception."""
+
+    pass
+
+
+class BudgetAlreadyExists(Exception):
+    """Budget already exists for the category exception."""
+
+    pass
@@ -1,14 +1,80 @@
+from datetime import date
+from typing import NamedTuple
 from uuid import uuid4
 
-from sqlalchemy import Boolean, Column, Date, Float, ForeignKey, Integer, String
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Computed,
+    Date,
+    Float,
+    ForeignKey,
+    ForeignKeyConstraint,
+    Index,
+    Integer,
+    PrimaryKeyConstraint,
+    String,
+    TypeDecorator,
+    UniqueConstraint,
+    and_,
+    text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR, UUID
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import operators
 
-from app.solomon.infrastructure.database import BaseModel
+from app.solomon.infrastructure.database import Base, BaseModel
+
+UNDATED = date.min
+"""Date stored in place of NULL by ``OptionalDate`` columns."""
+
+
+class OptionalDate(TypeDecorator):
+    """
+    Date that may be missing, stored as ``UNDATED`` in a NOT NULL column, e.g. for
+    a partition key.
+
+    ``None`` is written as ``UNDATED`` and ``UNDATED`` is read as ``None``.
+    Comparisons behave as if it was NULL: ``IS NULL`` tests for ``UNDATED`` and
+    ``UNDATED`` is not before any date. Expressions built on the column, such as
+    ``coalesce``, see the stored value.
+    """
+
+    impl = Date
+    cache_ok = True
+
+    class comparator_factory(Date.Comparator):
+        def operate(self, op, *other, **kwargs):
+            if other and other[0] is None:
+                if op in (operators.is_, operators.eq):
+                    return self.expr == UNDATED
+                if op in (operators.is_not, operators.ne):
+                    return self.expr != UNDATED
+
+            expression = super().operate(op, *other, **kwargs)
+            if op in (operators.lt, operators.le):
+                return and_(expression, self.expr != UNDATED)
+            return expression
+
+    def process_bind_param(self, value, dialect):
+        return UNDATED if value is None else value
+
+    def process_result_value(self, value, dialect):
+        return None if value == UNDATED else value
 
 
 class CreditCard(BaseModel):
-    """Credit card model"""
+    """
+    Credit card model
+
+    ``committed`` is the sum of the card's installments on invoices that are still
+    open, i.e. after ``closed_through``, the period of the last closed invoice. It
+    is kept up to date as installments are created and invoices close, so the
+    available limit is read without scanning the installments.
+
+    When ``alert_threshold`` is set, an alert is queued whenever a write makes the
+    committed amount reach that percentage of the limit.
+    """
 
     __tablename__ = "credit_cards"
 
@@ -20,6 +86,9 @@ class CreditCard(BaseModel):
     name = Column(String(50), nullable=False)
     limit = Column(Float, nullable=False)
     invoice_start_day = Column(Integer, nullable=False)
+    committed = Column(Float, nullable=False, default=0, server_default=text("0"))
+    closed_through = Column(Date, nullable=True)
+    alert_threshold = Column(Integer, nullable=True)
     transactions = relationship("Transaction", back_populates="credit_card")
 
 
@@ -33,17 +102,77 @@ class Category(BaseModel):
 
 
 class Transaction(BaseModel):
-    """Transaction model"""
+    """
+    Transaction model
+
+    Transactions materialized from a fixed transaction keep it as their
+    ``source_transaction_id`` and the month they occur in as their ``period``, at
+    most one per source and period.
+
+    Installments are stored either as ``Installment`` rows or, in the compact
+    storage mode, as a schedule on the transaction itself: ``installments_number``
+    monthly installments of ``installment_amount`` from ``date`` on, the last one
+    adding the ``installment_remainder``. Compact schedules are expanded into
+    installments when read.
+
+    The table is partitioned by month of ``date`` (see ``PartitionRepository``).
+    Unique constraints of a partitioned table must include the partition key, so
+    the primary key is (``id``, ``date``). Fixed transactions without a date are
+    stored with ``UNDATED``, in a partition of their own. The key is created by the
+    migration and ``id`` alone is the primary key of the mapping, as the unit of
+    work refuses to locate a row through a key column that reads as None.
+    ``source_transaction_id`` has no foreign key, as it does not hold the date of
+    the source.
+    """
 
     __tablename__ = "transactions"
+    __table_args__ = (
+        UniqueConstraint(
+            "source_transaction_id",
+            "period",
+            "date",
+            name="uq_transactions_source_transaction_id_period",
+        ),
+        Index("ix_transactions_user_id_date", "user_id", "date"),
+        Index("ix_transactions_user_id_category_id", "user_id", "category_id"),
+        Index("ix_transactions_user_id_credit_card_id", "user_id", "credit_card_id"),
+        Index(
+            "ix_transactions_credit_card_id_compact_installments",
+            "credit_card_id",
+            postgresql_where=text("installments_number IS NOT NULL"),
+        ),
+        Index(
+            "ix_transactions_search_vector", "search_vector", postgresql_using="gin"
+        ),
+        Index(
+            "ix_transactions_description_trgm",
+            "description",
+            postgresql_using="gin",
+            postgresql_ops={"description": "gin_trgm_ops"},
+        ),
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
+    __mapper_args__ = {"primary_key": ["id"]}
 
+    id = Column(UUID(as_uuid=False), nullable=False, default=uuid4)
     description = Column(String(50), nullable=False)
     amount = Column(Float, nullable=False)
     is_fixed = Column(Boolean, nullable=False, default=False)
     is_revenue = Column(Boolean, nullable=False, default=False)
-    date = Column(Date, nullable=True)
+    date = Column(
+        OptionalDate,
+        nullable=False,
+        server_default=text(f"'{UNDATED.isoformat()}'"),
+    )
     recurring_day = Column(Integer, nullable=True)
     kind = Column(String(20), nullable=False)
+    installments_number = Column(Integer, nullable=True)
+    installment_amount = Column(Float, nullable=True)
+    installment_remainder = Column(Float, nullable=True)
+    search_vector = Column(
+        TSVECTOR,
+        Computed("to_tsvector('simple', description)", persisted=True),
+    )
 
     installments = relationship(
         "Installment", back_populates="transaction", lazy="noload"
@@ -59,18 +188,277 @@ class Transaction(BaseModel):
     credit_card_id = Column(
         UUID(as_uuid=False), ForeignKey("credit_cards.id"), nullable=True
     )
+    source_transaction_id = Column(UUID(as_uuid=False), nullable=True)
+    period = Column(Date, nullable=True)
+
+
+class TransactionView(Base):
+    """
+    Transaction view model
+
+    Denormalized copy of the transactions as they are listed and exported, with the
+    description of their category and the name of their credit card flattened in.
+    It is a plain table kept in sync by triggers on ``transactions``,
+    ``categories`` and ``credit_cards``, created by the migration that adds it, so
+    it changes in the same database transaction as the rows it copies.
+
+    Every column is part of the index on (``user_id``, ``date``, ``id``), so a page
+    of a user's transactions is read with an index-only scan and no joins.
+    """
+
+    __tablename__ = "transaction_view"
+    __table_args__ = (
+        Index(
+            "ix_transaction_view_user_id_date_id",
+            "user_id",
+            "date",
+            "id",
+            postgresql_include=[
+                "description",
+                "amount",
+                "is_fixed",
+                "is_revenue",
+                "recurring_day",
+                "kind",
+                "category_id",
+                "category_description",
+                "credit_card_id",
+                "credit_card_name",
+                "source_transaction_id",
+            ],
+        ),
+    )
+
+    id = Column(UUID(as_uuid=False), primary_key=True)
+    user_id = Column(UUID(as_uuid=False), nullable=False)
+    description = Column(String(50), nullable=False)
+    amount = Column(Float, nullable=False)
+    is_fixed = Column(Boolean, nullable=False)
+    is_revenue = Column(Boolean, nullable=False)
+    date = Column(Date, nullable=True)
+    recurring_day = Column(Integer, nullable=True)
+    kind = Column(String(20), nullable=False)
+    category_id = Column(UUID(as_uuid=False), nullable=True)
+    category_description = Column(String(30), nullable=True)
+    credit_card_id = Column(UUID(as_uuid=False), nullable=True)
+    credit_card_name = Column(String(50), nullable=True)
+    source_transaction_id = Column(UUID(as_uuid=False), nullable=True)
 
 
 class Installment(BaseModel):
-    """Installment model"""
+    """
+    Installment model
+
+    Installments of credit card transactions carry the card and the invoice period
+    (first day of the invoice month) they are billed on, derived from their date and
+    the card's ``invoice_start_day``.
+
+    Like transactions, the table is partitioned by month of ``date``, with an
+    (``id``, ``date``) primary key. Installments reference the (``id``, ``date``)
+    key of their transaction, which follows the changes of the transaction date.
+    The foreign key is deferrable, so rows can be moved between partitions (see
+    ``PartitionRepository``).
+    """
 
     __tablename__ = "installments"
+    __table_args__ = (
+        PrimaryKeyConstraint("id", "date"),
+        ForeignKeyConstraint(
+            ["transaction_id", "transaction_date"],
+            ["transactions.id", "transactions.date"],
+            name="installments_transaction_id_fkey",
+            onupdate="CASCADE",
+            deferrable=True,
+        ),
+        Index(
+            "ix_installments_credit_card_id_invoice_period",
+            "credit_card_id",
+            "invoice_period",
+        ),
+        {"postgresql_partition_by": "RANGE (date)"},
+    )
+    __mapper_args__ = {"primary_key": ["id"]}
 
+    id = Column(UUID(as_uuid=False), default=uuid4)
     date = Column(Date, nullable=False)
     installment_number = Column(Integer, nullable=False)
     amount = Column(Float, nullable=False)
+    invoice_period = Column(Date, nullable=True)
 
-    transaction_id = Column(
-        UUID(as_uuid=False), ForeignKey("transactions.id"), nullable=False
-    )
+    transaction_id = Column(UUID(as_uuid=False), nullable=False, index=True)
+    transaction_date = Column(OptionalDate, nullable=False)
     transaction = relationship("Transaction", back_populates="installments")
+    credit_card_id = Column(
+        UUID(as_uuid=False), ForeignKey("credit_cards.id"), nullable=True
+    )
+
+
+class ArchivedTransaction(BaseModel):
+    """
+    Archived transaction model
+
+    Transactions older than the archive horizon are moved here, with the same
+    columns, by the archiving job (see ``TransactionRepository.archive``), so that
+    ``transactions`` and its indexes only hold the recent history. The archive is
+    read-only and only indexed for the listing of a user's transactions by date
+    and for the lookup of the occurrences materialized from fixed transactions.
+    """
+
+    __tablename__ = "transactions_archive"
+    __table_args__ = (
+        Index("ix_transactions_archive_user_id_date_id", "user_id", "date", "id"),
+        Index(
+            "ix_transactions_archive_source_transaction_id_period",
+            "source_transaction_id",
+            "period",
+        ),
+    )
+
+    description = Column(String(50), nullable=False)
+    amount = Column(Float, nullable=False)
+    is_fixed = Column(Boolean, nullable=False)
+    is_revenue = Column(Boolean, nullable=False)
+    date = Column(Date, nullable=True)
+    recurring_day = Column(Integer, nullable=True)
+    kind = Column(String(20), nullable=False)
+    installments_number = Column(Integer, nullable=True)
+    installment_amount = Column(Float, nullable=True)
+    installment_remainder = Column(Float, nullable=True)
+    search_vector = Column(
+        TSVECTOR,
+        Computed("to_tsvector('simple', description)", persisted=True),
+    )
+
+    category_id = Column(UUID(as_uuid=False), ForeignKey("categories.id"))
+    user_id = Column(UUID(as_uuid=False), ForeignKey("users.id"), nullable=False)
+    credit_card_id = Column(
+        UUID(as_uuid=False), ForeignKey("credit_cards.id"), nullable=True
+    )
+    source_transaction_id = Column(UUID(as_uuid=False), nullable=True)
+    period = Column(Date, nullable=True)
+
+
+class ArchivedInstallment(BaseModel):
+    """
+    Archived installment model
+
+    Installments of the archived transactions, compact schedules included, which
+    are expanded into rows when archived. Indexed like ``installments`` for the
+    invoices of a credit card.
+    """
+
+    __tablename__ = "installments_archive"
+    __table_args__ = (
+        Index(
+            "ix_installments_archive_credit_card_id_invoice_period",
+            "credit_card_id",
+            "invoice_period",
+        ),
+    )
+
+    date = Column(Date, nullable=False)
+    installment_number = Column(Integer, nullable=False)
+    amount = Column(Float, nullable=False)
+    invoice_period = Column(Date, nullable=True)
+
+    transaction_id = Column(UUID(as_uuid=False), nullable=False, index=True)
+    transaction_date = Column(Date, nullable=False)
+    credit_card_id = Column(
+        UUID(as_uuid=False), ForeignKey("credit_cards.id"), nullable=True
+    )
+
+
+class InstallmentSchedule(NamedTuple):
+    """Installments of a transaction, all of ``amount`` but the last one."""
+
+    first_date: date
+    number: int
+    amount: float
+    remainder: float
+
+
+# unique indexes treat NULLs as distinct, so uncategorized rows are keyed on nil
+ROLLUP_CATEGORY_KEY = (
+    "coalesce(category_id, '00000000-0000-0000-0000-000000000000'::uuid)"
+)
+
+
+class MonthlyRollup(BaseModel):
+    """
+    Monthly rollup model
+
+    Sum and count of a user's transaction entries per month, category, kind and
+    revenue/expense. Installments count in the month they fall due.
+    """
+
+    __tablename__ = "monthly_rollups"
+    __table_args__ = (
+        Index(
+            "uq_monthly_rollups_key",
+            "user_id",
+            "month",
+            text(ROLLUP_CATEGORY_KEY),
+            "kind",
+            "is_revenue",
+            unique=True,
+        ),
+    )
+
+    user_id = Column(UUID(as_uuid=False), ForeignKey("users.id"), nullable=False)
+    month = Column(Date, nullable=False)
+    category_id = Column(UUID(as_uuid=False), ForeignKey("categories.id"))
+    kind = Column(String(20), nullable=False)
+    is_revenue = Column(Boolean, nullable=False)
+    total = Column(Float, nullable=False, default=0)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class Balance(BaseModel):
+    """
+    Balance model
+
+    Running balance of a user's transactions of one kind, revenues counted as
+    positive and expenses as negative. Credit card purchases are not part of the
+    balance until their invoices are paid, so there is no row for them. It is kept
+    up to date as transactions are written, like the monthly rollups.
+    """
+
+    __tablename__ = "balances"
+    __table_args__ = (
+        UniqueConstraint("user_id", "kind", name="uq_balances_user_id_kind"),
+    )
+
+    user_id = Column(UUID(as_uuid=False), ForeignKey("users.id"), nullable=False)
+    kind = Column(String(20), nullable=False)
+    total = Column(Float, nullable=False, default=0)
+
+
+class Budget(BaseModel):
+    """
+    Budget model
+
+    Monthly spending limit of a user for a category. The spending is read from the
+    monthly rollups, which are incremented as transactions are written, so checking
+    a budget never sums the transactions themselves.
+
+    An alert is queued the first time a write makes the spending of a month reach
+    ``alert_threshold`` percent of the amount.
+    """
+
+    __tablename__ = "budgets"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "category_id", name="uq_budgets_user_id_category_id"
+        ),
+    )
+
+    user_id = Column(UUID(as_uuid=False), ForeignKey("users.id"), nullable=False)
+    category_id = Column(
+        UUID(as_uuid=False), ForeignKey("categories.id"), nullable=False
+    )
+    amount = Column(Float, nullable=False)
+    alert_threshold = Column(
+        Integer, nullable=False, default=100, server_default=text("100")
+    )
+
+    category = relationship("Category")
@@ -1,3 +1,4 @@
+from datetime import date, timedelta
 from enum import Enum
 
 
@@ -7,3 +8,31 @@ class Kinds(str, Enum):
     TRANSFER = "transfer"
     PIX = "pix"
     CASH = "cash"
+
+
+class SummaryGroups(str, Enum):
+    MONTH = "month"
+    CATEGORY = "category"
+    KIND = "kind"
+    CREDIT_CARD = "credit_card"
+    IS_REVENUE = "is_revenue"
+
+
+class InstallmentStorage(str, Enum):
+    ROWS = "rows"
+    COMPACT = "compact"
+
+
+class AnalyticsPeriods(str, Enum):
+    DAY = "day"
+    WEEK = "week"
+
+    @property
+    def days(self) -> int:
+        return 7 if self is AnalyticsPeriods.WEEK else 1
+
+    def first_bucket(self, start: date) -> date:
+        """First day of the bucket containing ``start``, weeks starting on Monday."""
+        if self is AnalyticsPeriods.WEEK:
+            return start - timedelta(days=start.weekday())
+        return start
@@ -1,21 +1,347 @@
 """Transactions Repositories Module"""
 
-from typing import List, TypeVar
+import re
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple, TypeVar
 
-from sqlalchemy.orm import joinedload
+from sqlalchemy import (
+    Date,
+    DateTime,
+    Float,
+    Integer,
+    Interval,
+    Numeric,
+    Row,
+    Select,
+    Subquery,
+    and_,
+    case,
+    cast,
+    column,
+    delete,
+    false,
+    func,
+    literal,
+    literal_column,
+    or_,
+    select,
+    text,
+    true,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects.postgresql import UUID, aggregate_order_by, insert
+from sqlalchemy.orm import aliased
+from sqlalchemy.orm.attributes import set_committed_value
 from sqlalchemy.orm.session import Session
 from sqlalchemy.sql import desc
+from sqlalchemy.sql.elements import ColumnElement
 
+from app.solomon.alerts.domain.options import AlertTypes
+from app.solomon.alerts.infrastructure.repositories import AlertRepository
+from app.solomon.common.exceptions import InvalidFilter
 from app.solomon.infrastructure.database import CustomQuery
+from app.solomon.infrastructure.filters import FilterWhitelist
 from app.solomon.transactions.domain.models import (
+    ROLLUP_CATEGORY_KEY,
+    ArchivedInstallment,
+    ArchivedTransaction,
+    Balance,
+    Budget,
     Category,
     CreditCard,
     Installment,
+    InstallmentSchedule,
+    UNDATED,
+    MonthlyRollup,
     Transaction,
+    TransactionView,
+)
+from app.solomon.transactions.domain.options import (
+    AnalyticsPeriods,
+    Kinds,
+    SummaryGroups,
 )
 
 T = TypeVar("T")
 
+SEARCH_CONFIG = "simple"
+
+RANGE_OPERATORS = {"gt", "lt", "gte", "lte", "between"}
+
+TRANSACTION_FILTERS = FilterWhitelist(
+    Transaction,
+    {
+        "date": RANGE_OPERATORS,
+        "amount": RANGE_OPERATORS,
+        "category_id": {"eq", "in"},
+        "credit_card_id": {"eq", "in"},
+        "kind": {"eq", "in"},
+        "is_fixed": {"eq"},
+        "is_revenue": {"eq"},
+    },
+)
+
+TRANSACTION_VIEW_COLUMNS = {
+    field: getattr(TransactionView, field) for field in TRANSACTION_FILTERS.fields
+}
+"""Columns of ``transaction_view`` that ``TRANSACTION_FILTERS`` filter on."""
+
+ARCHIVE_COLUMNS = {
+    field: getattr(ArchivedTransaction, field) for field in TRANSACTION_FILTERS.fields
+}
+"""Columns of ``transactions_archive`` that ``TRANSACTION_FILTERS`` filter on."""
+
+ROLLUP_GROUPS = {
+    SummaryGroups.MONTH,
+    SummaryGroups.CATEGORY,
+    SummaryGroups.KIND,
+    SummaryGroups.IS_REVENUE,
+}
+
+ROLLUP_FILTER_FIELDS = {"date", "category_id", "kind", "is_revenue"}
+
+MAX_EXPANDED_MONTHS = 120
+
+TRANSACTION_COLUMNS = [column.name for column in Transaction.__table__.columns]
+
+INSTALLMENT_COLUMNS = [
+    "id",
+    "created_at",
+    "updated_at",
+    "date",
+    "installment_number",
+    "amount",
+    "invoice_period",
+    "transaction_id",
+    "transaction_date",
+    "credit_card_id",
+]
+"""Columns of the installments, in the order ``installment_source`` selects them."""
+
+
+def invoice_period(
+    entry_date: ColumnElement, invoice_start_day: Any
+) -> ColumnElement:
+    """
+    SQL expression for the invoice period of an entry: the first day of its month
+    when it falls before the card's ``invoice_start_day``, otherwise the first day of
+    the next month.
+    """
+    month = func.date_trunc("month", cast(entry_date, DateTime))
+    return cast(
+        case(
+            (
+                func.extract("day", entry_date) >= invoice_start_day,
+                month + literal_column("INTERVAL '1 month'", Interval),
+            ),
+            else_=month,
+        ),
+        Date,
+    )
+
+
+def money(amount: ColumnElement) -> ColumnElement:
+    """Round an amount to cents, so that counters do not accumulate float error."""
+    return cast(func.round(cast(amount, Numeric), 2), Float)
+
+
+def expand_schedule(
+    first_date: Any,
+    number_of_installments: Any,
+    amount: Any,
+    remainder: Any,
+    invoice_start_day: Any,
+) -> Tuple[Any, Dict[str, ColumnElement]]:
+    """
+    Expand an installment schedule into one row per installment with
+    ``generate_series``, following the rules of ``InstallmentHandler``: the date
+    moves one month per installment from the first date, the last installment adds
+    the remainder and the invoice period is derived from the credit card's
+    ``invoice_start_day``, if there is a card.
+
+    The schedule may be given as columns or as values.
+
+    Returns
+    -------
+    Tuple[Any, Dict[str, ColumnElement]]
+        The installment numbers, to be joined (on ``true``) in the FROM clause, and
+        the ``number``, ``date``, ``amount`` and ``invoice_period`` of each
+        installment.
+    """
+    numbers = (
+        func.generate_series(1, number_of_installments)
+        .table_valued(column("number", Integer))
+        .render_derived(name="numbers")
+    )
+    number = numbers.c.number
+    installment_date = cast(
+        cast(first_date, DateTime)
+        + literal_column("INTERVAL '1 month'", Interval) * (number - 1),
+        Date,
+    )
+    return numbers, {
+        "number": number,
+        "date": installment_date,
+        "amount": money(
+            amount + case((number == number_of_installments, remainder), else_=0)
+        ),
+        "invoice_period": case(
+            (invoice_start_day.is_(None), None),
+            else_=invoice_period(installment_date, invoice_start_day),
+        ),
+    }
+
+
+def installment_source(archived: bool = False) -> Subquery:
+    """
+    Every installment, whether stored as an ``Installment`` row or as a compact
+    schedule on its transaction, and the archived installments when ``archived``.
+
+    Compact schedules are expanded with ``expand_schedule`` into rows with the same
+    columns as the ``installments`` table. Expanded installments get a
+    deterministic ID built from the transaction ID and the installment number.
+    """
+    models = (Installment, ArchivedInstallment) if archived else (Installment,)
+    stored = [
+        select(*(model.__table__.c[name] for name in INSTALLMENT_COLUMNS))
+        for model in models
+    ]
+
+    credit_card = aliased(CreditCard)
+    numbers, installment = expand_schedule(
+        Transaction.date,
+        Transaction.installments_number,
+        Transaction.installment_amount,
+        Transaction.installment_remainder,
+        credit_card.invoice_start_day,
+    )
+    expanded = (
+        select(
+            cast(
+                func.md5(func.concat(Transaction.id, "-", installment["number"])),
+                UUID(as_uuid=False),
+            ).label("id"),
+            Transaction.created_at,
+            Transaction.updated_at,
+            installment["date"].label("date"),
+            installment["number"].label("installment_number"),
+            installment["amount"].label("amount"),
+            installment["invoice_period"].label("invoice_period"),
+            Transaction.id.label("transaction_id"),
+            Transaction.date.label("transaction_date"),
+            Transaction.credit_card_id,
+        )
+        .select_from(Transaction)
+        .join(numbers, true())
+        .outerjoin(credit_card, credit_card.id == Transaction.credit_card_id)
+        .where(Transaction.installments_number.is_not(None))
+    )
+    return union_all(*stored, expanded).subquery("installment_entries")
+
+
+def ledger_source() -> Subquery:
+    """
+    Every transaction, whether in ``transactions`` or in ``transactions_archive``,
+    for the reads that cover the whole history of the users.
+    """
+    return union_all(
+        *(
+            select(*(model.__table__.c[name] for name in TRANSACTION_COLUMNS))
+            for model in (Transaction, ArchivedTransaction)
+        )
+    ).subquery("ledger")
+
+
+ExpandedInstallment = aliased(Installment, installment_source())
+"""``Installment`` mapped to ``installment_source``, for reading installments."""
+
+LedgerTransaction = aliased(Transaction, ledger_source())
+"""``Transaction`` mapped to ``ledger_source``, for reading archived ones too."""
+
+LedgerInstallment = aliased(Installment, installment_source(archived=True))
+"""``Installment`` mapped to ``installment_source`` with the archived ones."""
+
+
+def entry_date(
+    installment: Any = ExpandedInstallment, transaction: Any = Transaction
+) -> ColumnElement:
+    """
+    SQL expression for the date of an entry: the date of its installment, if any,
+    otherwise the date of its transaction, NULL for undated fixed transactions.
+    """
+    return func.coalesce(installment.date, func.nullif(transaction.date, UNDATED))
+
+
+def signed(
+    amount: ColumnElement, is_revenue: ColumnElement = Transaction.is_revenue
+) -> ColumnElement:
+    """An amount counted as positive for revenues and negative for expenses."""
+    return case((is_revenue, amount), else_=-amount)
+
+
+def last_closed_period(today: date, invoice_start_day: Any) -> ColumnElement:
+    """SQL expression for the period of the last invoice closed by ``today``."""
+    return cast(
+        invoice_period(literal(today, Date), invoice_start_day)
+        - literal_column("INTERVAL '1 month'", Interval),
+        Date,
+    )
+
+
+def occurrence_date(month: ColumnElement) -> ColumnElement:
+    """
+    SQL expression for the date a fixed transaction occurs on in ``month`` (its
+    first day): the ``recurring_day``, or the last day of shorter months.
+    """
+    days_in_month = cast(
+        func.extract(
+            "day",
+            cast(month, DateTime) + literal_column("INTERVAL '1 month - 1 day'"),
+        ),
+        Integer,
+    )
+    return month + (func.least(Transaction.recurring_day, days_in_month) - 1)
+
+
+def is_occurring(occurrence: ColumnElement) -> List[ColumnElement[bool]]:
+    """Whether a transaction is fixed and already started on the occurrence date."""
+    return [
+        Transaction.is_fixed.is_(True),
+        Transaction.recurring_day.is_not(None),
+        or_(Transaction.date.is_(None), occurrence >= Transaction.date),
+    ]
+
+
+def is_materialized(
+    month: ColumnElement, archived: bool = False
+) -> ColumnElement[bool]:
+    """
+    Whether a fixed transaction was materialized in ``month``, looking for the
+    materialized transaction in the archive as well when ``archived``.
+    """
+    materialized = aliased(Transaction)
+    models = (materialized, ArchivedTransaction) if archived else (materialized,)
+    return or_(
+        *(
+            select(model.id)
+            .where(
+                model.source_transaction_id == Transaction.id,
+                model.period == month,
+            )
+            .exists()
+            for model in models
+        )
+    )
+
+
+def is_open_installment() -> ColumnElement[bool]:
+    """Whether an installment is billed on an open invoice of its credit card."""
+    return or_(
+        CreditCard.closed_through.is_(None),
+        ExpandedInstallment.invoice_period > CreditCard.closed_through,
+    )
+
 
 class CategoryRepository:
     """Categories repository. It is used to interact with the database."""
@@ -25,11 +351,13 @@ class CategoryRepository:
 
     def get_all(self) -> List[Category]:
         """Get all Credit Cards."""
-        return self.session.query(Category).all()
+        return list(self.session.scalars(select(Category)).all())
 
     def get_by_id(self, credit_card_id: str) -> Category | None:
         """Get a Credit Card by id."""
-        return self.session.query(Category).filter_by(id=credit_card_id).first()
+        return self.session.scalars(
+            select(Category).where(Category.id == credit_card_id)
+        ).first()
 
 
 class CreditCardRepository:
@@ -41,21 +369,19 @@ class CreditCardRepository:
     def get_all(self, user_id: str, **kwargs: dict) -> List[CreditCard]:
         """Get all Credit Cards."""
 
-        return (
-            self.session.query(CreditCard)
-            .filter_by(user_id=user_id, **kwargs)
-            .all()
+        return list(
+            self.session.scalars(
+                select(CreditCard).filter_by(user_id=user_id, **kwargs)
+            ).all()
         )
 
     def get_by_id(self, credit_card_id: str, user_id: str) -> CreditCard | None:
         """Get a Credit Card by id."""
-        return (
-            self.session.query(CreditCard)
-            .filter(
+        return self.session.scalars(
+            select(CreditCard).where(
                 CreditCard.id == credit_card_id, CreditCard.user_id == user_id
             )
-            .first()
-        )
+        ).first()
 
     def commit(self):
         """Commit the current transaction."""
@@ -69,12 +395,171 @@ class CreditCardRepository:
         return instance
 
     def update(self, credit_card: CreditCard, **kwargs) -> CreditCard:
-        """Update a Credit Card."""
+        """
+        Update a Credit Card.
+
+        When ``invoice_start_day`` changes, the invoice periods of the card's
+        installments, archived ones included, the last closed invoice and so its
+        committed amount are recomputed in the same transaction.
+        """
+        start_day_changed = (
+            kwargs.get("invoice_start_day", credit_card.invoice_start_day)
+            != credit_card.invoice_start_day
+        )
         for key, value in kwargs.items():
             setattr(credit_card, key, value)
+        if start_day_changed:
+            self._update_invoice_periods(credit_card)
+            self._update_closed_through(credit_card, date.today())
+            self._reconcile_committed(CreditCard.id == credit_card.id)
         self.commit()
         return credit_card
 
+    def _update_invoice_periods(self, credit_card: CreditCard) -> None:
+        for model in (Installment, ArchivedInstallment):
+            self.session.execute(
+                update(model)
+                .where(model.credit_card_id == credit_card.id)
+                .values(
+                    invoice_period=invoice_period(
+                        model.date, credit_card.invoice_start_day
+                    )
+                )
+                .execution_options(synchronize_session=False)
+            )
+
+    def _update_closed_through(self, credit_card: CreditCard, today: date) -> None:
+        # a card whose invoices were never closed is left to close_invoices
+        self.session.execute(
+            update(CreditCard)
+            .where(
+                CreditCard.id == credit_card.id, CreditCard.closed_through.is_not(None)
+            )
+            .values(
+                closed_through=last_closed_period(today, credit_card.invoice_start_day)
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    def close_invoices(self, user_ids: List[str], today: date) -> int:
+        """
+        Release from the committed amount of the given users' credit cards the
+        installments of the invoices closed by ``today``.
+
+        Returns
+        -------
+        int
+            The number of credit cards with newly closed invoices.
+        """
+        closed_through = last_closed_period(today, CreditCard.invoice_start_day)
+        released = (
+            select(func.coalesce(func.sum(ExpandedInstallment.amount), 0))
+            .where(
+                ExpandedInstallment.credit_card_id == CreditCard.id,
+                is_open_installment(),
+                ExpandedInstallment.invoice_period <= closed_through,
+            )
+            .scalar_subquery()
+        )
+        result = self.session.execute(
+            update(CreditCard)
+            .where(
+                CreditCard.user_id.in_(user_ids),
+                or_(
+                    CreditCard.closed_through.is_(None),
+                    CreditCard.closed_through < closed_through,
+                ),
+            )
+            .values(
+                committed=money(CreditCard.committed - released),
+                closed_through=closed_through,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    def reconcile_committed(self, user_ids: List[str]) -> List[str]:
+        """
+        Recompute the committed amount of the given users' credit cards from their
+        open installments, correcting the ones that drifted.
+
+        Returns
+        -------
+        List[str]
+            The IDs of the credit cards that were corrected.
+        """
+        return self._reconcile_committed(CreditCard.user_id.in_(user_ids))
+
+    def _reconcile_committed(self, where: ColumnElement[bool]) -> List[str]:
+        expected = (
+            select(
+                CreditCard.id,
+                money(func.coalesce(func.sum(ExpandedInstallment.amount), 0)).label(
+                    "committed"
+                ),
+            )
+            .outerjoin(
+                ExpandedInstallment,
+                and_(
+                    ExpandedInstallment.credit_card_id == CreditCard.id,
+                    is_open_installment(),
+                ),
+            )
+            .where(where)
+            .group_by(CreditCard.id)
+            .subquery()
+        )
+        return list(
+            self.session.scalars(
+                update(CreditCard)
+                .where(
+                    CreditCard.id == expected.c.id,
+                    func.abs(CreditCard.committed - expected.c.committed) >= 0.01,
+                )
+                .values(committed=expected.c.committed)
+                .returning(CreditCard.id)
+                .execution_options(synchronize_session=False)
+            )
+        )
+
+    def get_invoice_installments(
+        self, credit_card_id: str, period: date
+    ) -> List[Installment]:
+        """
+        Get the installments billed on a credit card's invoice for a period, with
+        their transactions.
+
+        Invoices of archived periods are read from ``LedgerInstallment`` and
+        ``LedgerTransaction``. The last archived period of the card is read from the
+        index on (``credit_card_id``, ``invoice_period``) of
+        ``installments_archive``, so recent invoices never scan the archive.
+        """
+        archived_through = self.session.scalar(
+            select(func.max(ArchivedInstallment.invoice_period)).where(
+                ArchivedInstallment.credit_card_id == credit_card_id
+            )
+        )
+        installment, transaction = (
+            (LedgerInstallment, LedgerTransaction)
+            if archived_through is not None and period <= archived_through
+            else (ExpandedInstallment, Transaction)
+        )
+        rows = self.session.execute(
+            select(installment, transaction)
+            .join(transaction, transaction.id == installment.transaction_id)
+            .where(
+                installment.credit_card_id == credit_card_id,
+                installment.invoice_period == period,
+            )
+            .order_by(installment.date, installment.installment_number)
+        )
+
+        installments = []
+        for billed, billed_transaction in rows:
+            set_committed_value(billed, "transaction", billed_transaction)
+            installments.append(billed)
+        return installments
+
     def delete(self, credit_card: CreditCard) -> CreditCard:
         """Delete a Credit Card."""
         self.session.delete(credit_card)
@@ -82,11 +567,101 @@ class CreditCardRepository:
         return credit_card
 
 
+class BudgetRepository:
+    """Budgets repository. It is used to interact with the database."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def commit(self):
+        """Commit the current transaction."""
+        self.session.commit()
+
+    def get_by_id(self, budget_id: str, user_id: str) -> Budget | None:
+        """Get a Budget by id."""
+        return self.session.scalars(
+            select(Budget).where(Budget.id == budget_id, Budget.user_id == user_id)
+        ).first()
+
+    def get_by_category(self, category_id: str, user_id: str) -> Budget | None:
+        """Get the Budget of a user for a category."""
+        return self.session.scalars(
+            select(Budget).where(
+                Budget.category_id == category_id, Budget.user_id == user_id
+            )
+        ).first()
+
+    def get_statuses(
+        self, user_id: str, month: date, budget_id: Optional[str] = None
+    ) -> List[Row]:
+        """
+        Get a user's budgets with their spending in a month.
+
+        The spending is the sum of the expenses of the budget's category in the
+        monthly rollups, at most one row per kind of transaction, so it does not
+        depend on how many transactions the user has.
+
+        Parameters
+        ----------
+        user_id : str
+            The ID of the user that owns the budgets.
+        month : date
+            The first day of the month.
+        budget_id : str, optional
+            Get only this budget.
+
+        Returns
+        -------
+        List[Row]
+            The ``Budget`` and its ``spent`` amount, oldest budgets first.
+        """
+        spent = money(func.coalesce(func.sum(MonthlyRollup.total), 0))
+        statement = (
+            select(Budget, spent.label("spent"))
+            .outerjoin(
+                MonthlyRollup,
+                and_(
+                    MonthlyRollup.user_id == Budget.user_id,
+                    MonthlyRollup.month == month,
+                    MonthlyRollup.category_id == Budget.category_id,
+                    MonthlyRollup.is_revenue.is_(False),
+                ),
+            )
+            .where(Budget.user_id == user_id)
+            .group_by(Budget.id)
+            .order_by(Budget.created_at, Budget.id)
+        )
+        if budget_id is not None:
+            statement = statement.where(Budget.id == budget_id)
+        return list(self.session.execute(statement))
+
+    def create(self, **kwargs) -> Budget:
+        """Create a new Budget."""
+        instance = Budget(**kwargs)
+        self.session.add(instance)
+        self.commit()
+        return instance
+
+    def update(self, budget: Budget, **kwargs) -> Budget:
+        """Update a Budget."""
+        for key, value in kwargs.items():
+            setattr(budget, key, value)
+        self.commit()
+        return budget
+
+    def delete(self, budget: Budget) -> Budget:
+        """Delete a Budget."""
+        self.session.delete(budget)
+        self.commit()
+        return budget
+
+
 class TransactionRepository:
     """Transactions repository. It is used to interact with the database."""
 
     def __init__(self, session: Session):
         self.session = session
+        self.alerts = AlertRepository(session)
 
     def commit(self):
         """Commit the current transaction."""
@@ -96,48 +671,1819 @@ class TransactionRepository:
         """Rollback the current transaction."""
         self.session.rollback()
 
-    def get_all(self, user_id: str, filters: dict) -> CustomQuery[Transaction]:
-        """Get all transactions based on specified filters."""
-        custom_query = CustomQuery(entities=Transaction, session=self.session)
+    def get_all(
+        self,
+        user_id: str,
+        filters: dict,
+        or_groups: Optional[List[List[Tuple[str, Any]]]] = None,
+        allow_unindexed: bool = False,
+        search: Optional[str] = None,
+        latest: Optional[int] = None,
+    ) -> CustomQuery[TransactionView]:
+        """
+        Get all transactions based on specified filters, as they are listed.
+
+        The transactions are read from ``transaction_view``, latest first, in the
+        order of its index on (``user_id``, ``date``, ``id``), which also holds every
+        listed column, so a page is served without joins.
+
+        The filters and OR groups are validated against ``TRANSACTION_FILTERS``, which
+        raises ``InvalidFilter`` for fields or operators that are not allowed.
+
+        When ``search`` is given, only transactions whose description matches it are
+        returned, ranked by relevance. The view is then joined with ``transactions``
+        for the search indexes. See ``_search_criteria``.
+
+        When the date range reaches back to the user's archived transactions, the
+        matching ones are read from ``transactions_archive`` as well, and both are
+        sorted and paginated together. See ``_archived_through``. When only the
+        ``latest`` transactions are read, e.g. up to the end of the requested page,
+        and they are all listed before the archived ones, they are read from the view
+        alone and the archive is only counted for the total.
+        """
+        query = select(TransactionView).where(
+            *self._view_criteria(user_id, filters, or_groups, allow_unindexed, search)
+        )
+        view, rank = TransactionView, None
+
+        if search:
+            match, rank = self._search_criteria(search)
+            query = query.join(
+                Transaction, Transaction.id == TransactionView.id
+            ).where(match)
+
+        lower, _ = self._date_bounds(filters)
+        archived_through = self._archived_through(user_id)
+        count = None
+        if archived_through is not None and (
+            lower is None or lower <= archived_through
+        ):
+            archived = self._archived_view(
+                user_id, filters, or_groups, allow_unindexed, search
+            )
+            if search:
+                query = query.add_columns(rank.label("rank"))
+            listing = union_all(query, archived).subquery("listing")
+            if not search and self._listed_before(query, archived_through, latest):
+                count = select(func.count()).select_from(listing)
+            else:
+                view = aliased(TransactionView, listing)
+                rank = listing.c.rank if search else None
+                query = select(view)
+
+        order = [desc(view.date), desc(view.id)]
+        if rank is not None:
+            order.insert(0, desc(rank))
+
+        return CustomQuery(self.session, query.order_by(*order), count)
+
+    def get_all_with_occurrences(
+        self,
+        user_id: str,
+        filters: dict,
+        or_groups: Optional[List[List[Tuple[str, Any]]]] = None,
+        allow_unindexed: bool = False,
+        search: Optional[str] = None,
+    ) -> CustomQuery[Row]:
+        """
+        Get all transactions, with fixed transactions expanded into their
+        occurrences in the requested date range.
+
+        Each row holds the transaction, as listed in ``transaction_view``, the date it
+        is listed on and whether it is a virtual occurrence of a fixed transaction.
+        The occurrences are generated by the query itself and sorted and paginated
+        together with the other transactions. See ``_occurrences``. Archived
+        transactions are included as in ``get_all``.
+
+        Parameters
+        ----------
+        user_id, filters, or_groups, allow_unindexed, search
+            Same as ``get_all``.
+
+        Returns
+        -------
+        CustomQuery[Row]
+            The query for the (TransactionView, date, is_virtual) rows.
+
+        Raises
+        ------
+        InvalidFilter
+            If the filters are rejected or do not bound the date range.
+        """
+        lower, _ = self._date_bounds(filters)
+        archived = self._reaches_archive(user_id, lower)
+        criteria = self._criteria(user_id, filters, or_groups, allow_unindexed, search)
+        occurrence, months, occurrence_criteria = self._occurrences(
+            user_id, filters, or_groups, allow_unindexed, search, archived
+        )
+        ranks = []
+        if search:
+            _, rank = self._search_criteria(search)
+            ranks.append(rank.label("rank"))
+
+        regular = select(
+            Transaction.id, Transaction.date, false().label("is_virtual"), *ranks
+        ).where(*criteria, Transaction.is_fixed.is_(False))
+        virtual = (
+            select(Transaction.id, occurrence.label("date"), true(), *ranks)
+            .select_from(Transaction)
+            .join(months, true())
+            .where(*occurrence_criteria)
+        )
+        branches = [regular, virtual]
+
+        view = TransactionView
+        if archived:
+            archived_ranks = []
+            if search:
+                _, rank = self._search_criteria(search, ArchivedTransaction)
+                archived_ranks.append(rank)
+            branches.append(
+                select(
+                    ArchivedTransaction.id,
+                    ArchivedTransaction.date,
+                    false(),
+                    *archived_ranks,
+                ).where(
+                    *self._archive_criteria(
+                        user_id, filters, or_groups, allow_unindexed, search
+                    ),
+                    ArchivedTransaction.is_fixed.is_(False),
+                )
+            )
+            view = aliased(
+                TransactionView,
+                union_all(
+                    select(TransactionView).where(TransactionView.user_id == user_id),
+                    self._archived_view(user_id, {}, None, True, None),
+                ).subquery("listing"),
+            )
+        entries = union_all(*branches).subquery("entries")
+
+        order = [desc(entries.c.date), view.id]
+        if search:
+            order.insert(0, desc(entries.c.rank))
+
+        return CustomQuery(
+            self.session,
+            select(view, entries.c.date, entries.c.is_virtual)
+            .join(entries, entries.c.id == view.id)
+            .order_by(*order),
+        )
+
+    def _occurrences(
+        self,
+        user_id: str,
+        filters: dict,
+        or_groups: Optional[List[List[Tuple[str, Any]]]],
+        allow_unindexed: bool,
+        search: Optional[str],
+        archived: bool = False,
+    ) -> Tuple[ColumnElement, Any, List[ColumnElement[bool]]]:
+        """
+        Expand fixed transactions into one occurrence per month of the date range.
+
+        The months come from ``generate_series`` over the range and each fixed
+        transaction occurs on its ``recurring_day`` of every month (the last day for
+        shorter months), from the month of its date on, if it has one. Months in
+        which the occurrence was materialized as a transaction are skipped, since
+        that transaction is listed instead, looking for it in the archive as well
+        when ``archived``. The filters apply to the occurrence date instead of the
+        transaction date.
+
+        Returns
+        -------
+        Tuple[ColumnElement, Any, List[ColumnElement[bool]]]
+            The occurrence date, the months to join the transactions with (on
+            ``true``) and the criteria selecting the occurrences.
+        """
+        lower, upper = self._expansion_range(filters)
+        months = (
+            func.generate_series(
+                cast(lower.replace(day=1), DateTime),
+                cast(upper, DateTime),
+                literal_column("INTERVAL '1 month'", Interval),
+            )
+            .table_valued(column("month", DateTime))
+            .render_derived(name="months")
+        )
+        month = cast(months.c.month, Date)
+        occurrence = occurrence_date(month)
+
+        criteria = self._criteria(
+            user_id, filters, or_groups, allow_unindexed, search, {"date": occurrence}
+        )
+        criteria += [
+            *is_occurring(occurrence),
+            ~is_materialized(month, archived),
+        ]
+        return occurrence, months, criteria
+
+    @classmethod
+    def _expansion_range(cls, filters: dict) -> Tuple[date, date]:
+        """
+        First and last day selected by the date filters.
+
+        Raises
+        ------
+        InvalidFilter
+            If the range is not bounded on both sides or spans too many months.
+        """
+        lower, upper = cls._date_bounds(filters)
+        if lower is None or upper is None:
+            raise InvalidFilter(
+                "'expand_fixed' needs a date range with a lower and an upper bound"
+            )
+
+        months = (upper.year - lower.year) * 12 + upper.month - lower.month + 1
+        if months > MAX_EXPANDED_MONTHS:
+            raise InvalidFilter(
+                f"'expand_fixed' accepts date ranges of up to {MAX_EXPANDED_MONTHS} "
+                "months"
+            )
+        return lower, upper
+
+    @staticmethod
+    def _date_bounds(filters: dict) -> Tuple[Optional[date], Optional[date]]:
+        """First and last day selected by the date filters, None when unbounded."""
+        lowers, uppers = [], []
+        for key, value in filters.items():
+            field_name, _, operator_name = key.partition("__")
+            if field_name != "date":
+                continue
+            if operator_name == "between":
+                lowers.append(value[0])
+                uppers.append(value[1])
+            elif operator_name == "gte":
+                lowers.append(value)
+            elif operator_name == "gt":
+                lowers.append(value + timedelta(days=1))
+            elif operator_name == "lte":
+                uppers.append(value)
+            elif operator_name == "lt":
+                uppers.append(value - timedelta(days=1))
+
+        return max(lowers, default=None), min(uppers, default=None)
+
+    def _archived_through(self, user_id: str) -> Optional[date]:
+        """
+        The date of the user's last archived transaction, if any, read from the
+        index on (``user_id``, ``date``, ``id``) of ``transactions_archive``.
+        """
+        return self.session.scalar(
+            select(func.max(ArchivedTransaction.date)).where(
+                ArchivedTransaction.user_id == user_id
+            )
+        )
+
+    def _reaches_archive(self, user_id: str, since: Optional[date]) -> bool:
+        """
+        Whether reads from ``since`` on, or over the whole history when it is None,
+        reach back to the user's archived transactions.
+
+        The last archived date is read by ``_archived_through``, so reads of recent
+        data are left untouched and never scan the archive.
+        """
+        archived_through = self._archived_through(user_id)
+        return archived_through is not None and (
+            since is None or since <= archived_through
+        )
+
+    def _listed_before(
+        self, query: Select, archived_through: date, latest: Optional[int]
+    ) -> bool:
+        """
+        Whether the ``latest`` transactions of ``query``, latest first, are all
+        listed before the archived ones, i.e. undated or dated after
+        ``archived_through``. Counts at most ``latest`` rows.
+        """
+        if latest is None:
+            return False
+
+        newer = query.where(
+            or_(
+                TransactionView.date.is_(None),
+                TransactionView.date > archived_through,
+            )
+        )
+        count = select(func.count()).select_from(newer.limit(latest).subquery())
+        return self.session.scalar(count) >= latest
+
+    def _sources(self, user_id: str, since: Optional[date]) -> Tuple[Any, Any]:
+        """
+        The transaction and installment entities of reads from ``since`` on:
+        ``LedgerTransaction`` and ``LedgerInstallment`` when they reach the archive,
+        ``Transaction`` and ``ExpandedInstallment`` otherwise.
+        """
+        if self._reaches_archive(user_id, since):
+            return LedgerTransaction, LedgerInstallment
+        return Transaction, ExpandedInstallment
+
+    def summarize(
+        self,
+        user_id: str,
+        group_by: List[str],
+        filters: dict,
+        or_groups: Optional[List[List[Tuple[str, Any]]]] = None,
+        allow_unindexed: bool = False,
+        search: Optional[str] = None,
+        expand_fixed: bool = False,
+    ) -> List[Row]:
+        """
+        Sum the user's transactions grouped by the given dimensions.
+
+        Transactions with installments contribute each installment in the month it
+        falls due; all other transactions contribute their own amount and date. The
+        ``date`` and ``amount`` filters apply to those entries, the others to the
+        transactions.
+
+        When the summary only groups and filters by month, category, kind and
+        revenue/expense, closed months are read from the ``monthly_rollups`` table
+        and only the current month is aggregated live. Otherwise everything runs as
+        a single GROUP BY query over the transactions.
+
+        With ``expand_fixed``, fixed transactions contribute their amount once for
+        each of their occurrences in the date range, as listed by
+        ``get_all_with_occurrences``, and the summary is always aggregated live.
+
+        Live aggregates whose date range reaches back to the user's archived
+        transactions include them, as in ``get_all``.
+
+        Parameters
+        ----------
+        user_id : str
+            The ID of the user that owns the transactions.
+        group_by : List[str]
+            Dimensions to group by, values of ``SummaryGroups``.
+        filters, or_groups, allow_unindexed, search
+            Same as ``get_all``.
+        expand_fixed : bool
+            Whether to expand fixed transactions into their occurrences.
+
+        Returns
+        -------
+        List[Row]
+            One row per group, with the group columns, ``total`` and ``count``.
+        """
+        if (
+            not search
+            and not expand_fixed
+            and self._rollups_cover(group_by, filters, or_groups or [])
+        ):
+            statement = self._rollup_summary_statement(
+                user_id, group_by, filters, or_groups
+            )
+        else:
+            statement = self._live_summary_statement(
+                user_id,
+                group_by,
+                filters,
+                or_groups,
+                allow_unindexed,
+                search,
+                expand_fixed=expand_fixed,
+            )
+        return list(self.session.execute(statement))
+
+    def _live_summary_statement(
+        self,
+        user_id: str,
+        group_by: List[str],
+        filters: dict,
+        or_groups: Optional[List[List[Tuple[str, Any]]]],
+        allow_unindexed: bool,
+        search: Optional[str],
+        since: Optional[date] = None,
+        expand_fixed: bool = False,
+    ) -> Select:
+        entries = self._summary_entries(
+            user_id, filters, or_groups, allow_unindexed, search, since, expand_fixed
+        )
+        groups = {
+            SummaryGroups.MONTH: self._month(entries.c.date).label("month"),
+            SummaryGroups.CATEGORY: entries.c.category_id,
+            SummaryGroups.KIND: entries.c.kind,
+            SummaryGroups.CREDIT_CARD: entries.c.credit_card_id,
+            SummaryGroups.IS_REVENUE: entries.c.is_revenue,
+        }
+        group_columns = [groups[SummaryGroups(group)] for group in group_by]
+
+        return (
+            select(
+                *group_columns,
+                func.sum(entries.c.amount).label("total"),
+                func.count().label("count"),
+            )
+            .group_by(*group_columns)
+            .order_by(*group_columns)
+        )
+
+    def _summary_entries(
+        self,
+        user_id: str,
+        filters: dict,
+        or_groups: Optional[List[List[Tuple[str, Any]]]],
+        allow_unindexed: bool,
+        search: Optional[str],
+        since: Optional[date],
+        expand_fixed: bool,
+    ) -> Subquery:
+        """
+        The entries summed by a live summary: installments and transactions without
+        installments, plus the occurrences of fixed transactions when expanding.
+        The entries are read from the archive as well when the date range reaches
+        back to it.
+        """
+        lower, _ = self._date_bounds(filters)
+        transaction, installment = self._sources(
+            user_id, since if since is not None else lower
+        )
+        archived = transaction is LedgerTransaction
+
+        entry = self._entry_columns(transaction, installment)
+        criteria = self._criteria(
+            user_id, filters, or_groups, allow_unindexed, search, entry, transaction
+        )
+        if since is not None:
+            criteria.append(entry["date"] >= since)
+        if expand_fixed:
+            criteria.append(transaction.is_fixed.is_(False))
+
+        entries = (
+            select(
+                transaction.category_id,
+                transaction.kind,
+                transaction.credit_card_id,
+                transaction.is_revenue,
+                entry["amount"].label("amount"),
+                entry["date"].label("date"),
+            )
+            .select_from(transaction)
+            .outerjoin(installment, installment.transaction_id == transaction.id)
+            .where(*criteria)
+        )
+        if not expand_fixed:
+            return entries.subquery("entries")
+
+        # fixed transactions are never archived, only their materialized occurrences
+        occurrence, months, occurrence_criteria = self._occurrences(
+            user_id, filters, or_groups, allow_unindexed, search, archived
+        )
+        occurrences = (
+            select(
+                Transaction.category_id,
+                Transaction.kind,
+                Transaction.credit_card_id,
+                Transaction.is_revenue,
+                Transaction.amount,
+                occurrence,
+            )
+            .select_from(Transaction)
+            .join(months, true())
+            .where(*occurrence_criteria)
+        )
+        return union_all(entries, occurrences).subquery("entries")
+
+    def _rollup_summary_statement(
+        self,
+        user_id: str,
+        group_by: List[str],
+        filters: dict,
+        or_groups: Optional[List[List[Tuple[str, Any]]]],
+    ) -> Select:
+        """
+        Closed months are read from ``monthly_rollups`` and only the current month
+        is aggregated from the transactions, both combined in a single statement.
+        """
+        current_month = self._current_month()
+        groups = {
+            SummaryGroups.MONTH: MonthlyRollup.month.label("month"),
+            SummaryGroups.CATEGORY: MonthlyRollup.category_id.label("category_id"),
+            SummaryGroups.KIND: MonthlyRollup.kind.label("kind"),
+            SummaryGroups.IS_REVENUE: MonthlyRollup.is_revenue.label("is_revenue"),
+        }
+        group_columns = [groups[SummaryGroups(group)] for group in group_by]
+        columns = {
+            "date": MonthlyRollup.month,
+            "category_id": MonthlyRollup.category_id,
+            "kind": MonthlyRollup.kind,
+            "is_revenue": MonthlyRollup.is_revenue,
+        }
+        closed = (
+            select(
+                *group_columns,
+                func.sum(MonthlyRollup.total).label("total"),
+                func.sum(MonthlyRollup.count).label("count"),
+            )
+            .where(
+                MonthlyRollup.user_id == user_id,
+                MonthlyRollup.month < current_month,
+                MonthlyRollup.count > 0,
+                *TRANSACTION_FILTERS.criteria(filters, or_groups, True, columns),
+            )
+            .group_by(*group_columns)
+        )
+        live = self._live_summary_statement(
+            user_id, group_by, filters, or_groups, True, None, since=current_month
+        ).order_by(None)
+
+        combined = union_all(closed, live).subquery()
+        combined_groups = [combined.c[column.name] for column in group_columns]
+        return (
+            select(
+                *combined_groups,
+                func.sum(combined.c.total).label("total"),
+                cast(func.sum(combined.c.count), Integer).label("count"),
+            )
+            .group_by(*combined_groups)
+            .order_by(*combined_groups)
+        )
+
+    @staticmethod
+    def _rollups_cover(
+        group_by: List[str], filters: dict, or_groups: List[List[Tuple[str, Any]]]
+    ) -> bool:
+        """
+        Whether a summary can be answered from the monthly rollups: it groups and
+        filters only by their dimensions, and date filters select whole months.
+        """
+        if not {SummaryGroups(group) for group in group_by} <= ROLLUP_GROUPS:
+            return False
+
+        terms = list(filters.items()) + [term for group in or_groups for term in group]
+        for key, value in terms:
+            field_name, _, operator_name = key.partition("__")
+            if field_name not in ROLLUP_FILTER_FIELDS:
+                return False
+            if field_name == "date" and not _selects_whole_months(
+                operator_name, value
+            ):
+                return False
+
+        return True
+
+    @staticmethod
+    def _current_month() -> date:
+        return date.today().replace(day=1)
+
+    @staticmethod
+    def _month(column: ColumnElement) -> ColumnElement:
+        return cast(func.date_trunc("month", cast(column, DateTime)), Date)
+
+    @staticmethod
+    def _entry_columns(
+        transaction: Any = Transaction, installment: Any = ExpandedInstallment
+    ) -> Dict[str, ColumnElement]:
+        """
+        Amount and date of each entry of a transaction left joined to its
+        installments: the installment when there is one, otherwise the transaction.
+        """
+        return {
+            "amount": func.coalesce(installment.amount, transaction.amount),
+            "date": entry_date(installment, transaction),
+        }
+
+    def _criteria(
+        self,
+        user_id: str,
+        filters: dict,
+        or_groups: Optional[List[List[Tuple[str, Any]]]],
+        allow_unindexed: bool,
+        search: Optional[str],
+        columns: Optional[Dict[str, ColumnElement]] = None,
+        transaction: Any = Transaction,
+    ) -> List[ColumnElement[bool]]:
+        # the search predicate is served by GIN indexes, so it narrows the rows
+        # just like an indexed filter does
+        if transaction is not Transaction:
+            columns = {
+                **{
+                    field: getattr(transaction, field)
+                    for field in TRANSACTION_FILTERS.fields
+                },
+                **(columns or {}),
+            }
+        criteria = TRANSACTION_FILTERS.criteria(
+            filters, or_groups, allow_unindexed or bool(search), columns
+        )
+        criteria.insert(0, transaction.user_id == user_id)
+
+        if search:
+            match, _ = self._search_criteria(search, transaction)
+            criteria.append(match)
+
+        return criteria
+
+    @staticmethod
+    def _view_criteria(
+        user_id: str,
+        filters: dict,
+        or_groups: Optional[List[List[Tuple[str, Any]]]],
+        allow_unindexed: bool,
+        search: Optional[str],
+    ) -> List[ColumnElement[bool]]:
+        """The criteria of ``_criteria`` on ``transaction_view``, but the search."""
+        criteria = TRANSACTION_FILTERS.criteria(
+            filters,
+            or_groups,
+            allow_unindexed or bool(search),
+            TRANSACTION_VIEW_COLUMNS,
+        )
+        criteria.insert(0, TransactionView.user_id == user_id)
+        return criteria
+
+    def _archive_criteria(
+        self,
+        user_id: str,
+        filters: dict,
+        or_groups: Optional[List[List[Tuple[str, Any]]]],
+        allow_unindexed: bool,
+        search: Optional[str],
+    ) -> List[ColumnElement[bool]]:
+        """The criteria of ``_criteria`` on ``transactions_archive``."""
+        criteria = TRANSACTION_FILTERS.criteria(
+            filters, or_groups, allow_unindexed or bool(search), ARCHIVE_COLUMNS
+        )
+        criteria.insert(0, ArchivedTransaction.user_id == user_id)
+
+        if search:
+            match, _ = self._search_criteria(search, ArchivedTransaction)
+            criteria.append(match)
+
+        return criteria
+
+    def _archived_view(
+        self,
+        user_id: str,
+        filters: dict,
+        or_groups: Optional[List[List[Tuple[str, Any]]]],
+        allow_unindexed: bool,
+        search: Optional[str],
+    ) -> Select:
+        """
+        The matching archived transactions with the columns of ``transaction_view``,
+        in the same order, and their search rank when ``search`` is given.
+        """
+        flattened = {
+            "category_description": Category.description,
+            "credit_card_name": CreditCard.name,
+        }
+        columns = [
+            flattened.get(name, ArchivedTransaction.__table__.c.get(name)).label(name)
+            for name in TransactionView.__table__.columns.keys()
+        ]
+        if search:
+            _, rank = self._search_criteria(search, ArchivedTransaction)
+            columns.append(rank.label("rank"))
 
         return (
-            custom_query.filter(Transaction.user_id == user_id)
-            .apply_filters(Transaction, filters)
-            .order_by(desc(Transaction.date))
+            select(*columns)
+            .outerjoin(Category, Category.id == ArchivedTransaction.category_id)
+            .outerjoin(CreditCard, CreditCard.id == ArchivedTransaction.credit_card_id)
+            .where(
+                *self._archive_criteria(
+                    user_id, filters, or_groups, allow_unindexed, search
+                )
+            )
+        )
+
+    @staticmethod
+    def _search_criteria(search: str, transaction: Any = Transaction):
+        """
+        Build the match predicate and rank expression for a description search.
+
+        A description matches when it contains all the words of the search (full-text
+        search over the ``search_vector`` generated column), when it contains the
+        search as a substring, or when it is similar enough to it (``pg_trgm``'s
+        ``%`` operator, for typos). The three predicates are served by the GIN
+        indexes on ``search_vector`` and on ``description`` with ``gin_trgm_ops``.
+        The archive, whose ``transaction`` can be given instead, has no such
+        indexes and is only searched among the rows of the other criteria.
+        """
+        ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, search)
+        escaped = re.sub(r"([\\%_])", r"\\\1", search)
+        match = or_(
+            transaction.search_vector.op("@@")(ts_query),
+            transaction.description.ilike(f"%{escaped}%", escape="\\"),
+            transaction.description.op("%")(search),
         )
+        rank = func.ts_rank(transaction.search_vector, ts_query) + func.similarity(
+            transaction.description, search
+        )
+        return match, rank
 
     def get_by_id(
         self, transaction_id: str, user_id: str
     ) -> Transaction | None:
         """Get a Transaction by id."""
-        return (
-            self.session.query(Transaction)
-            .options(joinedload(Transaction.installments))
-            .filter(
-                Transaction.id == transaction_id, Transaction.user_id == user_id
+        return self._get_with_installments(
+            Transaction.id == transaction_id,
+            Transaction.user_id == user_id,
+        )
+
+    def _get_with_installments(
+        self, *criteria: ColumnElement[bool]
+    ) -> Transaction | None:
+        """
+        Get a Transaction with its installments read from ``installment_source``,
+        so that compact schedules are expanded into installments as well.
+        """
+        rows = self.session.execute(
+            select(Transaction, ExpandedInstallment)
+            .outerjoin(
+                ExpandedInstallment,
+                ExpandedInstallment.transaction_id == Transaction.id,
+            )
+            .where(*criteria)
+            .order_by(ExpandedInstallment.installment_number)
+        ).all()
+        if not rows:
+            return None
+
+        transaction = rows[0][0]
+        set_committed_value(
+            transaction,
+            "installments",
+            [installment for _, installment in rows if installment is not None],
+        )
+        return transaction
+
+    def get_balance(self, user_id: str, as_of: Optional[date] = None) -> List[Row]:
+        """
+        Get a user's balance per kind of transaction.
+
+        The current balance is read from ``balances``. The balance as of a date adds
+        the monthly rollups of the months before it to the transactions of its month
+        up to it, so it reads at most one month of transactions, from the archive as
+        well when the month was archived.
+
+        Parameters
+        ----------
+        user_id : str
+            The ID of the user that owns the transactions.
+        as_of : date, optional
+            The last day included in the balance, by default every transaction.
+
+        Returns
+        -------
+        List[Row]
+            The ``kind`` and ``total`` of each kind with transactions.
+        """
+        if as_of is None:
+            return list(
+                self.session.execute(
+                    select(Balance.kind, money(Balance.total).label("total"))
+                    .where(Balance.user_id == user_id)
+                    .order_by(Balance.kind)
+                )
+            )
+
+        month = as_of.replace(day=1)
+        rollups = select(
+            MonthlyRollup.kind,
+            signed(MonthlyRollup.total, MonthlyRollup.is_revenue).label("amount"),
+        ).where(
+            MonthlyRollup.user_id == user_id,
+            MonthlyRollup.kind != Kinds.CREDIT.value,
+            MonthlyRollup.month < month,
+        )
+        transaction = (
+            LedgerTransaction if self._reaches_archive(user_id, month) else Transaction
+        )
+        transactions = select(
+            transaction.kind,
+            signed(transaction.amount, transaction.is_revenue).label("amount"),
+        ).where(
+            transaction.user_id == user_id,
+            transaction.kind != Kinds.CREDIT.value,
+            transaction.date.between(month, as_of),
+        )
+        entries = union_all(rollups, transactions).subquery("entries")
+        return list(
+            self.session.execute(
+                select(
+                    entries.c.kind,
+                    money(func.sum(entries.c.amount)).label("total"),
+                )
+                .group_by(entries.c.kind)
+                .order_by(entries.c.kind)
+            )
+        )
+
+    def get_future_installments(self, user_id: str, since: date) -> List[Row]:
+        """
+        Get the period, amount and direction of a user's installments due from
+        ``since`` on. Credit card installments are due on their invoice period.
+        """
+        period = func.coalesce(
+            ExpandedInstallment.invoice_period, ExpandedInstallment.date
+        )
+        return list(
+            self.session.execute(
+                select(period, ExpandedInstallment.amount, Transaction.is_revenue)
+                .join(Transaction, Transaction.id == ExpandedInstallment.transaction_id)
+                .where(Transaction.user_id == user_id, period >= since)
+            )
+        )
+
+    def get_fixed_transactions(self, user_id: str) -> List[Row]:
+        """Get the first date, amount and direction of a user's fixed transactions."""
+        return list(
+            self.session.execute(
+                select(Transaction.date, Transaction.amount, Transaction.is_revenue)
+                .where(
+                    Transaction.user_id == user_id,
+                    Transaction.is_fixed.is_(True),
+                )
             )
-            .first()
         )
 
+    def get_spend_series(
+        self, user_id: str, start: date, end: date, period: AnalyticsPeriods
+    ) -> List[Row]:
+        """
+        Get a user's expenses per category and day or week, with the gaps filled
+        with zeros.
+
+        Entries are installments and transactions without installments, as in
+        summaries, archived ones included, summed per category and bucket. The sums
+        of each category are collected into arrays with their bucket positions, and
+        each array is then spread over ``generate_series`` of every position of the
+        range, so the result has one row per category with one total per bucket.
+
+        Parameters
+        ----------
+        user_id : str
+            The ID of the user that owns the transactions.
+        start, end : date
+            First and last day of the range. Weeks start on Monday, so the first
+            week may start before ``start``.
+        period : AnalyticsPeriods
+            The size of the buckets.
+
+        Returns
+        -------
+        List[Row]
+            The ``category_id`` and ``totals`` of each category with expenses in the
+            range.
+        """
+        first = period.first_bucket(start)
+        buckets = (end - first).days // period.days + 1
+
+        transaction, installment = self._sources(user_id, start)
+        entry = self._entry_columns(transaction, installment)
+        position = (entry["date"] - first) // period.days
+        spend = (
+            select(
+                transaction.category_id,
+                position.label("position"),
+                func.sum(entry["amount"]).label("total"),
+            )
+            .select_from(transaction)
+            .outerjoin(installment, installment.transaction_id == transaction.id)
+            .where(
+                transaction.user_id == user_id,
+                transaction.is_revenue.is_(False),
+                entry["date"].between(start, end),
+            )
+            .group_by(transaction.category_id, position)
+            .subquery("spend")
+        )
+        series = (
+            select(
+                spend.c.category_id,
+                func.array_agg(spend.c.position).label("positions"),
+                func.array_agg(spend.c.total).label("totals"),
+            )
+            .group_by(spend.c.category_id)
+            .subquery("series")
+        )
+
+        grid = (
+            func.generate_series(0, buckets - 1)
+            .table_valued("position")
+            .render_derived(name="grid")
+        )
+        totals = (
+            func.unnest(series.c.positions, series.c.totals)
+            .table_valued("position", "total")
+            .render_derived(name="totals")
+        )
+        filled = (
+            select(
+                func.array_agg(
+                    aggregate_order_by(
+                        func.coalesce(totals.c.total, 0), grid.c.position
+                    )
+                )
+            )
+            .select_from(grid)
+            .outerjoin(totals, totals.c.position == grid.c.position)
+            .scalar_subquery()
+        )
+        return list(
+            self.session.execute(
+                select(series.c.category_id, filled.label("totals")).order_by(
+                    series.c.category_id
+                )
+            )
+        )
+
+    def get_spend_outliers(
+        self, user_id: str, start: date, end: date, threshold: float
+    ) -> List[Row]:
+        """
+        Get a user's expenses whose amount is an outlier for their category.
+
+        The mean and standard deviation of each category are window aggregates over
+        the expenses of the range, and an expense is an outlier when its z-score,
+        its distance to the mean in standard deviations, reaches ``threshold``.
+        Purchases in installments count with their whole amount. Archived expenses
+        are included.
+
+        Returns
+        -------
+        List[Row]
+            The ``id``, ``description``, ``category_id``, ``date``, ``amount`` and
+            ``z_score`` of each outlier, the most unusual first.
+        """
+        transaction, _ = self._sources(user_id, start)
+        partition = {"partition_by": transaction.category_id}
+        expenses = (
+            select(
+                transaction.id,
+                transaction.description,
+                transaction.category_id,
+                transaction.date,
+                transaction.amount,
+                (
+                    (
+                        transaction.amount
+                        - func.avg(transaction.amount).over(**partition)
+                    )
+                    / func.nullif(
+                        func.stddev_samp(transaction.amount).over(**partition),
+                        0,
+                        type_=Float,
+                    )
+                ).label("z_score"),
+            )
+            .where(
+                transaction.user_id == user_id,
+                transaction.is_revenue.is_(False),
+                transaction.date.between(start, end),
+            )
+            .subquery("expenses")
+        )
+        return list(
+            self.session.execute(
+                select(
+                    expenses.c.id,
+                    expenses.c.description,
+                    expenses.c.category_id,
+                    expenses.c.date,
+                    expenses.c.amount,
+                    func.round(cast(expenses.c.z_score, Numeric), 2).label("z_score"),
+                )
+                .where(func.abs(expenses.c.z_score) >= threshold)
+                .order_by(desc(func.abs(expenses.c.z_score)), expenses.c.id)
+            )
+        )
+
+    def get_description_counts(self, user_id: str) -> Dict[str, int]:
+        """Get how many transactions used each distinct description of a user."""
+        rows = self.session.execute(
+            select(Transaction.description, func.count())
+            .where(Transaction.user_id == user_id)
+            .group_by(Transaction.description)
+        )
+        return {description: count for description, count in rows}
+
+    def materialize_occurrences(self, user_ids: List[str], period: date) -> int:
+        """
+        Insert the occurrences in ``period`` of the given users' fixed transactions
+        as transactions of their own, and add them to the monthly rollups.
+
+        The occurrences are inserted with a single INSERT ... SELECT. Fixed
+        transactions already materialized in ``period`` are skipped, whatever the
+        date of their occurrence, so running it again for the same period does
+        nothing, even after a change of ``recurring_day``. A fixed transaction with
+        a date already counts in the month of its date, so it is not materialized in
+        that month. The changes are left for the caller to commit.
+
+        Parameters
+        ----------
+        user_ids : List[str]
+            The users whose fixed transactions are materialized.
+        period : date
+            First day of the month of the occurrences.
+
+        Returns
+        -------
+        int
+            The number of transactions inserted.
+        """
+        month = literal(period, Date)
+        occurrence = occurrence_date(month)
+        rows = select(
+            func.gen_random_uuid(),
+            Transaction.description,
+            Transaction.amount,
+            false(),
+            Transaction.is_revenue,
+            occurrence,
+            Transaction.kind,
+            Transaction.category_id,
+            Transaction.user_id,
+            Transaction.credit_card_id,
+            Transaction.id,
+            month,
+            func.now(),
+        ).where(
+            Transaction.user_id.in_(user_ids),
+            *is_occurring(occurrence),
+            or_(Transaction.date.is_(None), Transaction.date < month),
+            ~is_materialized(month),
+        )
+        statement = (
+            insert(Transaction)
+            .from_select(
+                [
+                    "id",
+                    "description",
+                    "amount",
+                    "is_fixed",
+                    "is_revenue",
+                    "date",
+                    "kind",
+                    "category_id",
+                    "user_id",
+                    "credit_card_id",
+                    "source_transaction_id",
+                    "period",
+                    "updated_at",
+                ],
+                rows,
+            )
+            .on_conflict_do_nothing(
+                index_elements=[
+                    Transaction.source_transaction_id,
+                    Transaction.period,
+                    Transaction.date,
+                ]
+            )
+            .returning(Transaction.id)
+        )
+        inserted = list(self.session.scalars(statement))
+        if inserted:
+            self._add_entries(Transaction.id.in_(inserted))
+        return len(inserted)
+
+    def rebuild_rollups(self, user_ids: List[str]) -> None:
+        """
+        Recompute the monthly rollups and balances of the given users from their
+        transactions, archived ones included.
+
+        They are replaced in the current database transaction, which is left for the
+        caller to commit.
+        """
+        self.session.execute(
+            delete(MonthlyRollup).where(MonthlyRollup.user_id.in_(user_ids))
+        )
+        self.session.execute(delete(Balance).where(Balance.user_id.in_(user_ids)))
+        self._add_entries(
+            LedgerTransaction.user_id.in_(user_ids),
+            transaction=LedgerTransaction,
+            installment=LedgerInstallment,
+        )
+
+    def reconcile_rollups(self, user_ids: List[str]) -> List[str]:
+        """
+        Verify the monthly rollups of the given users against their transactions
+        and installments, archived ones included, rebuilding those of the users
+        whose rollups drifted.
+
+        The rebuild happens in the current database transaction, which is left for
+        the caller to commit.
+
+        Returns
+        -------
+        List[str]
+            The IDs of the users whose rollups were rebuilt.
+        """
+        entry = self._entry_columns(LedgerTransaction, LedgerInstallment)
+        keys = [
+            LedgerTransaction.user_id.label("user_id"),
+            self._month(entry["date"]).label("month"),
+            LedgerTransaction.category_id.label("category_id"),
+            LedgerTransaction.kind.label("kind"),
+            LedgerTransaction.is_revenue.label("is_revenue"),
+        ]
+        expected = (
+            select(
+                *keys,
+                func.sum(entry["amount"]).label("total"),
+                func.count().label("count"),
+            )
+            .select_from(LedgerTransaction)
+            .outerjoin(
+                LedgerInstallment,
+                LedgerInstallment.transaction_id == LedgerTransaction.id,
+            )
+            .where(
+                LedgerTransaction.user_id.in_(user_ids), entry["date"].is_not(None)
+            )
+            .group_by(*keys)
+            .subquery("expected")
+        )
+        stored = (
+            select(MonthlyRollup)
+            .where(MonthlyRollup.user_id.in_(user_ids))
+            .subquery("stored")
+        )
+        drifted = list(
+            self.session.scalars(
+                select(func.coalesce(expected.c.user_id, stored.c.user_id))
+                .select_from(
+                    expected.join(
+                        stored,
+                        and_(
+                            stored.c.user_id == expected.c.user_id,
+                            stored.c.month == expected.c.month,
+                            stored.c.category_id.is_not_distinct_from(
+                                expected.c.category_id
+                            ),
+                            stored.c.kind == expected.c.kind,
+                            stored.c.is_revenue == expected.c.is_revenue,
+                        ),
+                        full=True,
+                    )
+                )
+                .where(
+                    or_(
+                        func.abs(
+                            func.coalesce(expected.c.total, 0)
+                            - func.coalesce(stored.c.total, 0)
+                        )
+                        >= 0.01,
+                        func.coalesce(expected.c.count, 0)
+                        != func.coalesce(stored.c.count, 0),
+                    )
+                )
+                .distinct()
+            )
+        )
+        if drifted:
+            self.rebuild_rollups(drifted)
+        return drifted
+
+    def archive(self, user_ids: List[str], before: date, limit: int) -> int:
+        """
+        Move up to ``limit`` transactions of the given users, whose entries all fall
+        before ``before``, to ``transactions_archive`` and their installments to
+        ``installments_archive``.
+
+        Fixed transactions stay, since they keep occurring, and so do transactions
+        with an installment due or billed from ``before`` on. Compact schedules are
+        expanded into archived installments. The transactions are picked with
+        ``FOR UPDATE SKIP LOCKED``, so rows being written are left for the next run,
+        and the changes are left for the caller to commit, which bounds the locks
+        held to the rows of one call. The rollups and balances are left as they are,
+        since the archived entries still count.
+
+        Parameters
+        ----------
+        user_ids : List[str]
+            The users whose transactions are archived.
+        before : date
+            The archive horizon: the first day that is kept.
+        limit : int
+            The maximum number of transactions moved.
+
+        Returns
+        -------
+        int
+            The number of transactions archived.
+        """
+        recent = (
+            select(ExpandedInstallment.id)
+            .where(
+                ExpandedInstallment.transaction_id == Transaction.id,
+                func.greatest(
+                    ExpandedInstallment.date, ExpandedInstallment.invoice_period
+                )
+                >= before,
+            )
+            .exists()
+        )
+        ids = list(
+            self.session.scalars(
+                select(Transaction.id)
+                .where(
+                    Transaction.user_id.in_(user_ids),
+                    Transaction.is_fixed.is_(False),
+                    Transaction.date < before,
+                    ~recent,
+                )
+                .limit(limit)
+                .with_for_update(of=Transaction, skip_locked=True)
+            )
+        )
+        if not ids:
+            return 0
+
+        self.session.execute(
+            insert(ArchivedInstallment).from_select(
+                INSTALLMENT_COLUMNS,
+                select(
+                    *(
+                        getattr(ExpandedInstallment, name)
+                        for name in INSTALLMENT_COLUMNS
+                    )
+                ).where(ExpandedInstallment.transaction_id.in_(ids)),
+            )
+        )
+        self.session.execute(
+            delete(Installment).where(Installment.transaction_id.in_(ids))
+        )
+
+        columns = [
+            name
+            for name in TRANSACTION_COLUMNS
+            if Transaction.__table__.c[name].computed is None
+        ]
+        moved = (
+            delete(Transaction)
+            .where(Transaction.id.in_(ids))
+            .returning(*(Transaction.__table__.c[name] for name in columns))
+            .cte("moved")
+        )
+        self.session.execute(
+            insert(ArchivedTransaction).from_select(columns, select(moved))
+        )
+        return len(ids)
+
+    def _assign_invoice_periods(self, transaction: Transaction) -> None:
+        """Bill the installments of a transaction on its credit card's invoices."""
+        self.session.execute(
+            update(Installment)
+            .where(
+                Installment.transaction_id == Transaction.id,
+                CreditCard.id == Transaction.credit_card_id,
+                Transaction.id == transaction.id,
+            )
+            .values(
+                credit_card_id=CreditCard.id,
+                invoice_period=invoice_period(
+                    Installment.date, CreditCard.invoice_start_day
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
+    def _commit_to_credit_card(self, transaction: Transaction, sign: int = 1) -> None:
+        """
+        Add the installments of a transaction billed on open invoices to its credit
+        card's committed amount, or subtract them when ``sign`` is -1, with a single
+        atomic UPDATE.
+        """
+        self._commit_to_credit_cards(Transaction.id == transaction.id, sign)
+
+    def _commit_to_credit_cards(
+        self, where: ColumnElement[bool], sign: int = 1
+    ) -> None:
+        """
+        Add the installments of the matching transactions billed on open invoices to
+        their credit cards' committed amounts, or subtract them when ``sign`` is -1,
+        with a single atomic UPDATE.
+
+        When adding, the cards whose committed amount just reached their alert
+        threshold queue an alert, with no extra query: the UPDATE returns both the
+        new committed amount and what was added to it.
+        """
+        amounts = (
+            select(
+                ExpandedInstallment.credit_card_id,
+                func.sum(ExpandedInstallment.amount).label("amount"),
+            )
+            .join(Transaction, Transaction.id == ExpandedInstallment.transaction_id)
+            .where(
+                where,
+                ExpandedInstallment.credit_card_id.is_not(None),
+                is_open_installment(),
+            )
+            .group_by(ExpandedInstallment.credit_card_id)
+            .cte("amounts")
+        )
+        cards = self.session.execute(
+            update(CreditCard)
+            .where(CreditCard.id == amounts.c.credit_card_id)
+            .values(committed=money(CreditCard.committed + sign * amounts.c.amount))
+            .returning(
+                CreditCard.id,
+                CreditCard.user_id,
+                CreditCard.limit,
+                CreditCard.alert_threshold,
+                CreditCard.committed,
+                CreditCard.closed_through,
+                amounts.c.amount,
+            )
+            .execution_options(synchronize_session=False)
+        ).all()
+        if sign > 0:
+            self._queue_credit_card_alerts(cards)
+
+    def _queue_credit_card_alerts(self, cards: List[Row]) -> None:
+        """
+        Queue an alert for each card whose committed amount crossed its threshold,
+        at most once per card, threshold and invoice cycle: an update takes the
+        transaction off the committed amount before adding it back, which crosses
+        the threshold again.
+        """
+        alerts = []
+        for card in cards:
+            card_id, user_id, limit, threshold, committed, closed_through, amount = card
+            if threshold is None:
+                continue
+            alert_at = limit * threshold / 100
+            if committed - amount < alert_at <= committed:
+                alerts.append(
+                    {
+                        "user_id": user_id,
+                        "type": AlertTypes.CREDIT_CARD_LIMIT.value,
+                        "payload": {
+                            "credit_card_id": card_id,
+                            "limit": limit,
+                            "committed": committed,
+                            "threshold": threshold,
+                        },
+                        "dedupe_key": (
+                            f"credit_card:{card_id}:{threshold}:{closed_through}"
+                        ),
+                    }
+                )
+        self.alerts.queue(alerts)
+
+    def _add_entries(
+        self,
+        where: ColumnElement[bool],
+        sign: int = 1,
+        transaction: Any = Transaction,
+        installment: Any = ExpandedInstallment,
+    ) -> None:
+        """
+        Add the entries of the matching transactions to the monthly rollups and to
+        the balances, or subtract them when ``sign`` is -1. The transactions and
+        installments are read from ``transaction`` and ``installment``, which can
+        be ``LedgerTransaction`` and ``LedgerInstallment`` to include the archive.
+
+        When adding, the budgets of the expense rollups that were incremented are
+        checked against their alert thresholds.
+        """
+        rollups = self._add_to_rollups(where, sign, transaction, installment)
+        self._add_to_balances(where, sign, transaction)
+        if sign > 0:
+            self.alerts.queue_budget_alerts(
+                (user_id, category_id, month)
+                for user_id, month, category_id, is_revenue in rollups
+                if category_id is not None and not is_revenue
+            )
+
+    def _add_to_balances(
+        self,
+        where: ColumnElement[bool],
+        sign: int = 1,
+        transaction: Any = Transaction,
+    ) -> None:
+        """
+        Add the matching transactions to their users' balances, or subtract them
+        when ``sign`` is -1, with a single INSERT ... SELECT that merges into the
+        existing rows. Credit card purchases are left out of the balances.
+        """
+        rows = (
+            select(
+                func.gen_random_uuid(),
+                transaction.user_id,
+                transaction.kind,
+                sign * func.sum(signed(transaction.amount, transaction.is_revenue)),
+                func.now(),
+            )
+            .where(
+                where,
+                transaction.kind != Kinds.CREDIT.value,
+                transaction.date.is_not(None),
+            )
+            .group_by(transaction.user_id, transaction.kind)
+        )
+        statement = insert(Balance).from_select(
+            ["id", "user_id", "kind", "total", "updated_at"], rows
+        )
+        statement = statement.on_conflict_do_update(
+            constraint="uq_balances_user_id_kind",
+            set_={
+                "total": money(Balance.total + statement.excluded.total),
+                "updated_at": func.now(),
+            },
+        )
+        self.session.execute(statement)
+
+    def _add_to_rollups(
+        self,
+        where: ColumnElement[bool],
+        sign: int = 1,
+        transaction: Any = Transaction,
+        installment: Any = ExpandedInstallment,
+    ) -> List[Row]:
+        """
+        Add the entries of the matching transactions to the monthly rollups, or
+        subtract them when ``sign`` is -1, with a single INSERT ... SELECT that
+        merges into the existing rows.
+
+        Returns
+        -------
+        List[Row]
+            The ``user_id``, ``month``, ``category_id`` and ``is_revenue`` of the
+            rollups that changed.
+        """
+        entry = self._entry_columns(transaction, installment)
+        keys = [
+            transaction.user_id,
+            self._month(entry["date"]),
+            transaction.category_id,
+            transaction.kind,
+            transaction.is_revenue,
+        ]
+        rows = (
+            select(
+                func.gen_random_uuid(),
+                *keys,
+                sign * func.sum(entry["amount"]),
+                sign * func.count(),
+                func.now(),
+            )
+            .select_from(transaction)
+            .outerjoin(installment, installment.transaction_id == transaction.id)
+            .where(where, entry["date"].is_not(None))
+            .group_by(*keys)
+        )
+        statement = insert(MonthlyRollup).from_select(
+            [
+                "id",
+                "user_id",
+                "month",
+                "category_id",
+                "kind",
+                "is_revenue",
+                "total",
+                "count",
+                "updated_at",
+            ],
+            rows,
+        )
+        statement = statement.on_conflict_do_update(
+            index_elements=[
+                MonthlyRollup.user_id,
+                MonthlyRollup.month,
+                text(ROLLUP_CATEGORY_KEY),
+                MonthlyRollup.kind,
+                MonthlyRollup.is_revenue,
+            ],
+            set_={
+                "total": MonthlyRollup.total + statement.excluded.total,
+                "count": MonthlyRollup.count + statement.excluded.count,
+                "updated_at": func.now(),
+            },
+        )
+        return self.session.execute(
+            statement.returning(
+                MonthlyRollup.user_id,
+                MonthlyRollup.month,
+                MonthlyRollup.category_id,
+                MonthlyRollup.is_revenue,
+            )
+        ).all()
+
     def create(self, **kwargs) -> Transaction:
-        """Create a new Transaction."""
+        """
+        Create a new Transaction and add it to the monthly rollups and balances,
+        queuing the budget alerts it fires in the same database transaction.
+        """
         instance = Transaction(**kwargs)
         self.session.add(instance)
+        self.session.flush()
+        self._add_entries(Transaction.id == instance.id)
         self.commit()
         return instance
 
     def create_with_installments(
         self, transaction: Transaction, installments: List[Installment]
     ) -> Transaction | None:
-        """Create a new Transaction along with its associated Installments."""
+        """
+        Create a new Transaction along with its associated Installments, billing each
+        installment on its credit card invoice, committing it on the card's limit and
+        adding it to the monthly rollups in the month it falls due.
+
+        In the compact storage mode ``installments`` is empty and the installments
+        are expanded from the schedule on the transaction.
+
+        The credit card and budget alerts fired by the purchase are queued in the
+        same database transaction.
+        """
         transaction.installments = installments
 
         self.session.add(transaction)
+        self.session.flush()
+        self._assign_invoice_periods(transaction)
+        self._commit_to_credit_card(transaction)
+        self._add_entries(Transaction.id == transaction.id)
         self.session.commit()
 
-        return (
-            self.session.query(Transaction)
-            .options(joinedload(Transaction.installments))
-            .filter_by(id=transaction.id)
-            .first()
+        return self._get_with_installments(Transaction.id == transaction.id)
+
+    def update(
+        self,
+        transaction: Transaction,
+        schedule: Optional[InstallmentSchedule] = None,
+        **kwargs,
+    ) -> Transaction | None:
+        """
+        Update a Transaction, regenerating its installments from ``schedule``.
+
+        Everything happens in one database transaction with a fixed number of
+        statements, whatever the number of installments: the transaction's entries
+        are subtracted from the monthly rollups and its open installments from its
+        credit card's committed amount, the transaction is updated and its
+        installments regenerated, and the new entries and installments are added
+        back.
+
+        Stored installments are regenerated with a DELETE and an INSERT ... SELECT
+        over ``expand_schedule``. A compact schedule is simply replaced.
+
+        Parameters
+        ----------
+        transaction : Transaction
+            The transaction to be updated.
+        schedule : InstallmentSchedule, optional
+            The new installments, for transactions that have installments.
+        **kwargs
+            The new values of the transaction's columns.
+
+        Returns
+        -------
+        Transaction
+            The updated transaction, with its installments.
+        """
+        where = Transaction.id == transaction.id
+        self._add_entries(where, sign=-1)
+        self._commit_to_credit_card(transaction, sign=-1)
+
+        for key, value in kwargs.items():
+            setattr(transaction, key, value)
+        if schedule is not None and transaction.installments_number is not None:
+            transaction.installments_number = schedule.number
+            transaction.installment_amount = schedule.amount
+            transaction.installment_remainder = schedule.remainder
+        elif schedule is not None:
+            self._regenerate_installments(transaction, schedule)
+        self.session.flush()
+
+        self._add_entries(where)
+        self._commit_to_credit_card(transaction)
+        self.session.commit()
+
+        return self._get_with_installments(where)
+
+    def _regenerate_installments(
+        self, transaction: Transaction, schedule: InstallmentSchedule
+    ) -> None:
+        self.session.execute(
+            delete(Installment)
+            .where(Installment.transaction_id == transaction.id)
+            .execution_options(synchronize_session=False)
+        )
+        numbers, installment = expand_schedule(
+            literal(schedule.first_date, Date),
+            literal(schedule.number, Integer),
+            literal(schedule.amount, Float),
+            literal(schedule.remainder, Float),
+            CreditCard.invoice_start_day,
         )
+        rows = (
+            select(
+                func.gen_random_uuid(),
+                func.now(),
+                installment["date"],
+                installment["number"],
+                installment["amount"],
+                installment["invoice_period"],
+                Transaction.id,
+                Transaction.date,
+                Transaction.credit_card_id,
+            )
+            .select_from(Transaction)
+            .join(numbers, true())
+            .outerjoin(CreditCard, CreditCard.id == Transaction.credit_card_id)
+            .where(Transaction.id == transaction.id)
+        )
+        self.session.execute(
+            insert(Installment).from_select(
+                [
+                    "id",
+                    "updated_at",
+                    "date",
+                    "installment_number",
+                    "amount",
+                    "invoice_period",
+                    "transaction_id",
+                    "transaction_date",
+                    "credit_card_id",
+                ],
+                rows,
+            )
+        )
+
+    def count_matching(
+        self,
+        user_id: str,
+        filters: dict,
+        or_groups: Optional[List[List[Tuple[str, Any]]]] = None,
+        allow_unindexed: bool = False,
+        search: Optional[str] = None,
+    ) -> int:
+        """Count the transactions that a bulk update or delete would affect."""
+        where = self._bulk_criteria(
+            user_id, filters, or_groups, allow_unindexed, search
+        )
+        return self.session.scalar(
+            select(func.count()).select_from(Transaction).where(where)
+        )
+
+    def get_matching_description_counts(
+        self,
+        user_id: str,
+        filters: dict,
+        or_groups: Optional[List[List[Tuple[str, Any]]]] = None,
+        allow_unindexed: bool = False,
+        search: Optional[str] = None,
+    ) -> Dict[str, int]:
+        """
+        Get how many of the transactions that a bulk update would affect use each
+        distinct description.
+        """
+        where = self._bulk_criteria(
+            user_id, filters, or_groups, allow_unindexed, search
+        )
+        rows = self.session.execute(
+            select(Transaction.description, func.count())
+            .where(where)
+            .group_by(Transaction.description)
+        )
+        return {description: count for description, count in rows}
+
+    def update_matching(
+        self,
+        user_id: str,
+        filters: dict,
+        or_groups: Optional[List[List[Tuple[str, Any]]]] = None,
+        allow_unindexed: bool = False,
+        search: Optional[str] = None,
+        **values,
+    ) -> int:
+        """
+        Update every transaction of a user matching the filters with a single
+        UPDATE ... WHERE.
+
+        Only columns that leave the entries of the transactions unchanged are
+        expected, so installments and committed amounts stay as they are. When a
+        column of the monthly rollups changes, the entries are moved between rollups
+        with one INSERT ... SELECT before and one after the update.
+
+        Returns
+        -------
+        int
+            The number of updated transactions.
+
+        Raises
+        ------
+        InvalidFilter
+            If there are no filters, or they are rejected by ``TRANSACTION_FILTERS``.
+        """
+        where = self._bulk_criteria(
+            user_id, filters, or_groups, allow_unindexed, search
+        )
+        moves_entries = bool(values.keys() & {"category_id", "is_revenue"})
+        if moves_entries:
+            self._add_entries(where, sign=-1)
+
+        updated = self.session.scalars(
+            update(Transaction)
+            .where(where)
+            .values(**values)
+            .returning(Transaction.id)
+            .execution_options(synchronize_session=False)
+        ).all()
+
+        if moves_entries and updated:
+            self._add_entries(Transaction.id.in_(updated))
+        self.session.commit()
+        return len(updated)
+
+    def delete_matching(
+        self,
+        user_id: str,
+        filters: dict,
+        or_groups: Optional[List[List[Tuple[str, Any]]]] = None,
+        allow_unindexed: bool = False,
+        search: Optional[str] = None,
+    ) -> int:
+        """
+        Delete every transaction of a user matching the filters, with their
+        installments.
+
+        The entries are subtracted from the monthly rollups and the open installments
+        from the credit cards' committed amounts, then the installments and the
+        transactions are deleted, each with a single statement. Occurrences
+        materialized from a deleted fixed transaction are kept, detached from it
+        (there is no foreign key to do it, see ``Transaction``).
+
+        Returns
+        -------
+        int
+            The number of deleted transactions.
+
+        Raises
+        ------
+        InvalidFilter
+            If there are no filters, or they are rejected by ``TRANSACTION_FILTERS``.
+        """
+        where = self._bulk_criteria(
+            user_id, filters, or_groups, allow_unindexed, search
+        )
+        self._add_entries(where, sign=-1)
+        self._commit_to_credit_cards(where, sign=-1)
+
+        self.session.execute(
+            delete(Installment)
+            .where(Installment.transaction_id.in_(select(Transaction.id).where(where)))
+            .execution_options(synchronize_session=False)
+        )
+        deleted = self.session.scalars(
+            delete(Transaction)
+            .where(where)
+            .returning(Transaction.id)
+            .execution_options(synchronize_session=False)
+        ).all()
+        self.session.execute(
+            update(Transaction)
+            .where(
+                Transaction.user_id == user_id,
+                Transaction.source_transaction_id.in_(deleted),
+            )
+            .values(source_transaction_id=None)
+            .execution_options(synchronize_session=False)
+        )
+        self.session.commit()
+        return len(deleted)
+
+    def _bulk_criteria(
+        self,
+        user_id: str,
+        filters: dict,
+        or_groups: Optional[List[List[Tuple[str, Any]]]],
+        allow_unindexed: bool,
+        search: Optional[str],
+    ) -> ColumnElement[bool]:
+        """
+        Build the predicate of a bulk operation, refusing to match all of a user's
+        transactions by mistake.
+        """
+        if not (filters or or_groups or search):
+            raise InvalidFilter("Bulk operations require at least one filter")
+        return and_(
+            *self._criteria(user_id, filters, or_groups, allow_unindexed, search)
+        )
+
+
+def _selects_whole_months(operator_name: str, value: Any) -> bool:
+    """
+    Whether a date filter selects whole months, in which case it selects the same
+    entries when applied to the first day of their month.
+    """
+
+    def is_first_day(day: date) -> bool:
+        return day.day == 1
+
+    def is_last_day(day: date) -> bool:
+        return (day + timedelta(days=1)).day == 1
+
+    checks = {
+        "gte": lambda: is_first_day(value),
+        "lt": lambda: is_first_day(value),
+        "gt": lambda: is_last_day(value),
+        "lte": lambda: is_last_day(value),
+        "between": lambda: len(value) == 2
+        and is_first_day(value[0])
+        and is_last_day(value[1]),
+    }
+    check = checks.get(operator_name)
+    return check is not None and check()
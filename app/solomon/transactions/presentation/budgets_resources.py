@@ -0,0 +1,200 @@
+"""Budgets Endpoints"""
+
+import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from starlette import status
+
+from app.solomon.auth.application.security import get_current_user
+from app.solomon.auth.presentation.models import (
+    UserTokenAuthenticated,
+)
+from app.solomon.transactions.application.dependencies import get_budget_service
+from app.solomon.transactions.application.services import BudgetService
+from app.solomon.transactions.domain.exceptions import (
+    BudgetAlreadyExists,
+    BudgetNotFound,
+    CategoryNotFound,
+)
+from app.solomon.transactions.presentation.models import (
+    BudgetCreate,
+    BudgetResponseMapper,
+    BudgetsResponseMapper,
+    BudgetUpdate,
+)
+
+budget_router = APIRouter()
+
+MONTH_PATTERN = r"^\d{4}-(0[1-9]|1[0-2])$"
+
+
+def get_month(
+    month: Optional[str] = Query(None, pattern=MONTH_PATTERN)
+) -> datetime.date:
+    """First day of the requested YYYY-MM month, by default the current month."""
+    if month is None:
+        return datetime.date.today().replace(day=1)
+    return datetime.date.fromisoformat(f"{month}-01")
+
+
+@budget_router.post("/", status_code=status.HTTP_201_CREATED)
+async def create_budget(
+    budget: BudgetCreate,
+    month: datetime.date = Depends(get_month),
+    budget_service: BudgetService = Depends(get_budget_service),
+    current_user: UserTokenAuthenticated = Depends(get_current_user),
+) -> BudgetResponseMapper:
+    """
+    Create a monthly budget for a category.
+
+    Parameters
+    ----------
+    budget : BudgetCreate
+        The budget to be created.
+    month : datetime.date
+        The month whose spending is returned, by default the current one.
+    budget_service : BudgetService, optional
+        The service to be used to create the budget, by default
+        Depends(get_budget_service)
+    current_user : UserTokenAuthenticated, optional
+        The current user, by default Depends(get_current_user)
+
+    Returns
+    -------
+    BudgetResponseMapper
+        The created budget and its spending, with a 201 status code.
+    """
+    try:
+        return budget_service.create_budget(current_user.id, budget, month)
+    except CategoryNotFound as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=str(e)
+        ) from e
+    except BudgetAlreadyExists as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail=str(e)
+        ) from e
+
+
+@budget_router.get("/")
+async def get_budgets(
+    month: datetime.date = Depends(get_month),
+    budget_service: BudgetService = Depends(get_budget_service),
+    current_user: UserTokenAuthenticated = Depends(get_current_user),
+) -> BudgetsResponseMapper:
+    """
+    Get the current user's budgets with their spending in a month.
+
+    Parameters
+    ----------
+    month : datetime.date
+        The month, in the YYYY-MM format, by default the current one.
+    budget_service : BudgetService, optional
+        The service to be used to get the budgets, by default
+        Depends(get_budget_service)
+    current_user : UserTokenAuthenticated, optional
+        The current user, by default Depends(get_current_user)
+
+    Returns
+    -------
+    BudgetsResponseMapper
+        The amount, spending and remaining amount of each budget.
+    """
+    return budget_service.get_budgets(current_user.id, month)
+
+
+@budget_router.get("/{budget_id}")
+async def get_budget(
+    budget_id: str,
+    month: datetime.date = Depends(get_month),
+    budget_service: BudgetService = Depends(get_budget_service),
+    current_user: UserTokenAuthenticated = Depends(get_current_user),
+) -> BudgetResponseMapper:
+    """
+    Get a budget with its spending in a month.
+
+    Parameters
+    ----------
+    budget_id : str
+        The ID of the budget.
+    month : datetime.date
+        The month, in the YYYY-MM format, by default the current one.
+    budget_service : BudgetService, optional
+        The service to be used to get the budget, by default
+        Depends(get_budget_service)
+    current_user : UserTokenAuthenticated, optional
+        The current user, by default Depends(get_current_user)
+
+    Returns
+    -------
+    BudgetResponseMapper
+        The amount, spending and remaining amount of the budget.
+    """
+    try:
+        return budget_service.get_budget(budget_id, current_user.id, month)
+    except BudgetNotFound as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
+
+
+@budget_router.put("/{budget_id}")
+async def update_budget(
+    budget_id: str,
+    budget_update: BudgetUpdate,
+    month: datetime.date = Depends(get_month),
+    budget_service: BudgetService = Depends(get_budget_service),
+    current_user: UserTokenAuthenticated = Depends(get_current_user),
+) -> BudgetResponseMapper:
+    """
+    Update the amount of a budget.
+
+    Parameters
+    ----------
+    budget_id : str
+        The ID of the budget to update.
+    budget_update : BudgetUpdate
+        The new amount of the budget.
+    month : datetime.date
+        The month whose spending is returned, by default the current one.
+    budget_service : BudgetService, optional
+        The service to be used to update the budget, by default
+        Depends(get_budget_service)
+    current_user : UserTokenAuthenticated, optional
+        The current user, by default Depends(get_current_user)
+
+    Returns
+    -------
+    BudgetResponseMapper
+        The updated budget and its spending.
+    """
+    try:
+        return budget_service.update_budget(
+            budget_id, current_user.id, budget_update, month
+        )
+    except BudgetNotFound as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
+
+
+@budget_router.delete("/{budget_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_budget(
+    budget_id: str,
+    budget_service: BudgetService = Depends(get_budget_service),
+    current_user: UserTokenAuthenticated = Depends(get_current_user),
+) -> None:
+    """
+    Delete a budget.
+
+    Parameters
+    ----------
+    budget_id : str
+        The ID of the budget to delete.
+    budget_service : BudgetService, optional
+        The service to be used to delete the budget, by default
+        Depends(get_budget_service)
+    current_user : UserTokenAuthenticated, optional
+        The current user, by default Depends(get_current_user)
+    """
+    try:
+        budget_service.delete_budget(budget_id, current_user.id)
+    except BudgetNotFound as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException
+import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Path
 from starlette import status
 
 from app.solomon.auth.application.security import get_current_user
@@ -18,6 +20,7 @@ from app.solomon.transactions.presentation.models import (
     CreditCardResponseMapper,
     CreditCardsResponseMapper,
     CreditCardUpdate,
+    InvoiceResponseMapper,
 )
 
 credit_card_router = APIRouter()
@@ -124,6 +127,51 @@ async def get_credit_card(
         )
 
 
+@credit_card_router.get(
+    "/{credit_card_id}/invoices/{period}", response_model=InvoiceResponseMapper
+)
+async def get_invoice(
+    credit_card_id: str,
+    period: str = Path(..., pattern=r"^\d{4}-(0[1-9]|1[0-2])$"),
+    credit_card_service: CreditCardService = Depends(get_credit_card_service),
+    current_user: UserTokenAuthenticated = Depends(get_current_user),
+) -> InvoiceResponseMapper:
+    """
+    Get the invoice of a credit card for a month.
+
+    Parameters
+    ----------
+    credit_card_id : str
+        The ID of the credit card.
+    period : str
+        The invoice month, in the YYYY-MM format.
+    credit_card_service : CreditCardService
+        The service to use to retrieve the invoice
+    current_user : UserTokenAuthenticated
+        The current user, by default Depends(get_current_user)
+
+    Returns
+    -------
+    Response
+        The installments billed on the invoice and their total with a 200 status
+        code.
+    """
+    invoice_period = datetime.date.fromisoformat(f"{period}-01")
+    try:
+        installments = credit_card_service.get_invoice(
+            credit_card_id=credit_card_id,
+            user_id=current_user.id,
+            period=invoice_period,
+        )
+        return InvoiceResponseMapper.create(
+            credit_card_id, invoice_period, installments
+        )
+    except CreditCardNotFound as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=str(e)
+        )
+
+
 @credit_card_router.delete(
     "/{credit_card_id}",
     response_model=CreditCardResponseMapper,
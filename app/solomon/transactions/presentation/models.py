@@ -1,29 +1,44 @@
 import datetime
-from typing import List, Optional, Self
+from typing import Any, ClassVar, Dict, List, Optional, Self, Tuple
 
 from pydantic import (
     BaseModel,
     ConfigDict,
+    PositiveFloat,
     PositiveInt,
+    TypeAdapter,
+    ValidationError,
+    computed_field,
     field_validator,
     model_validator,
 )
 
+from app.solomon.common.exceptions import InvalidFilter
 from app.solomon.common.models import PaginationMeta, ResponseMapper
-from app.solomon.transactions.domain.models import (
-    Category,
-    CreditCard,
-    Transaction,
+from app.solomon.transactions.application.analytics import SpendSeries, to_list
+from app.solomon.transactions.application.forecast import CashFlow
+from app.solomon.transactions.domain.models import Budget, Category, CreditCard
+from app.solomon.transactions.domain.models import Installment as InstallmentModel
+from app.solomon.transactions.domain.models import Transaction, TransactionView
+from app.solomon.transactions.domain.options import (
+    AnalyticsPeriods,
+    Kinds,
+    SummaryGroups,
 )
-from app.solomon.transactions.domain.options import Kinds
 
 
 class CreditCardBase(BaseModel):
-    """Base model for credit card"""
+    """
+    Base model for credit card
+
+    ``alert_threshold`` is the percentage of the limit that, once committed, fires
+    an alert.
+    """
 
     name: str
     limit: float
     invoice_start_day: int
+    alert_threshold: Optional[PositiveInt] = None
 
 
 class CreditCardCreate(CreditCardBase):
@@ -38,6 +53,7 @@ class CreditCardUpdate(BaseModel):
     name: Optional[str] = None
     limit: Optional[float] = None
     invoice_start_day: Optional[PositiveInt] = None
+    alert_threshold: Optional[PositiveInt] = None
 
 
 class CreditCardMapper(CreditCardBase):
@@ -46,6 +62,19 @@ class CreditCardMapper(CreditCardBase):
     model_config = ConfigDict(from_attributes=True)
 
     id: str
+    committed: float = 0
+
+    @field_validator("committed", mode="before")
+    @classmethod
+    def default_committed(cls, value: Optional[float]) -> float:
+        """Cards that were not saved yet have nothing committed."""
+        return value or 0
+
+    @computed_field
+    @property
+    def available(self) -> float:
+        """The part of the limit not committed to open invoices."""
+        return round(self.limit - self.committed, 2)
 
     @classmethod
     def create(cls, credit_card: CreditCard) -> Self:
@@ -131,6 +160,71 @@ class CreditCardsResponseMapper(ResponseMapper):
         )
 
 
+class InvoiceInstallment(BaseModel):
+    """Response model for an installment billed on an invoice"""
+
+    transaction_id: str
+    description: str
+    installment_number: int
+    amount: float
+    date: datetime.date
+
+
+class Invoice(BaseModel):
+    """Response model for a credit card invoice"""
+
+    credit_card_id: str
+    period: datetime.date
+    total: float
+    installments: List[InvoiceInstallment]
+
+
+class InvoiceResponseMapper(ResponseMapper[Invoice]):
+    """Response model for credit card invoice"""
+
+    @classmethod
+    def create(
+        cls,
+        credit_card_id: str,
+        period: datetime.date,
+        installments: List[InstallmentModel],
+    ) -> Self:
+        """
+        Create an InvoiceResponseMapper instance.
+
+        Parameters
+        ----------
+        credit_card_id : str
+            The ID of the credit card.
+        period : datetime.date
+            The first day of the invoice month.
+        installments : List[InstallmentModel]
+            The installments billed on the invoice, with their transactions.
+
+        Returns
+        -------
+        InvoiceResponseMapper
+            An InvoiceResponseMapper instance containing the mapped invoice.
+        """
+        return cls(
+            data=Invoice(
+                credit_card_id=credit_card_id,
+                period=period,
+                total=round(sum(installment.amount for installment in installments), 2),
+                installments=[
+                    InvoiceInstallment(
+                        transaction_id=installment.transaction_id,
+                        description=installment.transaction.description,
+                        installment_number=installment.installment_number,
+                        amount=installment.amount,
+                        date=installment.date,
+                    )
+                    for installment in installments
+                ],
+            )
+        )
+
+
 class CategoryMapper(BaseModel):
     """Mapper model for categories"""
 
@@ -220,6 +314,127 @@ class CategoriesResponseMapper(ResponseMapper):
         )
 
 
+class BudgetCreate(BaseModel):
+    """
+    Request model for budget creation
+
+    ``alert_threshold`` is the percentage of the amount that, once spent in a
+    month, fires an alert.
+    """
+
+    category_id: str
+    amount: PositiveFloat
+    alert_threshold: PositiveInt = 100
+
+
+class BudgetUpdate(BaseModel):
+    """Request model for updating a budget"""
+
+    amount: Optional[PositiveFloat] = None
+    alert_threshold: Optional[PositiveInt] = None
+
+
+class BudgetMapper(BaseModel):
+    """Mapper model for the status of a budget in a month"""
+
+    id: str
+    category_id: str
+    amount: float
+    alert_threshold: int
+    month: datetime.date
+    spent: float
+
+    @computed_field
+    @property
+    def remaining(self) -> float:
+        """The part of the budget not spent yet, negative when exceeded."""
+        return round(self.amount - self.spent, 2)
+
+    @computed_field
+    @property
+    def is_exceeded(self) -> bool:
+        """Whether the spending passed the budget."""
+        return self.spent > self.amount
+
+    @classmethod
+    def create(cls, budget: Budget, spent: float, month: datetime.date) -> Self:
+        """
+        Create a BudgetMapper instance from a Budget object and its spending.
+
+        Parameters
+        ----------
+        budget : Budget
+            The Budget object to be mapped.
+        spent : float
+            The expenses of the budget's category in the month.
+        month : datetime.date
+            The first day of the month.
+
+        Returns
+        -------
+        BudgetMapper
+            A BudgetMapper instance representing the status of the budget.
+        """
+        return cls(
+            id=budget.id,
+            category_id=budget.category_id,
+            amount=budget.amount,
+            alert_threshold=budget.alert_threshold,
+            month=month,
+            spent=spent,
+        )
+
+
+class BudgetResponseMapper(ResponseMapper[BudgetMapper]):
+    """Response model for budget"""
+
+    @classmethod
+    def create(cls, budget: Budget, spent: float, month: datetime.date) -> Self:
+        """
+        Create a BudgetResponseMapper instance.
+
+        Parameters
+        ----------
+        budget : Budget
+            The Budget object to be mapped.
+        spent : float
+            The expenses of the budget's category in the month.
+        month : datetime.date
+            The first day of the month.
+
+        Returns
+        -------
+        BudgetResponseMapper
+            A BudgetResponseMapper instance containing the status of the budget.
+        """
+        return cls(data=BudgetMapper.create(budget, spent, month))
+
+
+class BudgetsResponseMapper(ResponseMapper[List[BudgetMapper]]):
+    """Response model for budgets"""
+
+    @classmethod
+    def create(cls, rows: List[Any], month: datetime.date) -> Self:
+        """
+        Create a BudgetsResponseMapper instance.
+
+        Parameters
+        ----------
+        rows : List[Any]
+            Pairs of Budget and spent amount.
+        month : datetime.date
+            The first day of the month.
+
+        Returns
+        -------
+        BudgetsResponseMapper
+            A BudgetsResponseMapper instance containing the status of each budget.
+        """
+        return cls(
+            data=[BudgetMapper.create(budget, spent, month) for budget, spent in rows]
+        )
+
+
 class InstallmentBase(BaseModel):
     """Base model for installments"""
 
@@ -240,6 +455,7 @@ class Installment(InstallmentBase):
     model_config = ConfigDict(from_attributes=True)
 
     id: str
+    invoice_period: Optional[datetime.date] = None
 
 
 class TransactionBase(BaseModel):
@@ -298,6 +514,42 @@ class TransactionCreate(TransactionBase):
         return data
 
 
+class TransactionUpdate(BaseModel):
+    """
+    Request model for updating a transaction
+
+    Changing the amount, date or number of installments of a credit card purchase
+    regenerates its installments.
+    """
+
+    description: Optional[str] = None
+    amount: Optional[float] = None
+    is_revenue: Optional[bool] = None
+    date: Optional[datetime.date] = None
+    recurring_day: Optional[PositiveInt] = None
+    category_id: Optional[str] = None
+    installments_number: Optional[PositiveInt] = None
+
+
+class TransactionBulkUpdate(BaseModel):
+    """
+    Request model for updating every transaction matching a filter
+
+    Only the columns that do not change the entries of a transaction can be updated
+    in bulk, so installments are kept as they are.
+    """
+
+    description: Optional[str] = None
+    is_revenue: Optional[bool] = None
+    category_id: Optional[str] = None
+
+    @model_validator(mode="after")
+    def validate_changes(self):
+        if not self.model_dump(exclude_none=True):
+            raise ValueError("at least one field must be updated")
+        return self
+
+
 class TransactionMapper(TransactionBase):
     """Mapper model for transactions"""
 
@@ -305,6 +557,7 @@ class TransactionMapper(TransactionBase):
 
     id: str
     installments: Optional[list[Installment]] = None
+    source_transaction_id: Optional[str] = None
 
     @classmethod
     def create(cls, transaction: Transaction) -> Self:
@@ -334,6 +587,112 @@ class TransactionMapper(TransactionBase):
         return cls.model_validate(transaction)
 
 
+class TransactionCreditCard(BaseModel):
+    """The credit card of a listed transaction"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    name: str
+
+
+class TransactionViewMapper(BaseModel):
+    """
+    Mapper model for transactions as they are listed and exported
+
+    ``transaction_view`` stores the category description and the credit card name
+    flattened, they are nested back into the ``category`` and ``credit_card``
+    objects.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    description: str
+    amount: float
+    is_fixed: bool
+    is_revenue: bool
+    date: Optional[datetime.date] = None
+    recurring_day: Optional[PositiveInt] = None
+    kind: Kinds
+    user_id: Optional[str] = None
+    category_id: Optional[str] = None
+    credit_card_id: Optional[str] = None
+    source_transaction_id: Optional[str] = None
+    is_virtual: bool = False
+
+    # Relationships
+    credit_card: Optional[TransactionCreditCard] = None
+    category: Optional[CategoryMapper] = None
+
+    @model_validator(mode="before")
+    @classmethod
+    def nest_view_columns(cls, data: Any) -> Any:
+        """Nest the flattened category and credit card of a transaction_view row."""
+        if not isinstance(data, TransactionView):
+            return data
+
+        values = {
+            field: getattr(data, field)
+            for field in cls.model_fields
+            if hasattr(data, field)
+        }
+        values["category"] = (
+            {"id": data.category_id, "description": data.category_description}
+            if data.category_id is not None
+            else None
+        )
+        values["credit_card"] = (
+            {"id": data.credit_card_id, "name": data.credit_card_name}
+            if data.credit_card_id is not None
+            else None
+        )
+        return values
+
+    @classmethod
+    def create(cls, transaction: TransactionView) -> Self:
+        """
+        Create a TransactionViewMapper instance from a TransactionView object.
+
+        Parameters
+        ----------
+        transaction : TransactionView
+            The TransactionView object to be mapped.
+
+        Returns
+        -------
+        TransactionViewMapper
+            A TransactionViewMapper instance representing the mapped transaction.
+        """
+        return cls.model_validate(transaction)
+
+    @classmethod
+    def create_occurrence(
+        cls, transaction: TransactionView, date: datetime.date, is_virtual: bool
+    ) -> Self:
+        """
+        Create a TransactionViewMapper for one occurrence of a transaction.
+
+        Parameters
+        ----------
+        transaction : TransactionView
+            The TransactionView object to be mapped.
+        date : datetime.date
+            The date of the occurrence.
+        is_virtual : bool
+            Whether the occurrence is an expansion of a fixed transaction rather
+            than the transaction itself.
+
+        Returns
+        -------
+        TransactionViewMapper
+            The mapped transaction, dated on the occurrence.
+        """
+        return cls.model_validate(transaction).model_copy(
+            update={"date": date, "is_virtual": is_virtual}
+        )
+
+
 class TransactionResponseMapper(ResponseMapper[TransactionMapper]):
     """Response model for transaction"""
 
@@ -363,47 +722,48 @@ class TransactionResponseMapper(ResponseMapper[TransactionMapper]):
         return cls(data=TransactionMapper.create(transaction))
 
 
-class TransactionsResponseMapper(ResponseMapper[List[TransactionMapper]]):
+class TransactionsResponseMapper(ResponseMapper[List[TransactionViewMapper]]):
     """Response model for transactions"""
 
     @classmethod
-    def create(cls, items: List[Transaction]) -> Self:
+    def create(cls, items: List[TransactionView]) -> Self:
         """
         Create a TransactionsResponseMapper instance.
 
         Parameters
         ----------
-        items : List[Transaction]
-            List of Transaction objects to be mapped.
+        items : List[TransactionView]
+            List of TransactionView objects to be mapped.
 
         Returns
         -------
         TransactionsResponseMapper
-            A TransactionsResponseMapper instance containing mapped Transaction objects.
+            A TransactionsResponseMapper instance containing mapped TransactionView
+            objects.
 
         Notes
         -----
         This method creates a TransactionsResponseMapper instance with the given list of
-        Transaction objects. It maps each Transaction object to a TransactionMapper
-        object using the TransactionMapper.create method and stores them in the 'data'
-        attribute of the TransactionsResponseMapper instance.
+        TransactionView objects. It maps each TransactionView object to a
+        TransactionViewMapper object using the TransactionViewMapper.create method and
+        stores them in the 'data' attribute of the TransactionsResponseMapper instance.
         """
         return cls(
             data=[
-                TransactionMapper.create(transaction) for transaction in items
+                TransactionViewMapper.create(transaction) for transaction in items
             ]
         )
 
 
 class PaginatedTransactionResponseMapper(
-    ResponseMapper[List[TransactionMapper]]
+    ResponseMapper[List[TransactionViewMapper]]
 ):
     """Response model for paginated transactions"""
 
     @classmethod
     def create(
         cls,
-        items: List[Transaction],
+        items: List[TransactionView],
         page: int,
         pages: int,
         size: int,
@@ -414,8 +774,8 @@ class PaginatedTransactionResponseMapper(
 
         Parameters
         ----------
-        items : List[Transaction]
-            List of Transaction objects representing the items in the current page.
+        items : List[TransactionView]
+            List of TransactionView objects representing the items in the current page.
         page : int
             The current page number.
         pages : int
@@ -434,8 +794,8 @@ class PaginatedTransactionResponseMapper(
         Notes
         -----
         This method creates a PaginatedTransactionResponseMapper instance with the given
-        parameters, including a list of Transaction objects representing the items in
-        the current page, pagination metadata such as page number, total pages, page
+        parameters, including a list of TransactionView objects representing the items
+        in the current page, pagination metadata such as page number, total pages, page
         size, and total number of items.
         """
         return cls(
@@ -444,10 +804,466 @@ class PaginatedTransactionResponseMapper(
         )
 
 
+class BulkOperationResult(BaseModel):
+    """Response model for a bulk update or delete"""
+
+    count: int
+    dry_run: bool
+
+
+class BulkOperationResponseMapper(ResponseMapper[BulkOperationResult]):
+    """Response model for bulk update and delete"""
+
+    @classmethod
+    def create(cls, count: int, dry_run: bool) -> Self:
+        """
+        Create a BulkOperationResponseMapper instance.
+
+        Parameters
+        ----------
+        count : int
+            Number of transactions affected, or that would be affected on a dry run.
+        dry_run : bool
+            Whether the transactions were only counted.
+
+        Returns
+        -------
+        BulkOperationResponseMapper
+            A BulkOperationResponseMapper instance containing the count.
+        """
+        return cls(data=BulkOperationResult(count=count, dry_run=dry_run))
+
+
+class DescriptionSuggestion(BaseModel):
+    """Response model for a description suggestion"""
+
+    description: str
+    count: int
+
+
+class DescriptionSuggestionsResponseMapper(
+    ResponseMapper[List[DescriptionSuggestion]]
+):
+    """Response model for description suggestions"""
+
+    @classmethod
+    def create(cls, suggestions: List[Tuple[str, int]]) -> Self:
+        """
+        Create a DescriptionSuggestionsResponseMapper instance.
+
+        Parameters
+        ----------
+        suggestions : List[Tuple[str, int]]
+            Pairs of description and use count, most used first.
+
+        Returns
+        -------
+        DescriptionSuggestionsResponseMapper
+            A DescriptionSuggestionsResponseMapper instance containing the mapped
+            suggestions.
+        """
+        return cls(
+            data=[
+                DescriptionSuggestion(description=description, count=count)
+                for description, count in suggestions
+            ]
+        )
+
+
+class TransactionSummary(BaseModel):
+    """
+    Response model for one group of a transactions summary
+
+    Only the columns of the requested groups are filled in.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    month: Optional[datetime.date] = None
+    category_id: Optional[str] = None
+    kind: Optional[str] = None
+    credit_card_id: Optional[str] = None
+    is_revenue: Optional[bool] = None
+    total: float
+    count: int
+
+
+class TransactionSummaryResponseMapper(ResponseMapper[List[TransactionSummary]]):
+    """Response model for transactions summary"""
+
+    @classmethod
+    def create(cls, rows: List[Any]) -> Self:
+        """
+        Create a TransactionSummaryResponseMapper instance.
+
+        Parameters
+        ----------
+        rows : List[Any]
+            Summary rows with the group columns, ``total`` and ``count``.
+
+        Returns
+        -------
+        TransactionSummaryResponseMapper
+            A TransactionSummaryResponseMapper instance containing the mapped rows.
+        """
+        return cls(data=[TransactionSummary.model_validate(row) for row in rows])
+
+
+class CashFlowMonth(BaseModel):
+    """Response model for one month of a cash flow forecast"""
+
+    month: datetime.date
+    inflow: float
+    outflow: float
+    net: float
+
+
+class CashFlowForecastResponseMapper(ResponseMapper[List[CashFlowMonth]]):
+    """Response model for cash flow forecast"""
+
+    @classmethod
+    def create(cls, cash_flow: CashFlow) -> Self:
+        """
+        Create a CashFlowForecastResponseMapper instance.
+
+        Parameters
+        ----------
+        cash_flow : CashFlow
+            The projected months with their inflow and outflow.
+
+        Returns
+        -------
+        CashFlowForecastResponseMapper
+            A CashFlowForecastResponseMapper instance containing one item per month.
+        """
+        return cls(
+            data=[
+                CashFlowMonth(month=month, inflow=inflow, outflow=outflow, net=net)
+                for month, inflow, outflow, net in zip(
+                    cash_flow.months,
+                    cash_flow.inflow.tolist(),
+                    cash_flow.outflow.tolist(),
+                    cash_flow.net.round(2).tolist(),
+                )
+            ]
+        )
+
+
+class CategorySpendSeries(BaseModel):
+    """Response model for the spend series of one category"""
+
+    category_id: Optional[str] = None
+    totals: List[float]
+    rolling_mean: List[float]
+    rolling_std: List[Optional[float]]
+
+
+class SpendOutlier(BaseModel):
+    """Response model for an expense that is an outlier for its category"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    description: str
+    category_id: Optional[str] = None
+    date: Optional[datetime.date] = None
+    amount: float
+    z_score: float
+
+
+class SpendAnalytics(BaseModel):
+    """
+    Response model for spend analytics
+
+    The series share the ``buckets``: the n-th item of each list belongs to the n-th
+    bucket.
+    """
+
+    period: AnalyticsPeriods
+    window: int
+    buckets: List[datetime.date]
+    series: List[CategorySpendSeries]
+    outliers: List[SpendOutlier]
+
+
+class SpendAnalyticsResponseMapper(ResponseMapper[SpendAnalytics]):
+    """Response model for spend analytics"""
+
+    @classmethod
+    def create(
+        cls,
+        period: AnalyticsPeriods,
+        window: int,
+        spend: SpendSeries,
+        outliers: List[Any],
+    ) -> Self:
+        """
+        Create a SpendAnalyticsResponseMapper instance.
+
+        Parameters
+        ----------
+        period : AnalyticsPeriods
+            The size of the buckets.
+        window : int
+            Number of buckets of the rolling window.
+        spend : SpendSeries
+            The buckets and the series of each category.
+        outliers : List[Any]
+            Outlier rows with the ``SpendOutlier`` columns.
+
+        Returns
+        -------
+        SpendAnalyticsResponseMapper
+            A SpendAnalyticsResponseMapper instance with the series and outliers.
+        """
+        return cls(
+            data=SpendAnalytics(
+                period=period,
+                window=window,
+                buckets=spend.buckets,
+                series=[
+                    CategorySpendSeries(
+                        category_id=category_id,
+                        totals=totals.tolist(),
+                        rolling_mean=rolling_mean.tolist(),
+                        rolling_std=to_list(rolling_std),
+                    )
+                    for category_id, totals, rolling_mean, rolling_std in zip(
+                        spend.categories,
+                        spend.totals,
+                        spend.rolling_mean,
+                        spend.rolling_std,
+                    )
+                ],
+                outliers=[SpendOutlier.model_validate(row) for row in outliers],
+            )
+        )
+
+
+class KindBalance(BaseModel):
+    """Response model for the balance of one kind of transaction"""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    kind: str
+    total: float
+
+
+class UserBalance(BaseModel):
+    """Response model for a user's balance"""
+
+    as_of: Optional[datetime.date] = None
+    total: float
+    kinds: List[KindBalance]
+
+
+class BalanceResponseMapper(ResponseMapper[UserBalance]):
+    """Response model for balance"""
+
+    @classmethod
+    def create(cls, rows: List[Any], as_of: Optional[datetime.date]) -> Self:
+        """
+        Create a BalanceResponseMapper instance.
+
+        Parameters
+        ----------
+        rows : List[Any]
+            Balance rows with ``kind`` and ``total``.
+        as_of : datetime.date, optional
+            The last day included in the balance, if any.
+
+        Returns
+        -------
+        BalanceResponseMapper
+            A BalanceResponseMapper instance with the total and the balance of each
+            kind.
+        """
+        kinds = [KindBalance.model_validate(row) for row in rows]
+        return cls(
+            data=UserBalance(
+                as_of=as_of,
+                total=round(sum(kind.total for kind in kinds), 2),
+                kinds=kinds,
+            )
+        )
+
+
+class TransactionSummaryParams(BaseModel):
+    """
+    Query string parameters for transactions summary
+
+    ``group_by`` takes comma separated dimensions, any of ``SummaryGroups``, for
+    example ``group_by=month,category``.
+    """
+
+    group_by: str = SummaryGroups.MONTH.value
+
+    def to_groups(self) -> List[SummaryGroups]:
+        """
+        Parse the ``group_by`` parameter.
+
+        Raises
+        ------
+        InvalidFilter
+            If a dimension is unknown.
+        """
+        try:
+            return TypeAdapter(List[SummaryGroups]).validate_python(
+                list(dict.fromkeys(self.group_by.split(",")))
+            )
+        except ValidationError as e:
+            raise InvalidFilter(f"Invalid group_by: {self.group_by}") from e
+
+
+class SpendAnalyticsParams(BaseModel):
+    """
+    Query string parameters for spend analytics
+
+    The range defaults to the last 90 days and spans up to ten years. ``window`` is
+    the number of days or weeks of the rolling statistics and ``threshold`` the
+    z-score from which an expense is an outlier.
+    """
+
+    MAX_DAYS: ClassVar[int] = 3653
+    DEFAULT_DAYS: ClassVar[int] = 90
+
+    start: Optional[datetime.date] = None
+    end: Optional[datetime.date] = None
+    period: AnalyticsPeriods = AnalyticsPeriods.DAY
+    window: PositiveInt = 7
+    threshold: PositiveFloat = 3.0
+
+    def to_range(self) -> Tuple[datetime.date, datetime.date]:
+        """
+        First and last day of the range.
+
+        Raises
+        ------
+        InvalidFilter
+            If the range is reversed or too long.
+        """
+        end = self.end or datetime.date.today()
+        start = self.start or end - datetime.timedelta(days=self.DEFAULT_DAYS - 1)
+        if start > end:
+            raise InvalidFilter("'start' must not be after 'end'")
+        if (end - start).days >= self.MAX_DAYS:
+            raise InvalidFilter(f"The range spans up to {self.MAX_DAYS} days")
+        return start, end
+
+
 class TransactionFilters(BaseModel):
+    """
+    Query string filters for transactions
+
+    Each field is named '<field>__<operator>' and the filters are combined with AND.
+    Multi-value operators ('in', 'between') take comma separated values, for example
+    ``category_id__in=<id>,<id>`` or ``date__between=2024-01-01,2024-03-31``.
+
+    OR groups are given through the ``any_of`` parameter, each group in the form
+    ``<field>__<operator>:<value>|<field>__<operator>:<value>`` and groups separated
+    by ``;``, for example ``any_of=kind__in:pix,cash|amount__gte:100``. Terms inside a
+    group are combined with OR and the groups are combined with the other filters
+    with AND.
+
+    Range filters on unindexed fields (such as ``amount``) must come together with a
+    filter on an indexed field, or with ``allow_unindexed=true``.
+
+    ``search`` matches descriptions by words, substring or similarity and ranks the
+    results by relevance.
+
+    ``expand_fixed`` lists fixed transactions once for each of their occurrences in
+    the requested date range, which must then have both a lower and an upper bound.
+    """
+
     date__gt: Optional[datetime.date] = None
     date__lt: Optional[datetime.date] = None
+    date__gte: Optional[datetime.date] = None
+    date__lte: Optional[datetime.date] = None
+    date__between: Optional[str] = None
+    amount__gt: Optional[float] = None
+    amount__lt: Optional[float] = None
+    amount__gte: Optional[float] = None
+    amount__lte: Optional[float] = None
+    amount__between: Optional[str] = None
     category_id__eq: Optional[str] = None
+    category_id__in: Optional[str] = None
+    credit_card_id__eq: Optional[str] = None
+    credit_card_id__in: Optional[str] = None
     kind__eq: Optional[str] = None
+    kind__in: Optional[str] = None
     is_fixed__eq: Optional[bool] = None
     is_revenue__eq: Optional[bool] = None
+    any_of: Optional[str] = None
+    allow_unindexed: bool = False
+    search: Optional[str] = None
+    expand_fixed: bool = False
+
+    MULTI_VALUE_TYPES: ClassVar[Dict[str, Any]] = {
+        "date__between": List[datetime.date],
+        "amount__between": List[float],
+        "category_id__in": List[str],
+        "credit_card_id__in": List[str],
+        "kind__in": List[Kinds],
+    }
+    OPTIONS: ClassVar[set] = {"any_of", "allow_unindexed", "search", "expand_fixed"}
+
+    def to_filters(self) -> Dict[str, Any]:
+        """
+        Return the AND filters in the '<field>__<operator>' form.
+
+        Raises
+        ------
+        InvalidFilter
+            If a multi-value filter has an invalid value.
+        """
+        filters = self.model_dump(exclude_none=True, exclude=self.OPTIONS)
+        return {
+            key: self._parse_value(key, value) if key in self.MULTI_VALUE_TYPES
+            else value
+            for key, value in filters.items()
+        }
+
+    def to_or_groups(self) -> List[List[Tuple[str, Any]]]:
+        """
+        Parse the ``any_of`` parameter into groups of '<field>__<operator>' terms.
+
+        Each value is validated with the type of the matching filter field.
+
+        Returns
+        -------
+        List[List[Tuple[str, Any]]]
+            One list of (key, value) terms per OR group.
+
+        Raises
+        ------
+        InvalidFilter
+            If a term is malformed, unknown or its value has an invalid type.
+        """
+        if not self.any_of:
+            return []
+
+        return [self._parse_or_group(group) for group in self.any_of.split(";")]
+
+    @classmethod
+    def _parse_or_group(cls, group: str) -> List[Tuple[str, Any]]:
+        terms = []
+        for term in group.split("|"):
+            key, separator, raw_value = term.partition(":")
+            if not separator or key not in cls.model_fields or key in cls.OPTIONS:
+                raise InvalidFilter(f"Invalid OR filter term '{term}'")
+
+            terms.append((key, cls._parse_value(key, raw_value)))
+
+        return terms
+
+    @classmethod
+    def _parse_value(cls, key: str, raw_value: str) -> Any:
+        try:
+            if key in cls.MULTI_VALUE_TYPES:
+                return TypeAdapter(cls.MULTI_VALUE_TYPES[key]).validate_python(
+                    raw_value.split(",")
+                )
+
+            return getattr(cls.model_validate({key: raw_value}), key)
+        except ValidationError as e:
+            raise InvalidFilter(f"Invalid value for '{key}': {raw_value}") from e
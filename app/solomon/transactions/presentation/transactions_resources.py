@@ -1,5 +1,8 @@
+from datetime import date
+from typing import Optional
+
 import openpyxl  # noqa
-from fastapi import Depends
+from fastapi import Depends, Query
 from fastapi.exceptions import HTTPException
 from fastapi.responses import StreamingResponse
 from fastapi.routing import APIRouter
@@ -11,7 +14,7 @@ from app.solomon.auth.presentation.models import (
     UserTokenAuthenticated,
 )
 from app.solomon.common.data_transformation import DataTransformationError
-from app.solomon.common.exceptions import ExcelGenerationError
+from app.solomon.common.exceptions import ExcelGenerationError, InvalidFilter
 from app.solomon.transactions.application.dependencies import get_transaction_service
 from app.solomon.transactions.application.services import TransactionService
 from app.solomon.transactions.domain.exceptions import (
@@ -19,10 +22,20 @@ from app.solomon.transactions.domain.exceptions import (
     TransactionNotFound,
 )
 from app.solomon.transactions.presentation.models import (
+    BalanceResponseMapper,
+    BulkOperationResponseMapper,
+    CashFlowForecastResponseMapper,
+    DescriptionSuggestionsResponseMapper,
     PaginatedTransactionResponseMapper,
+    SpendAnalyticsParams,
+    SpendAnalyticsResponseMapper,
+    TransactionBulkUpdate,
     TransactionCreate,
     TransactionFilters,
     TransactionResponseMapper,
+    TransactionSummaryParams,
+    TransactionSummaryResponseMapper,
+    TransactionUpdate,
 )
 
 transaction_router = APIRouter()
@@ -80,6 +93,10 @@ async def export_transactions(
             media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", # noqa
             headers={"Content-Disposition": "attachment; filename=transactions.xlsx"},
         )
+    except InvalidFilter as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
     except (
         NoTransactionsFound,
         DataTransformationError,
@@ -92,6 +109,165 @@ async def export_transactions(
         )
 
 
+@transaction_router.get("/summary")
+async def summarize_transactions(
+    transaction_service: TransactionService = Depends(get_transaction_service),
+    current_user: UserTokenAuthenticated = Depends(get_current_user),
+    params: TransactionSummaryParams = Depends(),
+    filters: TransactionFilters = Depends(),
+) -> TransactionSummaryResponseMapper:
+    """
+    Sum the current user's transactions grouped by month, category, kind, credit
+    card and/or revenue.
+
+    Parameters
+    ----------
+    transaction_service : TransactionService, optional
+        The service to be used to summarize the transactions, by default
+        Depends(get_transaction_service)
+    current_user : UserTokenAuthenticated, optional
+        The current user, by default Depends(get_current_user)
+    params : TransactionSummaryParams
+        The dimensions to group by
+    filters : TransactionFilters
+        The filters to be applied
+
+    Returns
+    -------
+    TransactionSummaryResponseMapper
+        One total and count per group.
+    """
+    try:
+        return transaction_service.summarize_transactions(
+            current_user.id, params, filters
+        )
+    except InvalidFilter as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
+
+
+@transaction_router.get("/forecast")
+async def forecast_cash_flow(
+    months: int = Query(12, ge=1, le=24),
+    transaction_service: TransactionService = Depends(get_transaction_service),
+    current_user: UserTokenAuthenticated = Depends(get_current_user),
+) -> CashFlowForecastResponseMapper:
+    """
+    Forecast the current user's monthly cash flow from future installments and
+    fixed transactions, starting at the current month.
+
+    Parameters
+    ----------
+    months : int
+        Number of months to forecast, up to 24.
+    transaction_service : TransactionService, optional
+        The service to be used to forecast the cash flow, by default
+        Depends(get_transaction_service)
+    current_user : UserTokenAuthenticated, optional
+        The current user, by default Depends(get_current_user)
+
+    Returns
+    -------
+    CashFlowForecastResponseMapper
+        Inflow, outflow and net of each month.
+    """
+    return transaction_service.forecast_cash_flow(current_user.id, months)
+
+
+@transaction_router.get("/analytics")
+async def get_spend_analytics(
+    transaction_service: TransactionService = Depends(get_transaction_service),
+    current_user: UserTokenAuthenticated = Depends(get_current_user),
+    params: SpendAnalyticsParams = Depends(),
+) -> SpendAnalyticsResponseMapper:
+    """
+    Get the current user's daily or weekly spend series per category, with their
+    rolling mean and standard deviation, and the expenses that are statistical
+    outliers for their category.
+
+    Parameters
+    ----------
+    transaction_service : TransactionService, optional
+        The service to be used to analyze the transactions, by default
+        Depends(get_transaction_service)
+    current_user : UserTokenAuthenticated, optional
+        The current user, by default Depends(get_current_user)
+    params : SpendAnalyticsParams
+        The range, bucket size, rolling window and outlier threshold.
+
+    Returns
+    -------
+    SpendAnalyticsResponseMapper
+        The spend series of each category and the outliers.
+    """
+    try:
+        return transaction_service.get_spend_analytics(current_user.id, params)
+    except InvalidFilter as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
+
+
+@transaction_router.get("/balance")
+async def get_balance(
+    as_of: Optional[date] = Query(None),
+    transaction_service: TransactionService = Depends(get_transaction_service),
+    current_user: UserTokenAuthenticated = Depends(get_current_user),
+) -> BalanceResponseMapper:
+    """
+    Get the current user's balance, in total and per kind of transaction.
+
+    Parameters
+    ----------
+    as_of : date, optional
+        The last day included in the balance, by default every transaction.
+    transaction_service : TransactionService, optional
+        The service to be used to get the balance, by default
+        Depends(get_transaction_service)
+    current_user : UserTokenAuthenticated, optional
+        The current user, by default Depends(get_current_user)
+
+    Returns
+    -------
+    BalanceResponseMapper
+        The total balance and the balance of each kind of transaction.
+    """
+    return transaction_service.get_balance(current_user.id, as_of)
+
+
+@transaction_router.get("/autocomplete")
+async def autocomplete_descriptions(
+    prefix: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+    transaction_service: TransactionService = Depends(get_transaction_service),
+    current_user: UserTokenAuthenticated = Depends(get_current_user),
+) -> DescriptionSuggestionsResponseMapper:
+    """
+    Suggest descriptions from the current user's past transactions.
+
+    Parameters
+    ----------
+    prefix : str
+        The typed prefix, matched case-insensitively.
+    limit : int
+        Maximum number of suggestions, by default 10.
+    transaction_service : TransactionService, optional
+        The service to be used to suggest the descriptions, by default
+        Depends(get_transaction_service)
+    current_user : UserTokenAuthenticated, optional
+        The current user, by default Depends(get_current_user)
+
+    Returns
+    -------
+    DescriptionSuggestionsResponseMapper
+        The matching descriptions with their use counts, most used first.
+    """
+    return transaction_service.autocomplete_descriptions(
+        current_user.id, prefix, limit
+    )
+
+
 @transaction_router.get("/{transaction_id}")
 async def get_transaction(
     transaction_id: str,
@@ -125,6 +301,45 @@ async def get_transaction(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
 
 
+@transaction_router.put("/{transaction_id}")
+async def update_transaction(
+    transaction_id: str,
+    transaction_update: TransactionUpdate,
+    transaction_service: TransactionService = Depends(get_transaction_service),
+    current_user: UserTokenAuthenticated = Depends(get_current_user),
+) -> TransactionResponseMapper:
+    """
+    Update a transaction.
+
+    Changing the amount, date or number of installments of a credit card purchase
+    regenerates its installments, keeping the monthly rollups and the credit card's
+    committed amount up to date.
+
+    Parameters
+    ----------
+    transaction_id : str
+        The ID of the transaction to be updated.
+    transaction_update : TransactionUpdate
+        The new data for the transaction.
+    transaction_service : TransactionService, optional
+        The service to be used to update the transaction, by default
+        Depends(get_transaction_service)
+    current_user : UserTokenAuthenticated, optional
+        The current user, by default Depends(get_current_user)
+
+    Returns
+    -------
+    Transaction
+        The updated transaction.
+    """
+    try:
+        return transaction_service.update_transaction(
+            transaction_id, current_user.id, transaction_update
+        )
+    except TransactionNotFound as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e)) from e
+
+
 @transaction_router.get("/")
 async def get_transactions(
     transaction_service: TransactionService = Depends(get_transaction_service),
@@ -155,8 +370,96 @@ async def get_transactions(
     PaginatedTransactionResponseMapper
         The retrieved transactions.
     """
-    paginated_transactions = transaction_service.get_transactions(
-        current_user.id, pagination, filters
-    )
+    try:
+        return transaction_service.get_transactions(
+            current_user.id, pagination, filters
+        )
+    except InvalidFilter as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
 
-    return paginated_transactions
+
+@transaction_router.patch("/")
+async def bulk_update_transactions(
+    transaction_update: TransactionBulkUpdate,
+    dry_run: bool = Query(False),
+    transaction_service: TransactionService = Depends(get_transaction_service),
+    current_user: UserTokenAuthenticated = Depends(get_current_user),
+    filters: TransactionFilters = Depends(),
+) -> BulkOperationResponseMapper:
+    """
+    Update every transaction of the current user matching the filters.
+
+    The transactions are updated with a single statement. At least one filter is
+    required, so that all transactions are not updated by mistake.
+
+    Parameters
+    ----------
+    transaction_update : TransactionBulkUpdate
+        The new data for the transactions.
+    dry_run : bool
+        Only count the transactions that would be updated, by default False.
+    transaction_service : TransactionService, optional
+        The service to be used to update the transactions, by default
+        Depends(get_transaction_service)
+    current_user : UserTokenAuthenticated, optional
+        The current user, by default Depends(get_current_user)
+    filters : TransactionFilters
+        The filters selecting the transactions to update.
+
+    Returns
+    -------
+    BulkOperationResponseMapper
+        The number of updated transactions.
+    """
+    try:
+        return transaction_service.bulk_update_transactions(
+            current_user.id, filters, transaction_update, dry_run
+        )
+    except InvalidFilter as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
+
+
+@transaction_router.delete("/")
+async def bulk_delete_transactions(
+    dry_run: bool = Query(False),
+    transaction_service: TransactionService = Depends(get_transaction_service),
+    current_user: UserTokenAuthenticated = Depends(get_current_user),
+    filters: TransactionFilters = Depends(),
+) -> BulkOperationResponseMapper:
+    """
+    Delete every transaction of the current user matching the filters, with their
+    installments.
+
+    The transactions are deleted with a single statement, keeping the monthly
+    rollups and the credit cards' committed amounts up to date. At least one filter
+    is required, so that all transactions are not deleted by mistake.
+
+    Parameters
+    ----------
+    dry_run : bool
+        Only count the transactions that would be deleted, by default False.
+    transaction_service : TransactionService, optional
+        The service to be used to delete the transactions, by default
+        Depends(get_transaction_service)
+    current_user : UserTokenAuthenticated, optional
+        The current user, by default Depends(get_current_user)
+    filters : TransactionFilters
+        The filters selecting the transactions to delete.
+
+    Returns
+    -------
+    BulkOperationResponseMapper
+        The number of deleted transactions.
+    """
+    try:
+        return transaction_service.bulk_delete_transactions(
+            current_user.id, filters, dry_run
+        )
+    except InvalidFilter as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)
+        ) from e
@@ -1,14 +1,38 @@
+from typing import Iterator
+
 from fastapi import Depends
+from sqlalchemy.orm import Session
 
-from app.solomon.infrastructure.database import get_repository
+from app.solomon.infrastructure.database import (
+    SHARDS,
+    create_session,
+    get_db_session,
+)
 from app.solomon.users.application.services import UserService
-from app.solomon.users.infrastructure.repositories import UserRepository
+from app.solomon.users.infrastructure.repositories import ShardedUserRepository
+
+
+def get_sharded_user_repository(
+    session: Session = Depends(get_db_session),
+) -> Iterator[ShardedUserRepository]:
+    """
+    Factory for ShardedUserRepository, on the request session when there is a
+    single shard, else on a session of its own on each shard.
+    """
+    if len(SHARDS.names) == 1:
+        yield ShardedUserRepository({SHARDS.default: session})
+        return
 
-get_user_repository = get_repository(UserRepository)
+    sessions = {shard: create_session(shard) for shard in SHARDS.names}
+    try:
+        yield ShardedUserRepository(sessions)
+    finally:
+        for shard_session in sessions.values():
+            shard_session.close()
 
 
 def get_user_service(
-    user_repository: UserRepository = Depends(get_user_repository),
+    user_repository: ShardedUserRepository = Depends(get_sharded_user_repository),
 ) -> UserService:
     """Factory for UserService"""
     return UserService(user_repository)
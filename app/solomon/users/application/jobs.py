@@ -0,0 +1,16 @@
+"""Users Jobs Module"""
+
+from typing import List, Optional
+
+from app.solomon.infrastructure.config import JOBS_BATCH_SIZE
+from app.solomon.infrastructure.database import create_session
+from app.solomon.users.infrastructure.repositories import UserRepository
+
+
+def next_user_batch(last_id: Optional[str]) -> List[str]:
+    """
+    Get the batch of ``JOBS_BATCH_SIZE`` user ids following ``last_id``, for jobs
+    that go through all users with ``run_in_batches``.
+    """
+    with create_session() as session:
+        return UserRepository(session).get_ids_after(last_id, JOBS_BATCH_SIZE)
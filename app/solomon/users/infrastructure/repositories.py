@@ -1,3 +1,10 @@
+from typing import Dict, List, Optional
+from uuid import uuid4
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.solomon.infrastructure.database import SHARDS
 from app.solomon.users.domain.models import User
 
 
@@ -9,15 +16,28 @@ class UserRepository:
 
     def get_by_id(self, user_id) -> User | None:
         """Get a user by id."""
-        return self.session.query(User).filter_by(id=user_id).first()
+        return self.session.scalars(
+            select(User).where(User.id == user_id)
+        ).first()
 
     def get_by_email(self, email) -> User | None:
         """Get a user by email."""
-        return self.session.query(User).filter_by(email=email).first()
+        return self.session.scalars(
+            select(User).where(User.email == email)
+        ).first()
 
     def get_by_username(self, username) -> User | None:
         """Get a user by username."""
-        return self.session.query(User).filter_by(username=username).first()
+        return self.session.scalars(
+            select(User).where(User.username == username)
+        ).first()
+
+    def get_ids_after(self, last_id: Optional[str], limit: int) -> List[str]:
+        """Get the next ``limit`` user ids after ``last_id``, in id order."""
+        statement = select(User.id).order_by(User.id).limit(limit)
+        if last_id is not None:
+            statement = statement.where(User.id > last_id)
+        return list(self.session.scalars(statement))
 
     def commit(self):
         """Commit the current transaction."""
@@ -29,3 +49,48 @@ class UserRepository:
         self.session.add(instance)
         self.commit()
         return instance
+
+
+class ShardedUserRepository:
+    """
+    User repository spanning every shard, for the requests made before the user
+    is known, i.e. signing up and logging in. Users are looked up on each shard in
+    turn and created on the shard of their bucket.
+
+    Parameters
+    ----------
+    sessions : Dict[str, Session]
+        A session on each shard, by shard name.
+    """
+
+    def __init__(self, sessions: Dict[str, Session]):
+        self.sessions = sessions
+        self.repositories = {
+            shard: UserRepository(session) for shard, session in sessions.items()
+        }
+
+    def get_by_id(self, user_id) -> User | None:
+        """Get a user by id."""
+        return self._find(lambda repository: repository.get_by_id(user_id))
+
+    def get_by_email(self, email) -> User | None:
+        """Get a user by email."""
+        return self._find(lambda repository: repository.get_by_email(email))
+
+    def get_by_username(self, username) -> User | None:
+        """Get a user by username."""
+        return self._find(lambda repository: repository.get_by_username(username))
+
+    def create(self, **kwargs) -> User:
+        """Create a new user on the shard of their bucket."""
+        user_id = str(uuid4())
+        return self.repositories[SHARDS.shard_for(user_id)].create(
+            id=user_id, **kwargs
+        )
+
+    def _find(self, get) -> User | None:
+        for repository in self.repositories.values():
+            user = get(repository)
+            if user is not None:
+                return user
+        return None
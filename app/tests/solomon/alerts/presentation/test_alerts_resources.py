@@ -0,0 +1,133 @@
+import datetime
+
+from fastapi.encoders import jsonable_encoder
+from fastapi_sqlalchemy import db
+
+from app.solomon.alerts.application.jobs import dispatch_alert_batch
+from app.solomon.alerts.domain.options import AlertTypes
+from app.solomon.transactions.domain.options import Kinds
+
+
+class TestAlertsResources:
+    def test_credit_card_limit_alert(
+        self,
+        auth_client,
+        current_user,
+        category_factory,
+        credit_card_factory,
+        transaction_create_factory,
+    ):
+        with db():
+            category = category_factory.create()
+            credit_card = credit_card_factory.create(
+                user=current_user, limit=1000.0, alert_threshold=80
+            )
+            alerts, transaction_ids = [], []
+            for amount in (500.0, 400.0, 50.0):
+                body = transaction_create_factory.build(
+                    kind=Kinds.CREDIT.value,
+                    is_fixed=False,
+                    recurring_day=None,
+                    credit_card_id=credit_card.id,
+                    category_id=category.id,
+                    amount=amount,
+                    installments_number=1,
+                    date=datetime.date.today(),
+                )
+                response = auth_client.post(
+                    "/transactions/", json=jsonable_encoder(body.model_dump())
+                )
+                transaction_ids.append(response.json()["data"]["id"])
+                alerts.append(len(auth_client.get("/alerts/").json()["data"]))
+
+            # editing a transaction of the card does not cross the threshold again
+            for description in ("Rename", "Rename again"):
+                auth_client.put(
+                    f"/transactions/{transaction_ids[1]}",
+                    json={"description": description},
+                )
+            alerts.append(len(auth_client.get("/alerts/").json()["data"]))
+
+            alert = auth_client.get("/alerts/").json()["data"][0]
+
+            assert alerts == [0, 1, 1, 1]
+            assert alert["type"] == AlertTypes.CREDIT_CARD_LIMIT.value
+            assert alert["payload"] == {
+                "credit_card_id": credit_card.id,
+                "limit": 1000.0,
+                "committed": 900.0,
+                "threshold": 80,
+            }
+
+    def test_budget_exceeded_alert(
+        self, auth_client, current_user, category_factory, transaction_create_factory
+    ):
+        with db():
+            category = category_factory.create()
+            budget = auth_client.post(
+                "/budgets/", json={"category_id": category.id, "amount": 200.0}
+            ).json()["data"]
+            alerts = []
+            for amount in (150.0, 100.0, 10.0):
+                body = transaction_create_factory.build(
+                    kind=Kinds.PIX.value,
+                    is_fixed=False,
+                    recurring_day=None,
+                    is_revenue=False,
+                    category_id=category.id,
+                    amount=amount,
+                    date=datetime.date(2024, 1, 10),
+                )
+                auth_client.post(
+                    "/transactions/", json=jsonable_encoder(body.model_dump())
+                )
+                alerts.append(len(auth_client.get("/alerts/").json()["data"]))
+
+            alert = auth_client.get("/alerts/").json()["data"][0]
+
+            assert alerts == [0, 1, 1]
+            assert alert["type"] == AlertTypes.BUDGET_EXCEEDED.value
+            assert alert["payload"] == {
+                "budget_id": budget["id"],
+                "category_id": category.id,
+                "month": "2024-01-01",
+                "amount": 200.0,
+                "spent": 250.0,
+                "threshold": 100,
+            }
+            assert alert["dispatched_at"] is None
+
+    def test_dispatch_alerts(
+        self, auth_client, current_user, category_factory, transaction_create_factory
+    ):
+        with db():
+            category = category_factory.create()
+            auth_client.post(
+                "/budgets/",
+                json={
+                    "category_id": category.id,
+                    "amount": 100.0,
+                    "alert_threshold": 50,
+                },
+            )
+            body = transaction_create_factory.build(
+                kind=Kinds.PIX.value,
+                is_fixed=False,
+                recurring_day=None,
+                is_revenue=False,
+                category_id=category.id,
+                amount=60.0,
+                date=datetime.date(2024, 1, 10),
+            )
+            auth_client.post("/transactions/", json=jsonable_encoder(body.model_dump()))
+
+            delivered = []
+            dispatched = dispatch_alert_batch(
+                lambda alert: delivered.append(alert.type)
+            )
+
+            assert dispatched == 1
+            assert delivered == [AlertTypes.BUDGET_EXCEEDED.value]
+            assert dispatch_alert_batch(delivered.append) == 0
+            alert = auth_client.get("/alerts/").json()["data"][0]
+            assert alert["dispatched_at"] is not None
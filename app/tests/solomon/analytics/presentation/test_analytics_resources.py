@@ -0,0 +1,96 @@
+import datetime
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from fastapi_sqlalchemy import db
+
+from app.solomon.analytics.application.dependencies import get_snapshot_store
+from app.solomon.analytics.application.jobs import snapshot_user_entries
+from app.solomon.analytics.infrastructure.snapshots import SnapshotStore
+from app.solomon.main import app
+from app.solomon.transactions.domain.options import Kinds
+
+
+@pytest.fixture
+def snapshot_store(tmp_path):
+    store = SnapshotStore(str(tmp_path))
+    app.dependency_overrides[get_snapshot_store] = lambda: store
+    yield store
+    del app.dependency_overrides[get_snapshot_store]
+
+
+class TestAnalyticsResources:
+    def test_summarize_entries(
+        self,
+        auth_client,
+        current_user,
+        snapshot_store,
+        category_factory,
+        credit_card_factory,
+        transaction_create_factory,
+    ):
+        with db():
+            category = category_factory.create()
+            credit_card = credit_card_factory.create(user=current_user)
+            ids = []
+            for kind, is_revenue, amount, installments_number, day in (
+                (Kinds.PIX.value, True, 1000.0, 1, datetime.date(2024, 1, 5)),
+                (Kinds.PIX.value, False, 200.0, 1, datetime.date(2024, 1, 10)),
+                (Kinds.CREDIT.value, False, 300.0, 3, datetime.date(2024, 1, 15)),
+            ):
+                body = transaction_create_factory.build(
+                    kind=kind,
+                    is_fixed=False,
+                    recurring_day=None,
+                    is_revenue=is_revenue,
+                    credit_card_id=credit_card.id,
+                    category_id=category.id,
+                    amount=amount,
+                    installments_number=installments_number,
+                    date=day,
+                )
+                response = auth_client.post(
+                    "/transactions/", json=jsonable_encoder(body.model_dump())
+                )
+                ids.append(response.json()["data"]["id"])
+
+            def summary(query):
+                response = auth_client.get(f"/analytics/summary?{query}")
+                return [
+                    (group["month"], group["is_revenue"], group["total"])
+                    for group in response.json()["data"]["groups"]
+                ]
+
+            snapshot_user_entries([current_user.id], snapshot_store)
+
+            assert summary("group_by=month,is_revenue") == [
+                ("2024-01-01", False, 300.0),
+                ("2024-01-01", True, 1000.0),
+                ("2024-02-01", False, 100.0),
+                ("2024-03-01", False, 100.0),
+            ]
+            assert summary(
+                "group_by=month,is_revenue&is_revenue=false&start=2024-02-01"
+            ) == [("2024-02-01", False, 100.0), ("2024-03-01", False, 100.0)]
+
+            auth_client.put(f"/transactions/{ids[1]}", json={"amount": 150.0})
+            auth_client.delete(f"/transactions/?kind__eq={Kinds.CREDIT.value}")
+            state = snapshot_store.get_state(current_user.id)
+
+            snapshot_user_entries([current_user.id], snapshot_store)
+
+            assert summary("group_by=month,is_revenue") == [
+                ("2024-01-01", False, 150.0),
+                ("2024-01-01", True, 1000.0),
+            ]
+            assert snapshot_store.get_state(current_user.id).synced_at > state.synced_at
+            assert list(snapshot_store.get_state(current_user.id).months) == [
+                datetime.date(2024, 1, 1)
+            ]
+
+    def test_summarize_entries_without_snapshot(self, auth_client, snapshot_store):
+        with db():
+            response = auth_client.get("/analytics/summary")
+
+            assert response.status_code == 404
+            assert response.json()["detail"] == "No analytics snapshot yet."
@@ -0,0 +1,87 @@
+import datetime
+
+from fastapi.encoders import jsonable_encoder
+from fastapi_sqlalchemy import db
+from sqlalchemy import func, select
+
+from app.solomon.commands.move_user import move_user
+from app.solomon.infrastructure.database import create_session
+from app.solomon.infrastructure.shards import Placement, locate_user, shard_placements
+from app.solomon.transactions.domain.models import Transaction, TransactionView
+from app.solomon.transactions.domain.options import Kinds
+from app.solomon.users.domain.models import User
+
+
+def count_transactions(shard, user_id):
+    with create_session(shard) as session:
+        return (
+            session.scalar(select(func.count()).where(Transaction.user_id == user_id)),
+            session.scalar(
+                select(func.count()).where(TransactionView.user_id == user_id)
+            ),
+        )
+
+
+class TestMoveUser:
+    def test_move_user(
+        self,
+        shards,
+        auth_client,
+        current_user,
+        category_factory,
+        credit_card_factory,
+        transaction_create_factory,
+    ):
+        with db():
+            user_id = current_user.id
+            category_id = category_factory.create().id
+            credit_card_id = credit_card_factory.create(user=current_user).id
+            db.session.commit()
+
+        def create_transaction(kind, installments_number):
+            body = transaction_create_factory.build(
+                kind=kind,
+                is_fixed=False,
+                recurring_day=None,
+                credit_card_id=credit_card_id,
+                category_id=category_id,
+                amount=300.0,
+                installments_number=installments_number,
+                date=datetime.date(2024, 1, 15),
+            )
+            return auth_client.post(
+                "/transactions/", json=jsonable_encoder(body.model_dump())
+            )
+
+        create_transaction(Kinds.PIX.value, 1)
+        create_transaction(Kinds.CREDIT.value, 3)
+
+        moved = move_user(user_id, "other", grace=0, pin_ttl=0)
+
+        assert moved["users"] == 1
+        assert moved["credit_cards"] == 1
+        assert moved["transactions"] == 2
+        assert moved["installments"] == 3
+        assert locate_user(user_id) == Placement(shard="other", is_moving=False)
+        assert count_transactions("main", user_id) == (0, 0)
+        assert count_transactions("other", user_id) == (2, 2)
+        with create_session("main") as session:
+            assert session.get(User, user_id) is None
+
+        # once the cached placements expire, the user's requests are served by
+        # the other shard
+        shard_placements.clear()
+        response = auth_client.get("/transactions/")
+        assert response.json()["meta"]["total"] == 2
+
+        assert create_transaction(Kinds.PIX.value, 1).status_code == 201
+        assert count_transactions("main", user_id) == (0, 0)
+        assert count_transactions("other", user_id) == (3, 3)
+
+        # moving the user back to the shard of their bucket removes their pin
+        move_user(user_id, "main", grace=0, pin_ttl=0)
+        shard_placements.clear()
+
+        assert locate_user(user_id) == Placement(shard="main", is_moving=False)
+        assert count_transactions("main", user_id) == (3, 3)
+        assert auth_client.get("/transactions/").json()["meta"]["total"] == 3
@@ -0,0 +1,38 @@
+import datetime
+
+from fastapi_sqlalchemy import db
+
+from app.solomon.commands.rebuild_rollups import rebuild_rollups
+from app.solomon.transactions.domain.models import MonthlyRollup
+from app.solomon.transactions.domain.options import Kinds
+
+
+class TestRebuildRollups:
+    def test_rebuild_rollups(
+        self, client, user_factory, category_factory, transaction_factory
+    ):
+        with db():
+            category = category_factory.create()
+            users = user_factory.create_batch(3)
+            for user in users:
+                transaction_factory.create_batch(
+                    2,
+                    user=user,
+                    category=category,
+                    kind=Kinds.PIX.value,
+                    is_revenue=False,
+                    amount=10.0,
+                    date=datetime.date(2024, 1, 15),
+                )
+
+            rebuilt = rebuild_rollups(db.session, batch_size=2)
+            # rebuilding again replaces the rows instead of adding to them
+            rebuild_rollups(db.session, user_id=users[0].id)
+
+            rollups = db.session.query(MonthlyRollup).all()
+
+            assert rebuilt == 3
+            assert sorted(rollup.user_id for rollup in rollups) == sorted(
+                user.id for user in users
+            )
+            assert {(rollup.total, rollup.count) for rollup in rollups} == {(20.0, 2)}
@@ -1,8 +1,12 @@
+from argparse import Namespace
+
 import pytest
+from alembic import command
+from alembic.config import Config
 from fastapi.testclient import TestClient
 from fastapi_sqlalchemy import db
 from pytest_factoryboy import register
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, make_url, text
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 
@@ -12,10 +16,12 @@ from app.solomon.auth.application.security import (
 )
 from app.solomon.infrastructure.config import DATABASE_URL
 from app.solomon.infrastructure.database import (
+    SHARDS,
     Base,
-    CustomQuery,
+    ShardMap,
     get_db_session,
 )
+from app.solomon.infrastructure.shards import shard_placements
 from app.solomon.main import app
 from app.solomon.users.domain.models import User
 from app.tests.solomon.factories.category_factory import CategoryFactory
@@ -28,9 +34,8 @@ from app.tests.solomon.factories.transaction_factory import (
 from app.tests.solomon.factories.user_factory import UserFactory
 
 engine = create_engine(DATABASE_URL)
-TestingSessionLocal = sessionmaker(
-    autocommit=False, autoflush=False, bind=engine, query_cls=CustomQuery
-)
+OTHER_DATABASE_URL = make_url(DATABASE_URL).set(database="solomon-test-other")
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
 def override_get_db():
@@ -63,6 +68,59 @@ def client():
     clear_data(engine)
 
 
+@pytest.fixture
+def other_database(client, monkeypatch) -> str:
+    """
+    A second database with the schema of the test database, created and migrated
+    on the fly, standing in for another shard or a replica. Requests get their
+    session from the shard and replica routing instead of the testing session.
+    """
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        if not conn.scalar(
+            text("SELECT EXISTS (SELECT FROM pg_database WHERE datname = :name)"),
+            {"name": OTHER_DATABASE_URL.database},
+        ):
+            conn.execute(text(f'CREATE DATABASE "{OTHER_DATABASE_URL.database}"'))
+
+    url = OTHER_DATABASE_URL.render_as_string(hide_password=False)
+    alembic_config = Config()
+    alembic_config.set_main_option("script_location", "app/solomon/migrations")
+    alembic_config.cmd_opts = Namespace(x=["shard=other"])
+    with monkeypatch.context() as patch:
+        patch.setattr(SHARDS, "urls", {**SHARDS.urls, "other": url})
+        command.upgrade(alembic_config, "head")
+    monkeypatch.delitem(app.dependency_overrides, get_db_session, raising=False)
+
+    yield url
+
+    other_engine = create_engine(url)
+    clear_data(other_engine)
+    other_engine.dispose()
+
+
+@pytest.fixture
+def shards(other_database, monkeypatch) -> ShardMap:
+    """
+    Spread the users over the test database, shard "main", and the other database,
+    shard "other". Every bucket is on "main".
+    """
+    monkeypatch.setattr(SHARDS, "urls", {"main": DATABASE_URL, "other": other_database})
+    monkeypatch.setattr(SHARDS, "buckets", ["main"])
+    yield SHARDS
+
+    shard_placements.clear()
+
+
+@pytest.fixture
+def replica(other_database, monkeypatch) -> str:
+    """
+    Make the other database the replica of the test database. Nothing is
+    replicated, the tests copy the rows they need.
+    """
+    monkeypatch.setattr(SHARDS, "replicas", {"main": [other_database]})
+    return other_database
+
+
 @pytest.fixture
 def current_user_token(client, user_factory) -> str:
     with db():
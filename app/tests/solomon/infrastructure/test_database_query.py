@@ -0,0 +1,42 @@
+import datetime
+from uuid import uuid4
+
+import pytest
+
+from app.solomon.infrastructure.database import select_query
+from app.solomon.transactions.domain.models import Transaction
+
+
+def _statement(filters):
+    return (
+        select_query(None, Transaction)
+        .filter(Transaction.user_id == str(uuid4()))
+        .apply_filters(Transaction, filters)
+        .statement
+    )
+
+
+class TestCustomQuery:
+    def test_same_filter_keys_share_cache_key(self):
+        first = _statement(
+            {"date__gt": datetime.date(2024, 1, 1), "is_fixed__eq": True}
+        )
+        second = _statement(
+            {"date__gt": datetime.date(2023, 5, 1), "is_fixed__eq": False}
+        )
+
+        assert first._generate_cache_key().key == second._generate_cache_key().key
+
+    def test_different_filter_keys_have_different_cache_keys(self):
+        first = _statement({"date__gt": datetime.date(2024, 1, 1)})
+        second = _statement({"date__lt": datetime.date(2024, 1, 1)})
+
+        assert first._generate_cache_key().key != second._generate_cache_key().key
+
+    def test_invalid_operator(self):
+        with pytest.raises(ValueError):
+            _statement({"date__neq": datetime.date(2024, 1, 1)})
+
+    def test_missing_operator(self):
+        with pytest.raises(ValueError):
+            _statement({"date": datetime.date(2024, 1, 1)})
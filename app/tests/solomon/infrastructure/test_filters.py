@@ -0,0 +1,91 @@
+import datetime
+
+import pytest
+
+from app.solomon.common.exceptions import InvalidFilter
+from app.solomon.transactions.infrastructure.repositories import (
+    TRANSACTION_FILTERS,
+)
+from app.solomon.transactions.presentation.models import TransactionFilters
+
+
+class TestFilterWhitelist:
+    def test_indexed_fields_come_from_table_metadata(self):
+        assert TRANSACTION_FILTERS.indexed_filter_fields == {
+            "date",
+            "category_id",
+            "credit_card_id",
+        }
+
+    def test_field_not_whitelisted(self):
+        with pytest.raises(InvalidFilter):
+            TRANSACTION_FILTERS.criteria({"description__ilike": "%uber%"})
+
+    def test_operator_not_whitelisted(self):
+        with pytest.raises(InvalidFilter):
+            TRANSACTION_FILTERS.criteria({"kind__gt": "cash"})
+
+    def test_unindexed_scan_without_indexed_filter(self):
+        with pytest.raises(InvalidFilter):
+            TRANSACTION_FILTERS.criteria({"amount__gte": 10})
+
+    def test_unindexed_scan_narrowed_by_indexed_filter(self):
+        criteria = TRANSACTION_FILTERS.criteria(
+            {"amount__gte": 10, "date__gt": datetime.date(2024, 1, 1)}
+        )
+
+        assert len(criteria) == 2
+
+    def test_unindexed_scan_narrowed_by_indexed_or_group(self):
+        criteria = TRANSACTION_FILTERS.criteria(
+            {"amount__gte": 10},
+            or_groups=[[("category_id__eq", "a"), ("credit_card_id__eq", "b")]],
+        )
+
+        assert len(criteria) == 2
+
+    def test_unindexed_scan_with_opt_in(self):
+        criteria = TRANSACTION_FILTERS.criteria(
+            {"amount__gte": 10}, allow_unindexed=True
+        )
+
+        assert len(criteria) == 1
+
+    def test_between_requires_two_values(self):
+        with pytest.raises(InvalidFilter):
+            TRANSACTION_FILTERS.criteria(
+                {"date__between": [datetime.date(2024, 1, 1)]}
+            )
+
+
+class TestTransactionFilters:
+    def test_to_filters_parses_multi_value_filters(self):
+        filters = TransactionFilters(
+            kind__in="pix,cash", date__between="2024-01-01,2024-01-31"
+        ).to_filters()
+
+        assert filters == {
+            "kind__in": ["pix", "cash"],
+            "date__between": [datetime.date(2024, 1, 1), datetime.date(2024, 1, 31)],
+        }
+
+    def test_to_or_groups(self):
+        groups = TransactionFilters(
+            any_of="kind__eq:pix|amount__gte:100;category_id__in:a,b"
+        ).to_or_groups()
+
+        assert groups == [
+            [("kind__eq", "pix"), ("amount__gte", 100.0)],
+            [("category_id__in", ["a", "b"])],
+        ]
+
+    @pytest.mark.parametrize(
+        "any_of", ["kind__eq", "allow_unindexed:true", "amount__gte:abc"]
+    )
+    def test_to_or_groups_with_invalid_terms(self, any_of):
+        with pytest.raises(InvalidFilter):
+            TransactionFilters(any_of=any_of).to_or_groups()
+
+    def test_to_filters_with_invalid_multi_value(self):
+        with pytest.raises(InvalidFilter):
+            TransactionFilters(kind__in="pix,bitcoin").to_filters()
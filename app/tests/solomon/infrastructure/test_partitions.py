@@ -0,0 +1,136 @@
+import datetime
+
+import pytest
+from fastapi_sqlalchemy import db
+from sqlalchemy import insert, select, text, update
+from sqlalchemy.exc import IntegrityError
+
+from app.solomon.infrastructure.database import create_session
+from app.solomon.infrastructure.partitions import PartitionRepository
+from app.solomon.transactions.domain.models import (
+    Installment,
+    Transaction,
+    TransactionView,
+)
+
+
+def get_partitions(session):
+    return dict(
+        session.execute(
+            select(Transaction.description, text("CAST(tableoid AS regclass)"))
+        ).all()
+    )
+
+
+class TestPartitionRepository:
+    def test_ensure_partitions_moves_rows_out_of_default_partition(
+        self, auth_client, current_user, transaction_factory
+    ):
+        month = datetime.date(2090, 3, 1)
+        with db():
+            transaction_id = transaction_factory.create(
+                user=current_user,
+                description="Rent",
+                is_fixed=False,
+                date=datetime.date(2090, 3, 10),
+            ).id
+            transaction_factory.create(
+                user=current_user,
+                description="Gym",
+                is_fixed=True,
+                recurring_day=5,
+                date=None,
+            )
+
+        with create_session() as session:
+            repository = PartitionRepository(session)
+            try:
+                assert get_partitions(session) == {
+                    "Rent": "transactions_default",
+                    "Gym": "transactions_undated",
+                }
+
+                assert repository.ensure_partitions("transactions", month, month) == [
+                    month
+                ]
+                assert month in repository.get_months("transactions")
+                assert get_partitions(session) == {
+                    "Rent": "transactions_p2090_03",
+                    "Gym": "transactions_undated",
+                }
+                session.commit()
+
+                # moving a row to another partition keeps the view in sync
+                with db():
+                    auth_client.put(
+                        f"/transactions/{transaction_id}", json={"date": "2090-04-10"}
+                    )
+                assert get_partitions(session)["Rent"] == "transactions_default"
+                assert session.scalar(
+                    select(TransactionView.date).where(
+                        TransactionView.id == transaction_id
+                    )
+                ) == datetime.date(2090, 4, 10)
+            finally:
+                session.rollback()
+                # the foreign key of installments keeps a partition from being
+                # dropped while it is attached
+                partition = "transactions_p2090_03"
+                session.execute(
+                    text(f"ALTER TABLE transactions DETACH PARTITION {partition}")
+                )
+                session.execute(text(f"DROP TABLE {partition}"))
+                session.commit()
+
+    def test_installments_reference_their_transaction(
+        self, current_user, transaction_factory, installment_factory
+    ):
+        with db():
+            transaction = transaction_factory.create(
+                user=current_user, is_fixed=False, date=datetime.date(2090, 3, 10)
+            )
+            installment_factory.create(
+                transaction=transaction, date=datetime.date(2090, 3, 10)
+            )
+            transaction_id, user_id = transaction.id, current_user.id
+
+        with create_session() as session:
+            try:
+                # the key follows a transaction moved to another month
+                session.execute(
+                    update(Transaction)
+                    .where(Transaction.id == transaction_id)
+                    .values(date=datetime.date(2090, 4, 10))
+                )
+                assert session.scalars(
+                    select(Installment.transaction_date).where(
+                        Installment.transaction_id == transaction_id
+                    )
+                ).all() == [datetime.date(2090, 4, 10)]
+
+                with pytest.raises(IntegrityError):
+                    with session.begin_nested():
+                        session.execute(
+                            insert(Installment).values(
+                                transaction_id=transaction_id,
+                                transaction_date=datetime.date(2090, 3, 10),
+                                date=datetime.date(2090, 3, 10),
+                                amount=10,
+                                installment_number=1,
+                            )
+                        )
+
+                with pytest.raises(IntegrityError):
+                    with session.begin_nested():
+                        session.execute(
+                            insert(Transaction).values(
+                                id=transaction_id,
+                                user_id=user_id,
+                                description="Duplicate",
+                                amount=10,
+                                kind="transaction",
+                                date=datetime.date(2090, 4, 10),
+                            )
+                        )
+            finally:
+                session.rollback()
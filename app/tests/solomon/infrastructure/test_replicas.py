@@ -0,0 +1,123 @@
+import datetime
+import uuid
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+from fastapi_sqlalchemy import db
+from sqlalchemy import create_engine, insert, update
+from sqlalchemy.orm import Session
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.solomon.infrastructure.database import create_session, request_session
+from app.solomon.infrastructure.replicas import ReplicaMiddleware, UserWrite
+from app.solomon.transactions.domain.options import Kinds
+from app.solomon.users.domain.models import User
+
+
+def expire_writes():
+    """Move the recorded writes out of the window."""
+    with create_session() as session:
+        session.execute(
+            update(UserWrite).values(
+                written_at=UserWrite.written_at - datetime.timedelta(seconds=10)
+            )
+        )
+        session.commit()
+
+
+def worker_client() -> TestClient:
+    """A client of an app with its own ReplicaMiddleware, as a worker process."""
+
+    async def endpoint(request: Request) -> JSONResponse:
+        status_code = 422 if request.headers.get("x-invalid") else 200
+        return JSONResponse(
+            {"replica": request_session.get() is not None}, status_code=status_code
+        )
+
+    app = Starlette(routes=[Route("/transactions/", endpoint, methods=["GET", "POST"])])
+    app.add_middleware(
+        ReplicaMiddleware,
+        get_user_id=lambda request: request.headers.get("x-user"),
+        prefixes=["/transactions"],
+        window=5,
+    )
+    return TestClient(app)
+
+
+def test_reads_stay_on_the_primary_on_every_worker(replica):
+    first, second = worker_client(), worker_client()
+    user, other_user = str(uuid.uuid4()), str(uuid.uuid4())
+
+    def served_by_replica(client, user):
+        response = client.get("/transactions/", headers={"x-user": user})
+        return response.json()["replica"]
+
+    assert served_by_replica(second, user)
+
+    # a failed write changes nothing
+    first.post("/transactions/", headers={"x-user": user, "x-invalid": "true"})
+    assert served_by_replica(second, user)
+
+    # the write is seen by whichever worker serves the reads
+    first.post("/transactions/", headers={"x-user": user})
+    assert not served_by_replica(second, user)
+    assert served_by_replica(second, other_user)
+
+    # the write is older than the window
+    expire_writes()
+    assert served_by_replica(second, user)
+
+
+class TestReplicaMiddleware:
+    def test_read_from_replica_unless_the_user_recently_wrote(
+        self,
+        replica,
+        auth_client,
+        current_user,
+        category_factory,
+        transaction_create_factory,
+    ):
+        with db():
+            user = {
+                column.name: getattr(current_user, column.name)
+                for column in User.__table__.columns
+            }
+            category_id = category_factory.create().id
+            db.session.commit()
+
+        # the replica is not replicated, only the user is copied so requests
+        # served by it can authenticate
+        replica_engine = create_engine(replica)
+        with Session(replica_engine) as session:
+            session.execute(insert(User), [user])
+            session.commit()
+        replica_engine.dispose()
+
+        def count_transactions():
+            return auth_client.get("/transactions/").json()["meta"]["total"]
+
+        def create_transaction():
+            body = transaction_create_factory.build(
+                kind=Kinds.PIX.value,
+                is_fixed=False,
+                recurring_day=None,
+                category_id=category_id,
+                date=datetime.date(2024, 1, 15),
+            )
+            return auth_client.post(
+                "/transactions/", json=jsonable_encoder(body.model_dump())
+            )
+
+        assert create_transaction().status_code == 201
+        assert count_transactions() == 1
+
+        expire_writes()
+
+        assert count_transactions() == 0
+
+        # writes go to the primary and pin the user's reads to it again
+        assert create_transaction().status_code == 201
+        assert count_transactions() == 2
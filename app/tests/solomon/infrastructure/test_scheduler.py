@@ -0,0 +1,87 @@
+import asyncio
+
+from sqlalchemy import func, select
+
+from app.solomon.infrastructure.database import create_session
+from app.solomon.infrastructure.scheduler import (
+    JobRun,
+    JobStatus,
+    ScheduledJob,
+    Scheduler,
+    run_in_batches,
+)
+
+
+def get_job_run(name):
+    with create_session() as session:
+        return session.scalar(select(JobRun).where(JobRun.name == name))
+
+
+class TestScheduler:
+    def test_run_if_due_records_the_run_and_waits_for_the_interval(self, client):
+        runs = []
+
+        async def job():
+            runs.append(1)
+            return 3
+
+        scheduler = Scheduler([])
+        scheduled_job = ScheduledJob("test-job", 3600, job)
+
+        assert asyncio.run(scheduler.run_if_due(scheduled_job)) is True
+        assert asyncio.run(scheduler.run_if_due(scheduled_job)) is False
+
+        run = get_job_run("test-job")
+
+        assert runs == [1]
+        assert run.status == JobStatus.SUCCESS.value
+        assert run.processed == 3
+        assert run.duration >= 0
+        assert run.last_success_at == run.finished_at
+
+    def test_run_if_due_skips_job_locked_by_another_worker(self, client):
+        async def job():
+            raise AssertionError("the job should not run")
+
+        with create_session() as session:
+            session.execute(select(func.pg_advisory_lock(func.hashtext("test-job"))))
+
+            ran = asyncio.run(
+                Scheduler([]).run_if_due(ScheduledJob("test-job", 0, job))
+            )
+            session.execute(select(func.pg_advisory_unlock(func.hashtext("test-job"))))
+
+        assert ran is False
+        assert get_job_run("test-job") is None
+
+    def test_run_if_due_records_failures(self, client):
+        async def job():
+            raise ValueError("boom")
+
+        asyncio.run(Scheduler([]).run_if_due(ScheduledJob("test-job", 0, job)))
+
+        run = get_job_run("test-job")
+
+        assert run.status == JobStatus.FAILED.value
+        assert "boom" in run.error
+        assert run.last_success_at is None
+
+    def test_run_in_batches_bounds_concurrency(self):
+        keys = [str(key) for key in range(10)]
+        running = []
+        max_running = []
+
+        def next_batch(last_key):
+            start = 0 if last_key is None else keys.index(last_key) + 1
+            return keys[start : start + 3]
+
+        def process(batch):
+            running.append(batch)
+            max_running.append(len(running))
+            running.remove(batch)
+            return len(batch)
+
+        processed = asyncio.run(run_in_batches(next_batch, process, concurrency=2))
+
+        assert processed == 10
+        assert max(max_running) <= 2
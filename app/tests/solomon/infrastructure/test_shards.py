@@ -0,0 +1,84 @@
+from fastapi_sqlalchemy import db
+
+from app.solomon.infrastructure import shards as shards_module
+from app.solomon.infrastructure.database import ShardMap, create_session
+from app.solomon.infrastructure.shards import ShardRepository, locate_user
+from app.solomon.users.domain.models import User
+
+
+def test_shard_for_spreads_users_over_buckets():
+    shards = ShardMap({"main": "main-url", "other": "other-url"}, ["main", "other"])
+    user_ids = [f"00000000-0000-0000-0000-{number:012}" for number in range(100)]
+
+    placements = [shards.shard_for(user_id) for user_id in user_ids]
+
+    assert placements == [shards.shard_for(user_id) for user_id in user_ids]
+    assert 30 < placements.count("main") < 70
+
+
+class TestShardMiddleware:
+    def test_register_and_login_on_the_shard_of_the_user_bucket(
+        self, shards, client, monkeypatch
+    ):
+        monkeypatch.setattr(shards, "buckets", ["other"])
+        body = {
+            "username": "Jane Doe",
+            "email": "jane.doe@example.com",
+            "password": "123456",
+        }
+
+        assert client.post("/auth/register", json=body).status_code == 201
+        response = client.post(
+            "/auth/login", json={"username": "Jane Doe", "password": "123456"}
+        )
+        token = response.json()["access_token"]
+        response = client.get(
+            "/transactions/", headers={"Authorization": f"Bearer {token}"}
+        )
+
+        assert response.status_code == 200
+        with create_session("main") as session:
+            assert session.query(User).count() == 0
+        with create_session("other") as session:
+            assert session.query(User).one().username == "Jane Doe"
+
+    def test_refuse_writes_of_a_moving_user(self, shards, auth_client, current_user):
+        with db():
+            user_id = current_user.id
+        with create_session("main") as session:
+            repository = ShardRepository(session)
+            repository.place(user_id, "main", is_moving=True)
+            repository.commit()
+
+        response = auth_client.post("/transactions/", json={})
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "5"
+        assert auth_client.get("/transactions/").status_code == 200
+
+    def test_cache_placements_for_reads_only(
+        self, shards, auth_client, current_user, monkeypatch
+    ):
+        with db():
+            user_id = current_user.id
+        lookups = []
+
+        def counted_locate_user(user_id):
+            lookups.append(user_id)
+            return locate_user(user_id)
+
+        monkeypatch.setattr(shards_module, "locate_user", counted_locate_user)
+
+        assert auth_client.get("/transactions/").status_code == 200
+        assert auth_client.get("/transactions/").status_code == 200
+        assert lookups == [user_id]
+
+        with create_session("main") as session:
+            repository = ShardRepository(session)
+            repository.place(user_id, "main", is_moving=True)
+            repository.commit()
+
+        # a write sees the move at once, reads keep the cached placement
+        assert auth_client.post("/transactions/", json={}).status_code == 503
+        assert auth_client.get("/transactions/").status_code == 200
+        assert lookups == [user_id, user_id]
@@ -0,0 +1,93 @@
+import datetime
+
+from fastapi.encoders import jsonable_encoder
+from fastapi_sqlalchemy import db
+
+from app.solomon.infrastructure.scheduler import JobRun
+from app.solomon.reports.application.jobs import refresh_user_reports
+from app.solomon.transactions.domain.options import Kinds
+
+
+class TestReportsResources:
+    def test_get_category_trends(
+        self, auth_client, current_user, category_factory, transaction_create_factory
+    ):
+        with db():
+            food = category_factory.create(description="Food")
+            for amount, date in (
+                (100.0, datetime.date(2023, 3, 1)),
+                (50.0, datetime.date(2024, 1, 10)),
+                (70.0, datetime.date(2024, 6, 10)),
+            ):
+                body = transaction_create_factory.build(
+                    kind=Kinds.PIX.value,
+                    category_id=food.id,
+                    amount=amount,
+                    date=date,
+                ).model_dump()
+                auth_client.post("/transactions/", json=jsonable_encoder(body))
+
+            refresh_user_reports([current_user.id])
+
+            response = auth_client.get("/reports/category-trends?year=2024")
+
+            assert response.status_code == 200
+            assert response.json()["data"] == [
+                {
+                    "category_id": food.id,
+                    "is_revenue": False,
+                    "year": 2024,
+                    "total": 120.0,
+                    "previous_total": 100.0,
+                }
+            ]
+
+    def test_get_card_utilization(
+        self,
+        auth_client,
+        current_user,
+        category_factory,
+        credit_card_factory,
+        transaction_create_factory,
+    ):
+        with db():
+            category = category_factory.create()
+            credit_card = credit_card_factory.create(user=current_user, limit=1000.0)
+            body = transaction_create_factory.build(
+                kind=Kinds.CREDIT.value,
+                credit_card_id=credit_card.id,
+                category_id=category.id,
+                amount=600.0,
+                installments_number=2,
+                date=datetime.date(2024, 1, 20),
+            ).model_dump()
+            auth_client.post("/transactions/", json=jsonable_encoder(body))
+
+            refresh_user_reports([current_user.id])
+
+            response = auth_client.get(
+                f"/reports/card-utilization?credit_card_id={credit_card.id}"
+            )
+
+            assert [
+                (row["month"], row["total"], row["utilization"])
+                for row in response.json()["data"]
+            ] == [("2024-01-01", 300.0, 0.3), ("2024-02-01", 300.0, 0.3)]
+
+    def test_get_job_runs(self, auth_client):
+        with db():
+            db.session.add(
+                JobRun(
+                    name="reports",
+                    status="success",
+                    started_at=datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC),
+                )
+            )
+            db.session.commit()
+
+            response = auth_client.get("/reports/jobs")
+
+            assert response.status_code == 200
+            assert [
+                (run["name"], run["status"]) for run in response.json()["data"]
+            ] == [("reports", "success")]
@@ -0,0 +1,97 @@
+from unittest.mock import Mock
+
+from app.solomon.transactions.application.autocomplete import (
+    DescriptionAutocomplete,
+    DescriptionIndex,
+)
+
+
+class TestDescriptionIndex:
+    def test_suggest_by_prefix_ranked_by_count(self):
+        index = DescriptionIndex({"Uber": 3, "Uber Eats": 5, "iFood": 8, "Ub": 1})
+
+        result = index.suggest("ube", limit=10)
+
+        assert result == [("Uber Eats", 5), ("Uber", 3)]
+
+    def test_suggest_is_case_insensitive_and_merges_variants(self):
+        index = DescriptionIndex({"uber": 1, "Uber": 4})
+
+        assert index.suggest("U", limit=10) == [("Uber", 5)]
+
+    def test_suggest_respects_limit(self):
+        index = DescriptionIndex({f"Item {i}": i for i in range(1, 20)})
+
+        result = index.suggest("item", limit=3)
+
+        assert result == [("Item 19", 19), ("Item 18", 18), ("Item 17", 17)]
+
+    def test_add_new_and_existing_descriptions(self):
+        index = DescriptionIndex({"Uber": 1})
+
+        index.add("Spotify")
+        index.add("uber")
+
+        assert index.suggest("", limit=10) == [("Uber", 2), ("Spotify", 1)]
+
+    def test_remove_decrements_and_drops_descriptions(self):
+        index = DescriptionIndex({"Uber": 2, "Spotify": 1})
+
+        index.remove("uber")
+        index.remove("Spotify")
+        index.remove("iFood")
+
+        assert index.suggest("", limit=10) == [("Uber", 1)]
+        assert index.suggest("s", limit=10) == []
+
+
+class TestDescriptionAutocomplete:
+    def test_index_is_built_lazily_once(self):
+        autocomplete = DescriptionAutocomplete(max_users=10, ttl=60)
+        loader = Mock(return_value={"Uber": 1})
+
+        autocomplete.suggest("user", "u", 10, loader)
+        result = autocomplete.suggest("user", "u", 10, loader)
+
+        assert result == [("Uber", 1)]
+        loader.assert_called_once()
+
+    def test_record_updates_cached_index(self):
+        autocomplete = DescriptionAutocomplete(max_users=10, ttl=60)
+        autocomplete.suggest("user", "u", 10, lambda: {"Uber": 1})
+
+        autocomplete.record("user", "Uber")
+        autocomplete.record("other user", "Uber")
+
+        assert autocomplete.suggest("user", "u", 10, dict) == [("Uber", 2)]
+
+    def test_forget_updates_cached_index(self):
+        autocomplete = DescriptionAutocomplete(max_users=10, ttl=60)
+        autocomplete.suggest("user", "u", 10, lambda: {"Uber": 2})
+
+        autocomplete.forget("user", "Uber")
+        autocomplete.forget("other user", "Uber")
+
+        assert autocomplete.suggest("user", "u", 10, dict) == [("Uber", 1)]
+
+    def test_least_recently_used_user_is_evicted(self):
+        autocomplete = DescriptionAutocomplete(max_users=2, ttl=60)
+        for user in ("a", "b"):
+            autocomplete.suggest(user, "", 10, lambda: {"Uber": 1})
+        autocomplete.suggest("a", "", 10, dict)
+        autocomplete.suggest("c", "", 10, dict)
+        loader = Mock(return_value={})
+
+        autocomplete.suggest("a", "", 10, loader)
+        autocomplete.suggest("b", "", 10, loader)
+
+        loader.assert_called_once()
+
+    def test_index_is_rebuilt_after_ttl(self):
+        autocomplete = DescriptionAutocomplete(max_users=10, ttl=-1)
+        loader = Mock(return_value={"Uber": 1})
+
+        autocomplete.suggest("user", "u", 10, loader)
+        autocomplete.suggest("user", "u", 10, loader)
+
+        assert loader.call_count == 2
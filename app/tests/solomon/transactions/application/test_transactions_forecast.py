@@ -0,0 +1,40 @@
+import datetime
+
+from app.solomon.transactions.application.forecast import columns, project_cash_flow
+
+
+def test_project_cash_flow():
+    cash_flow = project_cash_flow(
+        datetime.date(2024, 3, 15),
+        4,
+        installment_periods=[
+            datetime.date(2024, 2, 1),
+            datetime.date(2024, 3, 1),
+            datetime.date(2024, 4, 20),
+            datetime.date(2024, 7, 1),
+        ],
+        installment_amounts=[99.0, 100.0, 50.0, 10.0],
+        installment_is_revenue=[False, False, True, False],
+        fixed_dates=[None, datetime.date(2024, 5, 10), datetime.date(2023, 1, 1)],
+        fixed_amounts=[1000.0, 30.0, 5.0],
+        fixed_is_revenue=[True, False, False],
+    )
+
+    assert cash_flow.months == [
+        datetime.date(2024, 3, 1),
+        datetime.date(2024, 4, 1),
+        datetime.date(2024, 5, 1),
+        datetime.date(2024, 6, 1),
+    ]
+    assert cash_flow.inflow.tolist() == [1000.0, 1050.0, 1000.0, 1000.0]
+    assert cash_flow.outflow.tolist() == [105.0, 5.0, 35.0, 35.0]
+    assert cash_flow.net.tolist() == [895.0, 1045.0, 965.0, 965.0]
+
+
+def test_project_cash_flow_without_items():
+    cash_flow = project_cash_flow(
+        datetime.date(2024, 3, 1), 2, *columns([], 3), *columns([], 3)
+    )
+
+    assert cash_flow.inflow.tolist() == [0.0, 0.0]
+    assert cash_flow.outflow.tolist() == [0.0, 0.0]
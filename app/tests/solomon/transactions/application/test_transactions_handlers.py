@@ -1,8 +1,11 @@
 import datetime
 from uuid import uuid4
 
+from app.solomon.transactions.application.handlers import (
+    CreditCardTransactionHandler,
+)
 from app.solomon.transactions.domain.models import Installment, Transaction
-from app.solomon.transactions.domain.options import Kinds
+from app.solomon.transactions.domain.options import InstallmentStorage, Kinds
 from app.tests.solomon.factories.transaction_factory import TransactionCreateFactory
 
 
@@ -79,6 +82,32 @@ class TestCreditCardTransactionHandlers:
             assert str(e) == "Database not available"
             mock_repository.rollback.assert_called_once()
 
+    def test_process_transaction_with_compact_storage(self, mock_repository):
+        # Arrange
+        mock_transaction_create = TransactionCreateFactory.build(
+            kind=Kinds.CREDIT.value,
+            is_fixed=False,
+            recurring_day=None,
+            credit_card_id=str(uuid4()),
+            installments_number=3,
+            amount=100,
+            date="2023-12-20",
+        )
+        handler = CreditCardTransactionHandler(
+            mock_repository, InstallmentStorage.COMPACT
+        )
+
+        # Act
+        handler.process_transaction(mock_transaction_create)
+
+        # Assert
+        kwargs = mock_repository.create_with_installments.call_args.kwargs
+        transaction = kwargs["transaction"]
+        assert kwargs["installments"] == []
+        assert transaction.installments_number == 3
+        assert transaction.installment_amount == 33.33
+        assert transaction.installment_remainder == 0.01
+
 
 class TestInstallmentHandlers:
     def test_generate_installments(self, installment_handler):
@@ -132,3 +161,30 @@ class TestInstallmentHandlers:
         assert installments[0].amount == 300.15
         assert installments[0].date == datetime.date(2024, 2, 13)
         assert installments[0].installment_number == 1
+
+    def test_generate_installments_with_remainder(self, installment_handler):
+        # Arrange
+        transaction = TransactionCreateFactory.build(
+            kind=Kinds.CREDIT.value,
+            is_fixed=False,
+            recurring_day=None,
+            credit_card_id=str(uuid4()),
+            installments_number=3,
+            amount=100,
+            date="2024-01-31",
+        )
+
+        # Act
+        installments = installment_handler.generate_installments(transaction)
+
+        # Assert
+        assert [installment.amount for installment in installments] == [
+            33.33,
+            33.33,
+            33.34,
+        ]
+        assert [installment.date for installment in installments] == [
+            datetime.date(2024, 1, 31),
+            datetime.date(2024, 2, 29),
+            datetime.date(2024, 3, 31),
+        ]
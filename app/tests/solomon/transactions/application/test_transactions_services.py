@@ -181,6 +181,30 @@ class TestCreditCardService:
                 mock_credit_card.id, mock_credit_card.user_id
             )
 
+    def test_get_invoice(self, credit_card_service, mock_repository):
+        credit_card = CreditCardFactory.build()
+        installments = [Installment(amount=10.0)]
+        mock_repository.get_by_id.return_value = credit_card
+        mock_repository.get_invoice_installments.return_value = installments
+        period = datetime.date(2024, 2, 1)
+
+        result = credit_card_service.get_invoice(credit_card.id, "user_id", period)
+
+        assert result == installments
+        mock_repository.get_invoice_installments.assert_called_once_with(
+            credit_card.id, period
+        )
+
+    def test_get_invoice_credit_card_not_found(
+        self, credit_card_service, mock_repository
+    ):
+        mock_repository.get_by_id.return_value = None
+
+        with pytest.raises(CreditCardNotFound):
+            credit_card_service.get_invoice(
+                "credit_card_id", "user_id", datetime.date(2024, 2, 1)
+            )
+
 
 class TestTransactionService:
     @pytest.mark.parametrize(
@@ -0,0 +1,146 @@
+import datetime
+from uuid import uuid4
+
+from fastapi.encoders import jsonable_encoder
+from fastapi_sqlalchemy import db
+
+from app.solomon.transactions.domain.models import MonthlyRollup
+from app.solomon.transactions.domain.options import Kinds
+from app.solomon.transactions.infrastructure.repositories import (
+    TransactionRepository,
+)
+
+
+class TestBudgetsResources:
+    def test_get_budget_spending(
+        self,
+        auth_client,
+        current_user,
+        category_factory,
+        credit_card_factory,
+        transaction_create_factory,
+    ):
+        with db():
+            category, other_category = category_factory.create_batch(2)
+            credit_card = credit_card_factory.create(user=current_user)
+            for kind, is_revenue, amount, category_id in (
+                (Kinds.PIX.value, False, 120.0, category.id),
+                (Kinds.CREDIT.value, False, 300.0, category.id),
+                (Kinds.PIX.value, True, 1000.0, category.id),
+                (Kinds.PIX.value, False, 80.0, other_category.id),
+            ):
+                body = transaction_create_factory.build(
+                    kind=kind,
+                    is_fixed=False,
+                    recurring_day=None,
+                    is_revenue=is_revenue,
+                    credit_card_id=credit_card.id,
+                    category_id=category_id,
+                    amount=amount,
+                    installments_number=3,
+                    date=datetime.date(2024, 1, 10),
+                )
+                auth_client.post(
+                    "/transactions/", json=jsonable_encoder(body.model_dump())
+                )
+
+            response = auth_client.post(
+                "/budgets/?month=2024-01",
+                json={"category_id": category.id, "amount": 200.0},
+            )
+            budget_id = response.json()["data"]["id"]
+            february = auth_client.get(f"/budgets/{budget_id}?month=2024-02")
+
+            assert response.status_code == 201
+            assert response.json()["data"] == {
+                "id": budget_id,
+                "category_id": category.id,
+                "amount": 200.0,
+                "alert_threshold": 100,
+                "month": "2024-01-01",
+                "spent": 220.0,
+                "remaining": -20.0,
+                "is_exceeded": True,
+            }
+            assert february.json()["data"]["spent"] == 100.0
+            assert february.json()["data"]["is_exceeded"] is False
+
+    def test_get_budgets(self, auth_client, current_user, category_factory):
+        with db():
+            categories = category_factory.create_batch(2)
+            for category in categories:
+                auth_client.post(
+                    "/budgets/", json={"category_id": category.id, "amount": 50.0}
+                )
+
+            response = auth_client.get("/budgets/")
+
+            assert response.status_code == 200
+            assert [
+                (item["category_id"], item["spent"], item["month"])
+                for item in response.json()["data"]
+            ] == [
+                (category.id, 0.0, datetime.date.today().replace(day=1).isoformat())
+                for category in categories
+            ]
+
+    def test_create_duplicated_budget(self, auth_client, category_factory):
+        with db():
+            category = category_factory.create()
+            body = {"category_id": category.id, "amount": 50.0}
+
+            auth_client.post("/budgets/", json=body)
+            response = auth_client.post("/budgets/", json=body)
+
+            assert response.status_code == 409
+
+    def test_create_budget_with_invalid_category(self, auth_client):
+        with db():
+            response = auth_client.post(
+                "/budgets/", json={"category_id": str(uuid4()), "amount": 50.0}
+            )
+
+            assert response.status_code == 404
+            assert response.json()["detail"] == "Category not found."
+
+    def test_update_and_delete_budget(self, auth_client, category_factory):
+        with db():
+            category = category_factory.create()
+            response = auth_client.post(
+                "/budgets/", json={"category_id": category.id, "amount": 50.0}
+            )
+            budget_id = response.json()["data"]["id"]
+
+            updated = auth_client.put(f"/budgets/{budget_id}", json={"amount": 75.0})
+            deleted = auth_client.delete(f"/budgets/{budget_id}")
+
+            assert updated.json()["data"]["amount"] == 75.0
+            assert deleted.status_code == 204
+            assert auth_client.get(f"/budgets/{budget_id}").status_code == 404
+            assert auth_client.delete(f"/budgets/{budget_id}").status_code == 404
+
+    def test_reconcile_rollups(
+        self, current_user, category_factory, transaction_factory
+    ):
+        with db():
+            category = category_factory.create()
+            # created directly, so the rollups never saw it
+            transaction_factory.create(
+                user=current_user,
+                category=category,
+                kind=Kinds.PIX.value,
+                is_revenue=False,
+                amount=40.0,
+                date=datetime.date(2024, 1, 10),
+            )
+
+            repository = TransactionRepository(db.session)
+            drifted = repository.reconcile_rollups([current_user.id])
+            repository.commit()
+
+            assert drifted == [current_user.id]
+            assert [
+                (rollup.month, rollup.total, rollup.count)
+                for rollup in db.session.query(MonthlyRollup)
+            ] == [(datetime.date(2024, 1, 1), 40.0, 1)]
+            assert repository.reconcile_rollups([current_user.id]) == []
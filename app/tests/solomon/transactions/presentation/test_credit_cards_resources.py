@@ -1,5 +1,16 @@
+import datetime
 import uuid
 
+from fastapi.encoders import jsonable_encoder
+from fastapi_sqlalchemy import db
+
+from app.solomon.transactions.domain.options import Kinds
+from app.solomon.transactions.infrastructure.repositories import (
+    CreditCardRepository,
+    TransactionRepository,
+)
+from app.tests.solomon.factories.transaction_factory import TransactionFactory
+
 
 class TestCreditCardsResources:
     def test_create_credit_card(self, auth_client):
@@ -17,7 +28,10 @@ class TestCreditCardsResources:
             "name": "Credit Card",
             "limit": 1000.0,
             "invoice_start_day": 1,
+            "alert_threshold": None,
             "id": data["id"],
+            "committed": 0.0,
+            "available": 1000.0,
         }
 
     def test_create_invalid_credit_card(self, auth_client):
@@ -48,7 +62,10 @@ class TestCreditCardsResources:
             "name": credit_card.name,
             "limit": credit_card.limit,
             "invoice_start_day": credit_card.invoice_start_day,
+            "alert_threshold": None,
             "id": credit_card.id,
+            "committed": 0.0,
+            "available": credit_card.limit,
         }
 
     def test_get_credit_card_not_found(self, auth_client):
@@ -80,7 +97,10 @@ class TestCreditCardsResources:
             "name": "Updated Credit Card",
             "limit": 2000.0,
             "invoice_start_day": 2,
+            "alert_threshold": None,
             "id": credit_card.id,
+            "committed": 0.0,
+            "available": 2000.0,
         }
 
     def test_update_credit_card_not_found(self, auth_client):
@@ -134,3 +154,271 @@ class TestCreditCardsResources:
 
         # Assert
         assert response.status_code == 404
+
+    def test_get_invoice(
+        self,
+        auth_client,
+        current_user,
+        category_factory,
+        credit_card_factory,
+        transaction_create_factory,
+    ):
+        with db():
+            credit_card = credit_card_factory.create(
+                user=current_user, invoice_start_day=10
+            )
+            body = transaction_create_factory.build(
+                description="Notebook",
+                kind=Kinds.CREDIT.value,
+                credit_card_id=credit_card.id,
+                category_id=category_factory.create().id,
+                amount=300.0,
+                installments_number=3,
+                date=datetime.date(2024, 1, 20),
+            ).model_dump()
+            transaction_id = auth_client.post(
+                "/transactions/", json=jsonable_encoder(body)
+            ).json()["data"]["id"]
+
+            response = auth_client.get(
+                f"/credit-cards/{credit_card.id}/invoices/2024-02"
+            )
+
+            assert response.status_code == 200
+            assert response.json()["data"] == {
+                "credit_card_id": credit_card.id,
+                "period": "2024-02-01",
+                "total": 100.0,
+                "installments": [
+                    {
+                        "transaction_id": transaction_id,
+                        "description": "Notebook",
+                        "installment_number": 1,
+                        "amount": 100.0,
+                        "date": "2024-01-20",
+                    }
+                ],
+            }
+
+    def test_update_invoice_start_day_recomputes_invoices(
+        self,
+        auth_client,
+        current_user,
+        category_factory,
+        credit_card_factory,
+        transaction_create_factory,
+    ):
+        with db():
+            credit_card = credit_card_factory.create(
+                user=current_user, invoice_start_day=10
+            )
+            body = transaction_create_factory.build(
+                kind=Kinds.CREDIT.value,
+                credit_card_id=credit_card.id,
+                category_id=category_factory.create().id,
+                amount=300.0,
+                installments_number=3,
+                date=datetime.date(2024, 1, 20),
+            ).model_dump()
+            auth_client.post("/transactions/", json=jsonable_encoder(body))
+
+            auth_client.put(
+                f"/credit-cards/{credit_card.id}", json={"invoice_start_day": 25}
+            )
+
+            invoices = {
+                period: auth_client.get(
+                    f"/credit-cards/{credit_card.id}/invoices/{period}"
+                ).json()["data"]["installments"]
+                for period in ("2024-01", "2024-02", "2024-04")
+            }
+
+            assert [
+                installment["installment_number"] for installment in invoices["2024-01"]
+            ] == [1]
+            assert [
+                installment["installment_number"] for installment in invoices["2024-02"]
+            ] == [2]
+            assert invoices["2024-04"] == []
+
+    def test_update_invoice_start_day_recomputes_archived_invoices(
+        self,
+        auth_client,
+        current_user,
+        category_factory,
+        credit_card_factory,
+        transaction_create_factory,
+    ):
+        with db():
+            credit_card = credit_card_factory.create(
+                user=current_user, invoice_start_day=10
+            )
+            body = transaction_create_factory.build(
+                kind=Kinds.CREDIT.value,
+                credit_card_id=credit_card.id,
+                category_id=category_factory.create().id,
+                amount=300.0,
+                installments_number=3,
+                date=datetime.date(2023, 1, 20),
+            ).model_dump()
+            auth_client.post("/transactions/", json=jsonable_encoder(body))
+
+            repository = TransactionRepository(db.session)
+            assert repository.archive([current_user.id], datetime.date(2024, 1, 1), 5)
+            repository.commit()
+
+            auth_client.put(
+                f"/credit-cards/{credit_card.id}", json={"invoice_start_day": 25}
+            )
+
+            assert [
+                [
+                    installment["installment_number"]
+                    for installment in auth_client.get(
+                        f"/credit-cards/{credit_card.id}/invoices/{period}"
+                    ).json()["data"]["installments"]
+                ]
+                for period in ("2023-01", "2023-02", "2023-03", "2023-04")
+            ] == [[1], [2], [3], []]
+
+    def test_get_invoice_invalid_period(
+        self, auth_client, current_user, credit_card_factory
+    ):
+        credit_card = credit_card_factory.create(user=current_user)
+
+        response = auth_client.get(f"/credit-cards/{credit_card.id}/invoices/2024-13")
+
+        assert response.status_code == 422
+
+    def test_get_invoice_credit_card_not_found(self, auth_client):
+        response = auth_client.get(f"/credit-cards/{uuid.uuid4()}/invoices/2024-01")
+
+        assert response.status_code == 404
+
+    def test_credit_card_committed_amount(
+        self,
+        auth_client,
+        current_user,
+        category_factory,
+        credit_card_factory,
+        transaction_create_factory,
+    ):
+        with db():
+            credit_card = credit_card_factory.create(
+                user=current_user, limit=1000.0, invoice_start_day=10
+            )
+            body = transaction_create_factory.build(
+                kind=Kinds.CREDIT.value,
+                credit_card_id=credit_card.id,
+                category_id=category_factory.create().id,
+                amount=300.0,
+                installments_number=3,
+                date=datetime.date(2024, 1, 20),
+            ).model_dump()
+            auth_client.post("/transactions/", json=jsonable_encoder(body))
+
+            response = auth_client.get("/credit-cards/")
+
+            assert [
+                (card["limit"], card["committed"], card["available"])
+                for card in response.json()["data"]
+            ] == [(1000.0, 300.0, 700.0)]
+
+            # purchases from March 10th on go to the April invoice, so on March 9th
+            # only the February invoice is closed
+            repository = CreditCardRepository(db.session)
+            assert (
+                repository.close_invoices([current_user.id], datetime.date(2024, 3, 9))
+                == 1
+            )
+            assert (
+                repository.close_invoices([current_user.id], datetime.date(2024, 3, 9))
+                == 0
+            )
+            repository.commit()
+
+            data = auth_client.get(f"/credit-cards/{credit_card.id}").json()["data"]
+
+            assert (data["committed"], data["available"]) == (200.0, 800.0)
+
+    def test_update_invoice_start_day_recomputes_closed_invoices(
+        self,
+        auth_client,
+        current_user,
+        category_factory,
+        credit_card_factory,
+        transaction_create_factory,
+    ):
+        with db():
+            today = datetime.date.today()
+            month = today.replace(day=1)
+            previous_month = (month - datetime.timedelta(days=1)).replace(day=1)
+            credit_card = credit_card_factory.create(
+                user=current_user, limit=1000.0, invoice_start_day=1
+            )
+            body = transaction_create_factory.build(
+                kind=Kinds.CREDIT.value,
+                credit_card_id=credit_card.id,
+                category_id=category_factory.create().id,
+                amount=300.0,
+                installments_number=3,
+                date=previous_month,
+            ).model_dump()
+            auth_client.post("/transactions/", json=jsonable_encoder(body))
+
+            repository = CreditCardRepository(db.session)
+            repository.close_invoices([current_user.id], today)
+            repository.commit()
+
+            # with invoices starting on the 1st, the invoice of this month is closed
+            data = auth_client.get(f"/credit-cards/{credit_card.id}").json()["data"]
+            assert data["committed"] == 200.0
+
+            auth_client.put(
+                f"/credit-cards/{credit_card.id}", json={"invoice_start_day": 31}
+            )
+
+            # starting on the 31st, it only closes then
+            closed_through, committed = (
+                (month, 100.0) if today.day == 31 else (previous_month, 200.0)
+            )
+            db.session.expire_all()
+            credit_card = repository.get_by_id(credit_card.id, current_user.id)
+            assert (credit_card.closed_through, credit_card.committed) == (
+                closed_through,
+                committed,
+            )
+
+    def test_reconcile_credit_card_committed_amount(
+        self, auth_client, current_user, credit_card_factory, installment_factory
+    ):
+        with db():
+            credit_card = credit_card_factory.create(
+                user=current_user,
+                committed=999.0,
+                closed_through=datetime.date(2024, 1, 1),
+            )
+            other_credit_card = credit_card_factory.create(user=current_user)
+            for invoice_period in (
+                datetime.date(2024, 1, 1),
+                datetime.date(2024, 2, 1),
+            ):
+                installment_factory.create(
+                    transaction=TransactionFactory(user=current_user),
+                    credit_card_id=credit_card.id,
+                    invoice_period=invoice_period,
+                    amount=50.0,
+                )
+
+            repository = CreditCardRepository(db.session)
+            corrected = repository.reconcile_committed([current_user.id])
+            repository.commit()
+
+            assert corrected == [credit_card.id]
+            assert (
+                repository.get_by_id(credit_card.id, current_user.id).committed == 50.0
+            )
+            assert (
+                repository.get_by_id(other_credit_card.id, current_user.id).committed
+                == 0.0
+            )
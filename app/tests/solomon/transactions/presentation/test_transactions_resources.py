@@ -8,8 +8,15 @@ import pandas as pd
 from fastapi.encoders import jsonable_encoder
 from fastapi_sqlalchemy import db
 
-from app.solomon.transactions.domain.models import Transaction
+from app.solomon.transactions.domain.models import (
+    Installment,
+    MonthlyRollup,
+    Transaction,
+)
 from app.solomon.transactions.domain.options import Kinds
+from app.solomon.transactions.infrastructure.repositories import (
+    TransactionRepository,
+)
 
 
 class TestTransactionsResources:
@@ -73,6 +80,65 @@ class TestTransactionsResources:
             assert result["installments"][0]["amount"] == 100.00
             assert result["installments"][0]["date"] == "2023-05-01"
 
+    def test_create_credit_card_transaction_with_compact_installments(
+        self,
+        auth_client,
+        current_user,
+        transaction_create_factory,
+        category_factory,
+        credit_card_factory,
+    ):
+        with db():
+            category = category_factory.create()
+            credit_card = credit_card_factory.create(
+                user=current_user, limit=1000.0, invoice_start_day=25
+            )
+            body = transaction_create_factory.build(
+                kind=Kinds.CREDIT.value,
+                is_fixed=False,
+                recurring_day=None,
+                credit_card_id=credit_card.id,
+                category_id=category.id,
+                amount=100.00,
+                installments_number=3,
+                date=datetime.date(2024, 1, 31),
+            ).model_dump()
+
+            with patch(
+                "app.solomon.transactions.application.handlers.INSTALLMENT_STORAGE",
+                "compact",
+            ):
+                response = auth_client.post(
+                    "/transactions/", json=jsonable_encoder(body)
+                )
+            transaction_id = response.json()["data"]["id"]
+            result = auth_client.get(f"/transactions/{transaction_id}/").json()["data"]
+
+            assert response.status_code == 201
+            assert db.session.query(Installment).count() == 0
+            assert [
+                (item["date"], item["amount"], item["invoice_period"])
+                for item in result["installments"]
+            ] == [
+                ("2024-01-31", 33.33, "2024-02-01"),
+                ("2024-02-29", 33.33, "2024-03-01"),
+                ("2024-03-31", 33.34, "2024-04-01"),
+            ]
+
+            invoice = auth_client.get(
+                f"/credit-cards/{credit_card.id}/invoices/2024-03"
+            ).json()["data"]
+            assert invoice["total"] == 33.33
+
+            credit_card = auth_client.get(f"/credit-cards/{credit_card.id}").json()
+            assert credit_card["data"]["committed"] == 100.0
+
+            params = {"group_by": "month", "date__between": "2024-01-01,2024-03-31"}
+            summary = auth_client.get(f"/transactions/summary?{urlencode(params)}")
+            assert [
+                (row["month"], row["total"]) for row in summary.json()["data"]
+            ] == [("2024-01-01", 33.33), ("2024-02-01", 33.33), ("2024-03-01", 33.34)]
+
     def test_create_invalid_credit_card_variable_transaction(
         self,
         auth_client,
@@ -127,6 +193,247 @@ class TestTransactionsResources:
             assert result["amount"] == transaction.amount
             assert len(installments) == 3
 
+    def test_update_credit_card_transaction_regenerates_installments(
+        self,
+        auth_client,
+        current_user,
+        transaction_create_factory,
+        category_factory,
+        credit_card_factory,
+    ):
+        with db():
+            category = category_factory.create()
+            credit_card = credit_card_factory.create(
+                user=current_user, limit=1000.0, invoice_start_day=25
+            )
+            body = transaction_create_factory.build(
+                kind=Kinds.CREDIT.value,
+                is_fixed=False,
+                recurring_day=None,
+                credit_card_id=credit_card.id,
+                category_id=category.id,
+                amount=300.00,
+                installments_number=3,
+                date=datetime.date(2024, 1, 10),
+            ).model_dump()
+            response = auth_client.post("/transactions/", json=jsonable_encoder(body))
+            transaction_id = response.json()["data"]["id"]
+
+            response = auth_client.put(
+                f"/transactions/{transaction_id}",
+                json={"amount": 100.0, "installments_number": 2},
+            )
+            result = response.json()["data"]
+
+            assert response.status_code == 200
+            assert result["amount"] == 100.0
+            assert [
+                (item["date"], item["amount"], item["invoice_period"])
+                for item in result["installments"]
+            ] == [
+                ("2024-01-10", 50.0, "2024-01-01"),
+                ("2024-02-10", 50.0, "2024-02-01"),
+            ]
+            assert db.session.query(Installment).count() == 2
+
+            data = auth_client.get(f"/credit-cards/{credit_card.id}").json()["data"]
+            assert data["committed"] == 100.0
+
+            rollups = db.session.query(MonthlyRollup).filter(MonthlyRollup.count > 0)
+            assert sorted(
+                (rollup.month, rollup.total, rollup.count) for rollup in rollups
+            ) == [
+                (datetime.date(2024, 1, 1), 50.0, 1),
+                (datetime.date(2024, 2, 1), 50.0, 1),
+            ]
+
+    def test_update_credit_card_transaction_with_compact_installments(
+        self,
+        auth_client,
+        current_user,
+        transaction_create_factory,
+        category_factory,
+        credit_card_factory,
+    ):
+        with db():
+            category = category_factory.create()
+            credit_card = credit_card_factory.create(
+                user=current_user, invoice_start_day=25
+            )
+            body = transaction_create_factory.build(
+                kind=Kinds.CREDIT.value,
+                is_fixed=False,
+                recurring_day=None,
+                credit_card_id=credit_card.id,
+                category_id=category.id,
+                amount=300.00,
+                installments_number=3,
+                date=datetime.date(2024, 1, 10),
+            ).model_dump()
+            with patch(
+                "app.solomon.transactions.application.handlers.INSTALLMENT_STORAGE",
+                "compact",
+            ):
+                response = auth_client.post(
+                    "/transactions/", json=jsonable_encoder(body)
+                )
+            transaction_id = response.json()["data"]["id"]
+
+            response = auth_client.put(
+                f"/transactions/{transaction_id}",
+                json={"date": "2024-03-10", "installments_number": 2},
+            )
+            result = response.json()["data"]
+
+            assert response.status_code == 200
+            assert [
+                (item["date"], item["amount"]) for item in result["installments"]
+            ] == [("2024-03-10", 150.0), ("2024-04-10", 150.0)]
+            assert db.session.query(Installment).count() == 0
+
+            data = auth_client.get(f"/credit-cards/{credit_card.id}").json()["data"]
+            assert data["committed"] == 300.0
+
+    def test_update_transaction_description(
+        self, auth_client, current_user, transaction_factory
+    ):
+        with db():
+            transaction = transaction_factory.create(
+                user=current_user, kind=Kinds.PIX.value, description="Market"
+            )
+            auth_client.get("/transactions/autocomplete?prefix=m")
+
+            response = auth_client.put(
+                f"/transactions/{transaction.id}", json={"description": "Groceries"}
+            )
+
+            assert response.status_code == 200
+            assert response.json()["data"]["description"] == "Groceries"
+            assert response.json()["data"]["amount"] == transaction.amount
+
+            response = auth_client.get("/transactions/autocomplete?prefix=m")
+
+            assert response.json()["data"] == []
+
+    def test_update_invalid_transaction(self, auth_client):
+        with db():
+            response = auth_client.put(
+                f"/transactions/{uuid4()}", json={"description": "Groceries"}
+            )
+
+            assert response.status_code == 404
+
+    def test_bulk_update_transactions(
+        self, auth_client, current_user, category_factory, transaction_create_factory
+    ):
+        with db():
+            imported, groceries = category_factory.create_batch(2)
+            for kind in (Kinds.PIX.value, Kinds.PIX.value, Kinds.CASH.value):
+                body = transaction_create_factory.build(
+                    description="Market",
+                    kind=kind,
+                    category_id=imported.id,
+                    is_revenue=False,
+                    amount=100.0,
+                    date=datetime.date(2024, 1, 20),
+                )
+                auth_client.post(
+                    "/transactions/", json=jsonable_encoder(body.model_dump())
+                )
+            auth_client.get("/transactions/autocomplete?prefix=m")
+            params = {"kind__eq": Kinds.PIX.value}
+            changes = {"category_id": groceries.id, "description": "Groceries"}
+
+            dry_run = auth_client.patch(
+                f"/transactions/?{urlencode({**params, 'dry_run': True})}",
+                json=changes,
+            )
+            response = auth_client.patch(
+                f"/transactions/?{urlencode(params)}", json=changes
+            )
+
+            assert dry_run.status_code == 200
+            assert dry_run.json()["data"] == {"count": 2, "dry_run": True}
+            assert response.status_code == 200
+            assert response.json()["data"] == {"count": 2, "dry_run": False}
+            assert sorted(
+                (transaction.kind, transaction.category_id, transaction.description)
+                for transaction in db.session.query(Transaction)
+            )[-2:] == [
+                (Kinds.PIX.value, groceries.id, "Groceries"),
+                (Kinds.PIX.value, groceries.id, "Groceries"),
+            ]
+            rollups = db.session.query(MonthlyRollup).filter(MonthlyRollup.count > 0)
+            assert sorted(
+                (rollup.kind, rollup.category_id == groceries.id, rollup.total)
+                for rollup in rollups
+            ) == [(Kinds.CASH.value, False, 100.0), (Kinds.PIX.value, True, 200.0)]
+
+            suggestions = {
+                prefix: auth_client.get(
+                    f"/transactions/autocomplete?prefix={prefix}"
+                ).json()["data"]
+                for prefix in ("m", "g")
+            }
+            assert suggestions == {
+                "m": [{"description": "Market", "count": 1}],
+                "g": [{"description": "Groceries", "count": 2}],
+            }
+
+    def test_bulk_delete_transactions(
+        self,
+        auth_client,
+        current_user,
+        category_factory,
+        credit_card_factory,
+        transaction_create_factory,
+    ):
+        with db():
+            category = category_factory.create()
+            credit_card = credit_card_factory.create(
+                user=current_user, invoice_start_day=25
+            )
+            for kind in (Kinds.CREDIT.value, Kinds.PIX.value):
+                body = transaction_create_factory.build(
+                    kind=kind,
+                    is_fixed=False,
+                    recurring_day=None,
+                    credit_card_id=credit_card.id,
+                    category_id=category.id,
+                    amount=300.0,
+                    installments_number=3,
+                    date=datetime.date.today(),
+                )
+                auth_client.post(
+                    "/transactions/", json=jsonable_encoder(body.model_dump())
+                )
+            params = urlencode({"credit_card_id__eq": credit_card.id})
+
+            dry_run = auth_client.delete(f"/transactions/?{params}&dry_run=true")
+            assert dry_run.json()["data"] == {"count": 1, "dry_run": True}
+            assert db.session.query(Installment).count() == 3
+
+            response = auth_client.delete(f"/transactions/?{params}")
+
+            assert response.status_code == 200
+            assert response.json()["data"] == {"count": 1, "dry_run": False}
+            assert db.session.query(Installment).count() == 0
+            assert [
+                transaction.kind for transaction in db.session.query(Transaction)
+            ] == [Kinds.PIX.value]
+            data = auth_client.get(f"/credit-cards/{credit_card.id}").json()["data"]
+            assert data["committed"] == 0.0
+            rollups = db.session.query(MonthlyRollup).filter(MonthlyRollup.count > 0)
+            assert [(rollup.kind, rollup.total) for rollup in rollups] == [
+                (Kinds.PIX.value, 300.0)
+            ]
+
+    def test_bulk_delete_transactions_without_filters(self, auth_client):
+        with db():
+            response = auth_client.delete("/transactions/")
+
+            assert response.status_code == 400
+
     def test_get_invalid_transaction(self, auth_client):
         with db():
             response = auth_client.get(f"/transactions/{uuid4()}/")
@@ -164,6 +471,62 @@ class TestTransactionsResources:
             assert len(data) == 5
             assert isinstance(data, list)
 
+    def test_get_transactions_from_view(
+        self,
+        auth_client,
+        current_user,
+        category_factory,
+        credit_card_factory,
+        transaction_factory,
+    ):
+        with db():
+            category = category_factory.create(description="Home")
+            credit_card = credit_card_factory.create(user=current_user, name="Card A")
+            rent, market = (
+                transaction_factory.create(
+                    user=current_user,
+                    description=description,
+                    is_fixed=False,
+                    kind=Kinds.CREDIT.value,
+                    category=category,
+                    credit_card=credit_card,
+                    date=day,
+                )
+                for description, day in (
+                    ("Rent", datetime.date(2024, 1, 5)),
+                    ("Market", datetime.date(2024, 1, 10)),
+                )
+            )
+
+            def listed():
+                return [
+                    (
+                        item["description"],
+                        item["category"]["description"],
+                        item["credit_card"]["name"],
+                    )
+                    for item in auth_client.get("/transactions/").json()["data"]
+                ]
+
+            assert listed() == [
+                ("Market", "Home", "Card A"),
+                ("Rent", "Home", "Card A"),
+            ]
+
+            category.description = "House"
+            db.session.commit()
+            auth_client.put(f"/credit-cards/{credit_card.id}", json={"name": "Card B"})
+            auth_client.put(f"/transactions/{rent.id}", json={"date": "2024-01-15"})
+
+            assert listed() == [
+                ("Rent", "House", "Card B"),
+                ("Market", "House", "Card B"),
+            ]
+
+            auth_client.delete("/transactions/?date__lt=2024-01-15")
+
+            assert listed() == [("Rent", "House", "Card B")]
+
     def test_get_transactions_with_filters(
         self, auth_client, category_factory, transaction_factory, current_user
     ):
@@ -220,6 +583,809 @@ class TestTransactionsResources:
                 )
                 assert item["is_revenue"] is False
 
+    def test_get_transactions_with_in_between_and_or_filters(
+        self, auth_client, category_factory, transaction_factory, current_user
+    ):
+        with db():
+            food_category = category_factory.create(description="Food")
+            home_category = category_factory.create(description="Home")
+            other_category = category_factory.create(description="Other")
+            for category, kind, amount in (
+                (food_category, Kinds.PIX.value, 50.0),
+                (food_category, Kinds.CASH.value, 500.0),
+                (home_category, Kinds.DEBIT.value, 900.0),
+                (other_category, Kinds.PIX.value, 10.0),
+            ):
+                transaction_factory.create(
+                    user=current_user,
+                    category=category,
+                    kind=kind,
+                    amount=amount,
+                    date=datetime.date(2024, 3, 10),
+                )
+            transaction_factory.create(
+                user=current_user,
+                category=food_category,
+                kind=Kinds.PIX.value,
+                amount=50.0,
+                date=datetime.date(2023, 3, 10),
+            )
+
+            params = {
+                "category_id__in": f"{food_category.id},{home_category.id}",
+                "date__between": "2024-01-01,2024-12-31",
+                "any_of": "kind__in:pix|amount__gte:800",
+            }
+            response = auth_client.get(f"/transactions/?{urlencode(params)}")
+            data = response.json()["data"]
+
+            assert response.status_code == 200
+            assert sorted(item["amount"] for item in data) == [50.0, 900.0]
+
+    def test_get_transactions_with_unindexed_range_filter(
+        self, auth_client, transaction_factory, current_user
+    ):
+        with db():
+            transaction_factory.create(user=current_user, amount=100.0)
+            transaction_factory.create(user=current_user, amount=10.0)
+
+            response = auth_client.get("/transactions/?amount__gt=50")
+            assert response.status_code == 400
+
+            response = auth_client.get(
+                "/transactions/?amount__gt=50&allow_unindexed=true"
+            )
+            assert response.status_code == 200
+            assert [item["amount"] for item in response.json()["data"]] == [100.0]
+
+    def test_get_transactions_with_invalid_or_filter(self, auth_client):
+        with db():
+            response = auth_client.get("/transactions/?any_of=description__eq:x")
+
+            assert response.status_code == 400
+
+    def test_get_transactions_with_search(
+        self, auth_client, transaction_factory, current_user
+    ):
+        with db():
+            for description in ("Uber Eats", "Uber", "Spotify", "iFood"):
+                transaction_factory.create(
+                    user=current_user,
+                    description=description,
+                    kind=Kinds.PIX.value,
+                    date=datetime.date(2024, 3, 10),
+                )
+
+            response = auth_client.get("/transactions/?search=uber")
+            descriptions = [item["description"] for item in response.json()["data"]]
+
+            assert response.status_code == 200
+            assert sorted(descriptions) == ["Uber", "Uber Eats"]
+
+            response = auth_client.get("/transactions/?search=spotfy")
+            descriptions = [item["description"] for item in response.json()["data"]]
+
+            assert descriptions == ["Spotify"]
+
+            response = auth_client.get(
+                "/transactions/?search=uber&kind__eq=pix&date__gt=2024-03-11"
+            )
+
+            assert response.json()["data"] == []
+
+    def test_autocomplete_descriptions(
+        self,
+        auth_client,
+        current_user,
+        transaction_factory,
+        transaction_create_factory,
+        category_factory,
+    ):
+        with db():
+            for description in ("Uber", "Uber Eats", "Uber Eats", "Spotify"):
+                transaction_factory.create(user=current_user, description=description)
+
+            response = auth_client.get("/transactions/autocomplete?prefix=ub")
+
+            assert response.status_code == 200
+            assert response.json()["data"] == [
+                {"description": "Uber Eats", "count": 2},
+                {"description": "Uber", "count": 1},
+            ]
+
+            body = transaction_create_factory.build(
+                description="Uber",
+                kind=Kinds.PIX.value,
+                category_id=category_factory.create().id,
+                user_id=current_user.id,
+            ).model_dump()
+            auth_client.post("/transactions/", json=jsonable_encoder(body))
+
+            response = auth_client.get("/transactions/autocomplete?prefix=UB&limit=1")
+
+            assert response.json()["data"] == [{"description": "Uber", "count": 2}]
+
+    def test_get_transactions_expanding_fixed_transactions(
+        self, auth_client, category_factory, transaction_factory, current_user
+    ):
+        with db():
+            category = category_factory.create()
+            rent = transaction_factory.create(
+                user=current_user,
+                category=category,
+                description="Rent",
+                amount=1000.0,
+                is_fixed=True,
+                date=None,
+                recurring_day=31,
+            )
+            gym = transaction_factory.create(
+                user=current_user,
+                category=category,
+                description="Gym",
+                amount=80.0,
+                is_fixed=True,
+                date=datetime.date(2024, 3, 1),
+                recurring_day=10,
+            )
+            market = transaction_factory.create(
+                user=current_user,
+                category=category,
+                description="Market",
+                amount=200.0,
+                is_fixed=False,
+                date=datetime.date(2024, 2, 15),
+            )
+
+            params = {
+                "date__gte": "2024-02-01",
+                "date__lt": "2024-04-30",
+                "expand_fixed": "true",
+            }
+            response = auth_client.get(f"/transactions/?{urlencode(params)}")
+            data = response.json()["data"]
+
+            assert response.status_code == 200
+            assert response.json()["meta"]["total"] == 5
+            assert [
+                (item["id"], item["date"], item["is_virtual"]) for item in data
+            ] == [
+                (gym.id, "2024-04-10", True),
+                (rent.id, "2024-03-31", True),
+                (gym.id, "2024-03-10", True),
+                (rent.id, "2024-02-29", True),
+                (market.id, "2024-02-15", False),
+            ]
+
+    def test_get_transactions_expanding_fixed_transactions_without_range(
+        self, auth_client
+    ):
+        with db():
+            response = auth_client.get(
+                "/transactions/?date__gte=2024-01-01&expand_fixed=true"
+            )
+
+            assert response.status_code == 400
+
+    def test_summarize_transactions_expanding_fixed_transactions(
+        self, auth_client, category_factory, transaction_factory, current_user
+    ):
+        with db():
+            category = category_factory.create()
+            transaction_factory.create(
+                user=current_user,
+                category=category,
+                amount=1000.0,
+                is_fixed=True,
+                date=None,
+                recurring_day=5,
+            )
+            transaction_factory.create(
+                user=current_user,
+                category=category,
+                amount=200.0,
+                is_fixed=False,
+                date=datetime.date(2024, 2, 15),
+            )
+
+            params = {
+                "date__between": "2024-01-01,2024-02-29",
+                "expand_fixed": "true",
+            }
+            response = auth_client.get(f"/transactions/summary?{urlencode(params)}")
+
+            assert response.status_code == 200
+            assert [
+                (row["month"], row["total"], row["count"])
+                for row in response.json()["data"]
+            ] == [("2024-01-01", 1000.0, 1), ("2024-02-01", 1200.0, 2)]
+
+    def test_materialize_fixed_transaction_occurrences(
+        self, auth_client, category_factory, transaction_factory, current_user
+    ):
+        with db():
+            category = category_factory.create()
+            rent = transaction_factory.create(
+                user=current_user,
+                category=category,
+                amount=1000.0,
+                is_fixed=True,
+                date=None,
+                recurring_day=31,
+            )
+            transaction_factory.create(
+                user=current_user,
+                category=category,
+                amount=80.0,
+                is_fixed=True,
+                date=datetime.date(2024, 3, 1),
+                recurring_day=10,
+            )
+
+            repository = TransactionRepository(db.session)
+            period = datetime.date(2024, 2, 1)
+            assert repository.materialize_occurrences([current_user.id], period) == 1
+            assert repository.materialize_occurrences([current_user.id], period) == 0
+            repository.commit()
+
+            params = {"date__between": "2024-02-01,2024-02-29"}
+            data = auth_client.get(f"/transactions/?{urlencode(params)}").json()["data"]
+            assert [
+                (item["source_transaction_id"], item["date"], item["is_fixed"])
+                for item in data
+            ] == [(rent.id, "2024-02-29", False)]
+
+            # the materialized occurrence replaces the virtual one
+            params["expand_fixed"] = "true"
+            data = auth_client.get(f"/transactions/?{urlencode(params)}").json()["data"]
+            assert [(item["date"], item["is_virtual"]) for item in data] == [
+                ("2024-02-29", False)
+            ]
+
+            rollup = db.session.query(MonthlyRollup).one()
+            assert (rollup.month, rollup.total, rollup.count) == (period, 1000.0, 1)
+
+    def test_materialize_after_changing_the_recurring_day(
+        self, auth_client, category_factory, transaction_factory, current_user
+    ):
+        with db():
+            rent = transaction_factory.create(
+                user=current_user,
+                category=category_factory.create(),
+                amount=1000.0,
+                is_fixed=True,
+                date=None,
+                recurring_day=10,
+            )
+
+            repository = TransactionRepository(db.session)
+            period = datetime.date(2024, 2, 1)
+            assert repository.materialize_occurrences([current_user.id], period) == 1
+            repository.commit()
+
+            response = auth_client.put(
+                f"/transactions/{rent.id}", json={"recurring_day": 20}
+            )
+            assert response.status_code == 200
+
+            # the period was already materialized on the former day
+            assert repository.materialize_occurrences([current_user.id], period) == 0
+            repository.commit()
+
+            params = {"date__between": "2024-02-01,2024-02-29"}
+            data = auth_client.get(f"/transactions/?{urlencode(params)}").json()["data"]
+            assert [item["date"] for item in data] == ["2024-02-10"]
+
+            rollup = db.session.query(MonthlyRollup).one()
+            assert (rollup.month, rollup.total, rollup.count) == (period, 1000.0, 1)
+
+    def test_materialize_skips_the_month_of_a_dated_fixed_transaction(
+        self, auth_client, category_factory, transaction_create_factory, current_user
+    ):
+        with db():
+            category = category_factory.create()
+            body = transaction_create_factory.build(
+                kind=Kinds.PIX.value,
+                is_fixed=True,
+                is_revenue=False,
+                recurring_day=10,
+                category_id=category.id,
+                amount=1000.0,
+                date=datetime.date(2024, 3, 1),
+            )
+            auth_client.post("/transactions/", json=jsonable_encoder(body.model_dump()))
+
+            def rollups():
+                return [
+                    (rollup.month, rollup.total, rollup.count)
+                    for rollup in db.session.query(MonthlyRollup).order_by(
+                        MonthlyRollup.month
+                    )
+                ]
+
+            march, april = datetime.date(2024, 3, 1), datetime.date(2024, 4, 1)
+            assert rollups() == [(march, 1000.0, 1)]
+
+            # the transaction already counts in March
+            repository = TransactionRepository(db.session)
+            assert repository.materialize_occurrences([current_user.id], march) == 0
+            assert repository.materialize_occurrences([current_user.id], april) == 1
+            repository.commit()
+
+            assert rollups() == [(march, 1000.0, 1), (april, 1000.0, 1)]
+
+    def test_get_archived_transactions(
+        self,
+        auth_client,
+        current_user,
+        category_factory,
+        credit_card_factory,
+        transaction_create_factory,
+    ):
+        with db():
+            category = category_factory.create()
+            credit_card = credit_card_factory.create(user=current_user)
+            for description, kind, is_fixed, amount, installments, day in (
+                ("Rent", Kinds.PIX.value, True, 1000.0, 1, None),
+                ("Old market", Kinds.PIX.value, False, 200.0, 1, "2024-01-05"),
+                ("Laptop", Kinds.CREDIT.value, False, 900.0, 3, "2024-01-15"),
+                ("New market", Kinds.PIX.value, False, 100.0, 1, "2024-03-05"),
+            ):
+                body = transaction_create_factory.build(
+                    description=description,
+                    kind=kind,
+                    is_fixed=is_fixed,
+                    recurring_day=10 if is_fixed else None,
+                    is_revenue=False,
+                    credit_card_id=credit_card.id,
+                    category_id=category.id,
+                    amount=amount,
+                    installments_number=installments,
+                    date=day and datetime.date.fromisoformat(day),
+                )
+                auth_client.post(
+                    "/transactions/", json=jsonable_encoder(body.model_dump())
+                )
+
+            repository = TransactionRepository(db.session)
+            repository.materialize_occurrences(
+                [current_user.id], datetime.date(2024, 2, 1)
+            )
+            repository.commit()
+
+            # the laptop has an installment due in March, so it is kept
+            before = datetime.date(2024, 3, 1)
+            assert repository.archive([current_user.id], before, 1) == 1
+            assert repository.archive([current_user.id], before, 5) == 1
+            assert repository.archive([current_user.id], before, 5) == 0
+            repository.commit()
+
+            def listed(**params):
+                response = auth_client.get(f"/transactions/?{urlencode(params)}")
+                return [
+                    (item["description"], item["date"])
+                    for item in response.json()["data"]
+                ]
+
+            assert listed(date__lte="2024-12-31") == [
+                ("New market", "2024-03-05"),
+                ("Rent", "2024-02-10"),
+                ("Laptop", "2024-01-15"),
+                ("Old market", "2024-01-05"),
+            ]
+            assert listed(date__gte="2024-03-01") == [("New market", "2024-03-05")]
+
+            # the first page only holds recent transactions, the total counts both
+            pages = [
+                auth_client.get(f"/transactions/?page={page}&size=2").json()
+                for page in (1, 2, 3)
+            ]
+            assert [
+                ([item["description"] for item in page["data"]], page["meta"]["total"])
+                for page in pages
+            ] == [
+                (["Rent", "New market"], 5),
+                (["Rent", "Laptop"], 5),
+                (["Old market"], 5),
+            ]
+            assert sorted(listed(search="market")) == [
+                ("New market", "2024-03-05"),
+                ("Old market", "2024-01-05"),
+            ]
+
+            # the archived occurrence still replaces the virtual one
+            params = {"date__between": "2024-02-01,2024-02-29", "expand_fixed": "true"}
+            data = auth_client.get(f"/transactions/?{urlencode(params)}").json()["data"]
+            assert [(item["date"], item["is_virtual"]) for item in data] == [
+                ("2024-02-10", False)
+            ]
+
+            assert repository.reconcile_rollups([current_user.id]) == []
+            response = auth_client.get("/transactions/balance?as_of=2024-01-31")
+            assert response.json()["data"]["total"] == -200.0
+
+    def test_read_archived_entries(
+        self,
+        auth_client,
+        current_user,
+        category_factory,
+        credit_card_factory,
+        transaction_create_factory,
+    ):
+        with db():
+            category = category_factory.create()
+            credit_card = credit_card_factory.create(user=current_user)
+            for description, kind, amount, installments, day in (
+                ("Notebook", Kinds.CREDIT.value, 300.0, 3, "2023-01-20"),
+                ("Bakery", Kinds.PIX.value, 10.0, 1, "2023-02-03"),
+                ("Market", Kinds.PIX.value, 100.0, 1, "2023-02-04"),
+            ):
+                body = transaction_create_factory.build(
+                    description=description,
+                    kind=kind,
+                    is_fixed=False,
+                    recurring_day=None,
+                    is_revenue=False,
+                    credit_card_id=credit_card.id,
+                    category_id=category.id,
+                    amount=amount,
+                    installments_number=installments,
+                    date=datetime.date.fromisoformat(day),
+                )
+                auth_client.post(
+                    "/transactions/", json=jsonable_encoder(body.model_dump())
+                )
+
+            repository = TransactionRepository(db.session)
+            assert (
+                repository.archive([current_user.id], datetime.date(2024, 1, 1), 5) == 3
+            )
+            repository.commit()
+
+            # a range starting mid-month is aggregated live
+            params = {
+                "group_by": "credit_card",
+                "date__between": "2023-01-15,2023-03-31",
+            }
+            response = auth_client.get(f"/transactions/summary?{urlencode(params)}")
+            assert sorted(
+                (row["credit_card_id"] or "", row["total"], row["count"])
+                for row in response.json()["data"]
+            ) == sorted([(credit_card.id, 300.0, 3), ("", 110.0, 2)])
+
+            params = {"start": "2023-02-01", "end": "2023-02-05", "threshold": 0.5}
+            analytics = auth_client.get(
+                f"/transactions/analytics?{urlencode(params)}"
+            ).json()["data"]
+            assert analytics["series"][0]["totals"] == [0.0, 0.0, 10.0, 100.0, 0.0]
+            assert sorted(outlier["amount"] for outlier in analytics["outliers"]) == [
+                10.0,
+                100.0,
+            ]
+
+            billed = [
+                (installment["description"], installment["installment_number"])
+                for month in range(1, 6)
+                for installment in auth_client.get(
+                    f"/credit-cards/{credit_card.id}/invoices/2023-0{month}"
+                ).json()["data"]["installments"]
+            ]
+            assert billed == [("Notebook", 1), ("Notebook", 2), ("Notebook", 3)]
+
+    def test_summarize_transactions(
+        self,
+        auth_client,
+        current_user,
+        category_factory,
+        credit_card_factory,
+        transaction_factory,
+        transaction_create_factory,
+    ):
+        with db():
+            food = category_factory.create(description="Food")
+            home = category_factory.create(description="Home")
+            credit_card = credit_card_factory.create(user=current_user)
+            transaction_factory.create(
+                user=current_user,
+                category=food,
+                kind=Kinds.PIX.value,
+                amount=100.0,
+                date=datetime.date(2024, 1, 10),
+            )
+            transaction_factory.create(
+                user=current_user,
+                category=home,
+                kind=Kinds.PIX.value,
+                amount=40.0,
+                is_revenue=True,
+                date=datetime.date(2024, 2, 5),
+            )
+            body = transaction_create_factory.build(
+                kind=Kinds.CREDIT.value,
+                credit_card_id=credit_card.id,
+                category_id=food.id,
+                amount=300.0,
+                installments_number=3,
+                date=datetime.date(2024, 1, 20),
+            ).model_dump()
+            auth_client.post("/transactions/", json=jsonable_encoder(body))
+            # factories skip the write path that maintains the rollups
+            TransactionRepository(db.session).rebuild_rollups([current_user.id])
+            db.session.commit()
+
+            response = auth_client.get("/transactions/summary")
+
+            assert response.status_code == 200
+            assert [
+                (row["month"], row["total"], row["count"])
+                for row in response.json()["data"]
+            ] == [
+                ("2024-01-01", 200.0, 2),
+                ("2024-02-01", 140.0, 2),
+                ("2024-03-01", 100.0, 1),
+            ]
+
+            params = {
+                "group_by": "category,is_revenue",
+                "date__between": "2024-01-01,2024-02-29",
+            }
+            response = auth_client.get(f"/transactions/summary?{urlencode(params)}")
+
+            assert [
+                (row["category_id"], row["is_revenue"], row["total"], row["month"])
+                for row in response.json()["data"]
+            ] == sorted(
+                [(food.id, False, 300.0, None), (home.id, True, 40.0, None)]
+            )
+
+    def test_create_transaction_updates_monthly_rollups(
+        self,
+        auth_client,
+        current_user,
+        category_factory,
+        credit_card_factory,
+        transaction_create_factory,
+    ):
+        with db():
+            category = category_factory.create()
+            credit_card = credit_card_factory.create(user=current_user)
+            for body in (
+                transaction_create_factory.build(
+                    kind=Kinds.PIX.value,
+                    category_id=category.id,
+                    amount=100.0,
+                    date=datetime.date(2024, 1, 20),
+                ),
+                transaction_create_factory.build(
+                    kind=Kinds.CREDIT.value,
+                    credit_card_id=credit_card.id,
+                    category_id=category.id,
+                    amount=100.0,
+                    installments_number=2,
+                    date=datetime.date(2024, 1, 20),
+                ),
+            ):
+                auth_client.post(
+                    "/transactions/", json=jsonable_encoder(body.model_dump())
+                )
+
+            rollups = db.session.query(MonthlyRollup).order_by(
+                MonthlyRollup.month, MonthlyRollup.kind
+            )
+
+            assert [
+                (rollup.month, rollup.kind, rollup.total, rollup.count)
+                for rollup in rollups
+            ] == [
+                (datetime.date(2024, 1, 1), Kinds.CREDIT.value, 50.0, 1),
+                (datetime.date(2024, 1, 1), Kinds.PIX.value, 100.0, 1),
+                (datetime.date(2024, 2, 1), Kinds.CREDIT.value, 50.0, 1),
+            ]
+
+    def test_summarize_transactions_aggregates_current_month_live(
+        self, auth_client, current_user, category_factory, transaction_factory
+    ):
+        with db():
+            category = category_factory.create()
+            today = datetime.date.today()
+            closed_month = (today.replace(day=1) - datetime.timedelta(days=1)).replace(
+                day=1
+            )
+            for day in (closed_month, today):
+                transaction_factory.create(
+                    user=current_user, category=category, amount=10.0, date=day
+                )
+            # only the closed month is rolled up, and it is read from the rollups
+            TransactionRepository(db.session).rebuild_rollups([current_user.id])
+            db.session.query(MonthlyRollup).update({"total": 25.0})
+            transaction_factory.create(
+                user=current_user, category=category, amount=5.0, date=today
+            )
+
+            response = auth_client.get("/transactions/summary")
+
+            assert [
+                (row["month"], row["total"], row["count"])
+                for row in response.json()["data"]
+            ] == [
+                (closed_month.isoformat(), 25.0, 1),
+                (today.replace(day=1).isoformat(), 15.0, 2),
+            ]
+
+    def test_get_balance(
+        self,
+        auth_client,
+        current_user,
+        category_factory,
+        credit_card_factory,
+        transaction_create_factory,
+    ):
+        with db():
+            category = category_factory.create()
+            credit_card = credit_card_factory.create(user=current_user)
+            ids = []
+            for kind, is_revenue, amount, day in (
+                (Kinds.PIX.value, True, 1000.0, datetime.date(2024, 1, 5)),
+                (Kinds.PIX.value, False, 200.0, datetime.date(2024, 2, 10)),
+                (Kinds.CASH.value, False, 50.0, datetime.date(2024, 2, 20)),
+                (Kinds.CREDIT.value, False, 300.0, datetime.date(2024, 1, 5)),
+            ):
+                body = transaction_create_factory.build(
+                    kind=kind,
+                    is_fixed=False,
+                    recurring_day=None,
+                    is_revenue=is_revenue,
+                    credit_card_id=credit_card.id,
+                    category_id=category.id,
+                    amount=amount,
+                    installments_number=1,
+                    date=day,
+                )
+                response = auth_client.post(
+                    "/transactions/", json=jsonable_encoder(body.model_dump())
+                )
+                ids.append(response.json()["data"]["id"])
+
+            def balance(**params):
+                response = auth_client.get(f"/transactions/balance?{urlencode(params)}")
+                return response.json()["data"]
+
+            assert balance() == {
+                "as_of": None,
+                "total": 750.0,
+                "kinds": [
+                    {"kind": Kinds.CASH.value, "total": -50.0},
+                    {"kind": Kinds.PIX.value, "total": 800.0},
+                ],
+            }
+            assert balance(as_of="2024-02-15")["kinds"] == [
+                {"kind": Kinds.PIX.value, "total": 800.0}
+            ]
+            assert balance(as_of="2024-01-31")["total"] == 1000.0
+
+            auth_client.put(f"/transactions/{ids[1]}", json={"amount": 150.0})
+            auth_client.delete(f"/transactions/?kind__eq={Kinds.CASH.value}")
+
+            assert balance()["kinds"] == [
+                {"kind": Kinds.CASH.value, "total": 0.0},
+                {"kind": Kinds.PIX.value, "total": 850.0},
+            ]
+            assert balance(as_of="2024-03-01")["total"] == 850.0
+
+    def test_get_spend_analytics(
+        self, auth_client, current_user, category_factory, transaction_factory
+    ):
+        with db():
+            category = category_factory.create()
+            for is_revenue, amount, day in (
+                (False, 10.0, 1),
+                (False, 10.0, 2),
+                (False, 10.0, 3),
+                (False, 10.0, 4),
+                (False, 100.0, 5),
+                (True, 500.0, 5),
+                (False, 70.0, 20),
+            ):
+                transaction_factory.create(
+                    user=current_user,
+                    category=category,
+                    kind=Kinds.PIX.value,
+                    is_revenue=is_revenue,
+                    amount=amount,
+                    date=datetime.date(2024, 1, day),
+                )
+
+            def analytics(**params):
+                response = auth_client.get(
+                    f"/transactions/analytics?{urlencode(params)}"
+                )
+                return response.json()["data"]
+
+            daily = analytics(start="2024-01-01", end="2024-01-05", window=2)
+            weekly = analytics(start="2024-01-03", end="2024-01-10", period="week")
+
+            assert daily["buckets"] == [f"2024-01-0{day}" for day in range(1, 6)]
+            assert daily["series"] == [
+                {
+                    "category_id": category.id,
+                    "totals": [10.0, 10.0, 10.0, 10.0, 100.0],
+                    "rolling_mean": [10.0, 10.0, 10.0, 10.0, 55.0],
+                    "rolling_std": [None, 0.0, 0.0, 0.0, 63.64],
+                }
+            ]
+            assert daily["outliers"] == []
+            assert weekly["buckets"] == ["2024-01-01", "2024-01-08"]
+            assert weekly["series"][0]["totals"] == [120.0, 0.0]
+            assert [
+                (outlier["amount"], outlier["z_score"])
+                for outlier in analytics(
+                    start="2024-01-01", end="2024-01-05", threshold=1.5
+                )["outliers"]
+            ] == [(100.0, 1.79)]
+
+    def test_get_spend_analytics_with_invalid_range(self, auth_client):
+        with db():
+            response = auth_client.get(
+                "/transactions/analytics?start=2024-02-01&end=2024-01-01"
+            )
+
+            assert response.status_code == 400
+
+    def test_forecast_cash_flow(
+        self,
+        auth_client,
+        current_user,
+        category_factory,
+        credit_card_factory,
+        transaction_factory,
+        transaction_create_factory,
+    ):
+        with db():
+            category = category_factory.create()
+            credit_card = credit_card_factory.create(
+                user=current_user, invoice_start_day=1
+            )
+            this_month = datetime.date.today().replace(day=1)
+            transaction_factory.create(
+                user=current_user,
+                category=category,
+                amount=1000.0,
+                is_fixed=True,
+                is_revenue=True,
+                date=None,
+                recurring_day=5,
+            )
+            # the invoice opens on the 1st, so installments are due the next month
+            body = transaction_create_factory.build(
+                kind=Kinds.CREDIT.value,
+                credit_card_id=credit_card.id,
+                category_id=category.id,
+                amount=300.0,
+                installments_number=2,
+                date=this_month,
+            ).model_dump()
+            auth_client.post("/transactions/", json=jsonable_encoder(body))
+
+            response = auth_client.get("/transactions/forecast?months=3")
+
+            assert response.status_code == 200
+            assert [
+                (row["inflow"], row["outflow"], row["net"])
+                for row in response.json()["data"]
+            ] == [(1000.0, 0.0, 1000.0), (1000.0, 150.0, 850.0), (1000.0, 150.0, 850.0)]
+            assert response.json()["data"][0]["month"] == this_month.isoformat()
+
+    def test_forecast_cash_flow_with_too_many_months(self, auth_client):
+        response = auth_client.get("/transactions/forecast?months=25")
+
+        assert response.status_code == 422
+
+    def test_summarize_transactions_with_invalid_group(self, auth_client):
+        with db():
+            response = auth_client.get("/transactions/summary?group_by=month,day")
+
+            assert response.status_code == 400
+
     def test_export_transactions_with_success(
         self, auth_client, category_factory, transaction_factory, current_user
     ):
@@ -0,0 +1,79 @@
+"""
+Micro-benchmark for the cash flow forecast projection.
+
+It projects a large account (thousands of future installments and fixed
+transactions) onto a 24-month grid with ``project_cash_flow`` and compares it with
+a per-item Python loop over the same data, as done when expanding installment dates
+one by one.
+
+No database connection is needed. Run it from the repository root with::
+
+    python -m benchmarks.cash_flow_forecast
+"""
+
+import datetime
+import random
+import timeit
+
+from dateutil.relativedelta import relativedelta
+
+from app.solomon.transactions.application.forecast import project_cash_flow
+
+ITERATIONS = 100
+MONTHS = 24
+INSTALLMENTS = 20_000
+FIXED_TRANSACTIONS = 2_000
+
+START = datetime.date(2024, 1, 1)
+
+
+def random_items(count, spread):
+    dates = [
+        START + datetime.timedelta(days=random.randint(-spread, spread))
+        for _ in range(count)
+    ]
+    amounts = [round(random.uniform(1, 1000), 2) for _ in range(count)]
+    is_revenue = [random.random() < 0.2 for _ in range(count)]
+    return dates, amounts, is_revenue
+
+
+def project_with_loops(installments, fixed_transactions):
+    inflow = [0.0] * MONTHS
+    outflow = [0.0] * MONTHS
+    grid = [START + relativedelta(months=month) for month in range(MONTHS)]
+
+    for period, amount, is_revenue in zip(*installments):
+        for month, first_day in enumerate(grid):
+            if (period.year, period.month) == (first_day.year, first_day.month):
+                (inflow if is_revenue else outflow)[month] += amount
+
+    for first_date, amount, is_revenue in zip(*fixed_transactions):
+        for month, first_day in enumerate(grid):
+            if first_date.replace(day=1) <= first_day:
+                (inflow if is_revenue else outflow)[month] += amount
+
+    return inflow, outflow
+
+
+def main():
+    installments = random_items(INSTALLMENTS, 800)
+    fixed_transactions = random_items(FIXED_TRANSACTIONS, 800)
+
+    vectorized = timeit.timeit(
+        lambda: project_cash_flow(START, MONTHS, *installments, *fixed_transactions),
+        number=ITERATIONS,
+    )
+    loops = timeit.timeit(
+        lambda: project_with_loops(installments, fixed_transactions), number=5
+    )
+
+    print(
+        f"{INSTALLMENTS} installments and {FIXED_TRANSACTIONS} fixed transactions "
+        f"over {MONTHS} months"
+    )
+    print(f"{'numpy projection':<20} {vectorized / ITERATIONS * 1_000:8.2f} ms/request")
+    print(f"{'python loops':<20} {loops / 5 * 1_000:8.2f} ms/request")
+
+
+if __name__ == "__main__":
+    main()
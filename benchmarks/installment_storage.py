@@ -0,0 +1,155 @@
+"""
+Benchmark for the two installment storage modes.
+
+It creates the same credit card purchases, 24 installments each, once with one
+``Installment`` row per installment (``rows``) and once with only the schedule on
+the transaction (``compact``), through the same handler used by
+``POST /transactions``, and reports for each mode:
+
+* the insert throughput, in purchases per second;
+* the rows stored in the ``transactions`` and ``installments`` tables, each also
+  being an entry in every index of its table, and the size of their tuples.
+
+It also times reading one purchase back with its installments, which the compact
+mode expands in SQL.
+
+The sizes are those of the stored tuples (``pg_column_size``), because the growth
+of the tables themselves depends on the free space left by earlier deletes. It
+needs a database with the migrations applied, ideally a scratch one, as the rows it
+creates are only deleted at the end. Run it from the repository root with::
+
+    ENV=test python -m benchmarks.installment_storage
+"""
+
+import datetime
+import time
+import timeit
+from uuid import uuid4
+
+from sqlalchemy import delete, func, select
+
+from app.solomon.infrastructure.database import create_session
+from app.solomon.models import *  # noqa
+from app.solomon.transactions.application.handlers import (
+    CreditCardTransactionHandler,
+)
+from app.solomon.transactions.domain.models import (
+    Category,
+    CreditCard,
+    Installment,
+    MonthlyRollup,
+    Transaction,
+)
+from app.solomon.transactions.domain.options import InstallmentStorage, Kinds
+from app.solomon.transactions.infrastructure.repositories import (
+    TransactionRepository,
+)
+from app.solomon.transactions.presentation.models import TransactionCreate
+from app.solomon.users.domain.models import User
+
+PURCHASES = 2_000
+INSTALLMENTS = 24
+READS = 500
+
+
+def stored_rows(session, user_id):
+    """Number and total size of the user's transaction and installment tuples."""
+    transactions = select(
+        func.count(),
+        func.sum(func.pg_column_size(Transaction.__table__.table_valued())),
+    ).where(Transaction.user_id == user_id)
+    installments = (
+        select(
+            func.count(),
+            func.sum(func.pg_column_size(Installment.__table__.table_valued())),
+        )
+        .join(Transaction, Transaction.id == Installment.transaction_id)
+        .where(Transaction.user_id == user_id)
+    )
+    rows, size = 0, 0
+    for count, total in (
+        session.execute(transactions).one(),
+        session.execute(installments).one(),
+    ):
+        rows, size = rows + count, size + (total or 0)
+    return rows, size
+
+
+def create_owner(session):
+    user = User(
+        username="benchmark",
+        email=f"benchmark-{uuid4()}@example.com",
+        hashed_password="-",
+    )
+    category = Category(description="Benchmark")
+    session.add_all([user, category])
+    session.flush()
+    credit_card = CreditCard(
+        user_id=user.id, name="Benchmark", limit=1_000_000, invoice_start_day=25
+    )
+    session.add(credit_card)
+    session.commit()
+    return user.id, category.id, credit_card.id
+
+
+def delete_owner(session, user_id, category_id, credit_card_id):
+    transaction_ids = select(Transaction.id).where(Transaction.user_id == user_id)
+    session.execute(
+        delete(Installment).where(Installment.transaction_id.in_(transaction_ids))
+    )
+    session.execute(delete(Transaction).where(Transaction.user_id == user_id))
+    session.execute(delete(MonthlyRollup).where(MonthlyRollup.user_id == user_id))
+    session.execute(delete(CreditCard).where(CreditCard.id == credit_card_id))
+    session.execute(delete(Category).where(Category.id == category_id))
+    session.execute(delete(User).where(User.id == user_id))
+    session.commit()
+
+
+def run(storage):
+    with create_session() as session:
+        owner = create_owner(session)
+        user_id, category_id, credit_card_id = owner
+        repository = TransactionRepository(session)
+        handler = CreditCardTransactionHandler(repository, storage)
+
+        started = time.perf_counter()
+        for number in range(PURCHASES):
+            transaction = handler.process_transaction(
+                TransactionCreate(
+                    description=f"Purchase {number}",
+                    amount=1_000.0,
+                    is_fixed=False,
+                    is_revenue=False,
+                    date=datetime.date(2024, 1, 1)
+                    + datetime.timedelta(days=number % 365),
+                    kind=Kinds.CREDIT.value,
+                    category_id=category_id,
+                    user_id=user_id,
+                    credit_card_id=credit_card_id,
+                    installments_number=INSTALLMENTS,
+                )
+            )
+        elapsed = time.perf_counter() - started
+        rows, size = stored_rows(session, user_id)
+
+        read = timeit.timeit(
+            lambda: repository.get_by_id(transaction.id, user_id), number=READS
+        )
+
+        delete_owner(session, *owner)
+
+    print(
+        f"{storage.value:<8} {PURCHASES / elapsed:8.0f} purchases/s "
+        f"{rows:8} rows {size / 1024 / 1024:8.2f} MiB "
+        f"{read / READS * 1_000:8.2f} ms/read"
+    )
+
+
+def main():
+    print(f"{PURCHASES} purchases of {INSTALLMENTS} installments")
+    for storage in InstallmentStorage:
+        run(storage)
+
+
+if __name__ == "__main__":
+    main()
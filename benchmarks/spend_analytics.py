@@ -0,0 +1,135 @@
+"""
+Benchmark for the spend analytics of ``GET /transactions/analytics``.
+
+It creates ten years of expenses, a few a day spread over several categories, and
+times ``TransactionService.get_spend_analytics`` over the whole history for daily
+and weekly buckets, split into:
+
+* the series query, gap-filled in SQL and returning one array per category;
+* the rolling statistics, computed with pandas over every category at once;
+* the outliers query;
+* the whole call, including building the response.
+
+It needs a database with the migrations applied, ideally a scratch one, as the rows
+it creates are only deleted at the end. Run it from the repository root with::
+
+    ENV=test python -m benchmarks.spend_analytics
+"""
+
+import datetime
+import random
+import time
+import timeit
+from uuid import uuid4
+
+from sqlalchemy import delete, insert, text
+
+from app.solomon.infrastructure.database import create_session
+from app.solomon.models import *  # noqa
+from app.solomon.transactions.application.analytics import rolling_spend
+from app.solomon.transactions.application.forecast import columns
+from app.solomon.transactions.application.services import TransactionService
+from app.solomon.transactions.domain.models import Category, Transaction
+from app.solomon.transactions.domain.options import AnalyticsPeriods, Kinds
+from app.solomon.transactions.infrastructure.repositories import TransactionRepository
+from app.solomon.transactions.presentation.models import SpendAnalyticsParams
+from app.solomon.users.domain.models import User
+
+ITERATIONS = 20
+CATEGORIES = 12
+EXPENSES_PER_DAY = 5
+WINDOW = 30
+
+END = datetime.date(2024, 12, 31)
+START = END - datetime.timedelta(days=SpendAnalyticsParams.MAX_DAYS - 1)
+
+
+def create_owner(session):
+    user = User(
+        username="benchmark",
+        email=f"benchmark-{uuid4()}@example.com",
+        hashed_password="-",
+    )
+    categories = [
+        Category(description=f"Benchmark {number}") for number in range(CATEGORIES)
+    ]
+    session.add_all([user, *categories])
+    session.flush()
+
+    days = (END - START).days + 1
+    session.execute(
+        insert(Transaction),
+        [
+            {
+                "description": "Expense",
+                "amount": round(random.lognormvariate(3, 1), 2),
+                "is_fixed": False,
+                "is_revenue": False,
+                "date": START + datetime.timedelta(days=day),
+                "kind": Kinds.PIX.value,
+                "category_id": random.choice(categories).id,
+                "user_id": user.id,
+            }
+            for day in range(days)
+            for _ in range(EXPENSES_PER_DAY)
+        ],
+    )
+    session.commit()
+    # as autovacuum would after such a load, so the plans see the real row counts
+    session.execute(text("ANALYZE transactions"))
+    return user.id, [category.id for category in categories]
+
+
+def delete_owner(session, user_id, category_ids):
+    session.execute(delete(Transaction).where(Transaction.user_id == user_id))
+    session.execute(delete(Category).where(Category.id.in_(category_ids)))
+    session.execute(delete(User).where(User.id == user_id))
+    session.commit()
+
+
+def milliseconds(function):
+    return timeit.timeit(function, number=ITERATIONS) / ITERATIONS * 1_000
+
+
+def run(session, user_id, period):
+    repository = TransactionRepository(session)
+    service = TransactionService(repository)
+    params = SpendAnalyticsParams(start=START, end=END, period=period, window=WINDOW)
+
+    rows = repository.get_spend_series(user_id, START, END, period)
+    series = milliseconds(
+        lambda: repository.get_spend_series(user_id, START, END, period)
+    )
+    rolling = milliseconds(
+        lambda: rolling_spend(START, END, period, WINDOW, *columns(rows, 2))
+    )
+    outliers = milliseconds(
+        lambda: repository.get_spend_outliers(user_id, START, END, params.threshold)
+    )
+    started = time.perf_counter()
+    for _ in range(ITERATIONS):
+        service.get_spend_analytics(user_id, params)
+    total = (time.perf_counter() - started) / ITERATIONS * 1_000
+
+    print(
+        f"{period.value:<5} {series:8.2f} ms series {rolling:8.2f} ms rolling "
+        f"{outliers:8.2f} ms outliers {total:8.2f} ms total"
+    )
+
+
+def main():
+    with create_session() as session:
+        user_id, category_ids = create_owner(session)
+        print(
+            f"{(END - START).days + 1} days, {EXPENSES_PER_DAY} expenses a day, "
+            f"{CATEGORIES} categories"
+        )
+        try:
+            for period in AnalyticsPeriods:
+                run(session, user_id, period)
+        finally:
+            delete_owner(session, user_id, category_ids)
+
+
+if __name__ == "__main__":
+    main()
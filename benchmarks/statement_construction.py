@@ -0,0 +1,76 @@
+"""
+Micro-benchmark for the statement construction overhead of the transactions list.
+
+It builds the ``GET /transactions`` statement the same way the repository does, for a
+fixed set of filter keys with different values on every iteration, and reports:
+
+* the time spent building the ``Select`` statement;
+* the time spent computing its cache key, which is all the engine does per execution
+  once the compiled form is in its compiled cache;
+* the time a full SQL compilation would take, i.e. the cost of a cache miss.
+
+No database connection is needed. Run it from the repository root with::
+
+    python -m benchmarks.statement_construction
+"""
+
+import datetime
+import random
+import timeit
+from uuid import uuid4
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql import desc
+
+from app.solomon.infrastructure.database import select_query
+from app.solomon.models import *  # noqa
+from app.solomon.transactions.domain.models import Transaction
+
+ITERATIONS = 5_000
+
+
+def build_statement():
+    """Build the list statement with random values for a fixed filter shape."""
+    filters = {
+        "date__gt": datetime.date(2023, 1, 1)
+        + datetime.timedelta(days=random.randint(0, 365)),
+        "date__lt": datetime.date(2024, 6, 1),
+        "category_id__eq": str(uuid4()),
+        "is_revenue__eq": random.choice([True, False]),
+    }
+    return (
+        select_query(None, Transaction)
+        .filter(Transaction.user_id == str(uuid4()))
+        .apply_filters(Transaction, filters)
+        .order_by(desc(Transaction.date))
+        .statement
+    )
+
+
+def main():
+    dialect = postgresql.dialect()
+
+    keys = {build_statement()._generate_cache_key().key for _ in range(100)}
+    print(f"distinct cache keys for 100 requests of the same shape: {len(keys)}")
+
+    # cache keys are memoized per statement, so every measurement gets a fresh one
+    statements = iter([build_statement() for _ in range(2 * ITERATIONS)])
+
+    build = timeit.timeit(build_statement, number=ITERATIONS)
+    cache_key = timeit.timeit(
+        lambda: next(statements)._generate_cache_key(), number=ITERATIONS
+    )
+    compile_ = timeit.timeit(
+        lambda: next(statements).compile(dialect=dialect), number=ITERATIONS
+    )
+
+    for label, total in (
+        ("build statement", build),
+        ("cache key (compiled cache hit)", cache_key),
+        ("full compile (compiled cache miss)", compile_),
+    ):
+        print(f"{label:<36} {total / ITERATIONS * 1_000_000:8.1f} us/request")
+
+
+if __name__ == "__main__":
+    main()